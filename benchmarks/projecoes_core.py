@@ -0,0 +1,185 @@
+"""
+Benchmark: leitura por instâncias do ORM x projeção (Core) das colunas usadas.
+
+Compara, por linha, o tempo de CPU e a memória alocada das leituras de serviços e colaboradores
+do estabelecimento (e, no PostgreSQL, da listagem de agendamentos do cliente) na forma antiga,
+com db.session.query(Modelo).all() e cópia dos campos, e na forma atual, com select() apenas das
+colunas necessárias.
+
+Uso (a partir da raiz do repositório):
+    python benchmarks/projecoes_core.py                    # SQLite em memória
+    python benchmarks/projecoes_core.py --linhas 5000
+    python benchmarks/projecoes_core.py --url postgresql://...   # banco com as migrações aplicadas
+
+No PostgreSQL os dados são criados em uma transação desfeita ao final.
+"""
+import argparse
+import gc
+import os
+import sys
+import time
+import tracemalloc
+import uuid
+from datetime import date, time as hora, timedelta
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'project'))
+os.environ.setdefault("SECRET_KEY_ID_USER", "benchmark")
+os.environ.setdefault("SECRET_KEY_ID_ESTABELECIMENTO", "benchmark")
+
+from sqlalchemy.orm import joinedload, selectinload, load_only  # noqa: E402
+from app import create_app  # noqa: E402
+from app.config import Config  # noqa: E402
+from app.extensions import db  # noqa: E402
+from app.models.models import Agendamento, Cliente, Colaborador, Estabelecimento, Servico  # noqa: E402
+from app.services.Cliente.Consulta_DataBase.Consultar_servicos import _carregar_servicos  # noqa: E402
+from app.services.Cliente.Consulta_DataBase.Consulta_colaboradores import _carregar_colaboradores  # noqa: E402
+from app.services.Cliente.Consulta_DataBase.Consultar_agendamentos_no_DB import (  # noqa: E402
+    consultar_agendamentos_por_estabelecimento_cliente_status
+)
+
+
+# --- Forma antiga (instâncias do ORM) ---
+
+def servicos_orm(estabelecimento_id):
+    servicos = db.session.query(Servico).filter_by(estabelecimento_id=estabelecimento_id).all()
+    return [(str(s.id), s.nome, s.descricao, str(s.preco), s.duracao) for s in servicos]
+
+
+def colaboradores_orm(estabelecimento_id):
+    colaboradores = db.session.query(Colaborador).filter_by(estabelecimento_id=estabelecimento_id).all()
+    return [(str(c.id), c.nome) for c in colaboradores]
+
+
+def agendamentos_orm(estabelecimento_id, cliente_id):
+    agendamentos = db.session.query(Agendamento).options(
+        load_only(Agendamento.id, Agendamento.data, Agendamento.horas, Agendamento.duracao, Agendamento.status),
+        joinedload(Agendamento.colaborador).load_only(Colaborador.nome),
+        joinedload(Agendamento.estabelecimento).load_only(Estabelecimento.nome_fantasia),
+        selectinload(Agendamento.servicos).load_only(Servico.nome)
+    ).filter(
+        Agendamento.estabelecimento_id == estabelecimento_id,
+        Agendamento.cliente_id == cliente_id,
+        Agendamento.status.in_(["cancelado", "concluído"])
+    ).all()
+    return [{
+        "id": str(ag.id),
+        "data": ag.data.isoformat(),
+        "horas": [h.strftime("%H:%M:%S") for h in ag.horas],
+        "duracao": ag.duracao,
+        "status": ag.status,
+        "colaborador": ag.colaborador.nome if ag.colaborador else None,
+        "servicos": [servico.nome for servico in ag.servicos],
+        "estabelecimento": ag.estabelecimento.nome_fantasia if ag.estabelecimento else None
+    } for ag in agendamentos]
+
+
+# --- Medição ---
+
+def medir(funcao, args, linhas, repeticoes):
+    """
+    Retorna (microssegundos por linha, bytes alocados por linha) da execução de funcao(*args).
+    O tempo é o melhor de 'repeticoes' execuções; a memória é o pico medido com tracemalloc.
+    """
+    tempos = []
+    for _ in range(repeticoes):
+        db.session.expunge_all()
+        gc.collect()
+        inicio = time.perf_counter()
+        resultado = funcao(*args)
+        tempos.append(time.perf_counter() - inicio)
+        assert len(resultado) == linhas
+        del resultado
+
+    db.session.expunge_all()
+    gc.collect()
+    tracemalloc.start()
+    resultado = funcao(*args)
+    pico = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    del resultado
+    return min(tempos) / linhas * 1e6, pico / linhas
+
+
+def semear(linhas, com_agendamentos):
+    sufixo = uuid.uuid4().hex[:8]
+    estabelecimento = Estabelecimento(
+        id=uuid.uuid4(), identificador_base=sufixo, email_login=f"bench{sufixo}@teste.com",
+        senha_hash="x", nome_fantasia="Benchmark"
+    )
+    db.session.add(estabelecimento)
+    db.session.flush()
+    servicos = [
+        Servico(id=uuid.uuid4(), nome=f"Serviço {i}", descricao="Descrição do serviço", duracao=30,
+                preco=50, estabelecimento_id=estabelecimento.id)
+        for i in range(linhas)
+    ]
+    colaboradores = [
+        Colaborador(id=uuid.uuid4(), nome=f"Colaborador {i}", estabelecimento_id=estabelecimento.id)
+        for i in range(linhas)
+    ]
+    db.session.add_all(servicos + colaboradores)
+    db.session.flush()
+
+    cliente_id = None
+    if com_agendamentos:
+        cliente = Cliente(id=uuid.uuid4(), email_login=f"cli{sufixo}@teste.com", senha_hash="x",
+                          nome="Cliente", estabelecimento_id=estabelecimento.id)
+        db.session.add(cliente)
+        db.session.flush()
+        cliente_id = cliente.id
+        db.session.add_all([
+            Agendamento(
+                cliente_id=cliente.id, colaborador_id=colaboradores[i % 10].id,
+                estabelecimento_id=estabelecimento.id, data=date(2000, 1, 1) + timedelta(days=i),
+                horas=[hora(9, 0)], duracao=30, status="concluído", servicos=servicos[:2]
+            )
+            for i in range(linhas)
+        ])
+        db.session.flush()
+    return estabelecimento.id, cliente_id
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--url", default="sqlite://", help="URL do banco (padrão: SQLite em memória)")
+    parser.add_argument("--linhas", type=int, default=2000, help="Linhas por consulta")
+    parser.add_argument("--repeticoes", type=int, default=5, help="Execuções por medição")
+    args = parser.parse_args()
+
+    class ConfigBenchmark(Config):
+        SQLALCHEMY_DATABASE_URI = args.url
+
+    app = create_app(ConfigBenchmark)
+    postgres = args.url.startswith("postgresql")
+    with app.app_context():
+        if not postgres:
+            # Os demais modelos usam tipos exclusivos do PostgreSQL
+            db.metadata.create_all(db.engine, tables=[
+                Estabelecimento.__table__, Servico.__table__, Colaborador.__table__
+            ])
+        estabelecimento_id, cliente_id = semear(args.linhas, com_agendamentos=postgres)
+
+        casos = [
+            ("servicos", servicos_orm, _carregar_servicos, (estabelecimento_id,)),
+            ("colaboradores", colaboradores_orm, _carregar_colaboradores, (estabelecimento_id,)),
+        ]
+        if postgres:
+            casos.append((
+                "agendamentos", agendamentos_orm,
+                lambda e, c: consultar_agendamentos_por_estabelecimento_cliente_status(e, c, "historico"),
+                (estabelecimento_id, cliente_id)
+            ))
+
+        print(f"{args.linhas} linhas por consulta, melhor de {args.repeticoes} ({db.engine.dialect.name})")
+        print(f"{'consulta':<14}{'ORM us/linha':>14}{'Core us/linha':>15}{'ORM B/linha':>13}{'Core B/linha':>14}")
+        for nome, orm, core, argumentos in casos:
+            tempo_orm, memoria_orm = medir(orm, argumentos, args.linhas, args.repeticoes)
+            tempo_core, memoria_core = medir(core, argumentos, args.linhas, args.repeticoes)
+            print(f"{nome:<14}{tempo_orm:>14.2f}{tempo_core:>15.2f}{memoria_orm:>13.0f}{memoria_core:>14.0f}"
+                  f"   ({tempo_orm / tempo_core:.1f}x CPU, {memoria_orm / memoria_core:.1f}x memória)")
+
+        db.session.rollback()
+
+
+if __name__ == "__main__":
+    main()
@@ -1,5 +1,6 @@
 import os
 from flask import Flask
+from werkzeug.middleware.proxy_fix import ProxyFix
 from dotenv import load_dotenv
 from .config import Config
 from .extensions import db, migrate, jwt, cors
@@ -11,6 +12,14 @@ from .controllers.Endpoints.Cliente.consultar_colaborador import consultar_colab
 from .controllers.Endpoints.Cliente.consultar_horarios import consultar_horarios_bp
 from .controllers.Endpoints.Cliente.cancelar_agendamento import cancelar_agendamento_bp
 from .controllers.Endpoints.Cliente.criar_agendamento import criar_agendamento_bp
+from .controllers.Endpoints.Cliente.consultar_metricas import consultar_metricas_bp
+from .controllers.Endpoints.Cliente.renovar_token import renovar_token_bp
+from .controllers.Endpoints.Estabelecimento.autenticar_estabelecimento import autenticar_estabelecimento_bp
+from .controllers.Endpoints.Estabelecimento.exportar_agendamentos import exportar_agendamentos_bp
+from .services.Cliente.Autenticacao_Tokens.Registro_chaves_api import carregar_chaves_api
+from .services.Cliente.Cache.Cache_clientes import registrar_invalidacao_clientes
+from .services.Cliente.Hashe_senha.Calibrar_bcrypt import calibrar_bcrypt_command
+from .services.Cliente.Consulta_DataBase.Tokens_refresh import purgar_tokens_refresh_command
 
 
 def create_app(config_class=Config):
@@ -19,6 +28,10 @@ def create_app(config_class=Config):
     app = Flask(__name__)
     app.config.from_object(config_class)
 
+    # request.remote_addr passa a ser o IP do cliente, e não o do proxy
+    if app.config.get("PROXIES_CONFIAVEIS"):
+        app.wsgi_app = ProxyFix(app.wsgi_app, x_for=app.config["PROXIES_CONFIAVEIS"])
+
     # inicializa extensões
     db.init_app(app)
     migrate.init_app(app, db)
@@ -31,9 +44,15 @@ def create_app(config_class=Config):
         ]
     )
    
+    # monta uma única vez as instâncias de Fernet das chaves de API de cada endpoint
+    carregar_chaves_api()
+
     # importa os models para que o SQLAlchemy os registre
     from .models import models
 
+    # remove do cache de autenticação clientes excluídos ou movidos de estabelecimento
+    registrar_invalidacao_clientes()
+
     app.register_blueprint(redirecionamento_bp)
     app.register_blueprint(autenticar_user_bp)
     app.register_blueprint(consultar_agendamentos_bp)
@@ -42,5 +61,14 @@ def create_app(config_class=Config):
     app.register_blueprint(consultar_horarios_bp)
     app.register_blueprint(cancelar_agendamento_bp)
     app.register_blueprint(criar_agendamento_bp)
+    app.register_blueprint(consultar_metricas_bp)
+    app.register_blueprint(renovar_token_bp)
+    app.register_blueprint(autenticar_estabelecimento_bp)
+    app.register_blueprint(exportar_agendamentos_bp)
+
+    # flask calibrar-bcrypt: sugere o BCRYPT_ROUNDS de acordo com o tempo do servidor
+    app.cli.add_command(calibrar_bcrypt_command)
+    # flask purgar-tokens-refresh: remove os tokens de renovação expirados (ex.: em um cron diário)
+    app.cli.add_command(purgar_tokens_refresh_command)
 
     return app
\ No newline at end of file
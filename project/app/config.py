@@ -7,4 +7,7 @@ class Config:
     SQLALCHEMY_DATABASE_URI = os.getenv("DATABASE_URL")
     SQLALCHEMY_TRACK_MODIFICATIONS = False
     JWT_SECRET_KEY = os.getenv("JWT_SECRET_KEY", SECRET_KEY)
+    # Quantidade de proxies reversos (ex.: Ngrok) à frente da aplicação. Com valor > 0, o IP do
+    # cliente é lido do X-Forwarded-For, usado pelo limite de tentativas de login
+    PROXIES_CONFIAVEIS = int(os.getenv("PROXIES_CONFIAVEIS", "0"))
     # outras configs...
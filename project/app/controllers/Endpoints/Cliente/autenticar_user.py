@@ -1,15 +1,17 @@
-from flask import Blueprint, request, jsonify
-from ....services.Cliente.Sanetizar_dados.sanitizar_token_fernet import verificar_token_fernet
-from ....services.Cliente.Sanetizar_dados.sanitizar_token_jwt import verificar_token_jwt
-from ....services.Cliente.Autenticacao_Tokens.Validar_Token_autenticar_user import validar_token_autenticar_user
-from ....services.Cliente.Autenticacao_Tokens.Validar_Token_ID_estabelecimento import validar_token_id_estabelecimento
+from flask import Blueprint, request, jsonify, g, current_app
+from ...Middlewares.autenticacao_cliente import exigir_autenticacao
 from ....services.Cliente.Sanetizar_dados.sanitizar_email import verificar_email
 from ....services.Cliente.Sanetizar_dados.sanitizar_senha import verificar_senha
 from ....services.Cliente.Consulta_DataBase.Consultar_ID_User import consultar_id_user
 from ....services.Cliente.Hashe_senha.Autendicar_senha import autenticar_senha
+from ....services.Cliente.Limite_login.Limitador_login import admitir_tentativa_login, limpar_tentativas_email
 from ....services.Cliente.Gerar_Token_JWT.Gerar_JWT_IDUser import gerar_jwt_id_estabelecimento
+from ....services.Cliente.Consulta_DataBase.Tokens_refresh import emitir_token_refresh
+from ...Middlewares.cookies_sessao import definir_cookie_user, definir_cookie_refresh
 
 autenticar_user_bp = Blueprint('autenticar_user', __name__, url_prefix='/api/autenticar_user')
+exigir_autenticacao(autenticar_user_bp, "autenticar_user", user=False,
+                    mensagem="Erro de autenticação", formato="status")
 
 @autenticar_user_bp.route('', methods=['POST'])
 def autenticar_user():
@@ -23,45 +25,24 @@ def autenticar_user():
 
     Fluxo:
     1. Valida presença dos dados obrigatórios.
-    2. Valida tokens.
-    3. Valida credenciais do usuário.
-    4. Gera JWT do usuário autenticado e retorna em cookie httpOnly.
+    2. Valida tokens (exigir_autenticacao, antes da view).
+    3. Limita as tentativas por IP, email e estabelecimento (janela deslizante) antes de
+       consultar o banco ou o bcrypt.
+    4. Valida credenciais do usuário.
+    5. Gera JWT do usuário autenticado e retorna em cookie httpOnly.
+    6. Gera o token de renovação ('token_refresh', cookie httpOnly) usado por /api/renovar_token
+       para obter novos JWTs sem informar a senha novamente. Se a emissão falhar, a falha é
+       registrada no log e a resposta traz o header 'X-Token-Refresh: indisponivel'.
 
     Returns:
         200: Autenticação bem-sucedida, retorna token em cookie e no corpo.
         400: Dados inválidos.
         401: Falha de autenticação.
         411: Dados insuficientes.
+        429: Tentativas de login em excesso (header 'Retry-After' com a espera em segundos).
+        503: Verificação de senha recusada por sobrecarga (pool do bcrypt cheio).
     """
-    authorization = request.headers.get('Authorization')
-    token_estabelecimento = request.cookies.get('token_estabelecimento')
-
-    if not (authorization and token_estabelecimento):
-        return jsonify({
-            "status": "error",
-            "message": "Erro de autenticação"
-        }), 401
-
-    if not (verificar_token_fernet(authorization) and verificar_token_jwt(token_estabelecimento)):
-        return jsonify({
-            "status": "error",
-            "message": "Erro de autenticação"
-        }), 401
-
-    if not validar_token_autenticar_user(authorization):
-        return jsonify({
-            "status": "error",
-            "message": "Erro de autenticação"
-        }), 401
-
-    resultado = validar_token_id_estabelecimento(token_estabelecimento)
-    if resultado is False:
-        return jsonify({
-            "status": "error",
-            "message": "Erro de autenticação"
-        }), 401
-
-    _, estabelecimento_id = resultado
+    estabelecimento_id = g.estabelecimento_id
     data = request.get_json(silent=True) or {}
     login = data.get("login")
     senha = data.get("senha")
@@ -78,6 +59,15 @@ def autenticar_user():
             "message": "Erro dados invalidos"
         }), 400
 
+    admitida, espera = admitir_tentativa_login(request.remote_addr, login, estabelecimento_id)
+    if not admitida:
+        resposta = jsonify({
+            "status": "error",
+            "message": "Muitas tentativas de login, tente novamente mais tarde"
+        })
+        resposta.headers["Retry-After"] = str(espera)
+        return resposta, 429
+
     consulta = consultar_id_user(estabelecimento_id, login)
     if consulta is False:
         return jsonify({
@@ -86,24 +76,39 @@ def autenticar_user():
         }), 401
 
     _, user_id = consulta
-    if not autenticar_senha(estabelecimento_id, user_id, senha):
+    senha_valida = autenticar_senha(estabelecimento_id, user_id, senha)
+    if senha_valida is None:
+        # Pool do bcrypt sobrecarregado: recusa rápido em vez de ocupar o worker
+        resposta = jsonify({
+            "status": "error",
+            "message": "Serviço de autenticação sobrecarregado, tente novamente"
+        })
+        resposta.headers["Retry-After"] = "1"
+        return resposta, 503
+
+    if not senha_valida:
         return jsonify({
             "status": "error",
             "message": "Erro ao autenticar user"
         }), 401
 
+    limpar_tentativas_email(login, estabelecimento_id)
     jwt_token = gerar_jwt_id_estabelecimento(user_id)
     resposta = jsonify({
         "status": "success",
         "message": "User autenticado",
         "token": jwt_token
     })
-    resposta.set_cookie(
-        "token_user",
-        jwt_token,
-        httponly=True,
-        secure=True,
-        samesite="None",
-        max_age=3600
-    )
+    definir_cookie_user(resposta, jwt_token)
+    token_refresh = emitir_token_refresh(estabelecimento_id, user_id)
+    if token_refresh:
+        definir_cookie_refresh(resposta, token_refresh)
+    else:
+        # O login continua válido sem o token de renovação; o usuário apenas precisará
+        # informar a senha novamente quando o JWT expirar
+        current_app.logger.warning(
+            "Falha ao emitir o token de renovação do usuário %s (estabelecimento %s)",
+            user_id, estabelecimento_id
+        )
+        resposta.headers["X-Token-Refresh"] = "indisponivel"
     return resposta, 200
\ No newline at end of file
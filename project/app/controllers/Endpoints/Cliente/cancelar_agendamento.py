@@ -1,13 +1,11 @@
-from flask import Blueprint, request, jsonify
-from ....services.Cliente.Sanetizar_dados.sanitizar_token_fernet import verificar_token_fernet
-from ....services.Cliente.Sanetizar_dados.sanitizar_token_jwt import verificar_token_jwt
-from ....services.Cliente.Autenticacao_Tokens.Validar_Token_cancelar_agendamento import validar_token_cancelar_agendamento
-from ....services.Cliente.Autenticacao_Tokens.Validar_Token_ID_estabelecimento import validar_token_id_estabelecimento
-from ....services.Cliente.Autenticacao_Tokens.Validar_Token_ID_user import validar_token_id_user
+from flask import Blueprint, request, jsonify, g
+from ...Middlewares.autenticacao_cliente import exigir_autenticacao
 from ....services.Cliente.Sanetizar_dados.sanitizar_id_agendamento import verificar_id_agendamento
 from ....services.Cliente.Consulta_DataBase.Cancelar_agendamento import cancelar_agendamento_db
 
 cancelar_agendamento_bp = Blueprint('cancelar_agendamento', __name__)
+exigir_autenticacao(cancelar_agendamento_bp, "cancelar_agendamento",
+                    mensagens={"user": "Autenticação falhou - erro no user"})
 
 @cancelar_agendamento_bp.route('/cancelar-agendamento', methods=['POST'])
 def cancelar_agendamento():
@@ -21,8 +19,8 @@ def cancelar_agendamento():
 
     Fluxo:
     1. Valida presença dos dados obrigatórios.
-    2. Valida tokens.
-    3. Valida credenciais do usuário e do estabelecimento.
+    2. Valida tokens (exigir_autenticacao, antes da view).
+    3. Valida credenciais do usuário e do estabelecimento (exigir_autenticacao).
     4. Valida o formato do agendamento_id.
     5. Cancela o agendamento no banco.
 
@@ -32,34 +30,8 @@ def cancelar_agendamento():
         401: Falha de autenticação.
         500: Erro interno ao cancelar.
     """
-    auth = request.headers.get('Authorization')
-    token_estabelecimento = request.cookies.get('token_estabelecimento')
-    token_user = request.cookies.get('token_user')
-
-    if not (auth and token_estabelecimento and token_user):
-        return jsonify({"erro": "Autenticação falhou"}), 401
-
-    if not (verificar_token_fernet(auth) and verificar_token_jwt(token_estabelecimento) and verificar_token_jwt(token_user)):
-        return jsonify({"erro": "Autenticação falhou"}), 401
-
-    if not validar_token_cancelar_agendamento(auth):
-        return jsonify({"erro": "Autenticação falhou"}), 401
-
-    result_est = validar_token_id_estabelecimento(token_estabelecimento)
-    if isinstance(result_est, tuple):
-        valid_est, estabelecimento_id = result_est
-    else:
-        valid_est = result_est
-        estabelecimento_id = None
-
-    if not (valid_est and estabelecimento_id):
-        return jsonify({"erro": "Autenticação falhou"}), 401
-
-    valid_user = validar_token_id_user(estabelecimento_id, token_user)
-    if not (isinstance(valid_user, tuple) and valid_user[0]):
-        return jsonify({"erro": "Autenticação falhou - erro no user"}), 401
-
-    _, user_id = valid_user
+    estabelecimento_id = g.estabelecimento_id
+    user_id = g.user_id
 
     req_data = request.get_json(silent=True) or {}
     if not (req_data and isinstance(req_data, dict)):
@@ -1,12 +1,17 @@
-from flask import Blueprint, request, jsonify
-from ....services.Cliente.Sanetizar_dados.sanitizar_token_fernet import verificar_token_fernet
-from ....services.Cliente.Sanetizar_dados.sanitizar_token_jwt import verificar_token_jwt
-from ....services.Cliente.Autenticacao_Tokens.Validar_Token_consulta_agendamentos import validar_token_consultar_agendamentos
-from ....services.Cliente.Autenticacao_Tokens.Validar_Token_ID_estabelecimento import validar_token_id_estabelecimento
-from ....services.Cliente.Autenticacao_Tokens.Validar_Token_ID_user import validar_token_id_user
-from ....services.Cliente.Consulta_DataBase.Consultar_agendamentos_no_DB import consultar_agendamentos_por_estabelecimento_cliente_status
+from flask import Blueprint, Response, request, jsonify, g
+from ...Middlewares.autenticacao_cliente import exigir_autenticacao
+from ....services.Cliente.Consulta_DataBase.Consultar_agendamentos_no_DB import (
+    consultar_agendamentos_por_estabelecimento_cliente_status,
+    consultar_historico_paginado,
+    consultar_agendamentos_json,
+    consultar_historico_paginado_json,
+    MAX_PAGINA_HISTORICO
+)
+from ....services.Cliente.Consulta_DataBase.Json_no_banco import JSON_NO_BANCO, corpo_json
 
 consultar_agendamentos_bp = Blueprint('consultar_agendamentos', __name__, url_prefix='/api/consultar_agendamentos')
+exigir_autenticacao(consultar_agendamentos_bp, "consultar_agendamentos",
+                    mensagem="Erro de autenticação", formato="status")
 
 @consultar_agendamentos_bp.route('', methods=['POST'])
 def consultar_agendamentos():
@@ -17,41 +22,26 @@ def consultar_agendamentos():
     - Header 'Authorization' com token Fernet válido.
     - Cookies 'token_estabelecimento' e 'token_user' com JWTs válidos.
     - JSON no corpo com 'type' ("ativos" ou "historico").
+    - Para "historico", opcionalmente 'cursor' (o 'next_cursor' da página anterior) e
+      'limite' (itens por página, de 1 a MAX_PAGINA_HISTORICO).
 
     Fluxo:
     1. Valida presença dos dados obrigatórios.
-    2. Valida tokens.
+    2. Valida tokens (exigir_autenticacao, antes da view).
     3. Valida tipo de consulta.
-    4. Consulta agendamentos no banco.
+    4. Consulta agendamentos no banco. O histórico é paginado do mais recente para o mais
+       antigo; a resposta traz 'next_cursor' (null na última página). Com JSON_NO_BANCO
+       ativo, a lista de agendamentos vem pronta do banco (texto JSON) e é inserida no corpo
+       da resposta sem passar por jsonify.
 
     Returns:
         200: Consulta realizada com sucesso ou nenhum agendamento encontrado.
-        400: Dados inválidos.
+        400: Dados inválidos (tipo, cursor ou limite).
         401: Falha de autenticação.
         411: Dados insuficientes.
     """
-    auth = request.headers.get('Authorization')
-    token_estabelecimento = request.cookies.get('token_estabelecimento')
-    token_user = request.cookies.get('token_user')
-
-    if not (auth and token_estabelecimento and token_user):
-        return jsonify({"status": "error", "message": "Erro de autenticação"}), 401
-
-    if not (verificar_token_fernet(auth) and verificar_token_jwt(token_estabelecimento) and verificar_token_jwt(token_user)):
-        return jsonify({"status": "error", "message": "Erro de autenticação"}), 401
-
-    if not validar_token_consultar_agendamentos(auth):
-        return jsonify({"status": "error", "message": "Erro de autenticação"}), 401
-
-    resultado = validar_token_id_estabelecimento(token_estabelecimento)
-    if resultado is False:
-        return jsonify({"status": "error", "message": "Erro de autenticação"}), 401
-    _, estabelecimento_id = resultado
-
-    valid_user = validar_token_id_user(estabelecimento_id, token_user)
-    if valid_user is False:
-        return jsonify({"status": "error", "message": "Erro de autenticação"}), 401
-    _, user_id = valid_user
+    estabelecimento_id = g.estabelecimento_id
+    user_id = g.user_id
 
     data = request.get_json(silent=True) or {}
     type_param = data.get("type")
@@ -61,8 +51,43 @@ def consultar_agendamentos():
     if type_param not in ["ativos", "historico"]:
         return jsonify({"status": "error", "message": "Dados invalidos"}), 400
 
-    agendamentos = consultar_agendamentos_por_estabelecimento_cliente_status(estabelecimento_id, user_id, type_param)
+    if type_param == "historico":
+        cursor = data.get("cursor")
+        limite = data.get("limite")
+        if (cursor is not None and not isinstance(cursor, str)) or (
+                limite is not None and (type(limite) is not int or not 1 <= limite <= MAX_PAGINA_HISTORICO)):
+            return jsonify({"status": "error", "message": "Dados invalidos"}), 400
+
+        if JSON_NO_BANCO:
+            resultado = consultar_historico_paginado_json(estabelecimento_id, user_id, cursor, limite)
+        else:
+            resultado = consultar_historico_paginado(estabelecimento_id, user_id, cursor, limite)
+        if resultado[0] is False:
+            return jsonify({"status": "error", "message": "Dados invalidos"}), 400
+
+        _, agendamentos, next_cursor = resultado
+        if not agendamentos:
+            return jsonify({
+                "status": "success",
+                "message": "Nenhum agendamento encontrado para os dados informados.",
+                "next_cursor": None
+            }), 200
+        if JSON_NO_BANCO:
+            return _resposta_json_no_banco(agendamentos, next_cursor=next_cursor)
+        return jsonify({
+            "status": "success",
+            "message": "Consulta realizada com sucesso.",
+            "agendamentos": agendamentos,
+            "next_cursor": next_cursor
+        }), 200
+
+    if JSON_NO_BANCO:
+        agendamentos = consultar_agendamentos_json(estabelecimento_id, user_id, type_param)
+    else:
+        agendamentos = consultar_agendamentos_por_estabelecimento_cliente_status(estabelecimento_id, user_id, type_param)
     if agendamentos is not None:
+        if JSON_NO_BANCO:
+            return _resposta_json_no_banco(agendamentos)
         return jsonify({
             "status": "success",
             "message": "Consulta realizada com sucesso.",
@@ -72,4 +97,11 @@ def consultar_agendamentos():
         return jsonify({
             "status": "success",
             "message": "Nenhum agendamento encontrado para os dados informados."
-        }), 200
\ No newline at end of file
+        }), 200
+
+
+def _resposta_json_no_banco(agendamentos_json: str, **campos) -> Response:
+    # Mesmo envelope da resposta com jsonify; 'agendamentos' é o texto JSON gerado pelo banco
+    envelope = {"status": "success", "message": "Consulta realizada com sucesso."}
+    envelope.update(campos)
+    return Response(corpo_json(envelope, agendamentos=agendamentos_json), status=200, mimetype="application/json")
\ No newline at end of file
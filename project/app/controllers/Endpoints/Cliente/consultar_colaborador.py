@@ -1,12 +1,10 @@
-from flask import Blueprint, request, jsonify
-from ....services.Cliente.Sanetizar_dados.sanitizar_token_fernet import verificar_token_fernet
-from ....services.Cliente.Sanetizar_dados.sanitizar_token_jwt import verificar_token_jwt
-from ....services.Cliente.Autenticacao_Tokens.Validar_Token_consultar_colaboradores import validar_token_consultar_colaborador
-from ....services.Cliente.Autenticacao_Tokens.Validar_Token_ID_estabelecimento import validar_token_id_estabelecimento
-from ....services.Cliente.Autenticacao_Tokens.Validar_Token_ID_user import validar_token_id_user
-from ....services.Cliente.Consulta_DataBase.Consulta_colaboradores import consultar_colaboradores_por_estabelecimento
+from flask import Blueprint, Response, jsonify, g
+from ...Middlewares.autenticacao_cliente import exigir_autenticacao
+from ....services.Cliente.Consulta_DataBase.Consulta_colaboradores import consultar_colaboradores_por_estabelecimento, colaboradores_json_por_estabelecimento
+from ....services.Cliente.Consulta_DataBase.Json_no_banco import JSON_NO_BANCO, corpo_json
 
 consultar_colaborador_bp = Blueprint('consultar_colaborador', __name__)
+exigir_autenticacao(consultar_colaborador_bp, "consultar_colaborador")
 
 @consultar_colaborador_bp.route('/consultar-colaborador', methods=['POST'])
 def consultar_colaborador():
@@ -19,42 +17,30 @@ def consultar_colaborador():
 
     Fluxo:
     1. Valida presença dos dados obrigatórios.
-    2. Valida tokens.
-    3. Valida credenciais do usuário e do estabelecimento.
-    4. Consulta colaboradores no banco.
+    2. Valida tokens (exigir_autenticacao, antes da view).
+    3. Valida credenciais do usuário e do estabelecimento (exigir_autenticacao).
+    4. Consulta colaboradores no banco. Com JSON_NO_BANCO ativo, a lista vem pronta do banco
+       (texto JSON) e é inserida no corpo da resposta sem passar por jsonify.
 
     Returns:
         200: Consulta realizada com sucesso.
         401: Falha de autenticação.
         404: Não foi possível localizar os dados.
     """
-    auth = request.headers.get('Authorization')
-    token_estabelecimento = request.cookies.get('token_estabelecimento')
-    token_user = request.cookies.get('token_user')
+    estabelecimento_id = g.estabelecimento_id
+    user_id = g.user_id
 
-    if not (auth and token_estabelecimento and token_user):
-        return jsonify({"erro": "Autenticação falhou"}), 401
-
-    if not (verificar_token_fernet(auth) and verificar_token_jwt(token_estabelecimento) and verificar_token_jwt(token_user)):
-        return jsonify({"erro": "Autenticação falhou"}), 401
-
-    if not validar_token_consultar_colaborador(auth):
-        return jsonify({"erro": "Autenticação falhou"}), 401
-
-    result_est = validar_token_id_estabelecimento(token_estabelecimento)
-    if isinstance(result_est, tuple):
-        valid_est, estabelecimento_id = result_est
-    else:
-        valid_est = result_est
-        estabelecimento_id = None
-
-    if not (valid_est and estabelecimento_id):
-        return jsonify({"erro": "Autenticação falhou"}), 401
-
-    result_user = validar_token_id_user(estabelecimento_id, token_user)
-    if not isinstance(result_user, tuple):
-        return jsonify({"erro": "Autenticação falhou"}), 401
-    _, user_id = result_user
+    if JSON_NO_BANCO:
+        servicos_json = colaboradores_json_por_estabelecimento(estabelecimento_id)
+        if servicos_json:
+            return Response(corpo_json({
+                "message": "Requisição bem sucedida",
+                "estabelecimento_id": estabelecimento_id,
+                "user_id": user_id
+            }, servicos=servicos_json), status=200, mimetype="application/json")
+        return jsonify({
+            "erro": "Não foi possível localizar os dados"
+        }), 404
 
     result = consultar_colaboradores_por_estabelecimento(estabelecimento_id)
     if result:
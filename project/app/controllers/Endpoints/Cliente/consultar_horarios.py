@@ -1,15 +1,18 @@
-from flask import Blueprint, request, jsonify
-from ....services.Cliente.Sanetizar_dados.sanitizar_token_fernet import verificar_token_fernet
-from ....services.Cliente.Sanetizar_dados.sanitizar_token_jwt import verificar_token_jwt
-from ....services.Cliente.Autenticacao_Tokens.Validar_Token_consultar_horarios import validar_token_consultar_horarios
-from ....services.Cliente.Autenticacao_Tokens.Validar_Token_ID_estabelecimento import validar_token_id_estabelecimento
-from ....services.Cliente.Autenticacao_Tokens.Validar_Token_ID_user import validar_token_id_user
+from flask import Blueprint, request, jsonify, g
+from ...Middlewares.autenticacao_cliente import exigir_autenticacao
 from ....services.Cliente.Sanetizar_dados.sanitizar_colaborador_id import verificar_id_colaborador
-from ....services.Cliente.Sanetizar_dados.sanitizar_data import verificar_data
+from ....services.Cliente.Sanetizar_dados.sanitizar_data import verificar_data, verificar_periodo
 from ....services.Cliente.Sanetizar_dados.sanitizar_id_servico import verificar_ids_servicos
-from ....services.Cliente.Consulta_DataBase.Consultar_horario import consultar_horarios_agendamento
+from ....services.Cliente.Consulta_DataBase.Consultar_horario import consultar_horarios_agendamento, consultar_horarios_periodo
 
 consultar_horarios_bp = Blueprint('consultar_horarios', __name__)
+exigir_autenticacao(consultar_horarios_bp, "consultar_horarios", mensagens={
+    "cabecalhos": "Autenticação falhou - cabeçalhos não encontrados",
+    "tokens": "Autenticação falhou - erro na verificação dos tokens",
+    "escopo": "Autenticação falhou - erro no token da API",
+    "estabelecimento": "Autenticação falhou - erro ao validar token estabelecimento",
+    "user": "Autenticação falhou - erro no user",
+})
 
 @consultar_horarios_bp.route('/consultar-horarios', methods=['POST'])
 def consultar_horarios():
@@ -21,67 +24,65 @@ def consultar_horarios():
     - Cookies 'token_estabelecimento' e 'token_user' com JWTs válidos.
     - JSON no corpo com:
         - 'servicos': lista de IDs de serviços
-        - 'colaborador_id': ID do colaborador
-        - 'data': data do agendamento
+        - 'colaborador_id' (opcional): ID do colaborador; se omitido, consulta qualquer colaborador
+        - 'data': data do agendamento, ou
+        - 'data_inicial' e 'data_final': período (inclusive) para consultar várias datas de uma vez
 
     Fluxo:
     1. Valida presença dos dados obrigatórios.
-    2. Valida tokens.
-    3. Valida credenciais do usuário e do estabelecimento.
+    2. Valida tokens (exigir_autenticacao, antes da view).
+    3. Valida credenciais do usuário e do estabelecimento (exigir_autenticacao).
     4. Valida formato dos dados.
     5. Consulta horários disponíveis no banco.
 
+    Quando o período é informado, 'horarios' é um objeto com uma lista de horários
+    (possivelmente vazia) para cada data do período. Sem 'colaborador_id', cada horário
+    vem como {"horario": "HH:MM:SS", "colaboradores": [<ids livres nesse horário>]}.
+
     Returns:
         200: Consulta realizada com sucesso.
         400: Dados insuficientes ou inválidos.
         401: Falha de autenticação.
         501: Erro interno ao consultar horários.
     """
-    auth = request.headers.get('Authorization')
-    token_estabelecimento = request.cookies.get('token_estabelecimento')
-    token_user = request.cookies.get('token_user')
-
-    if not (auth and token_estabelecimento and token_user):
-        return jsonify({"erro": "Autenticação falhou - cabeçalhos não encontrados"}), 401
-
-    if not (verificar_token_fernet(auth) and verificar_token_jwt(token_estabelecimento) and verificar_token_jwt(token_user)):
-        return jsonify({"erro": "Autenticação falhou - erro na verificação dos tokens"}), 401
-
-    if not validar_token_consultar_horarios(auth):
-        return jsonify({"erro": "Autenticação falhou - erro no token da API"}), 401
-
-    result_est = validar_token_id_estabelecimento(token_estabelecimento)
-    if isinstance(result_est, tuple):
-        valid_est, estabelecimento_id = result_est
-    else:
-        valid_est = result_est
-        estabelecimento_id = None
-
-    if not (valid_est and estabelecimento_id):
-        return jsonify({"erro": "Autenticação falhou - erro ao validar token estabelecimento"}), 401
-
-    valid_user = validar_token_id_user(estabelecimento_id, token_user)
-    if not isinstance(valid_user, tuple):
-        return jsonify({"erro": "Autenticação falhou - erro no user"}), 401
-    _, user_id = valid_user
+    estabelecimento_id = g.estabelecimento_id
 
     req_data = request.get_json(silent=True) or {}
     servicos = req_data.get('servicos')
     colaborador_id = req_data.get('colaborador_id')
     data_agendamento = req_data.get('data')
+    data_inicial = req_data.get('data_inicial')
+    data_final = req_data.get('data_final')
 
-    if not (servicos and isinstance(servicos, list) and colaborador_id and data_agendamento):
+    if not (servicos and isinstance(servicos, list) and (data_agendamento or (data_inicial and data_final))):
         return jsonify({"erro": "Dados Insuficientes"}), 400
 
-    if not verificar_id_colaborador(colaborador_id):
+    if colaborador_id is not None and not verificar_id_colaborador(colaborador_id):
         return jsonify({"erro": "Dados invalidos: colaborador_id inválido"}), 400
 
-    if not verificar_data(data_agendamento):
-        return jsonify({"erro": "Dados invalidos: data inválida"}), 400
+    if data_agendamento:
+        if not verificar_data(data_agendamento):
+            return jsonify({"erro": "Dados invalidos: data inválida"}), 400
+    elif not verificar_periodo(data_inicial, data_final):
+        return jsonify({"erro": "Dados invalidos: período inválido"}), 400
 
     if not verificar_ids_servicos(servicos):
         return jsonify({"erro": "Dados invalidos: ids de serviço inválidos"}), 400
 
+    if not data_agendamento:
+        resultado = consultar_horarios_periodo(estabelecimento_id, colaborador_id, data_inicial, data_final, servicos)
+        if resultado is False:
+            return jsonify({"erro": "Erro interno ao processar solicitação"}), 501
+
+        _, horarios_por_data = resultado
+        return jsonify({
+            "message": "Requisição bem sucedida",
+            "horarios": {
+                data: formatar_horarios(horarios) if horarios != [None] else []
+                for data, horarios in horarios_por_data.items()
+            }
+        }), 200
+
     resultado = consultar_horarios_agendamento(estabelecimento_id, colaborador_id, data_agendamento, servicos)
     if resultado is False:
         return jsonify({"erro": "Erro interno ao processar solicitação"}), 501
@@ -92,5 +93,20 @@ def consultar_horarios():
 
     return jsonify({
         "message": "Requisição bem sucedida",
-        "horarios": [slot.strftime("%H:%M:%S") for slot in horarios_array]
-    }), 200
\ No newline at end of file
+        "horarios": formatar_horarios(horarios_array)
+    }), 200
+
+
+def formatar_horarios(horarios: list) -> list:
+    """
+    Converte os horários retornados pela consulta para JSON: "HH:MM:SS" para a consulta de um
+    colaborador e {"horario": "HH:MM:SS", "colaboradores": [...]} para a consulta sem colaborador.
+    """
+    formatados = []
+    for item in horarios:
+        if isinstance(item, tuple):
+            slot, colaboradores = item
+            formatados.append({"horario": slot.strftime("%H:%M:%S"), "colaboradores": colaboradores})
+        else:
+            formatados.append(item.strftime("%H:%M:%S"))
+    return formatados
\ No newline at end of file
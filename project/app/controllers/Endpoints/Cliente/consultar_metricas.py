@@ -0,0 +1,30 @@
+from flask import Blueprint, jsonify
+from ...Middlewares.autenticacao_cliente import exigir_autenticacao
+from ....services.Cliente.Cache.Cache_catalogo import estatisticas_catalogo
+from ....services.Cliente.Cache.Cache_tokens import estatisticas_tokens
+from ....services.Cliente.Hashe_senha.Executor_bcrypt import estatisticas_bcrypt
+from ....services.Cliente.Limite_login.Limitador_login import estatisticas_login
+
+consultar_metricas_bp = Blueprint('consultar_metricas', __name__)
+exigir_autenticacao(consultar_metricas_bp, "consultar_metricas", estabelecimento=False, user=False)
+
+@consultar_metricas_bp.route('/consultar-metricas', methods=['POST'])
+def consultar_metricas():
+    """
+    Endpoint para consulta das métricas dos caches em memória, do pool do bcrypt e do limite
+    de tentativas de login do processo, usadas para dimensioná-los de acordo com a carga.
+
+    Espera receber:
+    - Header 'Authorization' com token Fernet válido para CHAVE_API_CONSULTAR_METRICAS.
+
+    Returns:
+        200: Métricas do processo que atendeu a requisição.
+        401: Falha de autenticação.
+    """
+    return jsonify({
+        "message": "Requisição bem sucedida",
+        "cache_catalogo": estatisticas_catalogo(),
+        "cache_tokens": estatisticas_tokens(),
+        "bcrypt": estatisticas_bcrypt(),
+        "tentativas_login": estatisticas_login()
+    }), 200
\ No newline at end of file
@@ -1,12 +1,10 @@
-from flask import Blueprint, request, jsonify
-from ....services.Cliente.Sanetizar_dados.sanitizar_token_fernet import verificar_token_fernet
-from ....services.Cliente.Sanetizar_dados.sanitizar_token_jwt import verificar_token_jwt
-from ....services.Cliente.Autenticacao_Tokens.Validar_Token_consultar_servicos import validar_token_consultar_servico
-from ....services.Cliente.Autenticacao_Tokens.Validar_Token_ID_estabelecimento import validar_token_id_estabelecimento
-from ....services.Cliente.Autenticacao_Tokens.Validar_Token_ID_user import validar_token_id_user
-from ....services.Cliente.Consulta_DataBase.Consultar_servicos import consultar_servicos_por_estabelecimento
+from flask import Blueprint, Response, jsonify, g
+from ...Middlewares.autenticacao_cliente import exigir_autenticacao
+from ....services.Cliente.Consulta_DataBase.Consultar_servicos import consultar_servicos_por_estabelecimento, servicos_json_do_catalogo
+from ....services.Cliente.Consulta_DataBase.Json_no_banco import JSON_NO_BANCO, corpo_json
 
 consultar_servicos_bp = Blueprint('consultar_servicos', __name__)
+exigir_autenticacao(consultar_servicos_bp, "consultar_servicos")
 
 @consultar_servicos_bp.route('/consultar-servicos', methods=['POST'])
 def consultar_servicos():
@@ -19,42 +17,30 @@ def consultar_servicos():
 
     Fluxo:
     1. Valida presença dos dados obrigatórios.
-    2. Valida tokens.
-    3. Valida credenciais do usuário e do estabelecimento.
-    4. Consulta serviços no banco.
+    2. Valida tokens (exigir_autenticacao, antes da view).
+    3. Valida credenciais do usuário e do estabelecimento (exigir_autenticacao).
+    4. Consulta serviços no banco. Com JSON_NO_BANCO ativo, a lista vem pronta do banco
+       (texto JSON) e é inserida no corpo da resposta sem passar por jsonify.
 
     Returns:
         200: Consulta realizada com sucesso.
         401: Falha de autenticação.
         404: Não foi possível localizar os dados.
     """
-    auth = request.headers.get('Authorization')
-    token_estabelecimento = request.cookies.get('token_estabelecimento')
-    token_user = request.cookies.get('token_user')
+    estabelecimento_id = g.estabelecimento_id
+    user_id = g.user_id
 
-    if not (auth and token_estabelecimento and token_user):
-        return jsonify({"erro": "Autenticação falhou"}), 401
-
-    if not (verificar_token_fernet(auth) and verificar_token_jwt(token_estabelecimento) and verificar_token_jwt(token_user)):
-        return jsonify({"erro": "Autenticação falhou"}), 401
-
-    if not validar_token_consultar_servico(auth):
-        return jsonify({"erro": "Autenticação falhou"}), 401
-
-    result_est = validar_token_id_estabelecimento(token_estabelecimento)
-    if isinstance(result_est, tuple):
-        valid_est, estabelecimento_id = result_est
-    else:
-        valid_est = result_est
-        estabelecimento_id = None
-
-    if not (valid_est and estabelecimento_id):
-        return jsonify({"erro": "Autenticação falhou"}), 401
-
-    result_user = validar_token_id_user(estabelecimento_id, token_user)
-    if not isinstance(result_user, tuple):
-        return jsonify({"erro": "Autenticação falhou"}), 401
-    _, user_id = result_user
+    if JSON_NO_BANCO:
+        servicos_json = servicos_json_do_catalogo(estabelecimento_id)
+        if servicos_json:
+            return Response(corpo_json({
+                "message": "Requisição bem sucedida",
+                "estabelecimento_id": estabelecimento_id,
+                "user_id": user_id
+            }, servicos=servicos_json), status=200, mimetype="application/json")
+        return jsonify({
+            "erro": "não foi possível localizar os dados"
+        }), 404
 
     result = consultar_servicos_por_estabelecimento(estabelecimento_id)
     if result:
@@ -1,9 +1,5 @@
-from flask import Blueprint, request, jsonify
-from ....services.Cliente.Sanetizar_dados.sanitizar_token_fernet import verificar_token_fernet
-from ....services.Cliente.Sanetizar_dados.sanitizar_token_jwt import verificar_token_jwt
-from ....services.Cliente.Autenticacao_Tokens.Validar_Token_criar_agendamento import validar_token_consultar_servico
-from ....services.Cliente.Autenticacao_Tokens.Validar_Token_ID_estabelecimento import validar_token_id_estabelecimento
-from ....services.Cliente.Autenticacao_Tokens.Validar_Token_ID_user import validar_token_id_user
+from flask import Blueprint, request, jsonify, g
+from ...Middlewares.autenticacao_cliente import exigir_autenticacao
 from ....services.Cliente.Sanetizar_dados.sanitizar_colaborador_id import verificar_id_colaborador
 from ....services.Cliente.Sanetizar_dados.sanitizar_horarios import verificar_horario_valido
 from ....services.Cliente.Sanetizar_dados.sanitizar_data import verificar_data
@@ -11,6 +7,7 @@ from ....services.Cliente.Sanetizar_dados.sanitizar_id_servico import verificar_
 from ....services.Cliente.Consulta_DataBase.Criar_agendamento import agendar
 
 criar_agendamento_bp = Blueprint('criar_agendamento', __name__)
+exigir_autenticacao(criar_agendamento_bp, "criar_agendamento", mensagem="Erro de autenticação")
 
 @criar_agendamento_bp.route('/criar-agendamento', methods=['POST'])
 def criar_agendamento():
@@ -28,40 +25,20 @@ def criar_agendamento():
 
     Fluxo:
     1. Valida presença dos dados obrigatórios.
-    2. Valida tokens.
-    3. Valida credenciais do usuário e do estabelecimento.
+    2. Valida tokens (exigir_autenticacao, antes da view).
+    3. Valida credenciais do usuário e do estabelecimento (exigir_autenticacao).
     4. Valida formato dos dados.
     5. Cria o agendamento no banco.
 
     Returns:
         200: Agendamento criado com sucesso.
         204: Horário indisponível.
-        400: Dados insuficientes ou inválidos.
+        400: Dados insuficientes ou inválidos, ou serviço não encontrado no estabelecimento.
         401: Falha de autenticação.
         500: Erro interno ao criar agendamento.
     """
-    auth = request.headers.get('Authorization')
-    token_estabelecimento = request.cookies.get('token_estabelecimento')
-    token_user = request.cookies.get('token_user')
-
-    if not (auth and token_estabelecimento and token_user):
-        return jsonify({"erro": "Erro de autenticação"}), 401
-
-    if not (verificar_token_fernet(auth) and verificar_token_jwt(token_user) and verificar_token_jwt(token_estabelecimento)):
-        return jsonify({"erro": "Erro de autenticação"}), 401
-
-    if not validar_token_consultar_servico(auth):
-        return jsonify({"erro": "Erro de autenticação"}), 401
-
-    resultado_est = validar_token_id_estabelecimento(token_estabelecimento)
-    if not (isinstance(resultado_est, tuple) and resultado_est[0]):
-        return jsonify({"erro": "Erro de autenticação"}), 401
-    _, estabelecimento_id = resultado_est
-
-    resultado_user = validar_token_id_user(estabelecimento_id, token_user)
-    if not (isinstance(resultado_user, tuple) and resultado_user[0]):
-        return jsonify({"erro": "Erro de autenticação"}), 401
-    _, user_id = resultado_user
+    estabelecimento_id = g.estabelecimento_id
+    user_id = g.user_id
 
     dados = request.get_json(silent=True) or {}
     colaborador_id = dados.get('colaborador_id')
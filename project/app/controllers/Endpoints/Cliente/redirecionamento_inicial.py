@@ -1,12 +1,13 @@
 from flask import Blueprint, request, jsonify
-from ....services.Cliente.Autenticacao_Tokens.Validar_Token_Inicial import validar_token_redirecionamento_inicial
-from ....services.Cliente.Sanetizar_dados.sanitizar_token_fernet import verificar_token_fernet
+from ...Middlewares.autenticacao_cliente import exigir_autenticacao
 from ....services.Cliente.Sanetizar_dados.sanitizar_id_base import verificar_id_base
 from ....services.Cliente.Sanetizar_dados.sanitizar_nome_estabelecimento import verificar_nome_estabelecimento
 from ....services.Cliente.Consulta_DataBase.Consulta_ID_Estabelecimento import consultar_estabelecimento
 from ....services.Cliente.Gerar_Token_JWT.Gerar_JWT_IDEstabelecimento import gerar_jwt_id_estabelecimento
 
 redirecionamento_bp = Blueprint('redirecionamento_inicial', __name__, url_prefix='/api/redirecionamento_inicial')
+exigir_autenticacao(redirecionamento_bp, "redirecionamento_inicial", estabelecimento=False, user=False,
+                    mensagem="Erro de autenticação", formato="status")
 
 @redirecionamento_bp.route('', methods=['POST'])
 def redirecionamento_inicial():
@@ -21,7 +22,7 @@ def redirecionamento_inicial():
 
     Fluxo:
     1. Valida presença do token e dos dados obrigatórios.
-    2. Valida o token Fernet e o token de redirecionamento.
+    2. Valida o token Fernet e o token de redirecionamento (exigir_autenticacao, antes da view).
     3. Valida o formato dos dados.
     4. Consulta o estabelecimento no banco.
     5. Gera e retorna o JWT do estabelecimento em cookie httpOnly.
@@ -32,16 +33,6 @@ def redirecionamento_inicial():
         401: Falha de autenticação.
         404: Estabelecimento não encontrado.
     """
-    token = request.headers.get('Authorization')
-    if not token:
-        return jsonify({"status": "error", "message": "Erro de autenticação"}), 401
-
-    if not verificar_token_fernet(token):
-        return jsonify({"status": "error", "message": "Erro de autenticação"}), 401
-
-    if not validar_token_redirecionamento_inicial(token):
-        return jsonify({"status": "error", "message": "Erro de autenticação"}), 401
-
     data = request.get_json(silent=True) or {}
     nome = data.get("nome")
     id_base = data.get("IDbase")
@@ -0,0 +1,68 @@
+from flask import Blueprint, request, jsonify, g
+from ...Middlewares.autenticacao_cliente import exigir_autenticacao
+from ...Middlewares.cookies_sessao import definir_cookie_user, definir_cookie_refresh
+from ....services.Cliente.Consulta_DataBase.Tokens_refresh import renovar_token_refresh
+from ....services.Cliente.Gerar_Token_JWT.Gerar_JWT_IDUser import gerar_jwt_id_estabelecimento
+
+renovar_token_bp = Blueprint('renovar_token', __name__, url_prefix='/api/renovar_token')
+exigir_autenticacao(renovar_token_bp, "renovar_token", user=False,
+                    mensagem="Erro de autenticação", formato="status")
+
+@renovar_token_bp.route('', methods=['POST'])
+def renovar_token():
+    """
+    Endpoint para renovação do token do usuário sem nova autenticação por senha.
+
+    Espera receber:
+    - Header 'Authorization' com token Fernet válido.
+    - Cookie 'token_estabelecimento' com JWT do estabelecimento.
+    - Cookie 'token_refresh' emitido por /api/autenticar_user ou por uma renovação anterior.
+
+    Fluxo:
+    1. Valida tokens e o estabelecimento (exigir_autenticacao, antes da view).
+    2. Troca o token de renovação por um novo da mesma família; um token já trocado
+       revoga a família inteira, exceto nos primeiros GRACA_REUSO_TOKEN_REFRESH segundos
+       após a troca (renovação concorrente ou repetida), em que apenas recusa com 409.
+    3. Gera um novo JWT do usuário e retorna os dois tokens em cookies httpOnly.
+
+    Returns:
+        200: Renovação bem-sucedida, retorna os novos tokens em cookie e o JWT no corpo.
+        401: Falha de autenticação ou token de renovação inválido, expirado ou reutilizado.
+        409: Token de renovação trocado há poucos segundos por outra requisição; o novo token
+             já está no cookie, e a renovação pode ser repetida ou o JWT novo usado.
+        500: Erro interno ao renovar.
+    """
+    token_refresh = request.cookies.get('token_refresh')
+    if not token_refresh:
+        return jsonify({
+            "status": "error",
+            "message": "Erro de autenticação"
+        }), 401
+
+    resultado = renovar_token_refresh(g.estabelecimento_id, token_refresh)
+    if resultado[0] is not True:
+        if resultado[1] == "Erro interno":
+            return jsonify({
+                "status": "error",
+                "message": "Erro interno ao renovar token"
+            }), 500
+        if resultado[1] == "Token já renovado":
+            return jsonify({
+                "status": "error",
+                "message": "Token já renovado"
+            }), 409
+        return jsonify({
+            "status": "error",
+            "message": "Erro de autenticação"
+        }), 401
+
+    _, user_id, novo_token_refresh = resultado
+    jwt_token = gerar_jwt_id_estabelecimento(user_id)
+    resposta = jsonify({
+        "status": "success",
+        "message": "Token renovado",
+        "token": jwt_token
+    })
+    definir_cookie_user(resposta, jwt_token)
+    definir_cookie_refresh(resposta, novo_token_refresh)
+    return resposta, 200
\ No newline at end of file
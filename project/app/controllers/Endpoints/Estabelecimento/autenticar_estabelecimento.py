@@ -0,0 +1,86 @@
+from flask import Blueprint, request, jsonify
+from ...Middlewares.autenticacao_cliente import exigir_autenticacao
+from ...Middlewares.cookies_sessao import definir_cookie_dono
+from ....services.Cliente.Sanetizar_dados.sanitizar_email import verificar_email
+from ....services.Cliente.Limite_login.Limitador_login import admitir_tentativa_login_dono, limpar_tentativas_dono
+from ....services.Estabelecimento.Consulta_DataBase.Autenticar_estabelecimento import autenticar_estabelecimento as autenticar_dono
+from ....services.Estabelecimento.Autenticacao_Tokens.Token_dono_estabelecimento import gerar_jwt_dono_estabelecimento
+
+autenticar_estabelecimento_bp = Blueprint('autenticar_estabelecimento', __name__, url_prefix='/api/autenticar_estabelecimento')
+exigir_autenticacao(autenticar_estabelecimento_bp, "autenticar_estabelecimento", estabelecimento=False, user=False,
+                    mensagem="Erro de autenticação", formato="status")
+
+@autenticar_estabelecimento_bp.route('', methods=['POST'])
+def autenticar_estabelecimento():
+    """
+    Endpoint para autenticação do dono do estabelecimento.
+
+    Espera receber:
+    - Header 'Authorization' com token Fernet válido.
+    - JSON no corpo com 'login' (email do estabelecimento) e 'senha'.
+
+    Fluxo:
+    1. Valida o token da API (exigir_autenticacao, antes da view).
+    2. Valida presença e formato dos dados.
+    3. Limita as tentativas por IP e email antes de consultar o banco ou o bcrypt (sem janela por
+       estabelecimento, ainda desconhecido antes da autenticação).
+    4. Valida email e senha do estabelecimento.
+    5. Gera o JWT do dono e retorna em cookie httpOnly ('token_dono'), exigido pelas rotas
+       restritas ao dono (ex.: /api/exportar_agendamentos).
+
+    Returns:
+        200: Autenticação bem-sucedida, retorna o token em cookie.
+        400: Dados inválidos.
+        401: Falha de autenticação.
+        411: Dados insuficientes.
+        429: Tentativas de login em excesso (header 'Retry-After' com a espera em segundos).
+        503: Verificação de senha recusada por sobrecarga (pool do bcrypt cheio).
+    """
+    data = request.get_json(silent=True) or {}
+    login = data.get("login")
+    senha = data.get("senha")
+
+    if not (login and senha):
+        return jsonify({
+            "status": "error",
+            "message": "Erro dados insuficientes"
+        }), 411
+
+    if not (isinstance(login, str) and isinstance(senha, str) and verificar_email(login)):
+        return jsonify({
+            "status": "error",
+            "message": "Erro dados invalidos"
+        }), 400
+
+    admitida, espera = admitir_tentativa_login_dono(request.remote_addr, login)
+    if not admitida:
+        resposta = jsonify({
+            "status": "error",
+            "message": "Muitas tentativas de login, tente novamente mais tarde"
+        })
+        resposta.headers["Retry-After"] = str(espera)
+        return resposta, 429
+
+    resultado = autenticar_dono(login, senha)
+    if resultado is None:
+        resposta = jsonify({
+            "status": "error",
+            "message": "Serviço de autenticação sobrecarregado, tente novamente"
+        })
+        resposta.headers["Retry-After"] = "1"
+        return resposta, 503
+
+    if resultado is False:
+        return jsonify({
+            "status": "error",
+            "message": "Erro ao autenticar estabelecimento"
+        }), 401
+
+    limpar_tentativas_dono(login)
+    _, estabelecimento_id = resultado
+    resposta = jsonify({
+        "status": "success",
+        "message": "Estabelecimento autenticado"
+    })
+    definir_cookie_dono(resposta, gerar_jwt_dono_estabelecimento(estabelecimento_id))
+    return resposta, 200
\ No newline at end of file
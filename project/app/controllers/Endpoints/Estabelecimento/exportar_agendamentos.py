@@ -0,0 +1,61 @@
+from flask import Blueprint, request, jsonify, g, Response, stream_with_context
+from ...Middlewares.autenticacao_cliente import exigir_autenticacao
+from ....services.Cliente.Sanetizar_dados.sanitizar_data import verificar_formato_data
+from ....services.Estabelecimento.Consulta_DataBase.Exportar_agendamentos import (
+    exportar_agendamentos as gerar_exportacao,
+    FORMATOS,
+    STATUS_AGENDAMENTO
+)
+
+exportar_agendamentos_bp = Blueprint('exportar_agendamentos', __name__, url_prefix='/api/exportar_agendamentos')
+exigir_autenticacao(exportar_agendamentos_bp, "exportar_agendamentos", estabelecimento=False, user=False,
+                    dono=True, mensagem="Erro de autenticação", formato="status")
+
+@exportar_agendamentos_bp.route('', methods=['POST'])
+def exportar_agendamentos():
+    """
+    Endpoint para exportação dos agendamentos do estabelecimento.
+
+    Espera receber:
+    - Header 'Authorization' com token Fernet válido para CHAVE_API_EXPORTAR_AGENDAMENTOS.
+    - Cookie 'token_dono' com o JWT do dono do estabelecimento (/api/autenticar_estabelecimento).
+      O JWT anônimo de 'token_estabelecimento' não é aceito.
+    - JSON no corpo (opcional) com:
+        'formato': "ndjson" (padrão) ou "csv";
+        'data_inicio' e 'data_fim': período 'YYYY-MM-DD' (opcionais);
+        'status': status dos agendamentos (opcional).
+
+    Fluxo:
+    1. Valida o token da API e o do dono (exigir_autenticacao, antes da view).
+    2. Valida os filtros.
+    3. Transmite a exportação em blocos, lidos do banco por um cursor do servidor, sem montar
+       a resposta inteira em memória.
+
+    Returns:
+        200: Arquivo NDJSON ou CSV transmitido em partes (Content-Disposition: attachment).
+        400: Dados inválidos.
+        401: Falha de autenticação.
+    """
+    estabelecimento_id = g.estabelecimento_id
+    data = request.get_json(silent=True) or {}
+    if not isinstance(data, dict):
+        return jsonify({"status": "error", "message": "Dados invalidos"}), 400
+    formato = data.get("formato", "ndjson")
+    data_inicio = data.get("data_inicio")
+    data_fim = data.get("data_fim")
+    status = data.get("status")
+
+    # Valores não textuais (listas, objetos) são recusados antes da busca em FORMATOS, que exige
+    # chaves hasheáveis
+    if (not isinstance(formato, str) or formato not in FORMATOS
+            or (data_inicio is not None and not verificar_formato_data(data_inicio))
+            or (data_fim is not None and not verificar_formato_data(data_fim))
+            or (data_inicio and data_fim and data_inicio > data_fim)
+            or (status is not None and (not isinstance(status, str) or status not in STATUS_AGENDAMENTO))):
+        return jsonify({"status": "error", "message": "Dados invalidos"}), 400
+
+    return Response(
+        stream_with_context(gerar_exportacao(estabelecimento_id, formato, data_inicio, data_fim, status)),
+        mimetype=FORMATOS[formato],
+        headers={"Content-Disposition": f'attachment; filename="agendamentos.{formato}"'}
+    )
\ No newline at end of file
@@ -0,0 +1,101 @@
+from flask import request, jsonify, g
+from ...services.Cliente.Sanetizar_dados.sanitizar_token_fernet import verificar_token_fernet
+from ...services.Cliente.Autenticacao_Tokens.Registro_chaves_api import validar_token_escopo
+from ...services.Cliente.Autenticacao_Tokens.Validar_Token_ID_estabelecimento import validar_token_id_estabelecimento
+from ...services.Cliente.Autenticacao_Tokens.Validar_Token_ID_user import validar_token_id_user
+from ...services.Estabelecimento.Autenticacao_Tokens.Token_dono_estabelecimento import validar_token_dono_estabelecimento
+
+ETAPAS = ("cabecalhos", "tokens", "escopo", "estabelecimento", "user", "dono")
+
+def exigir_autenticacao(blueprint, escopo: str, estabelecimento: bool = True, user: bool = True,
+                        dono: bool = False, mensagem: str = "Autenticação falhou", mensagens: dict = None, formato: str = "erro"):
+    """
+    Registra no blueprint um before_request que autentica todas as suas rotas antes da view.
+
+    Cada requisição passa uma única vez pela cadeia:
+      1. cabecalhos: header 'Authorization' e, conforme exigido, os cookies
+         'token_estabelecimento', 'token_user' e 'token_dono' presentes;
+      2. tokens: formato do token Fernet;
+      3. escopo: token Fernet válido para o escopo do endpoint (Registro_chaves_api);
+      4. estabelecimento: JWT do estabelecimento válido e estabelecimento existente;
+      5. user: JWT do user válido e cliente vinculado ao estabelecimento;
+      6. dono: JWT do dono do estabelecimento válido, emitido por /api/autenticar_estabelecimento
+         após email e senha, e estabelecimento existente.
+
+    Cada JWT é decodificado uma única vez, com verificação da assinatura, nas etapas 4 a 6;
+    um token malformado falha nessa decodificação.
+
+    Rotas restritas ao dono do estabelecimento usam dono=True (com estabelecimento=False e
+    user=False): o JWT de 'token_estabelecimento' é obtido sem senha por qualquer visitante
+    e não dá acesso a elas.
+
+    Em caso de sucesso, os IDs resolvidos ficam em g.estabelecimento_id e g.user_id
+    (None quando não exigidos). Em caso de falha, a view não é executada e a resposta
+    é 401 com a mensagem da etapa.
+
+    Parameters:
+        blueprint (Blueprint): Blueprint cujas rotas exigem autenticação.
+        escopo (str): Escopo do token da API (chave de Registro_chaves_api.ESCOPOS).
+        estabelecimento (bool): Exige o cookie 'token_estabelecimento'.
+        user (bool): Exige o cookie 'token_user' (implica estabelecimento).
+        dono (bool): Exige o cookie 'token_dono' e resolve g.estabelecimento_id a partir dele.
+        mensagem (str): Mensagem de erro padrão de todas as etapas.
+        mensagens (dict): Mensagens específicas por etapa (chaves de ETAPAS).
+        formato (str): "erro" para {"erro": mensagem} ou "status" para
+                       {"status": "error", "message": mensagem}.
+    """
+    mensagens = {etapa: (mensagens or {}).get(etapa, mensagem) for etapa in ETAPAS}
+    estabelecimento = estabelecimento or user
+    if dono and estabelecimento:
+        raise ValueError("dono=True exige estabelecimento=False e user=False")
+
+    def falha(etapa: str):
+        if formato == "status":
+            return jsonify({"status": "error", "message": mensagens[etapa]}), 401
+        return jsonify({"erro": mensagens[etapa]}), 401
+
+    @blueprint.before_request
+    def autenticar():
+        # Requisições de preflight do CORS não carregam credenciais
+        if request.method == "OPTIONS":
+            return None
+
+        g.estabelecimento_id = None
+        g.user_id = None
+
+        auth = request.headers.get('Authorization')
+        token_estabelecimento = request.cookies.get('token_estabelecimento') if estabelecimento else None
+        token_user = request.cookies.get('token_user') if user else None
+        token_dono = request.cookies.get('token_dono') if dono else None
+
+        if not (auth and (token_estabelecimento or not estabelecimento) and (token_user or not user)
+                and (token_dono or not dono)):
+            return falha("cabecalhos")
+
+        if not verificar_token_fernet(auth):
+            return falha("tokens")
+
+        if not validar_token_escopo(escopo, auth):
+            return falha("escopo")
+
+        if estabelecimento:
+            resultado_est = validar_token_id_estabelecimento(token_estabelecimento)
+            if not (isinstance(resultado_est, tuple) and resultado_est[0] and resultado_est[1]):
+                return falha("estabelecimento")
+            g.estabelecimento_id = resultado_est[1]
+
+        if user:
+            resultado_user = validar_token_id_user(g.estabelecimento_id, token_user)
+            if not (isinstance(resultado_user, tuple) and resultado_user[0]):
+                return falha("user")
+            g.user_id = resultado_user[1]
+
+        if dono:
+            resultado_dono = validar_token_dono_estabelecimento(token_dono)
+            if not (isinstance(resultado_dono, tuple) and resultado_dono[0] and resultado_dono[1]):
+                return falha("dono")
+            g.estabelecimento_id = resultado_dono[1]
+
+        return None
+
+    return autenticar
\ No newline at end of file
@@ -0,0 +1,46 @@
+from ...services.Cliente.Consulta_DataBase.Tokens_refresh import DIAS_VALIDADE
+
+# Cookies de sessão, definidos por /api/autenticar_user, /api/renovar_token e
+# /api/autenticar_estabelecimento
+
+def definir_cookie_user(resposta, jwt_token: str):
+    """
+    Define o cookie httpOnly 'token_user' com o JWT do usuário (validade de 1 hora).
+    """
+    resposta.set_cookie(
+        "token_user",
+        jwt_token,
+        httponly=True,
+        secure=True,
+        samesite="None",
+        max_age=3600
+    )
+
+
+def definir_cookie_refresh(resposta, token_refresh: str):
+    """
+    Define o cookie httpOnly 'token_refresh', enviado pelo navegador apenas para /api/renovar_token.
+    """
+    resposta.set_cookie(
+        "token_refresh",
+        token_refresh,
+        httponly=True,
+        secure=True,
+        samesite="None",
+        max_age=DIAS_VALIDADE * 24 * 3600,
+        path="/api/renovar_token"
+    )
+
+
+def definir_cookie_dono(resposta, jwt_token: str):
+    """
+    Define o cookie httpOnly 'token_dono' com o JWT do dono do estabelecimento (validade de 1 hora).
+    """
+    resposta.set_cookie(
+        "token_dono",
+        jwt_token,
+        httponly=True,
+        secure=True,
+        samesite="None",
+        max_age=3600
+    )
\ No newline at end of file
@@ -1,6 +1,6 @@
 import uuid
 from datetime import datetime
-from sqlalchemy.dialects.postgresql import UUID, ARRAY
+from sqlalchemy.dialects.postgresql import UUID, ARRAY, BIT, TSRANGE, ExcludeConstraint
 from sqlalchemy import Time
 from app.extensions import db
 
@@ -78,7 +78,9 @@ class Horario(BaseModel):
         UUID(as_uuid=True), db.ForeignKey('colaboradores.id'), nullable=False, index=True
     )
     data = db.Column(db.Date, nullable=False)
-    horarios = db.Column(ARRAY(Time), nullable=False)
+    # Um bit por slot da grade do dia (horario_inicial até horario_final, de menor_time
+    # em menor_time): '1' = livre, '0' = ocupado
+    disponibilidade = db.Column(BIT(varying=True), nullable=False)
 
     # Relacionamento: um Horario → muitos Agendamentos
     agendamentos = db.relationship(
@@ -92,6 +94,8 @@ class Horario(BaseModel):
         default=10,        # valor padrão (opcional)
         nullable=False     # força valor não-nulo
     )
+    # Contador de versão verificado pelo SQLAlchemy em cada UPDATE (concorrência otimista)
+    versao = db.Column(db.Integer, nullable=False, default=1, server_default='1')
 
     estabelecimento = db.relationship(
         'Estabelecimento', backref='horarios', lazy=True
@@ -100,6 +104,8 @@ class Horario(BaseModel):
         'Colaborador', backref='horarios', lazy=True
     )
 
+    __mapper_args__ = {'version_id_col': versao}
+
 
 # Estabelecimento
 class Estabelecimento(BaseModel):
@@ -234,7 +240,56 @@ class Agendamento(BaseModel):
 
     duracao = db.Column(db.Integer, nullable=False)
     status = db.Column(db.String(20), default='pendente', nullable=False)
+    # Intervalo ocupado pelo agendamento (data + primeiro horário, pela duração),
+    # gerado pelo banco e usado pela restrição de exclusão abaixo
+    periodo = db.Column(
+        TSRANGE,
+        db.Computed("tsrange(data + horas[1], data + horas[1] + duracao * interval '1 minute', '[)')"),
+        nullable=True
+    )
+    # Contador de versão verificado pelo SQLAlchemy em cada UPDATE (concorrência otimista)
+    versao = db.Column(db.Integer, nullable=False, default=1, server_default='1')
 
     servicos = db.relationship(
         'Servico', secondary=agendamento_servico, back_populates='agendamentos', lazy=True
     )
+
+    __mapper_args__ = {'version_id_col': versao}
+
+    # O banco rejeita dois agendamentos não cancelados do mesmo colaborador com períodos sobrepostos
+    __table_args__ = (
+        ExcludeConstraint(
+            (colaborador_id, '='),
+            (periodo, '&&'),
+            name='agendamentos_colaborador_periodo_excl',
+            using='gist',
+            where="status <> 'cancelado' AND NOT deleted"
+        ),
+        # Paginação por chave do histórico do cliente (data, id), apenas com os status do histórico
+        db.Index(
+            'ix_agendamentos_historico_cliente',
+            cliente_id, estabelecimento_id, data, 'id',
+            postgresql_where=db.text("status IN ('cancelado', 'concluído')")
+        ),
+    )
+
+
+# Token de renovação (refresh) do user
+class TokenRefresh(BaseModel):
+    __tablename__ = 'tokens_refresh'
+
+    cliente_id = db.Column(
+        UUID(as_uuid=True), db.ForeignKey('clientes.id'), nullable=False, index=True
+    )
+    estabelecimento_id = db.Column(
+        UUID(as_uuid=True), db.ForeignKey('estabelecimentos.id'), nullable=False
+    )
+    # Todos os tokens gerados a partir do mesmo login compartilham a família; o reuso de um
+    # token já trocado revoga a família inteira
+    familia = db.Column(UUID(as_uuid=True), nullable=False, index=True)
+    # Apenas o hash SHA-256 do token é armazenado
+    token_hash = db.Column(db.String(64), nullable=False, unique=True, index=True)
+    # Indexado para a remoção dos tokens expirados (purgar_tokens_refresh)
+    expira_em = db.Column(db.DateTime, nullable=False, index=True)
+    usado_em = db.Column(db.DateTime, nullable=True)
+    revogado = db.Column(db.Boolean, default=False, nullable=False)
\ No newline at end of file
@@ -0,0 +1,133 @@
+import os
+import threading
+import time
+from dotenv import dotenv_values, load_dotenv
+from cryptography.fernet import Fernet
+from ..Cache.Cache_tokens import obter_veredito, gravar_veredito, limpar_cache_tokens, marcar_leitura
+
+load_dotenv()
+
+# Escopo de cada endpoint -> sufixo das variáveis CHAVE_API_<sufixo> e TOKEN_API_<sufixo>
+ESCOPOS = {
+    "redirecionamento_inicial": "REDIRECIONAMENTO_INICIAL",
+    "autenticar_user": "AUTENTICAR_USER",
+    "consultar_agendamentos": "CONSULTAR_AGENDAMENTOS",
+    "consultar_servicos": "CONSULTAR_SERVICOS",
+    "consultar_colaborador": "CONSULTAR_COLABORADOR",
+    "consultar_horarios": "CONSULTAR_HORARIOS",
+    "cancelar_agendamento": "CANCELAR_AGENDAMENTO",
+    "criar_agendamento": "CRIAR_AGENDAMENTO",
+    "consultar_metricas": "CONSULTAR_METRICAS",
+    "renovar_token": "RENOVAR_TOKEN",
+    "exportar_agendamentos": "EXPORTAR_AGENDAMENTOS",
+    "autenticar_estabelecimento": "AUTENTICAR_ESTABELECIMENTO",
+}
+
+# Intervalo (em segundos) após o qual as chaves são relidas do .env/ambiente na próxima
+# validação, permitindo trocar chaves sem reiniciar os workers. 0 desativa a recarga.
+INTERVALO_RECARGA = float(os.getenv("INTERVALO_RECARGA_CHAVES_API", "300"))
+
+# escopo -> (Fernet, token esperado), ou None se as variáveis do escopo não estiverem definidas
+_registro = None
+# escopo -> (chave, token esperado) lidos na última carga, para detectar troca de chaves
+_valores = None
+_carregado_em = 0.0
+# Valores lidos do .env na última carga
+_arquivo = {}
+_lock = threading.Lock()
+
+def _limpar(valor: str) -> str:
+    # Remove possíveis aspas extras
+    return valor.strip().strip('"')
+
+
+def _ler_variavel(nome: str, arquivo: dict):
+    do_ambiente = os.environ.get(nome)
+    do_arquivo = arquivo.get(nome)
+    if do_ambiente is None or do_ambiente == _arquivo.get(nome, do_arquivo):
+        return do_arquivo or do_ambiente
+    return do_ambiente
+
+
+def carregar_chaves_api():
+    """
+    Lê as variáveis CHAVE_API_* e TOKEN_API_* de todos os escopos e monta, uma única vez,
+    a instância de Fernet e o token esperado de cada um.
+
+    As variáveis do ambiente do processo têm precedência sobre o arquivo .env, como em
+    load_dotenv. Uma variável que só está no ambiente porque load_dotenv a copiou do arquivo
+    (o valor no ambiente é o mesmo lido do arquivo na carga anterior) segue o arquivo, para
+    que uma alteração nele seja aplicada na recarga. Escopos com chave ausente ou inválida
+    ficam sem registro e rejeitam todos os tokens.
+
+    É chamada por create_app e, depois, a cada INTERVALO_RECARGA segundos.
+    """
+    global _registro, _valores, _carregado_em, _arquivo
+    arquivo = dotenv_values()
+
+    registro = {}
+    valores = {}
+    for escopo, sufixo in ESCOPOS.items():
+        chave = _ler_variavel(f"CHAVE_API_{sufixo}", arquivo)
+        esperado = _ler_variavel(f"TOKEN_API_{sufixo}", arquivo)
+        registro[escopo] = None
+        valores[escopo] = (chave, esperado)
+        if not (chave and esperado):
+            continue
+        try:
+            registro[escopo] = (Fernet(_limpar(chave)), _limpar(esperado))
+        except Exception:
+            continue
+
+    # Substitui o registro inteiro de uma vez: validações em andamento continuam usando o anterior
+    _registro = registro
+    if valores != _valores:
+        # Vereditos obtidos com as chaves anteriores deixam de valer, inclusive os de validações
+        # em andamento: o registro novo já está publicado, então toda marca posterior à limpeza
+        # corresponde a uma verificação com as chaves novas
+        limpar_cache_tokens()
+    _valores = valores
+    _arquivo = arquivo
+    _carregado_em = time.monotonic()
+
+
+def _registro_atual() -> dict:
+    if _registro is None or (INTERVALO_RECARGA and time.monotonic() - _carregado_em >= INTERVALO_RECARGA):
+        with _lock:
+            if _registro is None or (INTERVALO_RECARGA and time.monotonic() - _carregado_em >= INTERVALO_RECARGA):
+                carregar_chaves_api()
+    return _registro
+
+
+def validar_token_escopo(escopo: str, token: str) -> bool:
+    """
+    Descriptografa o token com a chave registrada para o escopo e compara com o token esperado.
+
+    O veredito fica em cache (Cache_tokens) por hash do token e escopo, de modo que chamadas
+    repetidas com o mesmo token não repetem a verificação do HMAC nem a descriptografia.
+    A marca de leitura é tomada antes de ler as chaves: se elas forem trocadas durante a
+    verificação, o veredito obtido com as chaves anteriores não é gravado.
+
+    Parameters:
+        escopo (str): Escopo do endpoint (chave de ESCOPOS).
+        token (str): Token Fernet recebido no header 'Authorization'.
+
+    Returns:
+        bool: True se os tokens coincidirem, False caso contrário.
+    """
+    marca = marcar_leitura()
+    entrada = _registro_atual().get(escopo)
+    if entrada is None:
+        return False
+
+    veredito = obter_veredito(escopo, token)
+    if veredito is not None:
+        return veredito
+
+    fernet, esperado = entrada
+    try:
+        valido = fernet.decrypt(token.encode()).decode() == esperado
+    except Exception:
+        valido = False
+    gravar_veredito(escopo, token, valido, marca)
+    return valido
\ No newline at end of file
@@ -1,8 +1,7 @@
 import os
 import jwt
 from dotenv import load_dotenv
-from app.models.models import Estabelecimento  # see [`Estabelecimento`](project/app/models/models.py)
-from app.extensions import db              # see [`db`](project/app/extensions.py)
+from ..Cache.Cache_estabelecimentos import estabelecimento_existe
 
 load_dotenv()
 
@@ -11,6 +10,9 @@ def validar_token_id_estabelecimento(token: str):
     Descriptografa o token JWT utilizando a chave SECRET_KEY_ID_ESTABELECIMENTO do .env.
     Caso consiga extrair o 'id' do payload e exista um estabelecimento com esse ID no banco,
     retorna (True, estabelecimento_id). Caso contrário, retorna False.
+
+    A existência é verificada no diretório de estabelecimentos em memória
+    (Cache_estabelecimentos), sem uma consulta ao banco por requisição.
     
     Parameters:
         token (str): Token JWT a ser validado.
@@ -33,7 +35,6 @@ def validar_token_id_estabelecimento(token: str):
         return False
     
     # Verifica se existe um estabelecimento com o ID extraído
-    estabelecimento = db.session.query(Estabelecimento).filter_by(id=estabelecimento_id).first()
-    if estabelecimento:
+    if estabelecimento_existe(estabelecimento_id):
         return True, estabelecimento_id
     return False
\ No newline at end of file
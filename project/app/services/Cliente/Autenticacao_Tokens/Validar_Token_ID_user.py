@@ -2,7 +2,8 @@ import os
 import jwt
 from dotenv import load_dotenv
 from app.models.models import Cliente  # see [`Cliente`](project/app/models/models.py)
-from app.extensions import db           # see [`db`](project/app/extensions.py)
+from ..Cache.Cache_clientes import cliente_confirmado, confirmar_cliente, marcar_leitura
+from ..Consulta_DataBase.Carregador_requisicao import carregar_colunas
 
 load_dotenv()
 
@@ -11,6 +12,11 @@ def validar_token_id_user(estabelecimento_id: str, token: str):
     Descriptografa o token JWT utilizando a chave SECRET_KEY_ID_USER do .env.
     Caso consiga extrair o 'id' do payload e exista um Cliente que esteja relacionado 
     ao estabelecimento informado com esse user id, retorna (True, user_id). Caso contrário, retorna False.
+
+    Clientes excluídos (deleted) não são aceitos. Pares (estabelecimento, cliente) já
+    confirmados ficam em cache (Cache_clientes) e não voltam a ser consultados no banco; um
+    cliente excluído por outro processo da aplicação continua aceito por no máximo
+    CACHE_CLIENTES_TTL segundos.
     
     Parameters:
         estabelecimento_id (str): O ID do estabelecimento (base).
@@ -33,8 +39,13 @@ def validar_token_id_user(estabelecimento_id: str, token: str):
     except Exception:
         return False
 
+    if cliente_confirmado(estabelecimento_id, user_id):
+        return True, user_id
+
     # Verifica se existe um Cliente com o ID extraído que está relacionado ao estabelecimento informado
-    cliente = db.session.query(Cliente).filter_by(id=user_id, estabelecimento_id=estabelecimento_id).first()
-    if cliente:
+    marca = marcar_leitura()
+    cliente = carregar_colunas(Cliente, user_id, "deleted", "estabelecimento_id")
+    if cliente and not cliente.deleted and str(cliente.estabelecimento_id) == str(estabelecimento_id):
+        confirmar_cliente(estabelecimento_id, user_id, marca)
         return True, user_id
     return False
\ No newline at end of file
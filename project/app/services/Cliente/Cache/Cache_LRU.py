@@ -0,0 +1,143 @@
+import itertools
+import threading
+import time
+from collections import OrderedDict
+
+class CacheLRU:
+    """
+    Cache em memória com tamanho máximo e descarte do item usado há mais tempo (LRU).
+
+    Opcionalmente, cada item expira 'ttl' segundos após ser gravado. O acesso é protegido
+    por um lock, pois o mesmo cache é compartilhado pelas threads do processo.
+
+    Se 'ao_descartar' for informado, é chamado com (chave, valor) para cada item descartado
+    por exceder max_itens ou por expirar (não para remover/remover_se/limpar).
+    """
+
+    def __init__(self, max_itens: int, ttl: float = None, ao_descartar=None):
+        self.max_itens = max_itens
+        self.ttl = ttl
+        self.ao_descartar = ao_descartar
+        self._itens = OrderedDict()
+        self._lock = threading.Lock()
+
+    def obter(self, chave, padrao=None):
+        """
+        Retorna o valor de 'chave' e o marca como usado recentemente, ou 'padrao' se a
+        chave não existir ou tiver expirado.
+        """
+        with self._lock:
+            item = self._itens.get(chave)
+            if item is None:
+                return padrao
+            valor, expira_em = item
+            if expira_em is None or expira_em > time.monotonic():
+                self._itens.move_to_end(chave)
+                return valor
+            del self._itens[chave]
+        if self.ao_descartar:
+            self.ao_descartar(chave, valor)
+        return padrao
+
+    def gravar(self, chave, valor):
+        """
+        Grava 'valor' em 'chave', descartando os itens menos usados acima de max_itens.
+        """
+        expira_em = time.monotonic() + self.ttl if self.ttl else None
+        descartados = []
+        with self._lock:
+            self._itens[chave] = (valor, expira_em)
+            self._itens.move_to_end(chave)
+            while len(self._itens) > self.max_itens:
+                chave_antiga, (valor_antigo, _) = self._itens.popitem(last=False)
+                descartados.append((chave_antiga, valor_antigo))
+        if self.ao_descartar:
+            for chave_antiga, valor_antigo in descartados:
+                self.ao_descartar(chave_antiga, valor_antigo)
+
+    def remover(self, chave):
+        """
+        Remove 'chave' do cache, se existir.
+        """
+        with self._lock:
+            self._itens.pop(chave, None)
+
+    def remover_se(self, condicao):
+        """
+        Remove todos os itens cuja chave satisfaça 'condicao(chave)'.
+        """
+        with self._lock:
+            for chave in [chave for chave in self._itens if condicao(chave)]:
+                del self._itens[chave]
+
+    def limpar(self):
+        """
+        Remove todos os itens do cache.
+        """
+        with self._lock:
+            self._itens.clear()
+
+    def __len__(self):
+        return len(self._itens)
+
+
+class MarcasInvalidacao:
+    """
+    Impede que um cache grave um valor lido da fonte (banco, chaves) antes da invalidação da sua chave.
+
+    Uso:
+      1. marca = marcar_leitura(), antes de ler a fonte;
+      2. com o lock (self.lock), gravar o valor apenas se atual(chave, marca);
+      3. ao alterar a fonte, invalidar(chave) (ou invalidar_tudo()) e remover o valor do cache,
+         com o lock, para que nenhuma gravação fique entre as duas etapas.
+
+    As marcas de invalidação ficam em um LRU de max_itens chaves. Quando uma é descartada, a
+    marca mínima passa a ser pelo menos a dela: toda leitura iniciada antes é tratada como
+    anterior à invalidação e recusada, em vez de aceita por falta da marca.
+    """
+
+    def __init__(self, max_itens: int):
+        self._marcas = itertools.count(1)
+        self._invalidacoes = CacheLRU(max_itens, ao_descartar=self._descartar)
+        self._marca_minima = 0
+        self.lock = threading.RLock()
+
+    def _descartar(self, chave, marca):
+        with self.lock:
+            self._marca_minima = max(self._marca_minima, marca)
+
+    def marcar_leitura(self) -> int:
+        """
+        Retorna a marca de uma leitura que está começando.
+        """
+        return next(self._marcas)
+
+    def atual(self, chave, marca: int) -> bool:
+        """
+        Retorna True se a leitura de 'marca' começou depois da última invalidação de 'chave'.
+        """
+        with self.lock:
+            return max(self._invalidacoes.obter(chave, 0), self._marca_minima) <= marca
+
+    def invalidar(self, chave):
+        """
+        Recusa as gravações de 'chave' das leituras iniciadas até agora.
+        """
+        with self.lock:
+            self._invalidacoes.gravar(chave, next(self._marcas))
+
+    def invalidar_tudo(self):
+        """
+        Recusa as gravações de qualquer chave das leituras iniciadas até agora.
+        """
+        with self.lock:
+            self._marca_minima = next(self._marcas)
+            self._invalidacoes.limpar()
+
+    def limpar(self):
+        """
+        Descarta todas as marcas de invalidação.
+        """
+        with self.lock:
+            self._invalidacoes.limpar()
+            self._marca_minima = 0
\ No newline at end of file
@@ -0,0 +1,97 @@
+import os
+import threading
+import time
+from dotenv import load_dotenv
+from sqlalchemy import func
+from app.extensions import db
+from .Cache_LRU import CacheLRU
+
+load_dotenv()
+
+# Quantidade de catálogos (tipo, estabelecimento) mantidos em cache e intervalo (em segundos)
+# durante o qual um catálogo é usado sem consultar o banco. Após o intervalo, a versão do
+# catálogo (max(updated_at) e quantidade de linhas do estabelecimento) é conferida e os
+# dados só são recarregados se ela tiver mudado.
+MAX_ITENS = int(os.getenv("CACHE_CATALOGO_MAX_ITENS", "3000"))
+TTL = float(os.getenv("CACHE_CATALOGO_TTL", "30"))
+
+# (tipo, estabelecimento_id) -> (versao, dados, valido_ate)
+_catalogos = CacheLRU(MAX_ITENS)
+_contadores = {}
+_lock = threading.Lock()
+
+def _contar(tipo: str, evento: str):
+    with _lock:
+        contadores = _contadores.setdefault(tipo, {"acertos": 0, "revalidacoes": 0, "faltas": 0})
+        contadores[evento] += 1
+
+
+def _versao(modelo, estabelecimento_id: str):
+    """
+    Versão do catálogo do estabelecimento: o maior updated_at e a quantidade de linhas
+    (a quantidade detecta exclusões, que não alteram o maior updated_at).
+    """
+    maior_updated_at, quantidade = db.session.query(
+        func.max(modelo.updated_at),
+        func.count(modelo.id)
+    ).filter(modelo.estabelecimento_id == estabelecimento_id).one()
+    return maior_updated_at, quantidade
+
+
+def ler_catalogo(tipo: str, modelo, estabelecimento_id: str, carregar):
+    """
+    Retorna o catálogo 'tipo' do estabelecimento a partir do cache.
+
+    - Dentro do TTL, os dados em cache são retornados sem acessar o banco (acerto).
+    - Após o TTL, a versão do catálogo é conferida; se não mudou, os dados em cache
+      continuam válidos por mais um TTL (revalidação).
+    - Caso contrário, 'carregar()' é executada e o resultado é gravado (falta).
+
+    Parameters:
+        tipo (str): Nome do catálogo (ex.: "servicos").
+        modelo: Model cuja tabela compõe o catálogo (deve ter estabelecimento_id e updated_at).
+        estabelecimento_id (str): ID do estabelecimento.
+        carregar (callable): Função sem argumentos que busca os dados no banco.
+
+    Returns:
+        O valor retornado por 'carregar' (armazenado em cache); não deve ser alterado.
+    """
+    chave = (tipo, str(estabelecimento_id))
+    entrada = _catalogos.obter(chave)
+    if entrada is not None and entrada[2] > time.monotonic():
+        _contar(tipo, "acertos")
+        return entrada[1]
+
+    # A versão é lida antes dos dados: se o catálogo mudar entre as duas leituras, a versão
+    # gravada fica desatualizada e os dados são recarregados na próxima conferência.
+    versao = _versao(modelo, estabelecimento_id)
+    if entrada is not None and entrada[0] == versao:
+        _contar(tipo, "revalidacoes")
+        _catalogos.gravar(chave, (versao, entrada[1], time.monotonic() + TTL))
+        return entrada[1]
+
+    _contar(tipo, "faltas")
+    dados = carregar()
+    _catalogos.gravar(chave, (versao, dados, time.monotonic() + TTL))
+    return dados
+
+
+def estatisticas_catalogo() -> dict:
+    """
+    Retorna os contadores de acertos, revalidações e faltas por catálogo e a ocupação do cache.
+
+    Returns:
+        dict: {"itens": int, "max_itens": int, "catalogos": {tipo: {"acertos", "revalidacoes", "faltas"}}}
+    """
+    with _lock:
+        catalogos = {tipo: dict(contadores) for tipo, contadores in _contadores.items()}
+    return {"itens": len(_catalogos), "max_itens": MAX_ITENS, "catalogos": catalogos}
+
+
+def limpar_cache_catalogo():
+    """
+    Esvazia o cache de catálogos e zera os contadores.
+    """
+    _catalogos.limpar()
+    with _lock:
+        _contadores.clear()
\ No newline at end of file
@@ -0,0 +1,112 @@
+import os
+from dotenv import load_dotenv
+from sqlalchemy import event, inspect
+from sqlalchemy.orm import Session, object_session
+from app.models.models import Cliente
+from .Cache_LRU import CacheLRU, MarcasInvalidacao
+
+load_dotenv()
+
+# Pares (estabelecimento_id, cliente_id) já confirmados no banco. A invalidação é feita pelos
+# eventos do ORM (registrar_invalidacao_clientes) e só alcança o processo que fez a alteração:
+# nos demais processos (workers), e para instruções em massa (query.update/delete), que não
+# disparam esses eventos, um cliente excluído continua autenticado por no máximo TTL segundos.
+MAX_ITENS = int(os.getenv("CACHE_CLIENTES_MAX_ITENS", "50000"))
+TTL = float(os.getenv("CACHE_CLIENTES_TTL", "60"))
+
+CHAVE_PENDENTES = "clientes_invalidados"
+
+_confirmados = CacheLRU(MAX_ITENS, TTL)
+# Marcas de invalidação por cliente_id
+_marcas = MarcasInvalidacao(MAX_ITENS)
+
+def marcar_leitura() -> int:
+    """
+    Deve ser chamada antes de consultar o cliente no banco. A marca retornada é passada a
+    confirmar_cliente, que não confirma o cliente se ele foi invalidado depois dela.
+    """
+    return _marcas.marcar_leitura()
+
+
+def cliente_confirmado(estabelecimento_id: str, cliente_id: str) -> bool:
+    """
+    Retorna True se o cliente já foi confirmado como vinculado ao estabelecimento.
+    """
+    return _confirmados.obter((str(estabelecimento_id), str(cliente_id)), False)
+
+
+def confirmar_cliente(estabelecimento_id: str, cliente_id: str, marca: int):
+    """
+    Registra que o cliente existe, não está excluído e pertence ao estabelecimento, a menos
+    que ele tenha sido invalidado após 'marca' (a leitura pode ter visto a versão anterior).
+    """
+    cliente_id = str(cliente_id)
+    with _marcas.lock:
+        if not _marcas.atual(cliente_id, marca):
+            return
+        _confirmados.gravar((str(estabelecimento_id), cliente_id), True)
+
+
+def invalidar_cliente(cliente_id: str):
+    """
+    Remove o cliente do cache, em qualquer estabelecimento.
+    """
+    cliente_id = str(cliente_id)
+    with _marcas.lock:
+        _marcas.invalidar(cliente_id)
+        _confirmados.remover_se(lambda chave: chave[1] == cliente_id)
+
+
+def _invalidar_no_flush(cliente):
+    # O flush ainda não foi confirmado: outras requisições continuam lendo a linha anterior
+    # até o commit, então o cliente é invalidado de novo em _apos_commit
+    invalidar_cliente(cliente.id)
+    sessao = object_session(cliente)
+    if sessao is not None:
+        sessao.info.setdefault(CHAVE_PENDENTES, set()).add(str(cliente.id))
+
+
+def _ao_atualizar_cliente(mapper, connection, cliente):
+    estado = inspect(cliente)
+    if cliente.deleted or estado.attrs.estabelecimento_id.history.has_changes():
+        _invalidar_no_flush(cliente)
+
+
+def _ao_excluir_cliente(mapper, connection, cliente):
+    _invalidar_no_flush(cliente)
+
+
+def _apos_commit(sessao):
+    for cliente_id in sessao.info.pop(CHAVE_PENDENTES, ()):
+        invalidar_cliente(cliente_id)
+
+
+def _apos_rollback(sessao):
+    sessao.info.pop(CHAVE_PENDENTES, None)
+
+
+def registrar_invalidacao_clientes():
+    """
+    Registra os eventos do ORM que removem o cliente do cache quando ele é excluído,
+    marcado como excluído (deleted) ou movido para outro estabelecimento. Chamada por create_app.
+
+    A remoção é feita no flush e repetida no commit da sessão, pois entre os dois outra
+    requisição ainda pode ler a linha anterior e confirmar o cliente.
+    """
+    for alvo, nome, funcao in (
+        (Cliente, "after_update", _ao_atualizar_cliente),
+        (Cliente, "after_delete", _ao_excluir_cliente),
+        (Session, "after_commit", _apos_commit),
+        (Session, "after_rollback", _apos_rollback),
+    ):
+        if not event.contains(alvo, nome, funcao):
+            event.listen(alvo, nome, funcao)
+
+
+def limpar_cache_clientes():
+    """
+    Esvazia o cache de clientes confirmados.
+    """
+    with _marcas.lock:
+        _confirmados.limpar()
+        _marcas.limpar()
\ No newline at end of file
@@ -0,0 +1,106 @@
+import os
+import threading
+import time
+import uuid
+from dotenv import load_dotenv
+from app.models.models import Estabelecimento
+from app.extensions import db
+from .Cache_LRU import CacheLRU
+from ..Consulta_DataBase.Carregador_requisicao import carregar
+
+load_dotenv()
+
+# O diretório completo de estabelecimentos (ids e pares nome/ID base) é recarregado a cada
+# CACHE_ESTABELECIMENTOS_TTL segundos. Consultas que não o encontram no diretório vão ao
+# banco uma vez (estabelecimento recém-criado) e, se também não existirem lá, ficam em um
+# cache negativo por CACHE_ESTABELECIMENTOS_NEGATIVOS_TTL segundos.
+TTL = float(os.getenv("CACHE_ESTABELECIMENTOS_TTL", "300"))
+MAX_NEGATIVOS = int(os.getenv("CACHE_ESTABELECIMENTOS_NEGATIVOS_MAX_ITENS", "1000"))
+TTL_NEGATIVO = float(os.getenv("CACHE_ESTABELECIMENTOS_NEGATIVOS_TTL", "60"))
+
+# (ids, {(nome_fantasia, identificador_base): id}, carregado_em)
+_diretorio = None
+_negativos = CacheLRU(MAX_NEGATIVOS, TTL_NEGATIVO)
+_lock = threading.Lock()
+
+def _carregar_diretorio():
+    global _diretorio
+    linhas = db.session.query(
+        Estabelecimento.id,
+        Estabelecimento.nome_fantasia,
+        Estabelecimento.identificador_base
+    ).all()
+    ids = {str(linha.id) for linha in linhas}
+    por_nome = {(linha.nome_fantasia, linha.identificador_base): str(linha.id) for linha in linhas}
+    _diretorio = (ids, por_nome, time.monotonic())
+    _negativos.limpar()
+
+
+def _diretorio_atual():
+    if _diretorio is None or time.monotonic() - _diretorio[2] >= TTL:
+        with _lock:
+            if _diretorio is None or time.monotonic() - _diretorio[2] >= TTL:
+                _carregar_diretorio()
+    return _diretorio
+
+
+def estabelecimento_existe(estabelecimento_id: str) -> bool:
+    """
+    Verifica se existe um estabelecimento com o ID informado, consultando o diretório em memória.
+
+    Returns:
+        bool: True se o estabelecimento existir, False caso contrário (inclusive para IDs
+              que não são UUIDs válidos).
+    """
+    try:
+        estabelecimento_id = str(uuid.UUID(str(estabelecimento_id)))
+    except ValueError:
+        return False
+
+    ids, _, _ = _diretorio_atual()
+    if estabelecimento_id in ids:
+        return True
+    if _negativos.obter(("id", estabelecimento_id)) is not None:
+        return False
+
+    estabelecimento = carregar(Estabelecimento, estabelecimento_id)
+    if estabelecimento:
+        ids.add(estabelecimento_id)
+        return True
+    _negativos.gravar(("id", estabelecimento_id), False)
+    return False
+
+
+def buscar_id_estabelecimento(nome: str, id_base: str):
+    """
+    Busca no diretório em memória o ID do estabelecimento com o nome_fantasia e o
+    identificador_base informados.
+
+    Returns:
+        str: ID do estabelecimento, ou None se não existir.
+    """
+    _, por_nome, _ = _diretorio_atual()
+    chave = (nome, id_base)
+    if chave in por_nome:
+        return por_nome[chave]
+    if _negativos.obter(("nome",) + chave) is not None:
+        return None
+
+    estabelecimento = db.session.query(Estabelecimento.id).filter(
+        Estabelecimento.identificador_base == id_base,
+        Estabelecimento.nome_fantasia == nome
+    ).first()
+    if estabelecimento:
+        por_nome[chave] = str(estabelecimento.id)
+        return por_nome[chave]
+    _negativos.gravar(("nome",) + chave, False)
+    return None
+
+
+def limpar_cache_estabelecimentos():
+    """
+    Descarta o diretório e o cache negativo; a próxima consulta recarrega o diretório.
+    """
+    global _diretorio
+    _diretorio = None
+    _negativos.limpar()
\ No newline at end of file
@@ -0,0 +1,86 @@
+import os
+from dotenv import load_dotenv
+from .Cache_LRU import CacheLRU, MarcasInvalidacao
+
+load_dotenv()
+
+# Quantidade de registros de Horario (estabelecimento, colaborador, data) mantidos em cache e
+# validade máxima (em segundos) de cada um. TTL precisa ser positivo; com 0 o cache fica desligado.
+MAX_ITENS = int(os.getenv("CACHE_HORARIOS_MAX_ITENS", "5000"))
+TTL = float(os.getenv("CACHE_HORARIOS_TTL", "60"))
+
+# (estabelecimento_id, colaborador_id ou None, data) -> {required_slots: horarios}
+_horarios = CacheLRU(MAX_ITENS, TTL)
+# Marcas de invalidação por (estabelecimento_id, colaborador_id ou None, data). O lock torna
+# atômicas a verificação + gravação de gravar_horarios e a marcação + remoção de
+# invalidar_horarios: uma invalidação nunca fica entre as duas etapas da outra
+_marcas = MarcasInvalidacao(MAX_ITENS)
+
+def _linha(estabelecimento_id, colaborador_id, data):
+    colaborador = str(colaborador_id) if colaborador_id is not None else None
+    return str(estabelecimento_id), colaborador, str(data)
+
+
+def marcar_leitura() -> int:
+    """
+    Deve ser chamada antes de consultar o banco. A marca retornada é passada a
+    gravar_horarios, que descarta o resultado se o registro foi invalidado depois dela
+    (um agendamento confirmado enquanto a consulta ainda lia a versão anterior).
+    """
+    return _marcas.marcar_leitura()
+
+
+def obter_horarios(estabelecimento_id: str, colaborador_id: str, data, required_slots: int):
+    """
+    Retorna a lista de horários em cache para a consulta, ou None se não houver.
+    colaborador_id None corresponde à consulta de qualquer colaborador.
+    """
+    if TTL <= 0:
+        return None
+    por_slots = _horarios.obter(_linha(estabelecimento_id, colaborador_id, data))
+    if por_slots is None or required_slots not in por_slots:
+        return None
+    return list(por_slots[required_slots])
+
+
+def gravar_horarios(estabelecimento_id: str, colaborador_id: str, data, required_slots: int, horarios: list, marca: int):
+    """
+    Grava o resultado de uma consulta, a menos que o registro tenha sido invalidado após 'marca'
+    (ou que a marca da invalidação já tenha sido descartada do LRU, caso em que a leitura é
+    tratada como anterior a ela).
+    """
+    if TTL <= 0:
+        return
+    linha = _linha(estabelecimento_id, colaborador_id, data)
+    with _marcas.lock:
+        if not _marcas.atual(linha, marca):
+            return
+        por_slots = dict(_horarios.obter(linha) or {})
+        por_slots[required_slots] = list(horarios)
+        _horarios.gravar(linha, por_slots)
+
+
+def invalidar_horarios(estabelecimento_id: str, colaborador_id: str, data):
+    """
+    Remove do cache as consultas afetadas pela alteração do registro de Horario do
+    colaborador na data: as do próprio colaborador (todos os required_slots) e as de
+    qualquer colaborador do estabelecimento na mesma data.
+
+    A invalidação é exata apenas no processo que chamou agendar/cancelar_agendamento_db:
+    nos demais processos (workers) da aplicação, a consulta afetada continua sendo
+    respondida pelo cache por no máximo TTL segundos após a gravação. Uma reserva feita a
+    partir de um horário desatualizado é recusada por agendar, que confere o bitmap no banco.
+    """
+    with _marcas.lock:
+        for linha in (_linha(estabelecimento_id, colaborador_id, data), _linha(estabelecimento_id, None, data)):
+            _marcas.invalidar(linha)
+            _horarios.remover(linha)
+
+
+def limpar_cache_horarios():
+    """
+    Esvazia o cache de horários.
+    """
+    with _marcas.lock:
+        _horarios.limpar()
+        _marcas.limpar()
\ No newline at end of file
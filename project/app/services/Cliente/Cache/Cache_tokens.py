@@ -0,0 +1,97 @@
+import os
+import hashlib
+import threading
+from dotenv import load_dotenv
+from .Cache_LRU import CacheLRU, MarcasInvalidacao
+
+load_dotenv()
+
+# Os tokens de API são poucos e constantes por build do frontend: vereditos positivos ficam
+# em cache por CACHE_TOKENS_TTL segundos. Vereditos negativos ficam em um cache separado e
+# menor, com validade curta, para que tokens inválidos variados não descartem os válidos.
+MAX_POSITIVOS = int(os.getenv("CACHE_TOKENS_MAX_ITENS", "256"))
+TTL_POSITIVO = float(os.getenv("CACHE_TOKENS_TTL", "300"))
+MAX_NEGATIVOS = int(os.getenv("CACHE_TOKENS_NEGATIVOS_MAX_ITENS", "64"))
+TTL_NEGATIVO = float(os.getenv("CACHE_TOKENS_NEGATIVOS_TTL", "30"))
+
+_positivos = CacheLRU(MAX_POSITIVOS, TTL_POSITIVO)
+_negativos = CacheLRU(MAX_NEGATIVOS, TTL_NEGATIVO)
+# limpar_cache_tokens invalida todas as marcas: um veredito obtido com as chaves anteriores à
+# troca não é gravado depois dela
+_marcas = MarcasInvalidacao(1)
+_contadores = {"acertos_positivos": 0, "acertos_negativos": 0, "faltas": 0}
+_lock = threading.Lock()
+
+def _chave(escopo: str, token: str):
+    # O token não é guardado em memória, apenas o seu hash
+    return escopo, hashlib.sha256(token.encode()).digest()
+
+
+def _contar(evento: str):
+    with _lock:
+        _contadores[evento] += 1
+
+
+def marcar_leitura() -> int:
+    """
+    Deve ser chamada antes de ler as chaves de API usadas na verificação. A marca retornada é
+    passada a gravar_veredito, que descarta o veredito se o cache foi limpo depois dela.
+    """
+    return _marcas.marcar_leitura()
+
+
+def obter_veredito(escopo: str, token: str):
+    """
+    Retorna o veredito em cache para o token no escopo: True (válido), False (inválido)
+    ou None se o token ainda não foi verificado (ou o veredito expirou).
+    """
+    chave = _chave(escopo, token)
+    if _positivos.obter(chave):
+        _contar("acertos_positivos")
+        return True
+    if _negativos.obter(chave) is not None:
+        _contar("acertos_negativos")
+        return False
+    _contar("faltas")
+    return None
+
+
+def gravar_veredito(escopo: str, token: str, valido: bool, marca: int):
+    """
+    Grava o resultado da verificação criptográfica do token no cache correspondente, a menos
+    que o cache tenha sido limpo (troca de chaves) após 'marca'.
+    """
+    chave = _chave(escopo, token)
+    with _marcas.lock:
+        if not _marcas.atual(None, marca):
+            return
+        if valido:
+            _positivos.gravar(chave, True)
+        else:
+            _negativos.gravar(chave, False)
+
+
+def estatisticas_tokens() -> dict:
+    """
+    Retorna os contadores de acertos (positivos e negativos) e faltas e a ocupação dos caches.
+    """
+    with _lock:
+        contadores = dict(_contadores)
+    contadores.update({
+        "positivos": len(_positivos),
+        "max_positivos": MAX_POSITIVOS,
+        "negativos": len(_negativos),
+        "max_negativos": MAX_NEGATIVOS,
+    })
+    return contadores
+
+
+def limpar_cache_tokens():
+    """
+    Descarta todos os vereditos (ex.: quando as chaves de API são trocadas) e recusa os das
+    verificações que já estavam em andamento.
+    """
+    with _marcas.lock:
+        _marcas.invalidar_tudo()
+        _positivos.limpar()
+        _negativos.limpar()
\ No newline at end of file
@@ -0,0 +1,86 @@
+import uuid
+from flask import g
+from app.extensions import db
+
+# Carregador por requisição de entidades pelo ID (Cliente, Estabelecimento, Colaborador, Servico...).
+#
+# As entidades carregadas ficam em g até o fim da requisição, de modo que cada uma é buscada no
+# banco no máximo uma vez, mesmo quando serviços diferentes precisam dela. O identity map da
+# sessão não basta para isso: ele guarda referências fracas, e uma entidade que o serviço não
+# devolveu (ex.: consultar_id_user retorna apenas o ID) é descartada logo em seguida.
+#   - lembrar() registra entidades obtidas por outras consultas (ex.: cliente buscado pelo email);
+#   - IDs inexistentes também ficam registrados e não são consultados de novo;
+#   - carregar_colunas() busca apenas as colunas pedidas, para validações que não precisam da
+#     linha inteira (ex.: sem Cliente.senha_hash).
+
+def _uuid(valor):
+    try:
+        return valor if isinstance(valor, uuid.UUID) else uuid.UUID(str(valor))
+    except (TypeError, ValueError):
+        return None
+
+
+def _carregadas() -> dict:
+    # (modelo, UUID) -> entidade, ou None se o ID não existir
+    return g.setdefault("_entidades_carregadas", {})
+
+
+def lembrar(entidade):
+    """
+    Registra no carregador da requisição uma entidade obtida por outra consulta.
+    """
+    if entidade is not None:
+        _carregadas()[(type(entidade), entidade.id)] = entidade
+    return entidade
+
+
+def carregar(modelo, id):
+    """
+    Retorna a entidade 'modelo' com o ID informado, consultando o banco no máximo uma vez por requisição.
+
+    Parameters:
+        modelo: Classe do model (ex.: Cliente).
+        id (str | UUID): ID da entidade.
+
+    Returns:
+        A entidade, ou None se o ID for inválido ou não existir.
+    """
+    id = _uuid(id)
+    if id is None:
+        return None
+
+    carregadas = _carregadas()
+    if (modelo, id) not in carregadas:
+        carregadas[(modelo, id)] = db.session.get(modelo, id)
+    return carregadas[(modelo, id)]
+
+
+def carregar_colunas(modelo, id, *colunas):
+    """
+    Retorna apenas as colunas informadas da entidade 'modelo' com o ID informado, consultando o
+    banco no máximo uma vez por requisição para o mesmo conjunto de colunas. Se a entidade
+    inteira já tiver sido carregada na requisição (carregar ou lembrar), ela é retornada sem
+    nova consulta.
+
+    Parameters:
+        modelo: Classe do model (ex.: Cliente).
+        id (str | UUID): ID da entidade.
+        colunas (str): Nomes das colunas (ex.: "deleted", "estabelecimento_id").
+
+    Returns:
+        Objeto com as colunas como atributos, ou None se o ID for inválido ou não existir.
+    """
+    id = _uuid(id)
+    if id is None:
+        return None
+
+    carregadas = _carregadas()
+    if carregadas.get((modelo, id)) is not None:
+        return carregadas[(modelo, id)]
+
+    chave = (modelo, id, colunas)
+    if chave not in carregadas:
+        carregadas[chave] = db.session.query(
+            *(getattr(modelo, coluna) for coluna in colunas)
+        ).filter(modelo.id == id).first()
+    return carregadas[chave]
\ No newline at end of file
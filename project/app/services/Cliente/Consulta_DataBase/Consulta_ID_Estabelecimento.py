@@ -1,10 +1,12 @@
-from app.models.models import Estabelecimento
-from app.extensions import db
+from ..Cache.Cache_estabelecimentos import buscar_id_estabelecimento
 
 def consultar_estabelecimento(nome: str, id_base: str):
     """
     Recebe as variáveis 'nome' e 'ID base', busca no banco de dados um estabelecimento
     cujo identificador_base seja igual ao id_base e o nome_fantasia seja igual ao nome.
+
+    A busca é feita no diretório de estabelecimentos em memória (Cache_estabelecimentos),
+    que só consulta o banco ao ser recarregado ou para pares ainda desconhecidos.
     
     Parameters:
         nome (str): Nome a ser buscado (corresponde ao campo nome_fantasia).
@@ -14,12 +16,9 @@ def consultar_estabelecimento(nome: str, id_base: str):
         tuple: (True, estabelecimento.id) se encontrado;
         bool: False caso nenhum estabelecimento correspondente seja localizado.
     """
-    estabelecimento = db.session.query(Estabelecimento).filter(
-        Estabelecimento.identificador_base == id_base,
-        Estabelecimento.nome_fantasia == nome
-    ).first()
+    estabelecimento_id = buscar_id_estabelecimento(nome, id_base)
     
-    if estabelecimento:
-        return True, str(estabelecimento.id)
+    if estabelecimento_id:
+        return True, estabelecimento_id
     else:
         return False
\ No newline at end of file
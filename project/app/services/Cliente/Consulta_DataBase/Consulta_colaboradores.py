@@ -1,5 +1,7 @@
+from sqlalchemy import select, text
 from app.models.models import Colaborador
 from app.extensions import db
+from ..Cache.Cache_catalogo import ler_catalogo
 
 def consultar_colaboradores_por_estabelecimento(estabelecimento_id: str):
     """
@@ -11,22 +13,52 @@ def consultar_colaboradores_por_estabelecimento(estabelecimento_id: str):
       - Nome do colaborador
       
     Organiza esses dados em um array onde cada elemento é outro array com os dados do colaborador.
+    O array é lido do cache de catálogos, consultando o banco apenas quando o catálogo muda
+    ou não está em cache.
     
     Returns:
         tuple: (True, lista_de_colaboradores) se colaboradores forem encontrados.
         bool: False caso nenhum colaborador seja encontrado.
     """
-    colaboradores = db.session.query(Colaborador)\
-                        .filter_by(estabelecimento_id=estabelecimento_id).all()
+    lista_colaboradores = ler_catalogo(
+        "colaboradores", Colaborador, estabelecimento_id,
+        lambda: _carregar_colaboradores(estabelecimento_id)
+    )
     
-    if colaboradores:
-        lista_colaboradores = []
-        for colaborador in colaboradores:
-            dados = [
-                str(colaborador.id),
-                colaborador.nome
-            ]
-            lista_colaboradores.append(dados)
-        return True, lista_colaboradores
+    if lista_colaboradores:
+        return True, [list(dados) for dados in lista_colaboradores]
     
-    return False
\ No newline at end of file
+    return False
+
+
+def _carregar_colaboradores(estabelecimento_id: str) -> list:
+    # Projeção apenas das colunas usadas: linhas leves (tuplas), sem instâncias do ORM
+    colaboradores = db.session.execute(
+        select(Colaborador.id, Colaborador.nome)
+        .where(Colaborador.estabelecimento_id == estabelecimento_id)
+    ).all()
+    return [(str(id), nome) for id, nome in colaboradores]
+
+
+def colaboradores_json_por_estabelecimento(estabelecimento_id: str):
+    """
+    Retorna os colaboradores do estabelecimento como texto JSON montado pelo banco, no mesmo
+    formato de consultar_colaboradores_por_estabelecimento ([[id, nome], ...]), lido do cache
+    de catálogos.
+
+    Returns:
+        str: Texto JSON da lista de colaboradores, ou None se não houver colaboradores.
+    """
+    return ler_catalogo(
+        "colaboradores_json", Colaborador, estabelecimento_id,
+        lambda: _carregar_colaboradores_json(estabelecimento_id)
+    )
+
+
+def _carregar_colaboradores_json(estabelecimento_id: str):
+    # ::text evita que o driver converta o JSON de volta em objetos Python
+    return db.session.execute(text("""
+        SELECT json_agg(json_build_array(id::text, nome))::text
+        FROM colaboradores
+        WHERE estabelecimento_id = :estabelecimento_id
+    """), {"estabelecimento_id": estabelecimento_id}).scalar()
\ No newline at end of file
@@ -1,10 +1,12 @@
 from app.models.models import Cliente
 from app.extensions import db
+from .Carregador_requisicao import lembrar
 
 def consultar_id_user(estabelecimento_id: str, email: str):
     """
     Recebe um ID de estabelecimento e um e-mail e verifica se existe algum Cliente
     vinculado a esse estabelecimento com o e-mail correspondente (email_login).
+    O cliente encontrado fica no carregador da requisição, para que autenticar_senha não o busque de novo.
     
     Returns:
         tuple: (True, cliente_id) se o cliente for encontrado.
@@ -16,5 +18,6 @@ def consultar_id_user(estabelecimento_id: str, email: str):
     ).first()
     
     if cliente:
+        lembrar(cliente)
         return True, str(cliente.id)
     return False
\ No newline at end of file
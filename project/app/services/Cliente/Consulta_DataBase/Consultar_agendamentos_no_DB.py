@@ -1,6 +1,88 @@
-from app.models.models import Agendamento  # see [`Agendamento`](project/app/models/models.py)
+import os
+import json
+import base64
+import uuid
+from datetime import date
+from dotenv import load_dotenv
+from sqlalchemy import select, text, tuple_
+from app.models.models import Agendamento, Colaborador, Estabelecimento, Servico, agendamento_servico  # see [`Agendamento`](project/app/models/models.py)
 from app.extensions import db
 
+load_dotenv()
+
+# Status agrupados aceitos no filtro
+GRUPOS_STATUS = {
+    "ativos": ["confirmado", "pendente"],
+    "historico": ["cancelado", "concluído"],
+}
+
+# Tamanho padrão e máximo de cada página do histórico
+TAMANHO_PAGINA_HISTORICO = int(os.getenv("TAMANHO_PAGINA_HISTORICO", "20"))
+MAX_PAGINA_HISTORICO = int(os.getenv("MAX_PAGINA_HISTORICO", "100"))
+
+def _consulta_listagem():
+    # Projeção (Core) apenas das colunas serializadas, com os nomes do colaborador e do
+    # estabelecimento por junção: linhas leves (tuplas) em vez de instâncias do ORM
+    return select(
+        Agendamento.id, Agendamento.data, Agendamento.horas, Agendamento.duracao, Agendamento.status,
+        Colaborador.nome.label("colaborador"),
+        Estabelecimento.nome_fantasia.label("estabelecimento")
+    ).outerjoin(
+        Colaborador, Colaborador.id == Agendamento.colaborador_id
+    ).outerjoin(
+        Estabelecimento, Estabelecimento.id == Agendamento.estabelecimento_id
+    )
+
+
+def _servicos_por_agendamento(agendamento_ids: list) -> dict:
+    # Nomes dos serviços de todos os agendamentos em uma única consulta (IN)
+    servicos = {}
+    if agendamento_ids:
+        linhas = db.session.execute(
+            select(agendamento_servico.c.agendamento_id, Servico.nome)
+            .join(Servico, Servico.id == agendamento_servico.c.servico_id)
+            .where(agendamento_servico.c.agendamento_id.in_(agendamento_ids))
+        )
+        for agendamento_id, nome in linhas:
+            servicos.setdefault(agendamento_id, []).append(nome)
+    return servicos
+
+
+def _serializar(agendamentos) -> list:
+    servicos = _servicos_por_agendamento([ag.id for ag in agendamentos])
+    return [{
+        "id": str(ag.id),
+        "data": ag.data.isoformat() if ag.data else None,
+        "horas": [h.strftime("%H:%M:%S") for h in ag.horas] if ag.horas else [],
+        "duracao": ag.duracao,
+        "status": ag.status,  # Adicionado o status do agendamento
+        "colaborador": ag.colaborador,
+        "servicos": servicos.get(ag.id, []),
+        "estabelecimento": ag.estabelecimento
+    } for ag in agendamentos]
+
+
+def codificar_cursor(data_agendamento: date, agendamento_id) -> str:
+    """
+    Gera o cursor opaco que aponta para a posição (data, id) de um agendamento no histórico.
+    """
+    conteudo = json.dumps({"d": data_agendamento.isoformat(), "i": str(agendamento_id)}, separators=(",", ":"))
+    return base64.urlsafe_b64encode(conteudo.encode()).decode().rstrip("=")
+
+
+def decodificar_cursor(cursor: str):
+    """
+    Lê um cursor gerado por codificar_cursor.
+
+    Returns:
+        tuple: (data, UUID) da posição, ou None se o cursor for inválido.
+    """
+    try:
+        conteudo = json.loads(base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)))
+        return date.fromisoformat(conteudo["d"]), uuid.UUID(conteudo["i"])
+    except Exception:
+        return None
+
 def consultar_agendamentos_por_estabelecimento_cliente_status(estabelecimento_id: str, cliente_id: str, status: str):
     """
     Busca os agendamentos que correspondem ao estabelecimento, cliente e status informados.
@@ -15,45 +97,176 @@ def consultar_agendamentos_por_estabelecimento_cliente_status(estabelecimento_id
       - Nome do colaborador responsável (através do relacionamento 'colaborador')
       - Nome dos serviços relacionados (através do relacionamento 'servicos')
       - Nome do estabelecimento (através do relacionamento 'estabelecimento', campo nome_fantasia)
+
+    A leitura é feita por projeção (Core) apenas das colunas usadas, sem instâncias do ORM: os
+    nomes do colaborador e do estabelecimento vêm no mesmo SELECT dos agendamentos e os dos
+    serviços em um único SELECT ... IN adicional. A quantidade de consultas é constante (2),
+    independente do número de agendamentos.
     
     Returns:
         list: Lista de dicionários com os dados extraídos dos agendamentos.
         None: Caso nenhum agendamento seja encontrado.
     """
-    if status == "ativos":
-        agendamentos = db.session.query(Agendamento).filter(
-            Agendamento.estabelecimento_id == estabelecimento_id,
-            Agendamento.cliente_id == cliente_id,
-            Agendamento.status.in_(["confirmado", "pendente"])
-        ).all()
-    elif status == "historico":
-        agendamentos = db.session.query(Agendamento).filter(
-            Agendamento.estabelecimento_id == estabelecimento_id,
-            Agendamento.cliente_id == cliente_id,
-            Agendamento.status.in_(["cancelado", "concluído"])
-        ).all()
-    else:
-        agendamentos = db.session.query(Agendamento).filter(
-            Agendamento.estabelecimento_id == estabelecimento_id,
-            Agendamento.cliente_id == cliente_id,
-            Agendamento.status == status
-        ).all()
+    filtro_status = (
+        Agendamento.status.in_(GRUPOS_STATUS[status]) if status in GRUPOS_STATUS
+        else Agendamento.status == status
+    )
+    agendamentos = db.session.execute(_consulta_listagem().where(
+        Agendamento.estabelecimento_id == estabelecimento_id,
+        Agendamento.cliente_id == cliente_id,
+        filtro_status
+    )).all()
     
     if not agendamentos:
         return None
     
-    resultados = []
-    for ag in agendamentos:
-        dados = {
-            "id": str(ag.id),
-            "data": ag.data.isoformat() if ag.data else None,
-            "horas": [h.strftime("%H:%M:%S") for h in ag.horas] if ag.horas else [],
-            "duracao": ag.duracao,
-            "status": ag.status,  # Adicionado o status do agendamento
-            "colaborador": ag.colaborador.nome if ag.colaborador and hasattr(ag.colaborador, 'nome') else None,
-            "servicos": [servico.nome for servico in ag.servicos if hasattr(servico, 'nome')],
-            "estabelecimento": ag.estabelecimento.nome_fantasia if ag.estabelecimento and hasattr(ag.estabelecimento, 'nome_fantasia') else None
-        }
-        resultados.append(dados)
+    resultados = _serializar(agendamentos)
     
-    return resultados
\ No newline at end of file
+    return resultados
+
+
+def consultar_historico_paginado(estabelecimento_id: str, cliente_id: str, cursor: str = None, limite: int = None):
+    """
+    Busca uma página do histórico (agendamentos cancelados ou concluídos) do cliente, do mais
+    recente para o mais antigo, ordenada por (data, id).
+
+    A paginação é por chave (keyset): a página seguinte começa logo após o (data, id) do último
+    item da anterior, informado no cursor. Com o índice parcial ix_agendamentos_historico_cliente
+    (cliente_id, estabelecimento_id, data, id), qualquer página custa o mesmo que a primeira.
+
+    Parameters:
+        estabelecimento_id (str): ID do estabelecimento.
+        cliente_id (str): ID do cliente.
+        cursor (str): Cursor 'next_cursor' da página anterior, ou None para a primeira página.
+        limite (int): Quantidade de itens da página (padrão TAMANHO_PAGINA_HISTORICO,
+                      no máximo MAX_PAGINA_HISTORICO).
+
+    Returns:
+        tuple: (True, agendamentos, next_cursor) com a lista de dicionários da página e o cursor
+               da próxima página (None se esta for a última),
+               (False, "Cursor inválido") se o cursor não puder ser lido.
+    """
+    limite = min(limite or TAMANHO_PAGINA_HISTORICO, MAX_PAGINA_HISTORICO)
+
+    consulta = _consulta_listagem().where(
+        Agendamento.cliente_id == cliente_id,
+        Agendamento.estabelecimento_id == estabelecimento_id,
+        Agendamento.status.in_(GRUPOS_STATUS["historico"])
+    )
+    if cursor:
+        posicao = decodificar_cursor(cursor)
+        if posicao is None:
+            return False, "Cursor inválido"
+        consulta = consulta.where(tuple_(Agendamento.data, Agendamento.id) < posicao)
+
+    # Um item além do limite indica se existe uma próxima página
+    agendamentos = db.session.execute(consulta.order_by(
+        Agendamento.data.desc(), Agendamento.id.desc()
+    ).limit(limite + 1)).all()
+
+    next_cursor = None
+    if len(agendamentos) > limite:
+        agendamentos = agendamentos[:limite]
+        next_cursor = codificar_cursor(agendamentos[-1].data, agendamentos[-1].id)
+
+    return True, _serializar(agendamentos), next_cursor
+
+
+# Listagem montada pelo banco (JSON_NO_BANCO): mesmas colunas e formato de _serializar. A página
+# (CTE) segue a mesma ordem e o mesmo índice da paginação por chave; os serviços são agregados
+# em uma única passada sobre os agendamentos da página.
+_SQL_LISTAGEM_JSON = """
+    WITH pagina AS (
+        SELECT a.id, a.data, a.horas, a.duracao, a.status,
+               c.nome AS colaborador, e.nome_fantasia AS estabelecimento,
+               row_number() OVER (ORDER BY a.data {ordem}, a.id {ordem}) AS posicao
+        FROM agendamentos a
+        LEFT JOIN colaboradores c ON c.id = a.colaborador_id
+        LEFT JOIN estabelecimentos e ON e.id = a.estabelecimento_id
+        WHERE a.estabelecimento_id = :estabelecimento_id
+          AND a.cliente_id = :cliente_id
+          AND a.status = ANY(:status)
+          {filtro_cursor}
+        ORDER BY a.data {ordem}, a.id {ordem}
+        {limite}
+    ),
+    servicos_pagina AS (
+        SELECT agendamento_servico.agendamento_id, json_agg(servicos.nome) AS servicos
+        FROM agendamento_servico
+        JOIN servicos ON servicos.id = agendamento_servico.servico_id
+        WHERE agendamento_servico.agendamento_id IN (SELECT id FROM pagina)
+        GROUP BY agendamento_servico.agendamento_id
+    )
+    SELECT
+        (json_agg(json_build_object(
+            'id', p.id::text,
+            'data', p.data,
+            'horas', to_json(p.horas),
+            'duracao', p.duracao,
+            'status', p.status,
+            'colaborador', p.colaborador,
+            'servicos', COALESCE(sp.servicos, '[]'::json),
+            'estabelecimento', p.estabelecimento
+        ) ORDER BY p.posicao) FILTER (WHERE p.posicao <= :maximo))::text AS agendamentos,
+        count(*) AS quantidade,
+        max(p.data) FILTER (WHERE p.posicao = :maximo) AS ultima_data,
+        max(p.id::text) FILTER (WHERE p.posicao = :maximo) AS ultimo_id
+    FROM pagina p
+    LEFT JOIN servicos_pagina sp ON sp.agendamento_id = p.id
+"""
+
+def consultar_agendamentos_json(estabelecimento_id: str, cliente_id: str, status: str):
+    """
+    Versão de consultar_agendamentos_por_estabelecimento_cliente_status com a lista montada
+    pelo banco (JSON_NO_BANCO), em ordem de data.
+
+    Returns:
+        str: Texto JSON da lista de agendamentos.
+        None: Caso nenhum agendamento seja encontrado.
+    """
+    linha = db.session.execute(
+        text(_SQL_LISTAGEM_JSON.format(ordem="ASC", filtro_cursor="", limite="")),
+        {
+            "estabelecimento_id": estabelecimento_id,
+            "cliente_id": cliente_id,
+            "status": GRUPOS_STATUS.get(status, [status]),
+            "maximo": 2 ** 31 - 1
+        }
+    ).one()
+    return linha.agendamentos
+
+
+def consultar_historico_paginado_json(estabelecimento_id: str, cliente_id: str, cursor: str = None, limite: int = None):
+    """
+    Versão de consultar_historico_paginado com a página montada pelo banco (JSON_NO_BANCO).
+
+    Returns:
+        tuple: (True, texto JSON da página ou None se estiver vazia, next_cursor),
+               (False, "Cursor inválido") se o cursor não puder ser lido.
+    """
+    limite = min(limite or TAMANHO_PAGINA_HISTORICO, MAX_PAGINA_HISTORICO)
+    parametros = {
+        "estabelecimento_id": estabelecimento_id,
+        "cliente_id": cliente_id,
+        "status": GRUPOS_STATUS["historico"],
+        "maximo": limite,
+        "limite_consulta": limite + 1
+    }
+    filtro_cursor = ""
+    if cursor:
+        posicao = decodificar_cursor(cursor)
+        if posicao is None:
+            return False, "Cursor inválido"
+        filtro_cursor = "AND (a.data, a.id) < (:cursor_data, :cursor_id)"
+        parametros["cursor_data"], parametros["cursor_id"] = posicao
+
+    # Um item além do limite indica se existe uma próxima página
+    linha = db.session.execute(
+        text(_SQL_LISTAGEM_JSON.format(ordem="DESC", filtro_cursor=filtro_cursor, limite="LIMIT :limite_consulta")),
+        parametros
+    ).one()
+
+    next_cursor = None
+    if linha.quantidade > limite:
+        next_cursor = codificar_cursor(linha.ultima_data, linha.ultimo_id)
+    return True, linha.agendamentos, next_cursor
\ No newline at end of file
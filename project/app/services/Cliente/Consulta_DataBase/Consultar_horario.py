@@ -1,88 +1,171 @@
 import math
-from datetime import time, datetime
+from datetime import datetime, timedelta
 from app.extensions import db
-from app.models.models import Funcionamento, Servico, Horario
+from app.models.models import Funcionamento, Horario
+from ..Disponibilidade.Bitmap_horarios import bits_para_inteiro, horario_do_indice, inicios_disponiveis
+from ..Disponibilidade.Motor_disponibilidade import consultar_horarios_em_lote, agrupar_colaboradores_por_horario
+from .Duracao_servicos import resolver_duracoes
+from ..Cache.Cache_horarios import obter_horarios, gravar_horarios, marcar_leitura
+from ..Cache.Cache_catalogo import ler_catalogo
+
+def calcular_required_slots(estabelecimento_id: str, servico_ids: list):
+    """
+    Busca o campo 'menor_time' do Funcionamento do estabelecimento, soma a duração dos
+    serviços informados (vinculados ao estabelecimento, resolvidos por resolver_duracoes) e
+    calcula a quantidade de horários sequenciais necessários:
+    required_slots = ceil(total_duracao / menor_time).
+
+    Funcionamento e serviços são lidos do cache de catálogos (ler_catalogo).
+
+    IDs de serviço que não pertencem ao estabelecimento são ignorados.
+
+    Returns:
+        int: required_slots.
+        None: Se o estabelecimento não possuir Funcionamento cadastrado.
+    """
+    menor_time = ler_catalogo(
+        "funcionamento", Funcionamento, estabelecimento_id,
+        lambda: _carregar_menor_time(estabelecimento_id)
+    )
+    if menor_time is None:
+        return None
+
+    duracoes, _ = resolver_duracoes(estabelecimento_id, servico_ids)
+    total_duracao = sum(duracoes.values())
+
+    return math.ceil(total_duracao / menor_time)
+
+
+def _carregar_menor_time(estabelecimento_id: str):
+    funcionamento = db.session.query(Funcionamento.menor_time).filter_by(estabelecimento_id=estabelecimento_id).first()
+    return funcionamento.menor_time if funcionamento else None
+
 
 def consultar_horarios_agendamento(estabelecimento_id: str, colaborador_id: str, data: str, servico_ids: list):
     """
     Recebe:
       - estabelecimento_id: o ID do estabelecimento;
-      - colaborador_id: o ID do colaborador;
+      - colaborador_id: o ID do colaborador, ou None para consultar qualquer colaborador;
       - data: uma data em formato 'YYYY-MM-DD';
       - servico_ids: um array com de 1 a 10 IDs de serviço.
       
     Procedimentos:
-      1. Busca na tabela Funcionamento o campo 'menor_time' usando o estabelecimento_id.
-      2. Para cada ID de serviço no array, busca o serviço na tabela Servico (vinculado ao estabelecimento)
-         e soma o valor do campo 'duracao'.
+      1. Busca o campo 'menor_time' do Funcionamento do estabelecimento (cache de catálogos).
+      2. Resolve, pelo catálogo de serviços do estabelecimento em cache, a duração dos serviços
+         do array e soma o valor do campo 'duracao'.
       3. Calcula a quantidade de horários sequenciais necessários (required_slots) como:
          required_slots = ceil(total_duracao / menor_time).
-      4. Busca na tabela Horario, usando estabelecimento_id, colaborador_id e data, e extrai o array de horários.
-      5. Percorre o array de horários e agrupa os horários consecutivos (diferentes de "00:00:00"). Ao final de cada bloco,
-         verifica cada posição que possa iniciar uma sequência com comprimento >= required_slots e a adiciona ao array de resultados.
+      4. Busca na tabela Horario, usando estabelecimento_id, colaborador_id e data, e extrai o bitmap de disponibilidade.
+      5. Localiza, com operações de bits, cada slot livre que inicia uma sequência de required_slots slots livres
+         e converte essas posições para horários da grade do dia.
       6. Se nenhum horário for encontrado, retorna (True, [None]). Em caso de erro, retorna False.
       
+    Sem colaborador_id, os registros de Horario de todos os colaboradores do estabelecimento na
+    data são carregados em uma única consulta e unidos em memória (agrupar_colaboradores_por_horario).
+
+    O resultado dos passos 4 a 6 fica em cache (Cache_horarios) por estabelecimento, colaborador,
+    data e required_slots, e é invalidado por agendar e cancelar_agendamento_db quando alteram
+    o registro de Horario correspondente. A invalidação é imediata no processo que fez a
+    alteração; nos demais processos da aplicação o resultado anterior pode ser devolvido por
+    até CACHE_HORARIOS_TTL segundos (agendar recusa reservas de slots que já foram ocupados).
+      
     Returns:
         tuple: (True, array_de_horarios) se o processo ocorrer sem erro.
         Ex: (True, [<hora_inicial_da_sequencia>, ...]) ou (True, [None]) se nenhum horário disponível.
+        Sem colaborador_id: (True, [(<hora_inicial_da_sequencia>, [colaborador_id, ...]), ...]) ou (True, [None]).
         bool: False em caso de erro.
     """
     try:
-        # 1. Busca o 'menor_time' na tabela Funcionamento
-        funcionamento = db.session.query(Funcionamento).filter_by(estabelecimento_id=estabelecimento_id).first()
-        if not funcionamento:
+        # 1 a 3. Calcula os espaços requeridos a partir do menor_time e da duração dos serviços
+        required_slots = calcular_required_slots(estabelecimento_id, servico_ids)
+        if required_slots is None:
             return False
-        menor_time = funcionamento.menor_time
-
-        # 2. Soma a duração de cada serviço
-        total_duracao = 0
-        for servico_id in servico_ids:
-            servico = db.session.query(Servico).filter_by(id=servico_id, estabelecimento_id=estabelecimento_id).first()
-            if servico:
-                total_duracao += servico.duracao
-
-        # 3. Calcula os espaços requeridos (arredondando para cima)
-        required_slots = math.ceil(total_duracao / menor_time)
-
-        # 4. Busca o registro de Horario para o estabelecimento, colaborador e data informados
-        horario_record = db.session.query(Horario).filter_by(
-            estabelecimento_id=estabelecimento_id,
-            colaborador_id=colaborador_id,
-            data=data
-        ).first()
-        if not horario_record:
-            return True, [None]
-
-        available_slots = horario_record.horarios   # array de objetos time ou strings
-
-        # 5. Percorre o array e agrupa os horários consecutivos que não são 00:00:00,
-        #    avaliando todas as posições possíveis como início de uma sequência válida.
-        found_slots = []
-        current_block = []
-        zero_time = time(0, 0, 0)
-
-        # Função auxiliar para processar a sequência atual
-        def process_block(block):
-            if len(block) >= required_slots:
-                # Para cada posição que permita uma sequência de tamanho required_slots, registre o horário de início.
-                for i in range(len(block) - required_slots + 1):
-                    found_slots.append(block[i])
-        
-        for slot in available_slots:
-            
-            if slot != zero_time:
-                current_block.append(slot)
-            else:
-                # Quando encontra 00:00:00, processa o bloco atual e reseta
-                process_block(current_block)
-                current_block = []
-        # Processa o último bloco, caso exista
-        process_block(current_block)
-
-        # 6. Retorna os resultados
-        if found_slots:
-            return True, found_slots
-        else:
-            return True, [None]
+
+        # Consultas repetidas do mesmo colaborador, data e required_slots são respondidas pelo
+        # cache até que um agendamento ou cancelamento altere o registro de Horario
+        horarios = obter_horarios(estabelecimento_id, colaborador_id, data, required_slots)
+        if horarios is not None:
+            return True, horarios
+
+        marca = marcar_leitura()
+        horarios = _calcular_horarios(estabelecimento_id, colaborador_id, data, required_slots)
+        gravar_horarios(estabelecimento_id, colaborador_id, data, required_slots, horarios, marca)
+        return True, horarios
     except Exception as e:
-        return False
\ No newline at end of file
+        return False
+
+
+def _calcular_horarios(estabelecimento_id: str, colaborador_id: str, data: str, required_slots: int) -> list:
+    """
+    Passos 4 a 6 de consultar_horarios_agendamento, executados quando a consulta não está em cache.
+    """
+    if colaborador_id is None:
+        data_consulta = datetime.strptime(data, "%Y-%m-%d").date()
+        por_colaborador_e_data = consultar_horarios_em_lote(estabelecimento_id, [data_consulta], required_slots)
+        return agrupar_colaboradores_por_horario(por_colaborador_e_data, data_consulta)
+
+    # 4. Busca o registro de Horario para o estabelecimento, colaborador e data informados
+    horario_record = db.session.query(Horario).filter_by(
+        estabelecimento_id=estabelecimento_id,
+        colaborador_id=colaborador_id,
+        data=data
+    ).first()
+    if not horario_record or horario_record.horario_inicial is None:
+        return [None]
+
+    # 5. Cada bit de 'disponibilidade' representa um slot da grade do dia ('1' = livre);
+    #    os inícios com required_slots slots livres em sequência são obtidos por operações de bits.
+    tamanho = len(horario_record.disponibilidade)
+    mapa = bits_para_inteiro(horario_record.disponibilidade)
+    found_slots = [
+        horario_do_indice(horario_record.horario_inicial, horario_record.menor_time, indice)
+        for indice in inicios_disponiveis(mapa, tamanho, required_slots)
+    ]
+
+    # 6. Retorna os resultados
+    if found_slots:
+        return found_slots
+    else:
+        return [None]
+
+
+def consultar_horarios_periodo(estabelecimento_id: str, colaborador_id: str, data_inicial: str, data_final: str, servico_ids: list):
+    """
+    Versão de consultar_horarios_agendamento para um período de datas (ex.: toda a janela
+    de agendamento exibida no calendário), em uma única chamada. Assim como nela,
+    colaborador_id pode ser None para consultar qualquer colaborador.
+
+    Procedimentos:
+      1. Calcula required_slots (calcular_required_slots) uma única vez para todo o período.
+      2. Busca em uma única consulta os registros de Horario do colaborador para todas as datas
+         do período e calcula os inícios disponíveis de todas elas com o motor vetorizado.
+
+    Returns:
+        tuple: (True, {'YYYY-MM-DD': [<hora_inicial_da_sequencia>, ...] ou [None], ...}) com
+               uma entrada para cada data do período, em ordem. Sem colaborador_id, cada
+               lista contém (<hora_inicial_da_sequencia>, [colaborador_id, ...]).
+        bool: False em caso de erro.
+    """
+    try:
+        required_slots = calcular_required_slots(estabelecimento_id, servico_ids)
+        if required_slots is None:
+            return False
+
+        inicio = datetime.strptime(data_inicial, "%Y-%m-%d").date()
+        fim = datetime.strptime(data_final, "%Y-%m-%d").date()
+        datas = [inicio + timedelta(days=i) for i in range((fim - inicio).days + 1)]
+
+        if colaborador_id is None:
+            por_colaborador_e_data = consultar_horarios_em_lote(estabelecimento_id, datas, required_slots)
+            return True, {
+                data.isoformat(): agrupar_colaboradores_por_horario(por_colaborador_e_data, data)
+                for data in datas
+            }
+
+        por_colaborador_e_data = consultar_horarios_em_lote(estabelecimento_id, datas, required_slots, [colaborador_id])
+        return True, {
+            data.isoformat(): por_colaborador_e_data.get((str(colaborador_id), data), [None])
+            for data in datas
+        }
+    except Exception:
+        return False
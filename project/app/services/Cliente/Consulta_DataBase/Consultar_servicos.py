@@ -1,5 +1,7 @@
+from sqlalchemy import select, text
 from app.models.models import Servico
 from app.extensions import db
+from ..Cache.Cache_catalogo import ler_catalogo
 
 def consultar_servicos_por_estabelecimento(estabelecimento_id: str):
     """
@@ -14,24 +16,56 @@ def consultar_servicos_por_estabelecimento(estabelecimento_id: str):
       - Duração (campo duracao)
     
     Organiza esses dados em um array onde cada elemento é outro array com os dados do serviço.
+    O array é lido do cache de catálogos (servicos_do_catalogo).
     
     Returns:
         tuple: (True, lista_de_servicos) se serviços forem encontrados.
         bool: False caso não sejam encontrados serviços.
     """
-    servicos = db.session.query(Servico).filter_by(estabelecimento_id=estabelecimento_id).all()
+    lista_servicos = servicos_do_catalogo(estabelecimento_id)
     
-    if servicos:
-        lista_servicos = []
-        for servico in servicos:
-            dados_servico = [
-                str(servico.id),
-                servico.nome,
-                servico.descricao,
-                str(servico.preco),  # convertendo o valor para string se necessário
-                servico.duracao
-            ]
-            lista_servicos.append(dados_servico)
-        return True, lista_servicos
+    if lista_servicos:
+        return True, [list(dados_servico) for dados_servico in lista_servicos]
     
-    return False
\ No newline at end of file
+    return False
+
+
+def servicos_do_catalogo(estabelecimento_id: str) -> list:
+    """
+    Retorna os serviços do estabelecimento ([id, nome, descricao, preco, duracao]) a partir
+    do cache de catálogos, consultando o banco apenas quando o catálogo muda ou não está em cache.
+    """
+    return ler_catalogo("servicos", Servico, estabelecimento_id, lambda: _carregar_servicos(estabelecimento_id))
+
+
+def _carregar_servicos(estabelecimento_id: str) -> list:
+    # Projeção apenas das colunas usadas: linhas leves (tuplas), sem instâncias do ORM
+    servicos = db.session.execute(
+        select(Servico.id, Servico.nome, Servico.descricao, Servico.preco, Servico.duracao)
+        .where(Servico.estabelecimento_id == estabelecimento_id)
+    ).all()
+    return [
+        (str(id), nome, descricao, str(preco), duracao)  # convertendo o valor para string se necessário
+        for id, nome, descricao, preco, duracao in servicos
+    ]
+
+
+def servicos_json_do_catalogo(estabelecimento_id: str):
+    """
+    Retorna os serviços do estabelecimento como texto JSON montado pelo banco, no mesmo formato
+    de consultar_servicos_por_estabelecimento ([[id, nome, descricao, preco, duracao], ...]).
+    O texto fica no cache de catálogos, como em servicos_do_catalogo.
+
+    Returns:
+        str: Texto JSON da lista de serviços, ou None se não houver serviços.
+    """
+    return ler_catalogo("servicos_json", Servico, estabelecimento_id, lambda: _carregar_servicos_json(estabelecimento_id))
+
+
+def _carregar_servicos_json(estabelecimento_id: str):
+    # ::text evita que o driver converta o JSON de volta em objetos Python
+    return db.session.execute(text("""
+        SELECT json_agg(json_build_array(id::text, nome, descricao, preco::text, duracao))::text
+        FROM servicos
+        WHERE estabelecimento_id = :estabelecimento_id
+    """), {"estabelecimento_id": estabelecimento_id}).scalar()
\ No newline at end of file
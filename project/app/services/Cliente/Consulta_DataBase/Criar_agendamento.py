@@ -1,92 +1,151 @@
-from app.models.models import Servico, Horario, Agendamento, Assinatura
-from datetime import datetime, timedelta, time
+from app.models.models import Agendamento, Assinatura, agendamento_servico
+from datetime import datetime, timedelta
+from sqlalchemy import text
+from sqlalchemy.exc import IntegrityError
+from psycopg2.errors import ExclusionViolation
 from app.extensions import db
-import math
+from .Duracao_servicos import resolver_duracoes
+from ..Cache.Cache_horarios import invalidar_horarios
+
+# Localiza o Horario do dia, calcula a máscara de bits dos slots pedidos e os bloqueia
+# em um único UPDATE condicional. A condição "disponibilidade & mascara = mascara" é
+# reavaliada pelo PostgreSQL sobre a versão mais recente da linha quando há outra
+# reserva concorrente, então dois agendamentos nunca bloqueiam o mesmo slot. O campo
+# 'versao' é incrementado para que escritas otimistas do ORM sobre o mesmo Horario
+# (ex.: cancelamentos) detectem a alteração.
+# Retorna uma linha por Horario encontrado, com 'reservado' indicando se o bloqueio ocorreu.
+SQL_RESERVAR_SLOTS = text("""
+    WITH grade AS (
+        SELECT id,
+               menor_time,
+               length(disponibilidade) AS tamanho,
+               CEIL(CAST(:duracao AS numeric) / menor_time)::integer AS slots,
+               (EXTRACT(EPOCH FROM (CAST(:horario AS time) - horario_inicial)) / 60)::integer AS minutos
+          FROM horarios
+         WHERE estabelecimento_id = :estabelecimento_id
+           AND colaborador_id = :colaborador_id
+           AND data = :data
+           AND horario_inicial IS NOT NULL
+    ), alvo AS (
+        SELECT id,
+               CAST(
+                   repeat('0', minutos / menor_time)
+                   || repeat('1', slots)
+                   || repeat('0', tamanho - minutos / menor_time - slots)
+               AS varbit) AS mascara
+          FROM grade
+         WHERE minutos >= 0
+           AND minutos % menor_time = 0
+           AND slots >= 1
+           AND minutos / menor_time + slots <= tamanho
+    ), reservado AS (
+        UPDATE horarios AS h
+           SET disponibilidade = h.disponibilidade & ~alvo.mascara,
+               versao = h.versao + 1,
+               updated_at = timezone('utc', now())
+          FROM alvo
+         WHERE h.id = alvo.id
+           AND h.disponibilidade & alvo.mascara = alvo.mascara
+        RETURNING h.id
+    )
+    SELECT grade.id, grade.menor_time, grade.slots, reservado.id IS NOT NULL AS reservado
+      FROM grade
+      LEFT JOIN reservado ON reservado.id = grade.id
+""")
 
 def agendar(estabelecimento_id: str, cliente_id: str, servico_ids: list, colaborador_id: str, data: str, horario: str):
     """
     Recebe os parâmetros necessários para criar um agendamento.
-    1. Busca os serviços pelo ID do estabelecimento e pelos IDs do array,
-       e soma o valor do campo 'duracao' de cada serviço encontrado.
-    2. Busca o registro de Horario pelo estabelecimento, colaborador e data.
-    3. Calcula a quantidade de slots necessários para o agendamento.
-    4. Gera um array apenas com os horários ocupados no formato [HH:MM:SS, ...].
-    5. Verifica se a sequência de horários está disponível no array de horários da tabela Horario.
-       Se estiver, bloqueia os horários (substitui por 00:00:00) e atualiza o registro.
-       Se não estiver, retorna False e mensagem de horário indisponível.
+    1. Resolve pelo catálogo de serviços em cache (resolver_duracoes) os serviços do
+       estabelecimento cujos IDs estão no array, e soma o valor do campo 'duracao' de cada um.
+       Se algum ID não corresponder a um serviço do estabelecimento, retorna False e mensagem
+       de serviço não encontrado.
+    2. Verifica se o cliente possui assinatura ativa.
+    3. Em um único UPDATE condicional (SQL_RESERVAR_SLOTS), localiza o registro de Horario
+       pelo estabelecimento, colaborador e data, calcula os slots necessários e os bloqueia
+       no bitmap de disponibilidade somente se todos estiverem livres.
+       Se não estiverem, retorna False e mensagem de horário indisponível.
+    4. Gera o array com os horários ocupados e cria o Agendamento na mesma transação,
+       confirmando reserva e agendamento com um único commit. Se a restrição de exclusão
+       de agendamentos rejeitar o período (sobreposição com outro agendamento ativo do
+       colaborador), a transação inteira é desfeita e o horário é tratado como indisponível.
+       Após o commit, as consultas de horários em cache desse colaborador e data são invalidadas.
 
     Retorna:
-        tuple: (True, duração_total, quantidade_de_slot, horarios_ocupados) em caso de sucesso,
-               (False, "Horário indisponível") em caso de conflito.
+        bool: True em caso de sucesso,
+        tuple: (False, "Serviço não encontrado") se algum serviço não pertencer ao estabelecimento,
+               (False, "Horário indisponível") em caso de conflito,
+               (False, "Erro interno") se não houver Horario para o dia ou a gravação falhar.
     """
-    # 1. Busca todos os serviços do estabelecimento cujos IDs estão no array
-    servicos = db.session.query(Servico).filter(
-        Servico.estabelecimento_id == estabelecimento_id,
-        Servico.id.in_(servico_ids)
-    ).all()
-
-    # Soma a duração de todos os serviços encontrados
-    duracao_total = sum(servico.duracao for servico in servicos)
-
-    # 2. Busca o registro de Horario para o estabelecimento, colaborador e data informados
-    horario_record = db.session.query(Horario).filter_by(
-        estabelecimento_id=estabelecimento_id,
-        colaborador_id=colaborador_id,
-        data=data
-    ).first()
-    if not horario_record:
-        return False, "Erro interno"
-
-    # 3. Calcula a quantidade de slots necessários
-    menor_time = horario_record.menor_time
-    quantidade_de_slot = math.ceil(duracao_total / menor_time)
-
-    # 4. Gera o array apenas com os horários ocupados (formato datetime.time)
-    horarios_ocupados = []
-    data_hora_inicial = datetime.strptime(f"{data} {horario}", "%Y-%m-%d %H:%M:%S")
-    for i in range(quantidade_de_slot):
-        proximo_horario = (data_hora_inicial + timedelta(minutes=menor_time * i)).time()
-        horarios_ocupados.append(proximo_horario)
-
-    # 5. Verifica se todos os horários estão disponíveis no array de horários da tabela Horario
-    horarios_disponiveis = list(horario_record.horarios)
-    indices_para_bloquear = []
-    for h in horarios_ocupados:
-        try:
-            idx = horarios_disponiveis.index(h)
-            indices_para_bloquear.append(idx)
-        except ValueError:
-            return False, "Horário indisponível"
+    # 1. Resolve a duração dos serviços do estabelecimento cujos IDs estão no array
+    duracoes, nao_encontrados = resolver_duracoes(estabelecimento_id, servico_ids)
+    if nao_encontrados:
+        return False, "Serviço não encontrado"
 
-    # 6. Bloqueia os horários substituindo por 00:00:00
-    for idx in indices_para_bloquear:
-        horarios_disponiveis[idx] = time(0, 0, 0)
-    horario_record.horarios = horarios_disponiveis
-    db.session.commit()
+    # Soma a duração de todos os serviços
+    duracao_total = sum(duracoes.values())
 
-      # 8. Verifica se o cliente possui assinatura ativa
+    # 2. Verifica se o cliente possui assinatura ativa
     assinatura = db.session.query(Assinatura).filter_by(
         cliente_id=cliente_id,
         status="ativa"
     ).first()
     assinatura_id = assinatura.id if assinatura else None
 
-    # 9. Cria o objeto Agendamento
-    agendamento = Agendamento(
-        estabelecimento_id=estabelecimento_id,
-        colaborador_id=colaborador_id,
-        cliente_id=cliente_id,
-        horario_id=horario_record.id,
-        data=datetime.strptime(data, "%Y-%m-%d").date(),
-        horas=horarios_ocupados,
-        duracao=duracao_total,
-        status="pendente",
-        assinatura_id=assinatura_id
-    )
-    # Adiciona os serviços ao relacionamento muitos-para-muitos
-    agendamento.servicos = db.session.query(Servico).filter(Servico.id.in_(servico_ids)).all()
+    try:
+        # 3. Verifica e bloqueia os slots no banco em uma única instrução
+        reserva = db.session.execute(SQL_RESERVAR_SLOTS, {
+            "estabelecimento_id": estabelecimento_id,
+            "colaborador_id": colaborador_id,
+            "data": data,
+            "horario": horario,
+            "duracao": duracao_total
+        }).first()
+        if not reserva:
+            db.session.rollback()
+            return False, "Erro interno"
+        if not reserva.reservado:
+            db.session.rollback()
+            return False, "Horário indisponível"
+
+        # 4. Gera o array apenas com os horários ocupados (formato datetime.time)
+        horarios_ocupados = []
+        data_hora_inicial = datetime.strptime(f"{data} {horario}", "%Y-%m-%d %H:%M:%S")
+        for i in range(reserva.slots):
+            proximo_horario = (data_hora_inicial + timedelta(minutes=reserva.menor_time * i)).time()
+            horarios_ocupados.append(proximo_horario)
 
-    db.session.add(agendamento)
-    db.session.commit()
+        # Cria o objeto Agendamento
+        agendamento = Agendamento(
+            estabelecimento_id=estabelecimento_id,
+            colaborador_id=colaborador_id,
+            cliente_id=cliente_id,
+            horario_id=reserva.id,
+            data=data_hora_inicial.date(),
+            horas=horarios_ocupados,
+            duracao=duracao_total,
+            status="pendente",
+            assinatura_id=assinatura_id
+        )
+        db.session.add(agendamento)
+        db.session.flush()
+
+        # Vincula os serviços já resolvidos no passo 1, sem carregá-los novamente
+        db.session.execute(agendamento_servico.insert(), [
+            {"agendamento_id": agendamento.id, "servico_id": servico_id}
+            for servico_id in duracoes
+        ])
+        db.session.commit()
+        invalidar_horarios(estabelecimento_id, colaborador_id, data)
+    except IntegrityError as erro:
+        db.session.rollback()
+        # agendamentos_colaborador_periodo_excl: o banco encontrou outro agendamento ativo
+        # do colaborador sobreposto a este período
+        if isinstance(erro.orig, ExclusionViolation):
+            return False, "Horário indisponível"
+        return False, "Erro interno"
+    except Exception:
+        db.session.rollback()
+        return False, "Erro interno"
 
-    return True
\ No newline at end of file
+    return True
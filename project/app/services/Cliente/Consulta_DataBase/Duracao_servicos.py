@@ -0,0 +1,29 @@
+from .Consultar_servicos import servicos_do_catalogo
+
+def resolver_duracoes(estabelecimento_id: str, servico_ids: list):
+    """
+    Resolve a duração de todos os serviços informados que pertencem ao estabelecimento
+    a partir do catálogo de serviços em cache (servicos_do_catalogo), sem uma consulta
+    por serviço.
+
+    IDs repetidos no array são considerados uma única vez, como na associação
+    agendamento_servico.
+
+    Parameters:
+        estabelecimento_id (str): ID do estabelecimento.
+        servico_ids (list): IDs dos serviços (str).
+
+    Returns:
+        tuple: (duracoes, nao_encontrados)
+            duracoes (dict): {servico_id (str): duracao em minutos} dos serviços encontrados.
+            nao_encontrados (list): IDs do array sem serviço correspondente no estabelecimento,
+                                    na ordem em que foram informados.
+    """
+    ids = list(dict.fromkeys(str(servico_id).lower() for servico_id in servico_ids))
+    if not ids:
+        return {}, []
+
+    catalogo = {dados_servico[0]: dados_servico[4] for dados_servico in servicos_do_catalogo(estabelecimento_id)}
+    duracoes = {servico_id: catalogo[servico_id] for servico_id in ids if servico_id in catalogo}
+    nao_encontrados = [servico_id for servico_id in ids if servico_id not in duracoes]
+    return duracoes, nao_encontrados
\ No newline at end of file
@@ -0,0 +1,30 @@
+import os
+import json
+from dotenv import load_dotenv
+
+load_dotenv()
+
+# Com JSON_NO_BANCO ativo, as listagens (serviços, colaboradores e agendamentos) são montadas
+# pelo PostgreSQL (json_agg/json_build_object) e o texto retornado é enviado como corpo da
+# resposta, sem criar dicionários/listas em Python nem serializar com jsonify.
+JSON_NO_BANCO = os.getenv("JSON_NO_BANCO", "0").strip().lower() in ("1", "true", "sim")
+
+def corpo_json(envelope: dict, **campos_json) -> str:
+    """
+    Monta o corpo JSON da resposta a partir dos campos comuns (envelope, serializados aqui)
+    e de campos cujo valor já é um texto JSON gerado pelo banco (inseridos sem reinterpretar).
+
+    Parameters:
+        envelope (dict): Campos serializados com json.dumps (ex.: "message").
+        **campos_json (str): Campos cujo valor é texto JSON pronto (ex.: servicos='[...]').
+
+    Returns:
+        str: O objeto JSON completo.
+    """
+    partes = [json.dumps(envelope, ensure_ascii=False)[:-1]]
+    separador = ", " if envelope else ""
+    for campo, texto in campos_json.items():
+        partes.append(f"{separador}{json.dumps(campo)}: {texto}")
+        separador = ", "
+    partes.append("}")
+    return "".join(partes)
\ No newline at end of file
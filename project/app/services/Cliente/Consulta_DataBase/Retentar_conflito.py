@@ -0,0 +1,35 @@
+import random
+import time
+from sqlalchemy.orm.exc import StaleDataError
+from app.extensions import db
+
+# Quantidade máxima de tentativas e espera inicial (em segundos) entre elas
+MAX_TENTATIVAS = 4
+ESPERA_INICIAL = 0.02
+ESPERA_MAXIMA = 0.2
+
+def executar_com_retentativa(operacao, max_tentativas: int = MAX_TENTATIVAS):
+    """
+    Executa 'operacao' e, se o SQLAlchemy detectar que outra transação alterou a mesma
+    linha versionada (StaleDataError em um UPDATE com version_id_col), desfaz a sessão,
+    aguarda um intervalo exponencial com jitter e tenta novamente.
+
+    Parameters:
+        operacao (callable): Função sem argumentos que lê, altera e faz commit dos registros.
+        max_tentativas (int): Número máximo de execuções antes de desistir.
+
+    Returns:
+        O valor retornado por 'operacao'.
+
+    Raises:
+        StaleDataError: Se o conflito persistir após max_tentativas execuções.
+    """
+    for tentativa in range(1, max_tentativas + 1):
+        try:
+            return operacao()
+        except StaleDataError:
+            db.session.rollback()
+            if tentativa == max_tentativas:
+                raise
+            espera = min(ESPERA_INICIAL * (2 ** (tentativa - 1)), ESPERA_MAXIMA)
+            time.sleep(random.uniform(0, espera))
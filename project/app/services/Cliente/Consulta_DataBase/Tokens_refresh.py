@@ -0,0 +1,187 @@
+import os
+import uuid
+import hashlib
+import secrets
+import time
+import threading
+import click
+from datetime import datetime, timedelta
+from dotenv import load_dotenv
+from app.models.models import TokenRefresh, Cliente
+from app.extensions import db
+from .Carregador_requisicao import carregar_colunas
+
+load_dotenv()
+
+# Validade (em dias) de cada token de renovação
+DIAS_VALIDADE = int(os.getenv("DIAS_VALIDADE_TOKEN_REFRESH", "30"))
+# Segundos após a troca de um token em que um novo uso dele é recusado sem revogar a família:
+# duas abas renovando ao mesmo tempo, ou a repetição de uma renovação cuja resposta se perdeu,
+# não são tratadas como roubo do token
+GRACA_REUSO = float(os.getenv("GRACA_REUSO_TOKEN_REFRESH", "10"))
+# Intervalo mínimo (em segundos) entre duas limpezas feitas por emitir_token_refresh em um
+# mesmo processo, e quantidade máxima de linhas removidas por cada uma delas
+INTERVALO_PURGA = int(os.getenv("INTERVALO_PURGA_TOKENS_REFRESH", "3600"))
+LOTE_PURGA = int(os.getenv("LOTE_PURGA_TOKENS_REFRESH", "1000"))
+
+_ultima_purga = None
+_lock_purga = threading.Lock()
+
+def _hash_token(token: str) -> str:
+    return hashlib.sha256(token.encode('utf-8')).hexdigest()
+
+
+def _novo_token(estabelecimento_id: str, cliente_id: str, familia) -> str:
+    token = secrets.token_urlsafe(48)
+    db.session.add(TokenRefresh(
+        cliente_id=cliente_id,
+        estabelecimento_id=estabelecimento_id,
+        familia=familia,
+        token_hash=_hash_token(token),
+        expira_em=datetime.utcnow() + timedelta(days=DIAS_VALIDADE)
+    ))
+    return token
+
+
+def emitir_token_refresh(estabelecimento_id: str, cliente_id: str):
+    """
+    Gera um token de renovação opaco para o cliente, iniciando uma nova família (um login).
+    Apenas o hash do token é gravado no banco.
+
+    No máximo uma vez a cada INTERVALO_PURGA segundos por processo, remove também até
+    LOTE_PURGA tokens expirados (purgar_tokens_refresh), para que a tabela não cresça sem limite.
+
+    Returns:
+        str: O token, a ser enviado ao cliente em cookie httpOnly.
+        bool: False se a gravação falhar.
+    """
+    try:
+        token = _novo_token(estabelecimento_id, cliente_id, uuid.uuid4())
+        db.session.commit()
+    except Exception:
+        db.session.rollback()
+        return False
+
+    if _purga_pendente():
+        purgar_tokens_refresh(LOTE_PURGA)
+    return token
+
+
+def _purga_pendente() -> bool:
+    global _ultima_purga
+    with _lock_purga:
+        agora = time.monotonic()
+        if _ultima_purga is not None and agora - _ultima_purga < INTERVALO_PURGA:
+            return False
+        _ultima_purga = agora
+        return True
+
+
+def purgar_tokens_refresh(lote: int = None):
+    """
+    Remove os tokens de renovação expirados, usados ou não, revogados ou não.
+
+    Tokens usados e ainda não expirados são mantidos: é por eles que renovar_token_refresh
+    detecta o reuso de um token já trocado e revoga a família. Depois de expirado, um token
+    é recusado de qualquer forma, então a linha deixa de ser necessária. Assim, a tabela
+    guarda apenas os tokens emitidos nos últimos DIAS_VALIDADE dias.
+
+    Args:
+        lote: Quantidade máxima de linhas removidas; None remove todas.
+
+    Returns:
+        int: Quantidade de linhas removidas (0 se a remoção falhar).
+    """
+    try:
+        expirados = db.session.query(TokenRefresh.id).filter(
+            TokenRefresh.expira_em <= datetime.utcnow()
+        )
+        if lote is not None:
+            expirados = expirados.limit(lote)
+        removidos = db.session.query(TokenRefresh).filter(
+            TokenRefresh.id.in_(expirados.scalar_subquery())
+        ).delete(synchronize_session=False)
+        db.session.commit()
+        return removidos
+    except Exception:
+        db.session.rollback()
+        return 0
+
+
+def renovar_token_refresh(estabelecimento_id: str, token: str):
+    """
+    Troca um token de renovação válido por um novo token da mesma família (rotação).
+
+    Procedimento:
+      1. Marca o token como usado com um UPDATE condicional (ainda não usado, não revogado,
+         não expirado e do estabelecimento informado). Entre duas trocas concorrentes do mesmo
+         token, apenas uma altera a linha.
+      2. Se nenhuma linha foi alterada e o token existe mas já havia sido usado:
+         - até GRACA_REUSO segundos após a troca, recusa sem revogar nada (renovação
+           concorrente de outra aba ou repetição de uma requisição); o cliente deve usar o
+           token novo, já enviado em cookie na resposta da troca;
+         - depois disso, trata como reuso (token copiado ou roubado) e revoga todos os tokens
+           da família.
+      3. Confirma que o cliente ainda existe e não foi excluído e gera o próximo token da família.
+
+    Returns:
+        tuple: (True, cliente_id, novo_token) em caso de sucesso,
+               (False, "Token já renovado") se o token tiver sido trocado há no máximo
+               GRACA_REUSO segundos,
+               (False, "Token reutilizado") se o token já tiver sido trocado antes disso,
+               (False, "Token inválido") se não existir, estiver expirado ou revogado,
+               (False, "Erro interno") se a gravação falhar.
+    """
+    token_hash = _hash_token(token)
+    agora = datetime.utcnow()
+    try:
+        # 1. Consome o token
+        consumidos = db.session.query(TokenRefresh).filter(
+            TokenRefresh.token_hash == token_hash,
+            TokenRefresh.estabelecimento_id == estabelecimento_id,
+            TokenRefresh.usado_em.is_(None),
+            TokenRefresh.revogado.is_(False),
+            TokenRefresh.expira_em > agora
+        ).update({"usado_em": agora, "updated_at": agora}, synchronize_session=False)
+
+        registro = db.session.query(
+            TokenRefresh.cliente_id, TokenRefresh.familia, TokenRefresh.usado_em, TokenRefresh.revogado
+        ).filter(
+            TokenRefresh.token_hash == token_hash,
+            TokenRefresh.estabelecimento_id == estabelecimento_id
+        ).first()
+
+        if not consumidos:
+            # 2. Token trocado há pouco (e família não revogada): recusa sem revogar
+            if (registro and registro.usado_em is not None and not registro.revogado
+                    and agora - registro.usado_em <= timedelta(seconds=GRACA_REUSO)):
+                db.session.rollback()
+                return False, "Token já renovado"
+            # Reuso de um token já trocado: revoga a família inteira
+            if registro and registro.usado_em is not None:
+                db.session.query(TokenRefresh).filter(
+                    TokenRefresh.familia == registro.familia
+                ).update({"revogado": True, "updated_at": agora}, synchronize_session=False)
+                db.session.commit()
+                return False, "Token reutilizado"
+            db.session.rollback()
+            return False, "Token inválido"
+
+        # 3. O cliente precisa continuar ativo e vinculado ao estabelecimento
+        cliente = carregar_colunas(Cliente, registro.cliente_id, "deleted", "estabelecimento_id")
+        if not cliente or cliente.deleted or str(cliente.estabelecimento_id) != str(estabelecimento_id):
+            db.session.rollback()
+            return False, "Token inválido"
+
+        novo_token = _novo_token(estabelecimento_id, registro.cliente_id, registro.familia)
+        db.session.commit()
+        return True, str(registro.cliente_id), novo_token
+    except Exception:
+        db.session.rollback()
+        return False, "Erro interno"
+
+
+@click.command("purgar-tokens-refresh")
+def purgar_tokens_refresh_command():
+    """Remove os tokens de renovação expirados da tabela tokens_refresh."""
+    click.echo(f"Tokens de renovação removidos: {purgar_tokens_refresh()}")
@@ -0,0 +1,110 @@
+from datetime import datetime, date, time, timedelta
+
+def horario_do_indice(horario_inicial: time, menor_time: int, indice: int) -> time:
+    """
+    Converte a posição de um slot na grade do dia no horário correspondente.
+
+    Parameters:
+        horario_inicial (time): Primeiro horário da grade (campo Horario.horario_inicial).
+        menor_time (int): Intervalo em minutos entre dois slots consecutivos.
+        indice (int): Posição do slot na grade (0 = horario_inicial).
+
+    Returns:
+        time: Horário do slot.
+    """
+    inicio = datetime.combine(date.min, horario_inicial)
+    return (inicio + timedelta(minutes=menor_time * indice)).time()
+
+
+def indice_do_horario(horario_inicial: time, menor_time: int, horario: time):
+    """
+    Converte um horário na posição do slot correspondente na grade do dia.
+
+    Returns:
+        int: Posição do slot se o horário cair exatamente sobre a grade.
+        None: Se o horário for anterior ao início ou não estiver alinhado ao menor_time.
+    """
+    minutos = (datetime.combine(date.min, horario) - datetime.combine(date.min, horario_inicial)).total_seconds() / 60
+    if minutos < 0 or minutos % menor_time != 0:
+        return None
+    return int(minutos // menor_time)
+
+
+def bits_para_inteiro(bits: str) -> int:
+    """
+    Converte o BIT VARYING armazenado em Horario.disponibilidade em um inteiro.
+
+    O primeiro caractere da string representa o primeiro slot do dia e vira o bit
+    menos significativo do inteiro, de forma que o slot i corresponde a (1 << i).
+    '1' indica slot livre e '0' slot ocupado.
+    """
+    if not bits:
+        return 0
+    return int(bits[::-1], 2)
+
+
+def inteiro_para_bits(mapa: int, tamanho: int) -> str:
+    """
+    Operação inversa de bits_para_inteiro: gera a string de 'tamanho' caracteres
+    que é gravada em Horario.disponibilidade.
+    """
+    if tamanho <= 0:
+        return ''
+    return format(mapa, 'b').zfill(tamanho)[-tamanho:][::-1]
+
+
+def mascara_slots(inicio: int, quantidade: int) -> int:
+    """
+    Gera a máscara com 'quantidade' bits ligados a partir do slot 'inicio'.
+    """
+    return ((1 << quantidade) - 1) << inicio
+
+
+def inicios_disponiveis(mapa: int, tamanho: int, required_slots: int) -> list:
+    """
+    Retorna todas as posições de início que possuem 'required_slots' slots livres em sequência.
+
+    O bit i do acumulador indica que os slots i..i+n-1 estão livres. A cada passo o
+    acumulador é combinado com ele mesmo deslocado, dobrando n até alcançar required_slots,
+    o que resolve a busca em O(log required_slots) operações sobre o inteiro inteiro.
+    """
+    acumulado = mapa & ((1 << tamanho) - 1)
+    coberto = 1
+    while coberto < required_slots and acumulado:
+        passo = min(coberto, required_slots - coberto)
+        acumulado &= acumulado >> passo
+        coberto += passo
+
+    inicios = []
+    while acumulado:
+        menor_bit = acumulado & -acumulado
+        inicios.append(menor_bit.bit_length() - 1)
+        acumulado ^= menor_bit
+    return inicios
+
+
+def bloquear_slots(mapa: int, tamanho: int, inicio: int, quantidade: int):
+    """
+    Marca como ocupados os slots inicio..inicio+quantidade-1.
+
+    Returns:
+        int: O novo mapa, caso todos os slots estejam dentro da grade e livres.
+        None: Caso algum slot esteja ocupado ou fora da grade.
+    """
+    if inicio < 0 or quantidade < 1 or inicio + quantidade > tamanho:
+        return None
+    mascara = mascara_slots(inicio, quantidade)
+    if mapa & mascara != mascara:
+        return None
+    return mapa & ~mascara
+
+
+def liberar_slots(mapa: int, tamanho: int, inicio: int, quantidade: int) -> int:
+    """
+    Marca como livres os slots inicio..inicio+quantidade-1, ignorando o que
+    ultrapassar o final da grade.
+    """
+    if inicio < 0 or inicio >= tamanho or quantidade < 1:
+        return mapa
+    quantidade = min(quantidade, tamanho - inicio)
+    return mapa | mascara_slots(inicio, quantidade)
@@ -0,0 +1,125 @@
+import numpy as np
+from app.extensions import db
+from app.models.models import Horario
+from .Bitmap_horarios import horario_do_indice
+
+CODIGO_LIVRE = ord('1')
+
+def carregar_horarios(estabelecimento_id: str, datas: list, colaborador_ids: list = None):
+    """
+    Busca, em uma única consulta, os registros de Horario do estabelecimento para as datas
+    informadas (e, opcionalmente, apenas para os colaboradores informados).
+
+    Apenas as colunas usadas pelo motor são carregadas, sem instanciar objetos do ORM.
+
+    Returns:
+        list: Linhas com (colaborador_id, data, horario_inicial, menor_time, disponibilidade).
+    """
+    consulta = db.session.query(
+        Horario.colaborador_id,
+        Horario.data,
+        Horario.horario_inicial,
+        Horario.menor_time,
+        Horario.disponibilidade
+    ).filter(
+        Horario.estabelecimento_id == estabelecimento_id,
+        Horario.data.in_(datas),
+        Horario.horario_inicial.isnot(None)
+    )
+    if colaborador_ids is not None:
+        consulta = consulta.filter(Horario.colaborador_id.in_(colaborador_ids))
+    return consulta.all()
+
+
+def montar_matriz(registros: list):
+    """
+    Monta a matriz booleana colaborador × dia: cada linha é um registro de Horario e cada
+    coluna um slot da grade daquele dia (True = livre). Linhas com grades menores que a
+    maior grade são completadas com False.
+
+    Returns:
+        tuple: (matriz, registros) onde matriz[i] corresponde a registros[i].
+    """
+    largura = max((len(registro.disponibilidade) for registro in registros), default=0)
+    matriz = np.zeros((len(registros), largura), dtype=bool)
+    for linha, registro in enumerate(registros):
+        bits = np.frombuffer(registro.disponibilidade.encode('ascii'), dtype=np.uint8)
+        matriz[linha, :bits.size] = bits == CODIGO_LIVRE
+    return matriz, registros
+
+
+def inicios_disponiveis_matriz(matriz: np.ndarray, required_slots: int) -> np.ndarray:
+    """
+    Calcula, para todas as linhas de uma vez, quais slots iniciam uma sequência de
+    required_slots slots livres.
+
+    Usa a soma acumulada de cada linha: a janela [i, i + required_slots) está livre
+    quando acumulado[i + required_slots] - acumulado[i] == required_slots.
+
+    Returns:
+        np.ndarray: Matriz booleana do mesmo formato de 'matriz' com True nos inícios válidos.
+    """
+    required_slots = max(required_slots, 1)
+    linhas, largura = matriz.shape
+    inicios = np.zeros((linhas, largura), dtype=bool)
+    if largura < required_slots:
+        return inicios
+
+    acumulado = np.zeros((linhas, largura + 1), dtype=np.int32)
+    np.cumsum(matriz, axis=1, out=acumulado[:, 1:])
+    janelas = acumulado[:, required_slots:] - acumulado[:, :-required_slots]
+    inicios[:, :janelas.shape[1]] = janelas == required_slots
+    return inicios
+
+
+def consultar_horarios_em_lote(estabelecimento_id: str, datas: list, required_slots: int, colaborador_ids: list = None):
+    """
+    Calcula os horários disponíveis de vários colaboradores e datas de uma só vez.
+
+    Para cada par (colaborador_id, data) com registro de Horario, devolve a mesma lista que
+    consultar_horarios_agendamento devolveria para esse par e esse required_slots:
+    os horários de início das sequências livres, ou [None] se não houver nenhum.
+
+    Returns:
+        dict: {(colaborador_id, data): [time, ...] ou [None]}
+    """
+    registros = carregar_horarios(estabelecimento_id, datas, colaborador_ids)
+    matriz, registros = montar_matriz(registros)
+    inicios = inicios_disponiveis_matriz(matriz, required_slots)
+
+    resultado = {}
+    for linha, registro in enumerate(registros):
+        indices = np.flatnonzero(inicios[linha])
+        horarios = [
+            horario_do_indice(registro.horario_inicial, registro.menor_time, int(indice))
+            for indice in indices
+        ]
+        resultado[(str(registro.colaborador_id), registro.data)] = horarios or [None]
+    return resultado
+
+
+def agrupar_colaboradores_por_horario(por_colaborador_e_data: dict, data) -> list:
+    """
+    Une, em memória, os horários de todos os colaboradores em uma data: para cada horário
+    de início disponível, lista os colaboradores livres nele.
+
+    Parameters:
+        por_colaborador_e_data (dict): Resultado de consultar_horarios_em_lote.
+        data (date): Data a ser agrupada.
+
+    Returns:
+        list: [(time, [colaborador_id, ...]), ...] ordenado por horário, ou [None] se vazio.
+    """
+    colaboradores_por_horario = {}
+    for (colaborador_id, data_registro), horarios in por_colaborador_e_data.items():
+        if data_registro != data:
+            continue
+        for horario in horarios:
+            if horario is not None:
+                colaboradores_por_horario.setdefault(horario, []).append(colaborador_id)
+
+    agrupados = [
+        (horario, sorted(colaboradores))
+        for horario, colaboradores in sorted(colaboradores_por_horario.items())
+    ]
+    return agrupados or [None]
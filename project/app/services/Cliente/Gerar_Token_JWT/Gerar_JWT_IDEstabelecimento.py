@@ -26,5 +26,4 @@ def gerar_jwt_id_estabelecimento(estabelecimento_id: str, exp_minutes: int = 60)
     }
     
     token = jwt.encode(payload, secret, algorithm="HS256")
-    return token
-print(gerar_jwt_id_estabelecimento(""))
+    return token
\ No newline at end of file
@@ -1,12 +1,21 @@
 import bcrypt
 from app.models.models import Cliente
 from app.extensions import db
+from ..Consulta_DataBase.Carregador_requisicao import carregar
+from .Executor_bcrypt import executar_bcrypt
+from .Hashear_senha import CUSTO, custo_do_hash, hashear_senha
 
 def autenticar_senha(estabelecimento_id: str, cliente_id: str, senha: str) -> bool:
     """
     Recebe o ID do estabelecimento, o ID do cliente e uma senha em formato string.
-    Busca pelo cliente no banco de dados; caso encontre, extrai o hash da senha armazenada
+    Busca pelo cliente pelo carregador da requisição (sem nova consulta se ele já tiver sido
+    carregado, por exemplo por consultar_id_user); caso encontre, extrai o hash da senha armazenada
     (campo 'senha_hash') e utiliza bcrypt.checkpw() para comparar com a senha fornecida.
+    A comparação roda no pool dedicado do bcrypt (Executor_bcrypt), fora da thread da requisição.
+
+    Se a senha estiver correta e o hash armazenado tiver custo diferente de BCRYPT_ROUNDS, a senha
+    é hasheada novamente com o custo atual e gravada no cliente. Se o novo hash não puder ser
+    gerado ou gravado, o login segue normalmente e a troca é tentada no próximo login.
     
     Parameters:
         estabelecimento_id (str): ID do estabelecimento.
@@ -15,12 +24,22 @@ def autenticar_senha(estabelecimento_id: str, cliente_id: str, senha: str) -> bo
         
     Returns:
         bool: True se a senha corresponder ao hash armazenado, False caso contrário.
+        None: Se o pool do bcrypt estiver sobrecarregado ou a verificação exceder o tempo limite.
     """
-    cliente = db.session.query(Cliente).filter_by(id=cliente_id, estabelecimento_id=estabelecimento_id).first()
-    if not cliente:
+    cliente = carregar(Cliente, cliente_id)
+    if not cliente or str(cliente.estabelecimento_id) != str(estabelecimento_id):
         return False
 
     senha_bytes = senha.encode('utf-8')
     hash_bytes = cliente.senha_hash.encode('utf-8') if isinstance(cliente.senha_hash, str) else cliente.senha_hash
 
-    return bcrypt.checkpw(senha_bytes, hash_bytes)
\ No newline at end of file
+    valida = executar_bcrypt(bcrypt.checkpw, senha_bytes, hash_bytes)
+    if valida and custo_do_hash(hash_bytes) != CUSTO:
+        novo_hash = hashear_senha(senha)
+        if novo_hash:
+            try:
+                cliente.senha_hash = novo_hash
+                db.session.commit()
+            except Exception:
+                db.session.rollback()
+    return valida
\ No newline at end of file
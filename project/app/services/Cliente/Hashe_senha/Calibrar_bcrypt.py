@@ -0,0 +1,49 @@
+import statistics
+import time
+import bcrypt
+import click
+from .Hashear_senha import CUSTO
+
+def medir_checkpw(custo: int, repeticoes: int = 3) -> float:
+    """
+    Mede, em milissegundos, a mediana do tempo de bcrypt.checkpw para um hash com o custo informado.
+    """
+    senha = b'Calibracao.123'
+    hash_bytes = bcrypt.hashpw(senha, bcrypt.gensalt(rounds=custo))
+    tempos = []
+    for _ in range(repeticoes):
+        inicio = time.perf_counter()
+        bcrypt.checkpw(senha, hash_bytes)
+        tempos.append((time.perf_counter() - inicio) * 1000)
+    return statistics.median(tempos)
+
+
+def calibrar_custo(alvo_ms: float, custo_min: int = 10, custo_max: int = 16):
+    """
+    Mede o checkpw em custos crescentes e retorna o maior custo cujo tempo não passa do alvo.
+
+    Returns:
+        tuple: (custo recomendado, [(custo, ms), ...] medidos). O custo recomendado é custo_min
+               se nem ele couber no alvo.
+    """
+    medicoes = []
+    recomendado = custo_min
+    for custo in range(custo_min, custo_max + 1):
+        ms = medir_checkpw(custo)
+        medicoes.append((custo, ms))
+        if ms > alvo_ms:
+            break
+        recomendado = custo
+    return recomendado, medicoes
+
+
+@click.command("calibrar-bcrypt")
+@click.option("--alvo-ms", default=250.0, show_default=True,
+              help="Tempo máximo aceitável de uma verificação de senha, em milissegundos.")
+def calibrar_bcrypt_command(alvo_ms):
+    """Mede o bcrypt.checkpw neste servidor e sugere o valor de BCRYPT_ROUNDS."""
+    recomendado, medicoes = calibrar_custo(alvo_ms)
+    for custo, ms in medicoes:
+        click.echo(f"custo {custo:>2}: {ms:8.1f} ms")
+    click.echo(f"BCRYPT_ROUNDS atual: {CUSTO}")
+    click.echo(f"BCRYPT_ROUNDS recomendado para {alvo_ms:.0f} ms: {recomendado}")
\ No newline at end of file
@@ -0,0 +1,64 @@
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor, TimeoutError
+from dotenv import load_dotenv
+
+load_dotenv()
+
+# O bcrypt libera o GIL durante o cálculo do hash, então um pool de threads próprio basta para
+# tirá-lo das threads de requisição. No máximo BCRYPT_WORKERS cálculos rodam ao mesmo tempo e
+# até BCRYPT_FILA_MAX aguardam na fila; acima disso a operação é recusada imediatamente.
+WORKERS = int(os.getenv("BCRYPT_WORKERS", "2"))
+FILA_MAX = int(os.getenv("BCRYPT_FILA_MAX", "8"))
+TIMEOUT = float(os.getenv("BCRYPT_TIMEOUT", "2"))
+
+_executor = ThreadPoolExecutor(max_workers=WORKERS, thread_name_prefix="bcrypt")
+_vagas = threading.BoundedSemaphore(WORKERS + FILA_MAX)
+_contadores = {"executadas": 0, "recusadas": 0, "expiradas": 0}
+_lock = threading.Lock()
+
+def _contar(evento: str):
+    with _lock:
+        _contadores[evento] += 1
+
+
+def executar_bcrypt(funcao, *args):
+    """
+    Executa uma operação do bcrypt (checkpw/hashpw) no pool dedicado e aguarda o resultado.
+
+    Parameters:
+        funcao (callable): Função do bcrypt a ser executada.
+        *args: Argumentos da função.
+
+    Returns:
+        O resultado da função, ou None se o pool estiver sobrecarregado (fila cheia) ou se o
+        resultado não ficar pronto em BCRYPT_TIMEOUT segundos.
+    """
+    if not _vagas.acquire(blocking=False):
+        _contar("recusadas")
+        return None
+
+    try:
+        futuro = _executor.submit(funcao, *args)
+    except Exception:
+        _vagas.release()
+        raise
+    # A vaga só é devolvida quando o cálculo termina, mesmo que a requisição já tenha desistido
+    futuro.add_done_callback(lambda _: _vagas.release())
+
+    try:
+        resultado = futuro.result(timeout=TIMEOUT)
+    except TimeoutError:
+        futuro.cancel()
+        _contar("expiradas")
+        return None
+    _contar("executadas")
+    return resultado
+
+
+def estatisticas_bcrypt() -> dict:
+    """
+    Retorna os contadores do pool do bcrypt e os limites configurados.
+    """
+    with _lock:
+        return {**_contadores, "workers": WORKERS, "fila_max": FILA_MAX, "timeout": TIMEOUT}
\ No newline at end of file
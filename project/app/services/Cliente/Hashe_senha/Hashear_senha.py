@@ -1,24 +1,50 @@
+import os
 import bcrypt
+from dotenv import load_dotenv
+from .Executor_bcrypt import executar_bcrypt
+
+load_dotenv()
+
+# Custo (log2 das iterações) dos novos hashes. Use 'flask calibrar-bcrypt' para escolher o
+# valor de acordo com o tempo de verificação aceitável no servidor.
+CUSTO = int(os.getenv("BCRYPT_ROUNDS", "12"))
+
+def custo_do_hash(hash_senha) -> int:
+    """
+    Extrai o custo de um hash bcrypt ('$2b$<custo>$...').
+
+    Returns:
+        int: O custo do hash, ou None se o formato não for reconhecido.
+    """
+    if isinstance(hash_senha, bytes):
+        hash_senha = hash_senha.decode('utf-8')
+    try:
+        return int(hash_senha.split('$')[2])
+    except (AttributeError, IndexError, ValueError):
+        return None
+
 
 def hashear_senha(senha: str) -> str:
     """
-    Recebe uma senha em formato string, gera um salt e utiliza bcrypt para hashear
-    a senha. Em seguida, imprime o hash resultante no terminal e o retorna.
+    Recebe uma senha em formato string, gera um salt com o custo configurado (BCRYPT_ROUNDS)
+    e utiliza bcrypt para hashear a senha no pool dedicado do bcrypt (Executor_bcrypt).
     
     Parameters:
         senha (str): A senha a ser hasheada.
     
     Returns:
         str: A senha hasheada.
+        None: Se o pool do bcrypt estiver sobrecarregado ou o cálculo exceder o tempo limite.
     """
     # Gera um salt
-    salt = bcrypt.gensalt()
+    salt = bcrypt.gensalt(rounds=CUSTO)
     # Converte a senha para bytes, pois o bcrypt trabalha com bytes
     senha_bytes = senha.encode('utf-8')
     # Gera o hash da senha utilizando o salt
-    hash_bytes = bcrypt.hashpw(senha_bytes, salt)
+    hash_bytes = executar_bcrypt(bcrypt.hashpw, senha_bytes, salt)
+    if hash_bytes is None:
+        return None
     # Converte o hash de bytes para string
     hash_str = hash_bytes.decode('utf-8')
     
-    return hash_str
-print(hashear_senha('Senha.123'))
+    return hash_str
\ No newline at end of file
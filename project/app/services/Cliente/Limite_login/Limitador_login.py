@@ -0,0 +1,262 @@
+import os
+import threading
+import time
+import uuid
+from collections import deque
+from dotenv import load_dotenv
+from ..Cache.Cache_LRU import CacheLRU
+
+try:
+    import redis
+except ImportError:  # armazenamento compartilhado é opcional
+    redis = None
+
+load_dotenv()
+
+# Janela deslizante: em qualquer intervalo de JANELA_LOGIN segundos, cada chave admite no máximo
+# o limite da sua dimensão. Tentativas recusadas não entram na contagem, e um limite 0 desliga a
+# dimensão.
+#
+# A janela do estabelecimento limita o custo total de bcrypt de um estabelecimento, mas é
+# compartilhada por todos os seus usuários: um ataque distribuído em muitos IPs e emails que a
+# esgote bloqueia o login de todo o estabelecimento por até JANELA_LOGIN segundos. Para reduzir
+# esse risco, logins bem-sucedidos devolvem a sua vaga (limpar_tentativas_email), de modo que
+# apenas tentativas que falharam a ocupam. LIMITE_LOGIN_ESTABELECIMENTO deve ficar bem acima do
+# volume de falhas legítimas no horário de pico; com 0, a proteção de CPU fica apenas com as
+# janelas de IP e email e com o pool limitado do bcrypt (503).
+JANELA = float(os.getenv("JANELA_LOGIN", "300"))
+LIMITES = {
+    "ip": int(os.getenv("LIMITE_LOGIN_IP", "20")),
+    "email": int(os.getenv("LIMITE_LOGIN_EMAIL", "5")),
+    "estabelecimento": int(os.getenv("LIMITE_LOGIN_ESTABELECIMENTO", "300")),
+}
+MAX_CHAVES = int(os.getenv("LIMITE_LOGIN_MAX_CHAVES", "100000"))
+# Com LIMITE_LOGIN_REDIS_URL definida (e o pacote redis instalado), as janelas ficam no Redis
+# e valem para todos os workers; caso contrário, cada processo mantém as suas em memória.
+REDIS_URL = os.getenv("LIMITE_LOGIN_REDIS_URL")
+
+_contadores = {"admitidas": 0, "recusadas": {dimensao: 0 for dimensao in LIMITES}}
+_lock_contadores = threading.Lock()
+
+
+class _JanelasMemoria:
+    """
+    Janelas em memória do processo: um deque com os instantes das tentativas admitidas por chave.
+    """
+
+    def __init__(self):
+        self._janelas = CacheLRU(MAX_CHAVES, JANELA)
+        self._lock = threading.Lock()
+
+    def admitir(self, chaves: dict):
+        agora = time.monotonic()
+        with self._lock:
+            janelas = {}
+            for dimensao, chave in chaves.items():
+                janela = self._janelas.obter(chave) or deque()
+                while janela and janela[0] <= agora - JANELA:
+                    janela.popleft()
+                if len(janela) >= LIMITES[dimensao]:
+                    return dimensao, janela[0] + JANELA - agora
+                janelas[chave] = janela
+            for chave, janela in janelas.items():
+                janela.append(agora)
+                self._janelas.gravar(chave, janela)
+            return None, 0
+
+    def descontar(self, chave):
+        with self._lock:
+            janela = self._janelas.obter(chave)
+            if janela:
+                janela.pop()
+
+    def limpar(self, chave):
+        self._janelas.remover(chave)
+
+    def limpar_tudo(self):
+        self._janelas.limpar()
+
+
+class _JanelasRedis:
+    """
+    Janelas compartilhadas no Redis: um sorted set por chave, com o instante de cada tentativa
+    admitida como score.
+
+    A verificação e o registro de todas as chaves de uma tentativa são feitos por um único
+    script Lua (_ADMITIR), executado de forma atômica pelo Redis: entre a contagem e a inserção,
+    nenhuma tentativa de outro worker é admitida, então o limite não é ultrapassado por
+    tentativas concorrentes.
+    """
+
+    # KEYS: sorted sets de cada dimensão, na ordem de LIMITES.
+    # ARGV: agora, JANELA, membro da tentativa e o limite de cada chave.
+    # Retorna {0, '0'} se admitida, ou {posição da chave que recusou, espera em segundos}.
+    _ADMITIR = """
+    local agora = tonumber(ARGV[1])
+    local janela = tonumber(ARGV[2])
+    for i, nome in ipairs(KEYS) do
+        redis.call('ZREMRANGEBYSCORE', nome, '-inf', agora - janela)
+        if redis.call('ZCARD', nome) >= tonumber(ARGV[3 + i]) then
+            local mais_antiga = redis.call('ZRANGE', nome, 0, 0, 'WITHSCORES')
+            local espera = janela
+            if mais_antiga[2] then
+                espera = tonumber(mais_antiga[2]) + janela - agora
+            end
+            return {i, tostring(espera)}
+        end
+    end
+    for _, nome in ipairs(KEYS) do
+        redis.call('ZADD', nome, agora, ARGV[3])
+        redis.call('EXPIRE', nome, math.floor(janela) + 1)
+    end
+    return {0, '0'}
+    """
+
+    def __init__(self, url: str):
+        self._redis = redis.Redis.from_url(url)
+        self._admitir = self._redis.register_script(self._ADMITIR)
+
+    @staticmethod
+    def _nome(chave) -> str:
+        return "limite_login:" + ":".join(chave)
+
+    def admitir(self, chaves: dict):
+        # Relógio de parede: o monotônico não é comparável entre processos ou máquinas
+        agora = time.time()
+        dimensoes = list(chaves)
+        posicao, espera = self._admitir(
+            keys=[self._nome(chaves[dimensao]) for dimensao in dimensoes],
+            args=[repr(agora), repr(JANELA), uuid.uuid4().hex] + [LIMITES[dimensao] for dimensao in dimensoes]
+        )
+        if int(posicao) == 0:
+            return None, 0
+        return dimensoes[int(posicao) - 1], float(espera)
+
+    def descontar(self, chave):
+        self._redis.zpopmax(self._nome(chave))
+
+    def limpar(self, chave):
+        self._redis.delete(self._nome(chave))
+
+    def limpar_tudo(self):
+        for nome in self._redis.scan_iter("limite_login:*"):
+            self._redis.delete(nome)
+
+
+_janelas = _JanelasRedis(REDIS_URL) if REDIS_URL and redis is not None else _JanelasMemoria()
+
+def _chaves(ip: str, email: str, estabelecimento_id: str) -> dict:
+    estabelecimento_id = str(estabelecimento_id)
+    return {
+        "ip": ("ip", str(ip or "")),
+        "email": ("email", estabelecimento_id, (email or "").strip().lower()),
+        "estabelecimento": ("estabelecimento", estabelecimento_id),
+    }
+
+
+def _chaves_dono(ip: str, email: str) -> dict:
+    # O estabelecimento do dono só é conhecido após a autenticação: as tentativas dos donos
+    # usam apenas as janelas do IP e do email, este em um espaço próprio
+    return {
+        "ip": ("ip", str(ip or "")),
+        "email": ("dono", (email or "").strip().lower()),
+    }
+
+
+def _admitir(chaves: dict):
+    try:
+        chaves = {dimensao: chave for dimensao, chave in chaves.items() if LIMITES[dimensao] > 0}
+        dimensao, espera = _janelas.admitir(chaves) if chaves else (None, 0)
+    except Exception:
+        # Falha no armazenamento compartilhado não bloqueia o login
+        dimensao, espera = None, 0
+
+    with _lock_contadores:
+        if dimensao is None:
+            _contadores["admitidas"] += 1
+        else:
+            _contadores["recusadas"][dimensao] += 1
+
+    if dimensao is None:
+        return True, 0
+    return False, max(1, int(espera + 0.999))
+
+
+def admitir_tentativa_login(ip: str, email: str, estabelecimento_id: str):
+    """
+    Verifica, antes de qualquer consulta ao banco ou ao bcrypt, se a tentativa de login cabe nas
+    janelas do IP, do email (no estabelecimento) e do estabelecimento, e a registra se couber.
+
+    Parameters:
+        ip (str): Endereço do cliente.
+        email (str): Login informado.
+        estabelecimento_id (str): ID do estabelecimento.
+
+    Returns:
+        tuple: (True, 0) se a tentativa for admitida,
+               (False, segundos) com o tempo até a janela que a recusou liberar uma vaga.
+    """
+    return _admitir(_chaves(ip, email, estabelecimento_id))
+
+
+def admitir_tentativa_login_dono(ip: str, email: str):
+    """
+    Equivalente a admitir_tentativa_login para o login do dono do estabelecimento, limitado
+    apenas pelas janelas do IP e do email.
+
+    Parameters:
+        ip (str): Endereço do cliente.
+        email (str): Login informado.
+
+    Returns:
+        tuple: (True, 0) se a tentativa for admitida,
+               (False, segundos) com o tempo até a janela que a recusou liberar uma vaga.
+    """
+    return _admitir(_chaves_dono(ip, email))
+
+
+def limpar_tentativas_email(email: str, estabelecimento_id: str):
+    """
+    Zera a janela do email após um login bem-sucedido, para que erros anteriores do próprio
+    usuário não o bloqueiem, e devolve à janela do estabelecimento a vaga ocupada pelo login
+    (a tentativa mais recente da janela). A janela do IP é mantida.
+    """
+    chaves = _chaves(None, email, estabelecimento_id)
+    try:
+        _janelas.limpar(chaves["email"])
+        if LIMITES["estabelecimento"] > 0:
+            _janelas.descontar(chaves["estabelecimento"])
+    except Exception:
+        pass
+
+
+def limpar_tentativas_dono(email: str):
+    """
+    Zera a janela do email do dono após um login bem-sucedido. A janela do IP é mantida.
+    """
+    try:
+        _janelas.limpar(_chaves_dono(None, email)["email"])
+    except Exception:
+        pass
+
+
+def estatisticas_login() -> dict:
+    """
+    Retorna os contadores de tentativas de login admitidas e recusadas (por dimensão).
+    """
+    with _lock_contadores:
+        return {
+            "admitidas": _contadores["admitidas"],
+            "recusadas": dict(_contadores["recusadas"]),
+            "armazenamento": "redis" if isinstance(_janelas, _JanelasRedis) else "memoria",
+        }
+
+
+def limpar_limitador_login():
+    """
+    Descarta todas as janelas e zera os contadores.
+    """
+    _janelas.limpar_tudo()
+    with _lock_contadores:
+        _contadores["admitidas"] = 0
+        _contadores["recusadas"] = {dimensao: 0 for dimensao in LIMITES}
\ No newline at end of file
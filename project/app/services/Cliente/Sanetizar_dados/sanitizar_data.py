@@ -22,4 +22,40 @@ def verificar_data(data_input: str) -> bool:
     
     if hoje.date() <= data.date() <= limite.date():
         return True
-    return False
\ No newline at end of file
+    return False
+
+
+def verificar_periodo(data_inicial: str, data_final: str) -> bool:
+    """
+    Recebe duas datas como string e verifica se:
+      1. Ambas são válidas segundo verificar_data (formato e janela de 30 dias).
+      2. A data inicial não é posterior à data final.
+    
+    Parâmetros:
+        data_inicial (str): Primeira data do período em formato 'YYYY-MM-DD'.
+        data_final (str): Última data do período em formato 'YYYY-MM-DD'.
+        
+    Retorna:
+        bool: True se o período for válido, False caso contrário.
+    """
+    if not (verificar_data(data_inicial) and verificar_data(data_final)):
+        return False
+    return datetime.strptime(data_inicial, "%Y-%m-%d") <= datetime.strptime(data_final, "%Y-%m-%d")
+
+
+def verificar_formato_data(data_input: str) -> bool:
+    """
+    Recebe uma data como string e verifica apenas se ela é válida no formato 'YYYY-MM-DD',
+    sem restrição de intervalo (usada em consultas de períodos passados, como exportações).
+    
+    Parâmetros:
+        data_input (str): Data em formato 'YYYY-MM-DD'.
+        
+    Retorna:
+        bool: True se a data for válida, False caso contrário.
+    """
+    try:
+        datetime.strptime(data_input, "%Y-%m-%d")
+    except (TypeError, ValueError):
+        return False
+    return True
\ No newline at end of file
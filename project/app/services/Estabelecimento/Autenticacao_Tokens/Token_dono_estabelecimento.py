@@ -0,0 +1,63 @@
+import os
+import jwt
+from datetime import datetime, timedelta, timezone
+from dotenv import load_dotenv
+from ...Cliente.Cache.Cache_estabelecimentos import estabelecimento_existe
+
+load_dotenv()
+
+# O token do dono é assinado com uma chave própria (SECRET_KEY_DONO_ESTABELECIMENTO). O JWT
+# do estabelecimento emitido por /api/redirecionamento_inicial, obtido sem senha por qualquer
+# visitante, não é aceito no lugar dele.
+TIPO = "dono_estabelecimento"
+
+def gerar_jwt_dono_estabelecimento(estabelecimento_id: str, exp_minutes: int = 60) -> str:
+    """
+    Gera o JWT do dono do estabelecimento, após a autenticação por email e senha.
+
+    Parameters:
+        estabelecimento_id (str): O ID do estabelecimento.
+        exp_minutes (int, optional): Tempo de expiração em minutos (padrão 60).
+
+    Returns:
+        str: O token JWT.
+    """
+    secret = os.getenv("SECRET_KEY_DONO_ESTABELECIMENTO")
+    if not secret:
+        raise ValueError("SECRET_KEY_DONO_ESTABELECIMENTO não está definida nas variáveis de ambiente.")
+
+    payload = {
+        "id": estabelecimento_id,
+        "tipo": TIPO,
+        "exp": datetime.now(timezone.utc) + timedelta(minutes=exp_minutes)
+    }
+    return jwt.encode(payload, secret, algorithm="HS256")
+
+
+def validar_token_dono_estabelecimento(token: str):
+    """
+    Descriptografa o JWT do dono do estabelecimento com a chave SECRET_KEY_DONO_ESTABELECIMENTO
+    e verifica o tipo do token e a existência do estabelecimento.
+
+    Parameters:
+        token (str): Token JWT a ser validado.
+
+    Returns:
+        tuple: (True, estabelecimento_id) se o token for válido e o estabelecimento existir.
+        bool: False caso a validação falhe.
+    """
+    secret = os.getenv("SECRET_KEY_DONO_ESTABELECIMENTO")
+    if not secret:
+        return False
+
+    try:
+        payload = jwt.decode(token, secret, algorithms=["HS256"])
+        estabelecimento_id = payload.get("id")
+        if not estabelecimento_id or payload.get("tipo") != TIPO:
+            return False
+    except Exception:
+        return False
+
+    if estabelecimento_existe(estabelecimento_id):
+        return True, estabelecimento_id
+    return False
\ No newline at end of file
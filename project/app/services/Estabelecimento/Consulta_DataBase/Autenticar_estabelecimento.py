@@ -0,0 +1,38 @@
+import bcrypt
+from app.models.models import Estabelecimento
+from app.extensions import db
+from ...Cliente.Hashe_senha.Executor_bcrypt import executar_bcrypt
+
+def autenticar_estabelecimento(email: str, senha: str):
+    """
+    Autentica o dono do estabelecimento pelo email de login e pela senha.
+
+    Busca apenas o ID e o hash da senha do estabelecimento com o email informado e compara a
+    senha com bcrypt.checkpw, no pool dedicado do bcrypt (Executor_bcrypt).
+
+    Parameters:
+        email (str): Email de login do estabelecimento.
+        senha (str): A senha em texto puro.
+
+    Returns:
+        tuple: (True, estabelecimento_id) se o email existir e a senha estiver correta.
+        bool: False se o email não existir ou a senha estiver incorreta.
+        None: Se o pool do bcrypt estiver sobrecarregado ou a verificação exceder o tempo limite.
+    """
+    estabelecimento = db.session.query(Estabelecimento.id, Estabelecimento.senha_hash).filter(
+        Estabelecimento.email_login == email,
+        Estabelecimento.deleted.is_(False)
+    ).first()
+    if not estabelecimento:
+        return False
+
+    hash_senha = estabelecimento.senha_hash
+    hash_bytes = hash_senha.encode('utf-8') if isinstance(hash_senha, str) else hash_senha
+    try:
+        valida = executar_bcrypt(bcrypt.checkpw, senha.encode('utf-8'), hash_bytes)
+    except ValueError:
+        # Hash armazenado em formato inválido
+        return False
+    if valida is None:
+        return None
+    return (True, str(estabelecimento.id)) if valida else False
\ No newline at end of file
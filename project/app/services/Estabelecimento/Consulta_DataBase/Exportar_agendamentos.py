@@ -0,0 +1,132 @@
+import os
+import io
+import csv
+import json
+from dotenv import load_dotenv
+from sqlalchemy import select, func
+from sqlalchemy.dialects.postgresql import aggregate_order_by
+from app.models.models import Agendamento, Cliente, Colaborador, Servico, agendamento_servico
+from app.extensions import db
+
+load_dotenv()
+
+# Linhas lidas do cursor do servidor por vez; também é o tamanho de cada bloco enviado ao cliente
+LOTE_EXPORTACAO = int(os.getenv("LOTE_EXPORTACAO_AGENDAMENTOS", "500"))
+
+STATUS_AGENDAMENTO = ("confirmado", "pendente", "cancelado", "concluído")
+FORMATOS = {"ndjson": "application/x-ndjson", "csv": "text/csv"}
+COLUNAS = ("id", "data", "horas", "duracao", "status", "cliente", "colaborador", "servicos")
+# Planilhas interpretam como fórmula células de texto que começam com estes caracteres
+INICIOS_FORMULA = ("=", "+", "-", "@", "\t", "\r")
+
+def _consulta(estabelecimento_id: str, data_inicio: str = None, data_fim: str = None, status: str = None):
+    # Uma linha por agendamento, com os nomes do cliente, do colaborador e dos serviços
+    # resolvidos na mesma consulta
+    servicos = func.array_agg(
+        aggregate_order_by(Servico.nome, Servico.nome)
+    ).filter(Servico.id.isnot(None))
+
+    consulta = select(
+        Agendamento.id, Agendamento.data, Agendamento.horas, Agendamento.duracao, Agendamento.status,
+        Cliente.nome.label("cliente"),
+        Colaborador.nome.label("colaborador"),
+        servicos.label("servicos")
+    ).join(
+        Cliente, Cliente.id == Agendamento.cliente_id
+    ).join(
+        Colaborador, Colaborador.id == Agendamento.colaborador_id
+    ).outerjoin(
+        agendamento_servico, agendamento_servico.c.agendamento_id == Agendamento.id
+    ).outerjoin(
+        Servico, Servico.id == agendamento_servico.c.servico_id
+    ).where(
+        Agendamento.estabelecimento_id == estabelecimento_id,
+        Agendamento.deleted.is_(False)
+    )
+    if data_inicio:
+        consulta = consulta.where(Agendamento.data >= data_inicio)
+    if data_fim:
+        consulta = consulta.where(Agendamento.data <= data_fim)
+    if status:
+        consulta = consulta.where(Agendamento.status == status)
+
+    return consulta.group_by(
+        Agendamento.id, Cliente.nome, Colaborador.nome
+    ).order_by(Agendamento.data, Agendamento.id)
+
+
+def _registro(linha) -> dict:
+    return {
+        "id": str(linha.id),
+        "data": linha.data.isoformat(),
+        "horas": [h.strftime("%H:%M:%S") for h in linha.horas or []],
+        "duracao": linha.duracao,
+        "status": linha.status,
+        "cliente": linha.cliente,
+        "colaborador": linha.colaborador,
+        "servicos": linha.servicos or []
+    }
+
+
+def _bloco_ndjson(linhas) -> str:
+    return "".join(json.dumps(_registro(linha), ensure_ascii=False) + "\n" for linha in linhas)
+
+
+def _celula_csv(valor):
+    # Nomes de clientes, colaboradores e serviços são informados por usuários: um texto como
+    # '=HYPERLINK(...)' é exportado com um apóstrofo na frente, para ser exibido como texto
+    if isinstance(valor, str) and valor.startswith(INICIOS_FORMULA):
+        return "'" + valor
+    return valor
+
+
+def _bloco_csv(linhas, cabecalho: bool = False) -> str:
+    buffer = io.StringIO()
+    escritor = csv.writer(buffer)
+    if cabecalho:
+        escritor.writerow(COLUNAS)
+    for linha in linhas:
+        registro = _registro(linha)
+        registro["horas"] = " ".join(registro["horas"])
+        registro["servicos"] = ", ".join(registro["servicos"])
+        escritor.writerow([_celula_csv(registro[coluna]) for coluna in COLUNAS])
+    return buffer.getvalue()
+
+
+def exportar_agendamentos(estabelecimento_id: str, formato: str, data_inicio: str = None,
+                          data_fim: str = None, status: str = None):
+    """
+    Gera, em blocos de texto, a exportação dos agendamentos do estabelecimento em NDJSON
+    (um objeto JSON por linha) ou CSV (com cabeçalho), em ordem de data. No CSV, células de
+    texto que começam com '=', '+', '-', '@', tabulação ou retorno de carro recebem um
+    apóstrofo na frente, para não serem executadas como fórmula pela planilha.
+
+    As linhas são lidas por um cursor do servidor (yield_per), LOTE_EXPORTACAO de cada vez, e
+    cada lote é convertido e entregue antes do próximo ser lido: a memória usada não depende
+    da quantidade de agendamentos exportados. A consulta só é executada quando o primeiro
+    bloco é pedido, então o gerador deve ser consumido dentro do contexto da requisição
+    (stream_with_context).
+
+    Parameters:
+        estabelecimento_id (str): ID do estabelecimento.
+        formato (str): "ndjson" ou "csv" (chaves de FORMATOS).
+        data_inicio (str): Data inicial 'YYYY-MM-DD' (opcional).
+        data_fim (str): Data final 'YYYY-MM-DD' (opcional).
+        status (str): Status dos agendamentos (opcional, um de STATUS_AGENDAMENTO).
+
+    Yields:
+        str: Bloco de linhas já formatadas.
+    """
+    if formato == "csv":
+        yield _bloco_csv([], cabecalho=True)
+
+    resultado = db.session.execute(
+        _consulta(estabelecimento_id, data_inicio, data_fim, status),
+        execution_options={"yield_per": LOTE_EXPORTACAO}
+    )
+    try:
+        for linhas in resultado.partitions():
+            yield _bloco_csv(linhas) if formato == "csv" else _bloco_ndjson(linhas)
+    finally:
+        # Libera o cursor do servidor também quando o cliente interrompe o download
+        resultado.close()
\ No newline at end of file
@@ -0,0 +1,77 @@
+"""substitui array horarios por bitmap de disponibilidade
+
+Revision ID: 4c7e1a9d2b3f
+Revises: 9282d4153d04
+Create Date: 2026-10-18 09:12:40.318205
+
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+# revision identifiers, used by Alembic.
+revision = '4c7e1a9d2b3f'
+down_revision = '9282d4153d04'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    with op.batch_alter_table('horarios', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('disponibilidade', postgresql.BIT(varying=True), nullable=True))
+
+    # Registros antigos sem grade definida: deduz horario_inicial a partir do primeiro
+    # horário livre do array e horario_final a partir do tamanho do array.
+    op.execute("""
+        UPDATE horarios h
+           SET horario_inicial = (
+                   SELECT t.hora - ((t.ordem - 1) * h.menor_time) * INTERVAL '1 minute'
+                     FROM unnest(h.horarios) WITH ORDINALITY AS t(hora, ordem)
+                    WHERE t.hora <> TIME '00:00:00'
+                    ORDER BY t.ordem
+                    LIMIT 1
+               )
+         WHERE h.horario_inicial IS NULL
+    """)
+    op.execute("""
+        UPDATE horarios h
+           SET horario_final = h.horario_inicial
+                   + ((coalesce(array_length(h.horarios, 1), 1) - 1) * h.menor_time) * INTERVAL '1 minute'
+         WHERE h.horario_final IS NULL
+           AND h.horario_inicial IS NOT NULL
+    """)
+
+    # Cada posição do array vira um bit: '0' para os horários bloqueados (00:00:00), '1' para os livres
+    op.execute("""
+        UPDATE horarios h
+           SET disponibilidade = coalesce((
+                   SELECT string_agg(CASE WHEN t.hora = TIME '00:00:00' THEN '0' ELSE '1' END, '' ORDER BY t.ordem)
+                     FROM unnest(h.horarios) WITH ORDINALITY AS t(hora, ordem)
+               ), '')::varbit
+    """)
+
+    with op.batch_alter_table('horarios', schema=None) as batch_op:
+        batch_op.alter_column('disponibilidade', nullable=False)
+        batch_op.drop_column('horarios')
+
+
+def downgrade():
+    with op.batch_alter_table('horarios', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('horarios', postgresql.ARRAY(sa.Time()), autoincrement=False, nullable=True))
+
+    op.execute("""
+        UPDATE horarios h
+           SET horarios = ARRAY(
+                   SELECT CASE
+                              WHEN substring(h.disponibilidade::text, i + 1, 1) = '1'
+                              THEN h.horario_inicial + (i * h.menor_time) * INTERVAL '1 minute'
+                              ELSE TIME '00:00:00'
+                          END
+                     FROM generate_series(0, length(h.disponibilidade) - 1) AS i
+                    ORDER BY i
+               )::time[]
+    """)
+
+    with op.batch_alter_table('horarios', schema=None) as batch_op:
+        batch_op.alter_column('horarios', nullable=False)
+        batch_op.drop_column('disponibilidade')
@@ -0,0 +1,48 @@
+"""adiciona periodo e restricao de exclusao em agendamentos
+
+Revision ID: 7a2e94c15f60
+Revises: d81f3b6a0c25
+Create Date: 2026-10-18 13:41:52.207963
+
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision = '7a2e94c15f60'
+down_revision = 'd81f3b6a0c25'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # Necessária para usar '=' sobre uuid em um índice GiST
+    op.execute('CREATE EXTENSION IF NOT EXISTS btree_gist')
+
+    with op.batch_alter_table('agendamentos', schema=None) as batch_op:
+        batch_op.add_column(sa.Column(
+            'periodo',
+            postgresql.TSRANGE(),
+            sa.Computed("tsrange(data + horas[1], data + horas[1] + duracao * interval '1 minute', '[)')"),
+            nullable=True
+        ))
+
+    # Falha se já existirem agendamentos ativos sobrepostos para o mesmo colaborador;
+    # eles precisam ser resolvidos antes de aplicar esta migration.
+    op.create_exclude_constraint(
+        'agendamentos_colaborador_periodo_excl',
+        'agendamentos',
+        ('colaborador_id', '='),
+        ('periodo', '&&'),
+        where="status <> 'cancelado' AND NOT deleted",
+        using='gist'
+    )
+
+
+def downgrade():
+    op.drop_constraint('agendamentos_colaborador_periodo_excl', 'agendamentos', type_='exclude')
+
+    with op.batch_alter_table('agendamentos', schema=None) as batch_op:
+        batch_op.drop_column('periodo')
@@ -0,0 +1,32 @@
+"""adiciona versao em horarios e agendamentos
+
+Revision ID: d81f3b6a0c25
+Revises: 4c7e1a9d2b3f
+Create Date: 2026-10-18 11:03:27.846115
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'd81f3b6a0c25'
+down_revision = '4c7e1a9d2b3f'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    with op.batch_alter_table('horarios', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('versao', sa.Integer(), server_default='1', nullable=False))
+
+    with op.batch_alter_table('agendamentos', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('versao', sa.Integer(), server_default='1', nullable=False))
+
+
+def downgrade():
+    with op.batch_alter_table('agendamentos', schema=None) as batch_op:
+        batch_op.drop_column('versao')
+
+    with op.batch_alter_table('horarios', schema=None) as batch_op:
+        batch_op.drop_column('versao')
@@ -2,6 +2,7 @@ import pytest
 from unittest.mock import patch
 from flask import Flask, json
 from project.app.controllers.Endpoints.Cliente.autenticar_user import autenticar_user_bp
+from project.app.services.Cliente.Limite_login.Limitador_login import limpar_limitador_login
 
 # Arquivo de testes para o endpoint de autenticação de usuários
 
@@ -24,6 +25,15 @@ def client(app):
     """
     return app.test_client()
 
+@pytest.fixture(autouse=True)
+def limitador_limpo():
+    """
+    Fixture que zera as janelas do limite de tentativas de login entre os testes
+    """
+    limpar_limitador_login()
+    yield
+    limpar_limitador_login()
+
 def test_autenticar_user_success(client):
     """
     Teste do cenário de sucesso na autenticação com credenciais válidas
@@ -36,15 +46,15 @@ def test_autenticar_user_success(client):
     - Um token JWT é gerado corretamente
     """
     # Configura todos os mocks necessários para simular um fluxo de autenticação bem-sucedido
-    with patch('project.app.controllers.Endpoints.Cliente.autenticar_user.verificar_token_fernet', return_value=True), \
-         patch('project.app.controllers.Endpoints.Cliente.autenticar_user.verificar_token_jwt', return_value=True), \
-         patch('project.app.controllers.Endpoints.Cliente.autenticar_user.validar_token_autenticar_user', return_value=True), \
-         patch('project.app.controllers.Endpoints.Cliente.autenticar_user.validar_token_id_estabelecimento', return_value=(True, "123")), \
+    with patch('project.app.controllers.Middlewares.autenticacao_cliente.verificar_token_fernet', return_value=True), \
+         patch('project.app.controllers.Middlewares.autenticacao_cliente.validar_token_escopo', return_value=True), \
+         patch('project.app.controllers.Middlewares.autenticacao_cliente.validar_token_id_estabelecimento', return_value=(True, "123")), \
          patch('project.app.controllers.Endpoints.Cliente.autenticar_user.verificar_email', return_value=True), \
          patch('project.app.controllers.Endpoints.Cliente.autenticar_user.verificar_senha', return_value=True), \
          patch('project.app.controllers.Endpoints.Cliente.autenticar_user.consultar_id_user', return_value=(True, "456")), \
          patch('project.app.controllers.Endpoints.Cliente.autenticar_user.autenticar_senha', return_value=True), \
-         patch('project.app.controllers.Endpoints.Cliente.autenticar_user.gerar_jwt_id_estabelecimento', return_value="mock-jwt-token"):
+         patch('project.app.controllers.Endpoints.Cliente.autenticar_user.gerar_jwt_id_estabelecimento', return_value="mock-jwt-token"), \
+         patch('project.app.controllers.Endpoints.Cliente.autenticar_user.emitir_token_refresh', return_value="mock-refresh-token"):
         
         # Prepara os dados para o teste: cabeçalhos com tokens válidos
         headers = {
@@ -95,7 +105,7 @@ def test_autenticar_user_invalid_tokens(client):
     verificando se o endpoint rejeita corretamente a requisição
     """
     # Simula a verificação do token Fernet retornando falso (token inválido)
-    with patch('project.app.controllers.Endpoints.Cliente.autenticar_user.verificar_token_fernet', return_value=False):
+    with patch('project.app.controllers.Middlewares.autenticacao_cliente.verificar_token_fernet', return_value=False):
         headers = {
             'Authorization': 'invalid-token',
             'token-estabelecimento': 'some-token'
@@ -114,10 +124,9 @@ def test_autenticar_user_missing_credentials(client):
     não contém os campos de login e senha necessários
     """
     # Configura os mocks para simular tokens válidos
-    with patch('project.app.controllers.Endpoints.Cliente.autenticar_user.verificar_token_fernet', return_value=True), \
-         patch('project.app.controllers.Endpoints.Cliente.autenticar_user.verificar_token_jwt', return_value=True), \
-         patch('project.app.controllers.Endpoints.Cliente.autenticar_user.validar_token_autenticar_user', return_value=True), \
-         patch('project.app.controllers.Endpoints.Cliente.autenticar_user.validar_token_id_estabelecimento', return_value=(True, "123")):
+    with patch('project.app.controllers.Middlewares.autenticacao_cliente.verificar_token_fernet', return_value=True), \
+         patch('project.app.controllers.Middlewares.autenticacao_cliente.validar_token_escopo', return_value=True), \
+         patch('project.app.controllers.Middlewares.autenticacao_cliente.validar_token_id_estabelecimento', return_value=(True, "123")):
         
         # Prepara cabeçalhos válidos
         headers = {
@@ -142,10 +151,9 @@ def test_autenticar_user_invalid_email(client):
     fornecido tem um formato inválido
     """
     # Configura os mocks para simular tokens válidos, mas email inválido
-    with patch('project.app.controllers.Endpoints.Cliente.autenticar_user.verificar_token_fernet', return_value=True), \
-         patch('project.app.controllers.Endpoints.Cliente.autenticar_user.verificar_token_jwt', return_value=True), \
-         patch('project.app.controllers.Endpoints.Cliente.autenticar_user.validar_token_autenticar_user', return_value=True), \
-         patch('project.app.controllers.Endpoints.Cliente.autenticar_user.validar_token_id_estabelecimento', return_value=(True, "123")), \
+    with patch('project.app.controllers.Middlewares.autenticacao_cliente.verificar_token_fernet', return_value=True), \
+         patch('project.app.controllers.Middlewares.autenticacao_cliente.validar_token_escopo', return_value=True), \
+         patch('project.app.controllers.Middlewares.autenticacao_cliente.validar_token_id_estabelecimento', return_value=(True, "123")), \
          patch('project.app.controllers.Endpoints.Cliente.autenticar_user.verificar_email', return_value=False):
         
         # Prepara cabeçalhos válidos
@@ -176,10 +184,9 @@ def test_autenticar_user_user_not_found(client):
     no banco de dados, mesmo com email e senha em formato válido
     """
     # Configura os mocks para simular usuário não encontrado
-    with patch('project.app.controllers.Endpoints.Cliente.autenticar_user.verificar_token_fernet', return_value=True), \
-         patch('project.app.controllers.Endpoints.Cliente.autenticar_user.verificar_token_jwt', return_value=True), \
-         patch('project.app.controllers.Endpoints.Cliente.autenticar_user.validar_token_autenticar_user', return_value=True), \
-         patch('project.app.controllers.Endpoints.Cliente.autenticar_user.validar_token_id_estabelecimento', return_value=(True, "123")), \
+    with patch('project.app.controllers.Middlewares.autenticacao_cliente.verificar_token_fernet', return_value=True), \
+         patch('project.app.controllers.Middlewares.autenticacao_cliente.validar_token_escopo', return_value=True), \
+         patch('project.app.controllers.Middlewares.autenticacao_cliente.validar_token_id_estabelecimento', return_value=(True, "123")), \
          patch('project.app.controllers.Endpoints.Cliente.autenticar_user.verificar_email', return_value=True), \
          patch('project.app.controllers.Endpoints.Cliente.autenticar_user.verificar_senha', return_value=True), \
          patch('project.app.controllers.Endpoints.Cliente.autenticar_user.consultar_id_user', return_value=False):
@@ -212,10 +219,9 @@ def test_autenticar_user_wrong_password(client):
     mas a senha fornecida não corresponde à senha armazenada
     """
     # Configura os mocks para simular senha incorreta
-    with patch('project.app.controllers.Endpoints.Cliente.autenticar_user.verificar_token_fernet', return_value=True), \
-         patch('project.app.controllers.Endpoints.Cliente.autenticar_user.verificar_token_jwt', return_value=True), \
-         patch('project.app.controllers.Endpoints.Cliente.autenticar_user.validar_token_autenticar_user', return_value=True), \
-         patch('project.app.controllers.Endpoints.Cliente.autenticar_user.validar_token_id_estabelecimento', return_value=(True, "123")), \
+    with patch('project.app.controllers.Middlewares.autenticacao_cliente.verificar_token_fernet', return_value=True), \
+         patch('project.app.controllers.Middlewares.autenticacao_cliente.validar_token_escopo', return_value=True), \
+         patch('project.app.controllers.Middlewares.autenticacao_cliente.validar_token_id_estabelecimento', return_value=(True, "123")), \
          patch('project.app.controllers.Endpoints.Cliente.autenticar_user.verificar_email', return_value=True), \
          patch('project.app.controllers.Endpoints.Cliente.autenticar_user.verificar_senha', return_value=True), \
          patch('project.app.controllers.Endpoints.Cliente.autenticar_user.consultar_id_user', return_value=(True, "456")), \
@@ -239,4 +245,151 @@ def test_autenticar_user_wrong_password(client):
         assert json.loads(response.data) == {
             "status": "error",
             "message": "Erro ao autenticar user"
-        }
\ No newline at end of file
+        }
+
+def test_autenticar_user_bcrypt_sobrecarregado(client):
+    """
+    Teste de recusa rápida quando o pool do bcrypt está sobrecarregado
+
+    Verifica se o endpoint retorna 503 com 'Retry-After' quando a verificação
+    da senha é recusada (autenticar_senha retorna None) e não gera tokens
+    """
+    with patch('project.app.controllers.Middlewares.autenticacao_cliente.verificar_token_fernet', return_value=True), \
+         patch('project.app.controllers.Middlewares.autenticacao_cliente.validar_token_escopo', return_value=True), \
+         patch('project.app.controllers.Middlewares.autenticacao_cliente.validar_token_id_estabelecimento', return_value=(True, "123")), \
+         patch('project.app.controllers.Endpoints.Cliente.autenticar_user.verificar_email', return_value=True), \
+         patch('project.app.controllers.Endpoints.Cliente.autenticar_user.verificar_senha', return_value=True), \
+         patch('project.app.controllers.Endpoints.Cliente.autenticar_user.consultar_id_user', return_value=(True, "456")), \
+         patch('project.app.controllers.Endpoints.Cliente.autenticar_user.autenticar_senha', return_value=None), \
+         patch('project.app.controllers.Endpoints.Cliente.autenticar_user.gerar_jwt_id_estabelecimento') as mock_gerar:
+
+        client.set_cookie('token_estabelecimento', 'valid-jwt-token')
+        data = {
+            'login': 'test@example.com',
+            'senha': 'Valid123!'
+        }
+        response = client.post('/api/autenticar_user', headers={'Authorization': 'valid-fernet-token'}, json=data)
+
+        assert response.status_code == 503
+        assert response.headers['Retry-After'] == "1"
+        assert json.loads(response.data)["status"] == "error"
+        mock_gerar.assert_not_called()
+
+def test_autenticar_user_tentativas_recusadas(client):
+    """
+    Teste da recusa por excesso de tentativas
+
+    Verifica se o endpoint retorna 429 com 'Retry-After' e não consulta
+    o banco nem o bcrypt quando o limitador recusa a tentativa
+    """
+    with patch('project.app.controllers.Middlewares.autenticacao_cliente.verificar_token_fernet', return_value=True), \
+         patch('project.app.controllers.Middlewares.autenticacao_cliente.validar_token_escopo', return_value=True), \
+         patch('project.app.controllers.Middlewares.autenticacao_cliente.validar_token_id_estabelecimento', return_value=(True, "123")), \
+         patch('project.app.controllers.Endpoints.Cliente.autenticar_user.verificar_email', return_value=True), \
+         patch('project.app.controllers.Endpoints.Cliente.autenticar_user.verificar_senha', return_value=True), \
+         patch('project.app.controllers.Endpoints.Cliente.autenticar_user.admitir_tentativa_login', return_value=(False, 42)), \
+         patch('project.app.controllers.Endpoints.Cliente.autenticar_user.consultar_id_user') as mock_consulta, \
+         patch('project.app.controllers.Endpoints.Cliente.autenticar_user.autenticar_senha') as mock_senha:
+
+        client.set_cookie('token_estabelecimento', 'valid-jwt-token')
+        data = {
+            'login': 'test@example.com',
+            'senha': 'Valid123!'
+        }
+        response = client.post('/api/autenticar_user', headers={'Authorization': 'valid-fernet-token'}, json=data)
+
+        assert response.status_code == 429
+        assert response.headers['Retry-After'] == "42"
+        mock_consulta.assert_not_called()
+        mock_senha.assert_not_called()
+
+def test_autenticar_user_limite_por_email(client):
+    """
+    Teste do limite de tentativas por email
+
+    Verifica se, esgotado o limite de tentativas do email no estabelecimento,
+    as tentativas seguintes são recusadas antes da verificação da senha
+    """
+    from project.app.services.Cliente.Limite_login.Limitador_login import LIMITES
+
+    with patch('project.app.controllers.Middlewares.autenticacao_cliente.verificar_token_fernet', return_value=True), \
+         patch('project.app.controllers.Middlewares.autenticacao_cliente.validar_token_escopo', return_value=True), \
+         patch('project.app.controllers.Middlewares.autenticacao_cliente.validar_token_id_estabelecimento', return_value=(True, "123")), \
+         patch('project.app.controllers.Endpoints.Cliente.autenticar_user.verificar_email', return_value=True), \
+         patch('project.app.controllers.Endpoints.Cliente.autenticar_user.verificar_senha', return_value=True), \
+         patch('project.app.controllers.Endpoints.Cliente.autenticar_user.consultar_id_user', return_value=(True, "456")), \
+         patch('project.app.controllers.Endpoints.Cliente.autenticar_user.autenticar_senha', return_value=False) as mock_senha:
+
+        client.set_cookie('token_estabelecimento', 'valid-jwt-token')
+        data = {
+            'login': 'test@example.com',
+            'senha': 'WrongPassword'
+        }
+        status = [
+            client.post('/api/autenticar_user', headers={'Authorization': 'valid-fernet-token'}, json=data).status_code
+            for _ in range(LIMITES["email"] + 1)
+        ]
+
+        assert status == [401] * LIMITES["email"] + [429]
+        assert mock_senha.call_count == LIMITES["email"]
+
+def test_autenticar_user_falha_ao_emitir_token_refresh(client):
+    """
+    Teste do login quando a emissão do token de renovação falha
+
+    Verifica se o login continua bem-sucedido, sem o cookie 'token_refresh', e se a falha
+    é registrada no log e sinalizada no header 'X-Token-Refresh'
+    """
+    with patch('project.app.controllers.Middlewares.autenticacao_cliente.verificar_token_fernet', return_value=True), \
+         patch('project.app.controllers.Middlewares.autenticacao_cliente.validar_token_escopo', return_value=True), \
+         patch('project.app.controllers.Middlewares.autenticacao_cliente.validar_token_id_estabelecimento', return_value=(True, "123")), \
+         patch('project.app.controllers.Endpoints.Cliente.autenticar_user.verificar_email', return_value=True), \
+         patch('project.app.controllers.Endpoints.Cliente.autenticar_user.verificar_senha', return_value=True), \
+         patch('project.app.controllers.Endpoints.Cliente.autenticar_user.consultar_id_user', return_value=(True, "456")), \
+         patch('project.app.controllers.Endpoints.Cliente.autenticar_user.autenticar_senha', return_value=True), \
+         patch('project.app.controllers.Endpoints.Cliente.autenticar_user.gerar_jwt_id_estabelecimento', return_value="mock-jwt-token"), \
+         patch('project.app.controllers.Endpoints.Cliente.autenticar_user.emitir_token_refresh', return_value=False), \
+         patch.object(client.application.logger, 'warning') as mock_log:
+
+        client.set_cookie('token_estabelecimento', 'valid-jwt-token')
+        data = {
+            'login': 'test@example.com',
+            'senha': 'Valid123!'
+        }
+        response = client.post('/api/autenticar_user', headers={'Authorization': 'valid-fernet-token'}, json=data)
+
+        assert response.status_code == 200
+        assert response.headers['X-Token-Refresh'] == "indisponivel"
+        cookies = response.headers.getlist('Set-Cookie')
+        assert any(c.startswith('token_user=mock-jwt-token') for c in cookies)
+        assert not any(c.startswith('token_refresh=') for c in cookies)
+        mock_log.assert_called_once()
+
+def test_autenticar_user_define_cookie_refresh(client):
+    """
+    Teste do cookie 'token_refresh' emitido no login
+
+    Verifica se o cookie é restrito ao caminho de /api/renovar_token
+    """
+    with patch('project.app.controllers.Middlewares.autenticacao_cliente.verificar_token_fernet', return_value=True), \
+         patch('project.app.controllers.Middlewares.autenticacao_cliente.validar_token_escopo', return_value=True), \
+         patch('project.app.controllers.Middlewares.autenticacao_cliente.validar_token_id_estabelecimento', return_value=(True, "123")), \
+         patch('project.app.controllers.Endpoints.Cliente.autenticar_user.verificar_email', return_value=True), \
+         patch('project.app.controllers.Endpoints.Cliente.autenticar_user.verificar_senha', return_value=True), \
+         patch('project.app.controllers.Endpoints.Cliente.autenticar_user.consultar_id_user', return_value=(True, "456")), \
+         patch('project.app.controllers.Endpoints.Cliente.autenticar_user.autenticar_senha', return_value=True), \
+         patch('project.app.controllers.Endpoints.Cliente.autenticar_user.gerar_jwt_id_estabelecimento', return_value="mock-jwt-token"), \
+         patch('project.app.controllers.Endpoints.Cliente.autenticar_user.emitir_token_refresh', return_value="mock-refresh-token"):
+
+        client.set_cookie('token_estabelecimento', 'valid-jwt-token')
+        data = {
+            'login': 'test@example.com',
+            'senha': 'Valid123!'
+        }
+        response = client.post('/api/autenticar_user', headers={'Authorization': 'valid-fernet-token'}, json=data)
+
+        assert response.status_code == 200
+        assert 'X-Token-Refresh' not in response.headers
+        cookies = response.headers.getlist('Set-Cookie')
+        assert any(c.startswith('token_refresh=mock-refresh-token') and 'Path=/api/renovar_token' in c and 'HttpOnly' in c
+                   for c in cookies)
\ No newline at end of file
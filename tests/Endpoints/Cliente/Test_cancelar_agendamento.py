@@ -32,11 +32,10 @@ def test_cancelar_agendamento_sucesso(client):
     e o cancelamento no banco de dados ocorre com sucesso.
     Espera-se uma resposta 200 OK.
     """
-    with patch('project.app.controllers.Endpoints.Cliente.cancelar_agendamento.verificar_token_fernet', return_value=True) as mock_ver_fernet, \
-         patch('project.app.controllers.Endpoints.Cliente.cancelar_agendamento.verificar_token_jwt', return_value=True) as mock_ver_jwt, \
-         patch('project.app.controllers.Endpoints.Cliente.cancelar_agendamento.validar_token_cancelar_agendamento', return_value=True) as mock_val_token_cancel, \
-         patch('project.app.controllers.Endpoints.Cliente.cancelar_agendamento.validar_token_id_estabelecimento', return_value=(True, "est_id_123")) as mock_val_id_est, \
-         patch('project.app.controllers.Endpoints.Cliente.cancelar_agendamento.validar_token_id_user', return_value=(True, "user_id_456")) as mock_val_id_user, \
+    with patch('project.app.controllers.Middlewares.autenticacao_cliente.verificar_token_fernet', return_value=True) as mock_ver_fernet, \
+         patch('project.app.controllers.Middlewares.autenticacao_cliente.validar_token_escopo', return_value=True) as mock_val_token_cancel, \
+         patch('project.app.controllers.Middlewares.autenticacao_cliente.validar_token_id_estabelecimento', return_value=(True, "est_id_123")) as mock_val_id_est, \
+         patch('project.app.controllers.Middlewares.autenticacao_cliente.validar_token_id_user', return_value=(True, "user_id_456")) as mock_val_id_user, \
          patch('project.app.controllers.Endpoints.Cliente.cancelar_agendamento.verificar_id_agendamento', return_value=True) as mock_ver_id_ag, \
          patch('project.app.controllers.Endpoints.Cliente.cancelar_agendamento.cancelar_agendamento_db', return_value=True) as mock_cancel_db:
 
@@ -54,7 +53,6 @@ def test_cancelar_agendamento_sucesso(client):
 
         # Verifica se os mocks foram chamados
         mock_ver_fernet.assert_called_once_with('valid-fernet-token')
-        assert mock_ver_jwt.call_count == 2
         mock_val_token_cancel.assert_called_once_with('valid-fernet-token')
         mock_val_id_est.assert_called_once_with('valid-jwt-est-token')
         mock_val_id_user.assert_called_once_with("est_id_123", 'valid-jwt-user-token')
@@ -87,7 +85,7 @@ def test_cancelar_agendamento_token_fernet_invalido(client):
     Testa a falha quando o token Fernet ('auth') é inválido.
     Espera-se uma resposta 401 Unauthorized.
     """
-    with patch('project.app.controllers.Endpoints.Cliente.cancelar_agendamento.verificar_token_fernet', return_value=False):
+    with patch('project.app.controllers.Middlewares.autenticacao_cliente.verificar_token_fernet', return_value=False):
         headers = {
             'auth': 'invalid-fernet-token',
             'token-estabelecimento': 'valid-jwt-est-token',
@@ -107,8 +105,10 @@ def test_cancelar_agendamento_token_jwt_invalido(client, jwt_est_valid, jwt_user
     Testa a falha quando um dos tokens JWT é inválido.
     Espera-se uma resposta 401 Unauthorized.
     """
-    with patch('project.app.controllers.Endpoints.Cliente.cancelar_agendamento.verificar_token_fernet', return_value=True), \
-         patch('project.app.controllers.Endpoints.Cliente.cancelar_agendamento.verificar_token_jwt', side_effect=[jwt_est_valid, jwt_user_valid]):
+    with patch('project.app.controllers.Middlewares.autenticacao_cliente.verificar_token_fernet', return_value=True), \
+         patch('project.app.controllers.Middlewares.autenticacao_cliente.validar_token_escopo', return_value=True), \
+         patch('project.app.controllers.Middlewares.autenticacao_cliente.validar_token_id_estabelecimento', return_value=(True, "est_id_123") if jwt_est_valid else False), \
+         patch('project.app.controllers.Middlewares.autenticacao_cliente.validar_token_id_user', return_value=(True, "user_id_456") if jwt_user_valid else False):
         headers = {
             'auth': 'valid-fernet-token',
             'token-estabelecimento': 'jwt-est-token',
@@ -127,9 +127,8 @@ def test_cancelar_agendamento_token_auth_nao_valido_para_cancelar(client):
     Testa a falha quando o token 'auth' não é válido para cancelamento.
     Espera-se uma resposta 401 Unauthorized.
     """
-    with patch('project.app.controllers.Endpoints.Cliente.cancelar_agendamento.verificar_token_fernet', return_value=True), \
-         patch('project.app.controllers.Endpoints.Cliente.cancelar_agendamento.verificar_token_jwt', return_value=True), \
-         patch('project.app.controllers.Endpoints.Cliente.cancelar_agendamento.validar_token_cancelar_agendamento', return_value=False):
+    with patch('project.app.controllers.Middlewares.autenticacao_cliente.verificar_token_fernet', return_value=True), \
+         patch('project.app.controllers.Middlewares.autenticacao_cliente.validar_token_escopo', return_value=False):
         headers = {
             'auth': 'valid-fernet-token-but-not-for-cancel',
             'token-estabelecimento': 'valid-jwt-est-token',
@@ -150,10 +149,9 @@ def test_cancelar_agendamento_token_id_estabelecimento_invalido(client, id_est_r
     Casos: retorna False, (True, None), (False, None).
     Espera-se uma resposta 401 Unauthorized.
     """
-    with patch('project.app.controllers.Endpoints.Cliente.cancelar_agendamento.verificar_token_fernet', return_value=True), \
-         patch('project.app.controllers.Endpoints.Cliente.cancelar_agendamento.verificar_token_jwt', return_value=True), \
-         patch('project.app.controllers.Endpoints.Cliente.cancelar_agendamento.validar_token_cancelar_agendamento', return_value=True), \
-         patch('project.app.controllers.Endpoints.Cliente.cancelar_agendamento.validar_token_id_estabelecimento', return_value=id_est_return_val):
+    with patch('project.app.controllers.Middlewares.autenticacao_cliente.verificar_token_fernet', return_value=True), \
+         patch('project.app.controllers.Middlewares.autenticacao_cliente.validar_token_escopo', return_value=True), \
+         patch('project.app.controllers.Middlewares.autenticacao_cliente.validar_token_id_estabelecimento', return_value=id_est_return_val):
         headers = {
             'auth': 'valid-fernet-token',
             'token-estabelecimento': 'valid-jwt-est-token-invalid-id',
@@ -173,11 +171,10 @@ def test_cancelar_agendamento_token_id_user_invalido(client):
     Testa a falha quando a validação do token do usuário falha (não retorna tupla).
     Espera-se uma resposta 401 Unauthorized com mensagem específica "erro no user".
     """
-    with patch('project.app.controllers.Endpoints.Cliente.cancelar_agendamento.verificar_token_fernet', return_value=True), \
-         patch('project.app.controllers.Endpoints.Cliente.cancelar_agendamento.verificar_token_jwt', return_value=True), \
-         patch('project.app.controllers.Endpoints.Cliente.cancelar_agendamento.validar_token_cancelar_agendamento', return_value=True), \
-         patch('project.app.controllers.Endpoints.Cliente.cancelar_agendamento.validar_token_id_estabelecimento', return_value=(True, "est_id_123")), \
-         patch('project.app.controllers.Endpoints.Cliente.cancelar_agendamento.validar_token_id_user', return_value=False):
+    with patch('project.app.controllers.Middlewares.autenticacao_cliente.verificar_token_fernet', return_value=True), \
+         patch('project.app.controllers.Middlewares.autenticacao_cliente.validar_token_escopo', return_value=True), \
+         patch('project.app.controllers.Middlewares.autenticacao_cliente.validar_token_id_estabelecimento', return_value=(True, "est_id_123")), \
+         patch('project.app.controllers.Middlewares.autenticacao_cliente.validar_token_id_user', return_value=False):
         headers = {
             'auth': 'valid-fernet-token',
             'token-estabelecimento': 'valid-jwt-est-token',
@@ -198,11 +195,10 @@ def test_cancelar_agendamento_dados_insuficientes_ou_invalidos_payload(client, b
         ou 'agendamento_id' está ausente/vazio.
         Espera-se uma resposta 411 "Dados insuficientes".
         """
-        with patch('project.app.controllers.Endpoints.Cliente.cancelar_agendamento.verificar_token_fernet', return_value=True), \
-             patch('project.app.controllers.Endpoints.Cliente.cancelar_agendamento.verificar_token_jwt', return_value=True), \
-             patch('project.app.controllers.Endpoints.Cliente.cancelar_agendamento.validar_token_cancelar_agendamento', return_value=True), \
-             patch('project.app.controllers.Endpoints.Cliente.cancelar_agendamento.validar_token_id_estabelecimento', return_value=(True, "est_id_123")), \
-             patch('project.app.controllers.Endpoints.Cliente.cancelar_agendamento.validar_token_id_user', return_value=(True, "user_id_456")):
+        with patch('project.app.controllers.Middlewares.autenticacao_cliente.verificar_token_fernet', return_value=True), \
+             patch('project.app.controllers.Middlewares.autenticacao_cliente.validar_token_escopo', return_value=True), \
+             patch('project.app.controllers.Middlewares.autenticacao_cliente.validar_token_id_estabelecimento', return_value=(True, "est_id_123")), \
+             patch('project.app.controllers.Middlewares.autenticacao_cliente.validar_token_id_user', return_value=(True, "user_id_456")):
             headers = {
                 'auth': 'valid-fernet-token',
                 'token-estabelecimento': 'valid-jwt-est-token',
@@ -223,11 +219,10 @@ def test_cancelar_agendamento_id_agendamento_formato_invalido(client):
     Testa a falha quando 'agendamento_id' tem um formato inválido.
     Espera-se uma resposta 400 "Dados invalidos: agendamento_id inválido".
     """
-    with patch('project.app.controllers.Endpoints.Cliente.cancelar_agendamento.verificar_token_fernet', return_value=True), \
-         patch('project.app.controllers.Endpoints.Cliente.cancelar_agendamento.verificar_token_jwt', return_value=True), \
-         patch('project.app.controllers.Endpoints.Cliente.cancelar_agendamento.validar_token_cancelar_agendamento', return_value=True), \
-         patch('project.app.controllers.Endpoints.Cliente.cancelar_agendamento.validar_token_id_estabelecimento', return_value=(True, "est_id_123")), \
-         patch('project.app.controllers.Endpoints.Cliente.cancelar_agendamento.validar_token_id_user', return_value=(True, "user_id_456")), \
+    with patch('project.app.controllers.Middlewares.autenticacao_cliente.verificar_token_fernet', return_value=True), \
+         patch('project.app.controllers.Middlewares.autenticacao_cliente.validar_token_escopo', return_value=True), \
+         patch('project.app.controllers.Middlewares.autenticacao_cliente.validar_token_id_estabelecimento', return_value=(True, "est_id_123")), \
+         patch('project.app.controllers.Middlewares.autenticacao_cliente.validar_token_id_user', return_value=(True, "user_id_456")), \
          patch('project.app.controllers.Endpoints.Cliente.cancelar_agendamento.verificar_id_agendamento', return_value=False):
         headers = {
             'auth': 'valid-fernet-token',
@@ -245,11 +240,10 @@ def test_cancelar_agendamento_falha_no_banco(client):
     Testa a falha quando o cancelamento no banco de dados (cancelar_agendamento_db) retorna False.
     Espera-se uma resposta 500 "Erro interno".
     """
-    with patch('project.app.controllers.Endpoints.Cliente.cancelar_agendamento.verificar_token_fernet', return_value=True), \
-         patch('project.app.controllers.Endpoints.Cliente.cancelar_agendamento.verificar_token_jwt', return_value=True), \
-         patch('project.app.controllers.Endpoints.Cliente.cancelar_agendamento.validar_token_cancelar_agendamento', return_value=True), \
-         patch('project.app.controllers.Endpoints.Cliente.cancelar_agendamento.validar_token_id_estabelecimento', return_value=(True, "est_id_123")), \
-         patch('project.app.controllers.Endpoints.Cliente.cancelar_agendamento.validar_token_id_user', return_value=(True, "user_id_456")), \
+    with patch('project.app.controllers.Middlewares.autenticacao_cliente.verificar_token_fernet', return_value=True), \
+         patch('project.app.controllers.Middlewares.autenticacao_cliente.validar_token_escopo', return_value=True), \
+         patch('project.app.controllers.Middlewares.autenticacao_cliente.validar_token_id_estabelecimento', return_value=(True, "est_id_123")), \
+         patch('project.app.controllers.Middlewares.autenticacao_cliente.validar_token_id_user', return_value=(True, "user_id_456")), \
          patch('project.app.controllers.Endpoints.Cliente.cancelar_agendamento.verificar_id_agendamento', return_value=True), \
          patch('project.app.controllers.Endpoints.Cliente.cancelar_agendamento.cancelar_agendamento_db', return_value=False):
         headers = {
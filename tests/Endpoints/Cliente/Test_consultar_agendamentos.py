@@ -2,6 +2,7 @@ import pytest
 from unittest.mock import patch
 from flask import Flask, json
 from project.app.controllers.Endpoints.Cliente.cancelar_agendamento import cancelar_agendamento_bp
+from project.app.controllers.Endpoints.Cliente.consultar_agendamentos import consultar_agendamentos_bp
 
 @pytest.fixture
 def app():
@@ -32,11 +33,10 @@ def test_cancelar_agendamento_sucesso(client):
     e o cancelamento no banco de dados ocorre com sucesso.
     Espera-se uma resposta 200 OK.
     """
-    with patch('project.app.controllers.Endpoints.Cliente.cancelar_agendamento.verificar_token_fernet', return_value=True) as mock_ver_fernet, \
-         patch('project.app.controllers.Endpoints.Cliente.cancelar_agendamento.verificar_token_jwt', return_value=True) as mock_ver_jwt, \
-         patch('project.app.controllers.Endpoints.Cliente.cancelar_agendamento.validar_token_cancelar_agendamento', return_value=True) as mock_val_token_cancel, \
-         patch('project.app.controllers.Endpoints.Cliente.cancelar_agendamento.validar_token_id_estabelecimento', return_value=(True, "est_id_123")) as mock_val_id_est, \
-         patch('project.app.controllers.Endpoints.Cliente.cancelar_agendamento.validar_token_id_user', return_value=(True, "user_id_456")) as mock_val_id_user, \
+    with patch('project.app.controllers.Middlewares.autenticacao_cliente.verificar_token_fernet', return_value=True) as mock_ver_fernet, \
+         patch('project.app.controllers.Middlewares.autenticacao_cliente.validar_token_escopo', return_value=True) as mock_val_token_cancel, \
+         patch('project.app.controllers.Middlewares.autenticacao_cliente.validar_token_id_estabelecimento', return_value=(True, "est_id_123")) as mock_val_id_est, \
+         patch('project.app.controllers.Middlewares.autenticacao_cliente.validar_token_id_user', return_value=(True, "user_id_456")) as mock_val_id_user, \
          patch('project.app.controllers.Endpoints.Cliente.cancelar_agendamento.verificar_id_agendamento', return_value=True) as mock_ver_id_ag, \
          patch('project.app.controllers.Endpoints.Cliente.cancelar_agendamento.cancelar_agendamento_db', return_value=True) as mock_cancel_db:
 
@@ -54,7 +54,6 @@ def test_cancelar_agendamento_sucesso(client):
 
         # Verifica se os mocks foram chamados
         mock_ver_fernet.assert_called_once_with('valid-fernet-token')
-        assert mock_ver_jwt.call_count == 2
         mock_val_token_cancel.assert_called_once_with('valid-fernet-token')
         mock_val_id_est.assert_called_once_with('valid-jwt-est-token')
         mock_val_id_user.assert_called_once_with("est_id_123", 'valid-jwt-user-token')
@@ -87,7 +86,7 @@ def test_cancelar_agendamento_token_fernet_invalido(client):
     Testa a falha quando o token Fernet ('auth') é inválido.
     Espera-se uma resposta 401 Unauthorized.
     """
-    with patch('project.app.controllers.Endpoints.Cliente.cancelar_agendamento.verificar_token_fernet', return_value=False):
+    with patch('project.app.controllers.Middlewares.autenticacao_cliente.verificar_token_fernet', return_value=False):
         headers = {
             'auth': 'invalid-fernet-token',
             'token-estabelecimento': 'valid-jwt-est-token',
@@ -107,8 +106,10 @@ def test_cancelar_agendamento_token_jwt_invalido(client, jwt_est_valid, jwt_user
     Testa a falha quando um dos tokens JWT é inválido.
     Espera-se uma resposta 401 Unauthorized.
     """
-    with patch('project.app.controllers.Endpoints.Cliente.cancelar_agendamento.verificar_token_fernet', return_value=True), \
-         patch('project.app.controllers.Endpoints.Cliente.cancelar_agendamento.verificar_token_jwt', side_effect=[jwt_est_valid, jwt_user_valid]):
+    with patch('project.app.controllers.Middlewares.autenticacao_cliente.verificar_token_fernet', return_value=True), \
+         patch('project.app.controllers.Middlewares.autenticacao_cliente.validar_token_escopo', return_value=True), \
+         patch('project.app.controllers.Middlewares.autenticacao_cliente.validar_token_id_estabelecimento', return_value=(True, "est_id_123") if jwt_est_valid else False), \
+         patch('project.app.controllers.Middlewares.autenticacao_cliente.validar_token_id_user', return_value=(True, "user_id_456") if jwt_user_valid else False):
         headers = {
             'auth': 'valid-fernet-token',
             'token-estabelecimento': 'jwt-est-token',
@@ -127,9 +128,8 @@ def test_cancelar_agendamento_token_auth_nao_valido_para_cancelar(client):
     Testa a falha quando o token 'auth' não é válido para cancelamento.
     Espera-se uma resposta 401 Unauthorized.
     """
-    with patch('project.app.controllers.Endpoints.Cliente.cancelar_agendamento.verificar_token_fernet', return_value=True), \
-         patch('project.app.controllers.Endpoints.Cliente.cancelar_agendamento.verificar_token_jwt', return_value=True), \
-         patch('project.app.controllers.Endpoints.Cliente.cancelar_agendamento.validar_token_cancelar_agendamento', return_value=False):
+    with patch('project.app.controllers.Middlewares.autenticacao_cliente.verificar_token_fernet', return_value=True), \
+         patch('project.app.controllers.Middlewares.autenticacao_cliente.validar_token_escopo', return_value=False):
         headers = {
             'auth': 'valid-fernet-token-but-not-for-cancel',
             'token-estabelecimento': 'valid-jwt-est-token',
@@ -150,10 +150,9 @@ def test_cancelar_agendamento_token_id_estabelecimento_invalido(client, id_est_r
     Casos: retorna False, (True, None), (False, None).
     Espera-se uma resposta 401 Unauthorized.
     """
-    with patch('project.app.controllers.Endpoints.Cliente.cancelar_agendamento.verificar_token_fernet', return_value=True), \
-         patch('project.app.controllers.Endpoints.Cliente.cancelar_agendamento.verificar_token_jwt', return_value=True), \
-         patch('project.app.controllers.Endpoints.Cliente.cancelar_agendamento.validar_token_cancelar_agendamento', return_value=True), \
-         patch('project.app.controllers.Endpoints.Cliente.cancelar_agendamento.validar_token_id_estabelecimento', return_value=id_est_return_val):
+    with patch('project.app.controllers.Middlewares.autenticacao_cliente.verificar_token_fernet', return_value=True), \
+         patch('project.app.controllers.Middlewares.autenticacao_cliente.validar_token_escopo', return_value=True), \
+         patch('project.app.controllers.Middlewares.autenticacao_cliente.validar_token_id_estabelecimento', return_value=id_est_return_val):
         headers = {
             'auth': 'valid-fernet-token',
             'token-estabelecimento': 'valid-jwt-est-token-invalid-id',
@@ -173,11 +172,10 @@ def test_cancelar_agendamento_token_id_user_invalido(client):
     Testa a falha quando a validação do token do usuário falha (não retorna tupla).
     Espera-se uma resposta 401 Unauthorized com mensagem específica "erro no user".
     """
-    with patch('project.app.controllers.Endpoints.Cliente.cancelar_agendamento.verificar_token_fernet', return_value=True), \
-         patch('project.app.controllers.Endpoints.Cliente.cancelar_agendamento.verificar_token_jwt', return_value=True), \
-         patch('project.app.controllers.Endpoints.Cliente.cancelar_agendamento.validar_token_cancelar_agendamento', return_value=True), \
-         patch('project.app.controllers.Endpoints.Cliente.cancelar_agendamento.validar_token_id_estabelecimento', return_value=(True, "est_id_123")), \
-         patch('project.app.controllers.Endpoints.Cliente.cancelar_agendamento.validar_token_id_user', return_value=False):
+    with patch('project.app.controllers.Middlewares.autenticacao_cliente.verificar_token_fernet', return_value=True), \
+         patch('project.app.controllers.Middlewares.autenticacao_cliente.validar_token_escopo', return_value=True), \
+         patch('project.app.controllers.Middlewares.autenticacao_cliente.validar_token_id_estabelecimento', return_value=(True, "est_id_123")), \
+         patch('project.app.controllers.Middlewares.autenticacao_cliente.validar_token_id_user', return_value=False):
         headers = {
             'auth': 'valid-fernet-token',
             'token-estabelecimento': 'valid-jwt-est-token',
@@ -198,11 +196,10 @@ def test_cancelar_agendamento_dados_insuficientes_ou_invalidos_payload(client, b
         ou 'agendamento_id' está ausente/vazio.
         Espera-se uma resposta 411 "Dados insuficientes".
         """
-        with patch('project.app.controllers.Endpoints.Cliente.cancelar_agendamento.verificar_token_fernet', return_value=True), \
-             patch('project.app.controllers.Endpoints.Cliente.cancelar_agendamento.verificar_token_jwt', return_value=True), \
-             patch('project.app.controllers.Endpoints.Cliente.cancelar_agendamento.validar_token_cancelar_agendamento', return_value=True), \
-             patch('project.app.controllers.Endpoints.Cliente.cancelar_agendamento.validar_token_id_estabelecimento', return_value=(True, "est_id_123")), \
-             patch('project.app.controllers.Endpoints.Cliente.cancelar_agendamento.validar_token_id_user', return_value=(True, "user_id_456")):
+        with patch('project.app.controllers.Middlewares.autenticacao_cliente.verificar_token_fernet', return_value=True), \
+             patch('project.app.controllers.Middlewares.autenticacao_cliente.validar_token_escopo', return_value=True), \
+             patch('project.app.controllers.Middlewares.autenticacao_cliente.validar_token_id_estabelecimento', return_value=(True, "est_id_123")), \
+             patch('project.app.controllers.Middlewares.autenticacao_cliente.validar_token_id_user', return_value=(True, "user_id_456")):
             headers = {
                 'auth': 'valid-fernet-token',
                 'token-estabelecimento': 'valid-jwt-est-token',
@@ -223,11 +220,10 @@ def test_cancelar_agendamento_id_agendamento_formato_invalido(client):
     Testa a falha quando 'agendamento_id' tem um formato inválido.
     Espera-se uma resposta 400 "Dados invalidos: agendamento_id inválido".
     """
-    with patch('project.app.controllers.Endpoints.Cliente.cancelar_agendamento.verificar_token_fernet', return_value=True), \
-         patch('project.app.controllers.Endpoints.Cliente.cancelar_agendamento.verificar_token_jwt', return_value=True), \
-         patch('project.app.controllers.Endpoints.Cliente.cancelar_agendamento.validar_token_cancelar_agendamento', return_value=True), \
-         patch('project.app.controllers.Endpoints.Cliente.cancelar_agendamento.validar_token_id_estabelecimento', return_value=(True, "est_id_123")), \
-         patch('project.app.controllers.Endpoints.Cliente.cancelar_agendamento.validar_token_id_user', return_value=(True, "user_id_456")), \
+    with patch('project.app.controllers.Middlewares.autenticacao_cliente.verificar_token_fernet', return_value=True), \
+         patch('project.app.controllers.Middlewares.autenticacao_cliente.validar_token_escopo', return_value=True), \
+         patch('project.app.controllers.Middlewares.autenticacao_cliente.validar_token_id_estabelecimento', return_value=(True, "est_id_123")), \
+         patch('project.app.controllers.Middlewares.autenticacao_cliente.validar_token_id_user', return_value=(True, "user_id_456")), \
          patch('project.app.controllers.Endpoints.Cliente.cancelar_agendamento.verificar_id_agendamento', return_value=False):
         headers = {
             'auth': 'valid-fernet-token',
@@ -245,11 +241,10 @@ def test_cancelar_agendamento_falha_no_banco(client):
     Testa a falha quando o cancelamento no banco de dados (cancelar_agendamento_db) retorna False.
     Espera-se uma resposta 500 "Erro interno".
     """
-    with patch('project.app.controllers.Endpoints.Cliente.cancelar_agendamento.verificar_token_fernet', return_value=True), \
-         patch('project.app.controllers.Endpoints.Cliente.cancelar_agendamento.verificar_token_jwt', return_value=True), \
-         patch('project.app.controllers.Endpoints.Cliente.cancelar_agendamento.validar_token_cancelar_agendamento', return_value=True), \
-         patch('project.app.controllers.Endpoints.Cliente.cancelar_agendamento.validar_token_id_estabelecimento', return_value=(True, "est_id_123")), \
-         patch('project.app.controllers.Endpoints.Cliente.cancelar_agendamento.validar_token_id_user', return_value=(True, "user_id_456")), \
+    with patch('project.app.controllers.Middlewares.autenticacao_cliente.verificar_token_fernet', return_value=True), \
+         patch('project.app.controllers.Middlewares.autenticacao_cliente.validar_token_escopo', return_value=True), \
+         patch('project.app.controllers.Middlewares.autenticacao_cliente.validar_token_id_estabelecimento', return_value=(True, "est_id_123")), \
+         patch('project.app.controllers.Middlewares.autenticacao_cliente.validar_token_id_user', return_value=(True, "user_id_456")), \
          patch('project.app.controllers.Endpoints.Cliente.cancelar_agendamento.verificar_id_agendamento', return_value=True), \
          patch('project.app.controllers.Endpoints.Cliente.cancelar_agendamento.cancelar_agendamento_db', return_value=False):
         headers = {
@@ -261,4 +256,128 @@ def test_cancelar_agendamento_falha_no_banco(client):
         response = client.post('/cancelar-agendamento', headers=headers, json=payload)
         assert response.status_code == 500
         data = json.loads(response.data)
-        assert data['erro'] == "Não foi possível cancelar o agendamento. Erro interno."
\ No newline at end of file
+        assert data['erro'] == "Não foi possível cancelar o agendamento. Erro interno."
+
+# --- Testes para o endpoint /api/consultar_agendamentos (histórico paginado) ---
+
+@pytest.fixture
+def client_consulta():
+    """
+    Fixture que cria um cliente de teste para a aplicação com o blueprint 'consultar_agendamentos_bp',
+    com a autenticação do middleware simulada.
+    """
+    app = Flask(__name__)
+    app.register_blueprint(consultar_agendamentos_bp)
+    app.config['TESTING'] = True
+    client = app.test_client()
+    client.set_cookie('token_estabelecimento', 'valid-jwt-est-token')
+    client.set_cookie('token_user', 'valid-jwt-user-token')
+    with patch('project.app.controllers.Middlewares.autenticacao_cliente.verificar_token_fernet', return_value=True), \
+         patch('project.app.controllers.Middlewares.autenticacao_cliente.validar_token_escopo', return_value=True), \
+         patch('project.app.controllers.Middlewares.autenticacao_cliente.validar_token_id_estabelecimento', return_value=(True, "est_id_123")), \
+         patch('project.app.controllers.Middlewares.autenticacao_cliente.validar_token_id_user', return_value=(True, "user_id_456")):
+        yield client
+
+def test_consultar_historico_paginado(client_consulta):
+    """
+    Testa a consulta do histórico com cursor e limite.
+    Espera-se 200 com a página de agendamentos e o 'next_cursor' da próxima página.
+    """
+    pagina = [{"id": "ag_1", "status": "concluído"}]
+    with patch('project.app.controllers.Endpoints.Cliente.consultar_agendamentos.consultar_historico_paginado',
+               return_value=(True, pagina, "cursor-2")) as mock_historico:
+
+        response = client_consulta.post('/api/consultar_agendamentos', headers={'Authorization': 'valid-fernet-token'},
+                                        json={"type": "historico", "cursor": "cursor-1", "limite": 10})
+
+        assert response.status_code == 200
+        data = json.loads(response.data)
+        assert data['agendamentos'] == pagina
+        assert data['next_cursor'] == "cursor-2"
+        mock_historico.assert_called_once_with("est_id_123", "user_id_456", "cursor-1", 10)
+
+def test_consultar_historico_ultima_pagina(client_consulta):
+    """
+    Testa a primeira página do histórico sem parâmetros de paginação, que também é a última.
+    Espera-se 'next_cursor' nulo.
+    """
+    with patch('project.app.controllers.Endpoints.Cliente.consultar_agendamentos.consultar_historico_paginado',
+               return_value=(True, [{"id": "ag_1"}], None)) as mock_historico:
+
+        response = client_consulta.post('/api/consultar_agendamentos', headers={'Authorization': 'valid-fernet-token'},
+                                        json={"type": "historico"})
+
+        assert response.status_code == 200
+        assert json.loads(response.data)['next_cursor'] is None
+        mock_historico.assert_called_once_with("est_id_123", "user_id_456", None, None)
+
+@pytest.mark.parametrize("payload", [
+    {"type": "historico", "limite": 0},
+    {"type": "historico", "limite": 1000},
+    {"type": "historico", "limite": "10"},
+    {"type": "historico", "cursor": 123},
+])
+def test_consultar_historico_paginacao_invalida(client_consulta, payload):
+    """
+    Testa limites fora do intervalo permitido e cursores que não são texto.
+    Espera-se 400 sem consulta ao banco.
+    """
+    with patch('project.app.controllers.Endpoints.Cliente.consultar_agendamentos.consultar_historico_paginado') as mock_historico:
+        response = client_consulta.post('/api/consultar_agendamentos', headers={'Authorization': 'valid-fernet-token'}, json=payload)
+
+        assert response.status_code == 400
+        mock_historico.assert_not_called()
+
+def test_consultar_historico_cursor_invalido(client_consulta):
+    """
+    Testa um cursor que não pode ser lido pelo serviço.
+    Espera-se 400.
+    """
+    with patch('project.app.controllers.Endpoints.Cliente.consultar_agendamentos.consultar_historico_paginado',
+               return_value=(False, "Cursor inválido")):
+        response = client_consulta.post('/api/consultar_agendamentos', headers={'Authorization': 'valid-fernet-token'},
+                                        json={"type": "historico", "cursor": "xyz"})
+
+        assert response.status_code == 400
+        assert json.loads(response.data)['message'] == "Dados invalidos"
+
+def test_consultar_historico_json_no_banco(client_consulta):
+    """
+    Testa o histórico com JSON_NO_BANCO ativo: a página vem como texto JSON do banco e é
+    inserida no corpo com o mesmo envelope da resposta com jsonify.
+    """
+    pagina = '[{"id": "ag_1", "status": "concluído", "servicos": []}]'
+    with patch('project.app.controllers.Endpoints.Cliente.consultar_agendamentos.JSON_NO_BANCO', True), \
+         patch('project.app.controllers.Endpoints.Cliente.consultar_agendamentos.consultar_historico_paginado') as mock_historico, \
+         patch('project.app.controllers.Endpoints.Cliente.consultar_agendamentos.consultar_historico_paginado_json',
+               return_value=(True, pagina, "cursor-2")) as mock_historico_json:
+
+        response = client_consulta.post('/api/consultar_agendamentos', headers={'Authorization': 'valid-fernet-token'},
+                                        json={"type": "historico", "limite": 10})
+
+        assert response.status_code == 200
+        assert response.mimetype == "application/json"
+        assert json.loads(response.data) == {
+            "status": "success",
+            "message": "Consulta realizada com sucesso.",
+            "next_cursor": "cursor-2",
+            "agendamentos": [{"id": "ag_1", "status": "concluído", "servicos": []}]
+        }
+        mock_historico_json.assert_called_once_with("est_id_123", "user_id_456", None, 10)
+        mock_historico.assert_not_called()
+
+def test_consultar_ativos_json_no_banco_sem_agendamentos(client_consulta):
+    """
+    Testa os agendamentos ativos com JSON_NO_BANCO ativo quando o banco não retorna linhas.
+    Espera-se a mesma mensagem da resposta sem JSON_NO_BANCO.
+    """
+    with patch('project.app.controllers.Endpoints.Cliente.consultar_agendamentos.JSON_NO_BANCO', True), \
+         patch('project.app.controllers.Endpoints.Cliente.consultar_agendamentos.consultar_agendamentos_json',
+               return_value=None) as mock_json:
+
+        response = client_consulta.post('/api/consultar_agendamentos', headers={'Authorization': 'valid-fernet-token'},
+                                        json={"type": "ativos"})
+
+        assert response.status_code == 200
+        assert json.loads(response.data)['message'] == "Nenhum agendamento encontrado para os dados informados."
+        mock_json.assert_called_once_with("est_id_123", "user_id_456", "ativos")
\ No newline at end of file
@@ -35,11 +35,10 @@ def test_consultar_colaborador_sucesso_com_colaboradores(client):
     Espera-se uma resposta 200 OK com a lista de colaboradores.
     """
     # Mock das funções de serviço para simular um cenário de sucesso
-    with patch('project.app.controllers.Endpoints.Cliente.consultar_colaborador.verificar_token_fernet', return_value=True) as mock_ver_fernet, \
-         patch('project.app.controllers.Endpoints.Cliente.consultar_colaborador.verificar_token_jwt', return_value=True) as mock_ver_jwt, \
-         patch('project.app.controllers.Endpoints.Cliente.consultar_colaborador.validar_token_consultar_colaborador', return_value=True) as mock_val_token_colab, \
-         patch('project.app.controllers.Endpoints.Cliente.consultar_colaborador.validar_token_id_estabelecimento', return_value=(True, "est_id_789")) as mock_val_id_est, \
-         patch('project.app.controllers.Endpoints.Cliente.consultar_colaborador.validar_token_id_user', return_value=(True, "user_id_101")) as mock_val_id_user, \
+    with patch('project.app.controllers.Middlewares.autenticacao_cliente.verificar_token_fernet', return_value=True) as mock_ver_fernet, \
+         patch('project.app.controllers.Middlewares.autenticacao_cliente.validar_token_escopo', return_value=True) as mock_val_token_colab, \
+         patch('project.app.controllers.Middlewares.autenticacao_cliente.validar_token_id_estabelecimento', return_value=(True, "est_id_789")) as mock_val_id_est, \
+         patch('project.app.controllers.Middlewares.autenticacao_cliente.validar_token_id_user', return_value=(True, "user_id_101")) as mock_val_id_user, \
          patch('project.app.controllers.Endpoints.Cliente.consultar_colaborador.consultar_colaboradores_por_estabelecimento', return_value=(True, [{"id": 1, "nome": "Colaborador Alfa"}, {"id": 2, "nome": "Colaborador Beta"}])) as mock_cons_colab:
 
         headers = {
@@ -65,7 +64,6 @@ def test_consultar_colaborador_sucesso_com_colaboradores(client):
 
         # Verifica se os mocks foram chamados como esperado
         mock_ver_fernet.assert_called_once_with('valid-fernet-token')
-        assert mock_ver_jwt.call_count == 2 # Chamado para token-estabelecimento e token-user
         mock_val_token_colab.assert_called_once_with('valid-fernet-token')
         mock_val_id_est.assert_called_once_with('valid-jwt-est-token')
         mock_val_id_user.assert_called_once_with("est_id_789", 'valid-jwt-user-token')
@@ -77,11 +75,10 @@ def test_consultar_colaborador_sucesso_sem_colaboradores_cadastrados(client):
     mas o estabelecimento não possui colaboradores cadastrados (lista vazia).
     Espera-se uma resposta 200 OK com uma lista de 'servicos' (colaboradores) vazia.
     """
-    with patch('project.app.controllers.Endpoints.Cliente.consultar_colaborador.verificar_token_fernet', return_value=True), \
-         patch('project.app.controllers.Endpoints.Cliente.consultar_colaborador.verificar_token_jwt', return_value=True), \
-         patch('project.app.controllers.Endpoints.Cliente.consultar_colaborador.validar_token_consultar_colaborador', return_value=True), \
-         patch('project.app.controllers.Endpoints.Cliente.consultar_colaborador.validar_token_id_estabelecimento', return_value=(True, "est_id_789")), \
-         patch('project.app.controllers.Endpoints.Cliente.consultar_colaborador.validar_token_id_user', return_value=(True, "user_id_101")), \
+    with patch('project.app.controllers.Middlewares.autenticacao_cliente.verificar_token_fernet', return_value=True), \
+         patch('project.app.controllers.Middlewares.autenticacao_cliente.validar_token_escopo', return_value=True), \
+         patch('project.app.controllers.Middlewares.autenticacao_cliente.validar_token_id_estabelecimento', return_value=(True, "est_id_789")), \
+         patch('project.app.controllers.Middlewares.autenticacao_cliente.validar_token_id_user', return_value=(True, "user_id_101")), \
          patch('project.app.controllers.Endpoints.Cliente.consultar_colaborador.consultar_colaboradores_por_estabelecimento', return_value=(True, [])): # Lista de colaboradores vazia
 
         headers = {
@@ -104,11 +101,10 @@ def test_consultar_colaborador_falha_consulta_db(client):
     (retorna (False, ...)).
     Espera-se uma resposta 404 Not Found.
     """
-    with patch('project.app.controllers.Endpoints.Cliente.consultar_colaborador.verificar_token_fernet', return_value=True), \
-         patch('project.app.controllers.Endpoints.Cliente.consultar_colaborador.verificar_token_jwt', return_value=True), \
-         patch('project.app.controllers.Endpoints.Cliente.consultar_colaborador.validar_token_consultar_colaborador', return_value=True), \
-         patch('project.app.controllers.Endpoints.Cliente.consultar_colaborador.validar_token_id_estabelecimento', return_value=(True, "est_id_789")), \
-         patch('project.app.controllers.Endpoints.Cliente.consultar_colaborador.validar_token_id_user', return_value=(True, "user_id_101")), \
+    with patch('project.app.controllers.Middlewares.autenticacao_cliente.verificar_token_fernet', return_value=True), \
+         patch('project.app.controllers.Middlewares.autenticacao_cliente.validar_token_escopo', return_value=True), \
+         patch('project.app.controllers.Middlewares.autenticacao_cliente.validar_token_id_estabelecimento', return_value=(True, "est_id_789")), \
+         patch('project.app.controllers.Middlewares.autenticacao_cliente.validar_token_id_user', return_value=(True, "user_id_101")), \
          patch('project.app.controllers.Endpoints.Cliente.consultar_colaborador.consultar_colaboradores_por_estabelecimento', return_value=(False, [])): # Falha na consulta
 
         headers = {
@@ -127,11 +123,10 @@ def test_consultar_colaborador_falha_consulta_db_retorna_none(client):
     Testa o cenário onde a consulta ao banco de dados por colaboradores retorna None.
     Espera-se uma resposta 404 Not Found.
     """
-    with patch('project.app.controllers.Endpoints.Cliente.consultar_colaborador.verificar_token_fernet', return_value=True), \
-         patch('project.app.controllers.Endpoints.Cliente.consultar_colaborador.verificar_token_jwt', return_value=True), \
-         patch('project.app.controllers.Endpoints.Cliente.consultar_colaborador.validar_token_consultar_colaborador', return_value=True), \
-         patch('project.app.controllers.Endpoints.Cliente.consultar_colaborador.validar_token_id_estabelecimento', return_value=(True, "est_id_789")), \
-         patch('project.app.controllers.Endpoints.Cliente.consultar_colaborador.validar_token_id_user', return_value=(True, "user_id_101")), \
+    with patch('project.app.controllers.Middlewares.autenticacao_cliente.verificar_token_fernet', return_value=True), \
+         patch('project.app.controllers.Middlewares.autenticacao_cliente.validar_token_escopo', return_value=True), \
+         patch('project.app.controllers.Middlewares.autenticacao_cliente.validar_token_id_estabelecimento', return_value=(True, "est_id_789")), \
+         patch('project.app.controllers.Middlewares.autenticacao_cliente.validar_token_id_user', return_value=(True, "user_id_101")), \
          patch('project.app.controllers.Endpoints.Cliente.consultar_colaborador.consultar_colaboradores_por_estabelecimento', return_value=None): # Consulta retorna None
 
         headers = {
@@ -172,7 +167,7 @@ def test_consultar_colaborador_token_fernet_invalido(client):
     Testa a falha quando o token Fernet ('auth') é inválido.
     Espera-se uma resposta 401 Unauthorized.
     """
-    with patch('project.app.controllers.Endpoints.Cliente.consultar_colaborador.verificar_token_fernet', return_value=False):
+    with patch('project.app.controllers.Middlewares.autenticacao_cliente.verificar_token_fernet', return_value=False):
         headers = {
             'auth': 'invalid-fernet-token',
             'token-estabelecimento': 'valid-jwt-est-token',
@@ -190,8 +185,10 @@ def test_consultar_colaborador_token_jwt_estabelecimento_invalido(client):
     Testa a falha quando o token JWT do estabelecimento é inválido.
     Espera-se uma resposta 401 Unauthorized.
     """
-    with patch('project.app.controllers.Endpoints.Cliente.consultar_colaborador.verificar_token_fernet', return_value=True), \
-         patch('project.app.controllers.Endpoints.Cliente.consultar_colaborador.verificar_token_jwt', side_effect=[False, True]): # Primeiro JWT (est) é inválido
+    with patch('project.app.controllers.Middlewares.autenticacao_cliente.verificar_token_fernet', return_value=True), \
+         patch('project.app.controllers.Middlewares.autenticacao_cliente.validar_token_escopo', return_value=True), \
+         patch('project.app.controllers.Middlewares.autenticacao_cliente.validar_token_id_estabelecimento', return_value=False), \
+         patch('project.app.controllers.Middlewares.autenticacao_cliente.validar_token_id_user', return_value=(True, "user_id_456")): # Primeiro JWT (est) é inválido
         headers = {
             'auth': 'valid-fernet-token',
             'token-estabelecimento': 'invalid-jwt-est-token',
@@ -209,8 +206,10 @@ def test_consultar_colaborador_token_jwt_user_invalido(client):
     Testa a falha quando o token JWT do usuário é inválido.
     Espera-se uma resposta 401 Unauthorized.
     """
-    with patch('project.app.controllers.Endpoints.Cliente.consultar_colaborador.verificar_token_fernet', return_value=True), \
-         patch('project.app.controllers.Endpoints.Cliente.consultar_colaborador.verificar_token_jwt', side_effect=[True, False]): # Segundo JWT (user) é inválido
+    with patch('project.app.controllers.Middlewares.autenticacao_cliente.verificar_token_fernet', return_value=True), \
+         patch('project.app.controllers.Middlewares.autenticacao_cliente.validar_token_escopo', return_value=True), \
+         patch('project.app.controllers.Middlewares.autenticacao_cliente.validar_token_id_estabelecimento', return_value=(True, "est_id_123")), \
+         patch('project.app.controllers.Middlewares.autenticacao_cliente.validar_token_id_user', return_value=False): # Segundo JWT (user) é inválido
         headers = {
             'auth': 'valid-fernet-token',
             'token-estabelecimento': 'valid-jwt-est-token',
@@ -228,9 +227,8 @@ def test_consultar_colaborador_token_auth_nao_valido_para_colaborador(client):
     Testa a falha quando o token 'auth' não é válido para a consulta de colaboradores.
     Espera-se uma resposta 401 Unauthorized.
     """
-    with patch('project.app.controllers.Endpoints.Cliente.consultar_colaborador.verificar_token_fernet', return_value=True), \
-         patch('project.app.controllers.Endpoints.Cliente.consultar_colaborador.verificar_token_jwt', return_value=True), \
-         patch('project.app.controllers.Endpoints.Cliente.consultar_colaborador.validar_token_consultar_colaborador', return_value=False): # Token auth inválido para colaborador
+    with patch('project.app.controllers.Middlewares.autenticacao_cliente.verificar_token_fernet', return_value=True), \
+         patch('project.app.controllers.Middlewares.autenticacao_cliente.validar_token_escopo', return_value=False): # Token auth inválido para colaborador
         headers = {
             'auth': 'valid-fernet-token-but-not-for-colab',
             'token-estabelecimento': 'valid-jwt-est-token',
@@ -250,10 +248,9 @@ def test_consultar_colaborador_token_id_estabelecimento_invalido(client, id_est_
     (validar_token_id_estabelecimento retorna False, (True, None) ou (False, None)).
     Espera-se uma resposta 401 Unauthorized.
     """
-    with patch('project.app.controllers.Endpoints.Cliente.consultar_colaborador.verificar_token_fernet', return_value=True), \
-         patch('project.app.controllers.Endpoints.Cliente.consultar_colaborador.verificar_token_jwt', return_value=True), \
-         patch('project.app.controllers.Endpoints.Cliente.consultar_colaborador.validar_token_consultar_colaborador', return_value=True), \
-         patch('project.app.controllers.Endpoints.Cliente.consultar_colaborador.validar_token_id_estabelecimento', return_value=id_est_return_val): # Validação do ID do estabelecimento falha
+    with patch('project.app.controllers.Middlewares.autenticacao_cliente.verificar_token_fernet', return_value=True), \
+         patch('project.app.controllers.Middlewares.autenticacao_cliente.validar_token_escopo', return_value=True), \
+         patch('project.app.controllers.Middlewares.autenticacao_cliente.validar_token_id_estabelecimento', return_value=id_est_return_val): # Validação do ID do estabelecimento falha
         headers = {
             'auth': 'valid-fernet-token',
             'token-estabelecimento': 'valid-jwt-est-token-invalid-id',
@@ -273,11 +270,10 @@ def test_consultar_colaborador_token_id_user_invalido_nao_tupla(client):
     (validar_token_id_user retorna um valor que não é uma tupla, ex: False).
     Espera-se uma resposta 401 Unauthorized.
     """
-    with patch('project.app.controllers.Endpoints.Cliente.consultar_colaborador.verificar_token_fernet', return_value=True), \
-         patch('project.app.controllers.Endpoints.Cliente.consultar_colaborador.verificar_token_jwt', return_value=True), \
-         patch('project.app.controllers.Endpoints.Cliente.consultar_colaborador.validar_token_consultar_colaborador', return_value=True), \
-         patch('project.app.controllers.Endpoints.Cliente.consultar_colaborador.validar_token_id_estabelecimento', return_value=(True, "est_id_789")), \
-         patch('project.app.controllers.Endpoints.Cliente.consultar_colaborador.validar_token_id_user', return_value=False): # Validação do ID do usuário falha (não é tupla)
+    with patch('project.app.controllers.Middlewares.autenticacao_cliente.verificar_token_fernet', return_value=True), \
+         patch('project.app.controllers.Middlewares.autenticacao_cliente.validar_token_escopo', return_value=True), \
+         patch('project.app.controllers.Middlewares.autenticacao_cliente.validar_token_id_estabelecimento', return_value=(True, "est_id_789")), \
+         patch('project.app.controllers.Middlewares.autenticacao_cliente.validar_token_id_user', return_value=False): # Validação do ID do usuário falha (não é tupla)
         headers = {
             'auth': 'valid-fernet-token',
             'token-estabelecimento': 'valid-jwt-est-token',
@@ -288,4 +284,31 @@ def test_consultar_colaborador_token_id_user_invalido_nao_tupla(client):
         data = json.loads(response.data)
         assert data == {
             "erro": "Autenticação falhou"
-        }
\ No newline at end of file
+        }
+
+
+def test_consultar_colaborador_json_no_banco(client):
+    """
+    Testa a consulta com JSON_NO_BANCO ativo: a lista vem como texto JSON do banco e é
+    inserida no corpo com o mesmo envelope da resposta com jsonify.
+    """
+    client.set_cookie('token_estabelecimento', 'valid-jwt-est-token')
+    client.set_cookie('token_user', 'valid-jwt-user-token')
+    with patch('project.app.controllers.Middlewares.autenticacao_cliente.verificar_token_fernet', return_value=True), \
+         patch('project.app.controllers.Middlewares.autenticacao_cliente.validar_token_escopo', return_value=True), \
+         patch('project.app.controllers.Middlewares.autenticacao_cliente.validar_token_id_estabelecimento', return_value=(True, "est_id_123")), \
+         patch('project.app.controllers.Middlewares.autenticacao_cliente.validar_token_id_user', return_value=(True, "user_id_456")), \
+         patch('project.app.controllers.Endpoints.Cliente.consultar_colaborador.JSON_NO_BANCO', True), \
+         patch('project.app.controllers.Endpoints.Cliente.consultar_colaborador.colaboradores_json_por_estabelecimento', return_value='[["id_1", "Corte"]]') as mock_json:
+
+        response = client.post('/consultar-colaborador', headers={'Authorization': 'valid-fernet-token'})
+
+        assert response.status_code == 200
+        assert response.mimetype == "application/json"
+        assert json.loads(response.data) == {
+            "message": "Requisição bem sucedida",
+            "estabelecimento_id": "est_id_123",
+            "user_id": "user_id_456",
+            "servicos": [["id_1", "Corte"]]
+        }
+        mock_json.assert_called_once_with("est_id_123")
\ No newline at end of file
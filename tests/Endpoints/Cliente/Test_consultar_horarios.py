@@ -35,11 +35,10 @@ def test_consultar_horarios_sucesso_com_horarios(client):
     Espera-se uma resposta 200 OK com a lista de horários formatados.
     """
     horarios_mock = [datetime.time(9, 0), datetime.time(10, 30), datetime.time(14, 15)]
-    with patch('project.app.controllers.Endpoints.Cliente.consultar_horarios.verificar_token_fernet', return_value=True) as mock_v_fernet, \
-         patch('project.app.controllers.Endpoints.Cliente.consultar_horarios.verificar_token_jwt', return_value=True) as mock_v_jwt, \
-         patch('project.app.controllers.Endpoints.Cliente.consultar_horarios.validar_token_consultar_horarios', return_value=True) as mock_v_token_hor, \
-         patch('project.app.controllers.Endpoints.Cliente.consultar_horarios.validar_token_id_estabelecimento', return_value=(True, "est_id_abc")) as mock_v_id_est, \
-         patch('project.app.controllers.Endpoints.Cliente.consultar_horarios.validar_token_id_user', return_value=(True, "user_id_xyz")) as mock_v_id_user, \
+    with patch('project.app.controllers.Middlewares.autenticacao_cliente.verificar_token_fernet', return_value=True) as mock_v_fernet, \
+         patch('project.app.controllers.Middlewares.autenticacao_cliente.validar_token_escopo', return_value=True) as mock_v_token_hor, \
+         patch('project.app.controllers.Middlewares.autenticacao_cliente.validar_token_id_estabelecimento', return_value=(True, "est_id_abc")) as mock_v_id_est, \
+         patch('project.app.controllers.Middlewares.autenticacao_cliente.validar_token_id_user', return_value=(True, "user_id_xyz")) as mock_v_id_user, \
          patch('project.app.controllers.Endpoints.Cliente.consultar_horarios.verificar_id_colaborador', return_value=True) as mock_v_id_colab, \
          patch('project.app.controllers.Endpoints.Cliente.consultar_horarios.verificar_data', return_value=True) as mock_v_data, \
          patch('project.app.controllers.Endpoints.Cliente.consultar_horarios.verificar_ids_servicos', return_value=True) as mock_v_ids_serv, \
@@ -66,7 +65,6 @@ def test_consultar_horarios_sucesso_com_horarios(client):
 
         # Verifica chamadas dos mocks
         mock_v_fernet.assert_called_once_with('valid-fernet-token')
-        assert mock_v_jwt.call_count == 2
         mock_v_token_hor.assert_called_once_with('valid-fernet-token')
         mock_v_id_est.assert_called_once_with('valid-jwt-est-token')
         mock_v_id_user.assert_called_once_with("est_id_abc", 'valid-jwt-user-token')
@@ -81,11 +79,10 @@ def test_consultar_horarios_sucesso_nenhum_horario_disponivel(client):
     mas não há horários disponíveis (retorna [None]).
     Espera-se uma resposta 200 OK com a mensagem apropriada.
     """
-    with patch('project.app.controllers.Endpoints.Cliente.consultar_horarios.verificar_token_fernet', return_value=True), \
-         patch('project.app.controllers.Endpoints.Cliente.consultar_horarios.verificar_token_jwt', return_value=True), \
-         patch('project.app.controllers.Endpoints.Cliente.consultar_horarios.validar_token_consultar_horarios', return_value=True), \
-         patch('project.app.controllers.Endpoints.Cliente.consultar_horarios.validar_token_id_estabelecimento', return_value=(True, "est_id_abc")), \
-         patch('project.app.controllers.Endpoints.Cliente.consultar_horarios.validar_token_id_user', return_value=(True, "user_id_xyz")), \
+    with patch('project.app.controllers.Middlewares.autenticacao_cliente.verificar_token_fernet', return_value=True), \
+         patch('project.app.controllers.Middlewares.autenticacao_cliente.validar_token_escopo', return_value=True), \
+         patch('project.app.controllers.Middlewares.autenticacao_cliente.validar_token_id_estabelecimento', return_value=(True, "est_id_abc")), \
+         patch('project.app.controllers.Middlewares.autenticacao_cliente.validar_token_id_user', return_value=(True, "user_id_xyz")), \
          patch('project.app.controllers.Endpoints.Cliente.consultar_horarios.verificar_id_colaborador', return_value=True), \
          patch('project.app.controllers.Endpoints.Cliente.consultar_horarios.verificar_data', return_value=True), \
          patch('project.app.controllers.Endpoints.Cliente.consultar_horarios.verificar_ids_servicos', return_value=True), \
@@ -131,7 +128,7 @@ def test_consultar_horarios_token_fernet_invalido(client):
     Testa a falha quando o token Fernet ('auth') é inválido.
     Espera-se uma resposta 401 com mensagem específica.
     """
-    with patch('project.app.controllers.Endpoints.Cliente.consultar_horarios.verificar_token_fernet', return_value=False):
+    with patch('project.app.controllers.Middlewares.autenticacao_cliente.verificar_token_fernet', return_value=False):
         headers = {'auth': 'invalid', 'token-estabelecimento': 'valid', 'token-user': 'valid'}
         payload = {'servicos': ["s1"], 'colaborador-id': "c1", 'data': "d1"}
         response = client.post('/consultar-horarios', headers=headers, json=payload)
@@ -145,8 +142,10 @@ def test_consultar_horarios_token_jwt_invalido(client, jwt_est_valid, jwt_user_v
     Testa a falha quando um dos tokens JWT é inválido.
     Espera-se uma resposta 401 com mensagem específica.
     """
-    with patch('project.app.controllers.Endpoints.Cliente.consultar_horarios.verificar_token_fernet', return_value=True), \
-         patch('project.app.controllers.Endpoints.Cliente.consultar_horarios.verificar_token_jwt', side_effect=[jwt_est_valid, jwt_user_valid]):
+    with patch('project.app.controllers.Middlewares.autenticacao_cliente.verificar_token_fernet', return_value=True), \
+         patch('project.app.controllers.Middlewares.autenticacao_cliente.validar_token_escopo', return_value=True), \
+         patch('project.app.controllers.Middlewares.autenticacao_cliente.validar_token_id_estabelecimento', return_value=(True, "est_id_123") if jwt_est_valid else False), \
+         patch('project.app.controllers.Middlewares.autenticacao_cliente.validar_token_id_user', return_value=(True, "user_id_456") if jwt_user_valid else False):
         headers = {'auth': 'valid', 'token-estabelecimento': 'jwt1', 'token-user': 'jwt2'}
         payload = {'servicos': ["s1"], 'colaborador-id': "c1", 'data': "d1"}
         response = client.post('/consultar-horarios', headers=headers, json=payload)
@@ -159,9 +158,8 @@ def test_consultar_horarios_token_api_invalido(client):
     Testa a falha quando o token 'auth' não é válido para consultar horários.
     Espera-se uma resposta 401 com mensagem específica.
     """
-    with patch('project.app.controllers.Endpoints.Cliente.consultar_horarios.verificar_token_fernet', return_value=True), \
-         patch('project.app.controllers.Endpoints.Cliente.consultar_horarios.verificar_token_jwt', return_value=True), \
-         patch('project.app.controllers.Endpoints.Cliente.consultar_horarios.validar_token_consultar_horarios', return_value=False):
+    with patch('project.app.controllers.Middlewares.autenticacao_cliente.verificar_token_fernet', return_value=True), \
+         patch('project.app.controllers.Middlewares.autenticacao_cliente.validar_token_escopo', return_value=False):
         headers = {'auth': 'valid', 'token-estabelecimento': 'valid', 'token-user': 'valid'}
         payload = {'servicos': ["s1"], 'colaborador-id': "c1", 'data': "d1"}
         response = client.post('/consultar-horarios', headers=headers, json=payload)
@@ -175,10 +173,9 @@ def test_consultar_horarios_token_id_estabelecimento_invalido(client, id_est_ret
     Testa a falha quando a validação do token do estabelecimento falha.
     Espera-se uma resposta 401 com mensagem específica.
     """
-    with patch('project.app.controllers.Endpoints.Cliente.consultar_horarios.verificar_token_fernet', return_value=True), \
-         patch('project.app.controllers.Endpoints.Cliente.consultar_horarios.verificar_token_jwt', return_value=True), \
-         patch('project.app.controllers.Endpoints.Cliente.consultar_horarios.validar_token_consultar_horarios', return_value=True), \
-         patch('project.app.controllers.Endpoints.Cliente.consultar_horarios.validar_token_id_estabelecimento', return_value=id_est_return_val):
+    with patch('project.app.controllers.Middlewares.autenticacao_cliente.verificar_token_fernet', return_value=True), \
+         patch('project.app.controllers.Middlewares.autenticacao_cliente.validar_token_escopo', return_value=True), \
+         patch('project.app.controllers.Middlewares.autenticacao_cliente.validar_token_id_estabelecimento', return_value=id_est_return_val):
         headers = {'auth': 'valid', 'token-estabelecimento': 'invalid_est_token', 'token-user': 'valid'}
         payload = {'servicos': ["s1"], 'colaborador-id': "c1", 'data': "d1"}
         response = client.post('/consultar-horarios', headers=headers, json=payload)
@@ -191,11 +188,10 @@ def test_consultar_horarios_token_id_user_invalido(client):
     Testa a falha quando a validação do token do usuário falha (não retorna tupla).
     Espera-se uma resposta 401 com mensagem específica.
     """
-    with patch('project.app.controllers.Endpoints.Cliente.consultar_horarios.verificar_token_fernet', return_value=True), \
-         patch('project.app.controllers.Endpoints.Cliente.consultar_horarios.verificar_token_jwt', return_value=True), \
-         patch('project.app.controllers.Endpoints.Cliente.consultar_horarios.validar_token_consultar_horarios', return_value=True), \
-         patch('project.app.controllers.Endpoints.Cliente.consultar_horarios.validar_token_id_estabelecimento', return_value=(True, "est_id")), \
-         patch('project.app.controllers.Endpoints.Cliente.consultar_horarios.validar_token_id_user', return_value=False): # Falha na validação do user
+    with patch('project.app.controllers.Middlewares.autenticacao_cliente.verificar_token_fernet', return_value=True), \
+         patch('project.app.controllers.Middlewares.autenticacao_cliente.validar_token_escopo', return_value=True), \
+         patch('project.app.controllers.Middlewares.autenticacao_cliente.validar_token_id_estabelecimento', return_value=(True, "est_id")), \
+         patch('project.app.controllers.Middlewares.autenticacao_cliente.validar_token_id_user', return_value=False): # Falha na validação do user
         headers = {'auth': 'valid', 'token-estabelecimento': 'valid', 'token-user': 'invalid_user_token'}
         payload = {'servicos': ["s1"], 'colaborador-id': "c1", 'data': "d1"}
         response = client.post('/consultar-horarios', headers=headers, json=payload)
@@ -217,11 +213,10 @@ def test_consultar_horarios_dados_insuficientes_payload(client, bad_payload, exp
     Testa a falha quando o payload JSON é inválido ou dados obrigatórios estão ausentes.
     Espera-se uma resposta 400 com mensagem "Dados insuficientes".
     """
-    with patch('project.app.controllers.Endpoints.Cliente.consultar_horarios.verificar_token_fernet', return_value=True), \
-         patch('project.app.controllers.Endpoints.Cliente.consultar_horarios.verificar_token_jwt', return_value=True), \
-         patch('project.app.controllers.Endpoints.Cliente.consultar_horarios.validar_token_consultar_horarios', return_value=True), \
-         patch('project.app.controllers.Endpoints.Cliente.consultar_horarios.validar_token_id_estabelecimento', return_value=(True, "est_id")), \
-         patch('project.app.controllers.Endpoints.Cliente.consultar_horarios.validar_token_id_user', return_value=(True, "user_id")):
+    with patch('project.app.controllers.Middlewares.autenticacao_cliente.verificar_token_fernet', return_value=True), \
+         patch('project.app.controllers.Middlewares.autenticacao_cliente.validar_token_escopo', return_value=True), \
+         patch('project.app.controllers.Middlewares.autenticacao_cliente.validar_token_id_estabelecimento', return_value=(True, "est_id")), \
+         patch('project.app.controllers.Middlewares.autenticacao_cliente.validar_token_id_user', return_value=(True, "user_id")):
         headers = {'auth': 'valid', 'token-estabelecimento': 'valid', 'token-user': 'valid'}
         
         if bad_payload is None:
@@ -239,11 +234,10 @@ def test_consultar_horarios_id_colaborador_invalido(client):
     Testa a falha quando 'colaborador-id' é inválido.
     Espera-se uma resposta 400 com mensagem específica.
     """
-    with patch('project.app.controllers.Endpoints.Cliente.consultar_horarios.verificar_token_fernet', return_value=True), \
-         patch('project.app.controllers.Endpoints.Cliente.consultar_horarios.verificar_token_jwt', return_value=True), \
-         patch('project.app.controllers.Endpoints.Cliente.consultar_horarios.validar_token_consultar_horarios', return_value=True), \
-         patch('project.app.controllers.Endpoints.Cliente.consultar_horarios.validar_token_id_estabelecimento', return_value=(True, "est_id")), \
-         patch('project.app.controllers.Endpoints.Cliente.consultar_horarios.validar_token_id_user', return_value=(True, "user_id")), \
+    with patch('project.app.controllers.Middlewares.autenticacao_cliente.verificar_token_fernet', return_value=True), \
+         patch('project.app.controllers.Middlewares.autenticacao_cliente.validar_token_escopo', return_value=True), \
+         patch('project.app.controllers.Middlewares.autenticacao_cliente.validar_token_id_estabelecimento', return_value=(True, "est_id")), \
+         patch('project.app.controllers.Middlewares.autenticacao_cliente.validar_token_id_user', return_value=(True, "user_id")), \
          patch('project.app.controllers.Endpoints.Cliente.consultar_horarios.verificar_id_colaborador', return_value=False): # ID Colaborador inválido
         headers = {'auth': 'valid', 'token-estabelecimento': 'valid', 'token-user': 'valid'}
         payload = {'servicos': ["s1"], 'colaborador-id': "invalid_colab", 'data': "2024-01-01"}
@@ -257,11 +251,10 @@ def test_consultar_horarios_data_invalida(client):
     Testa a falha quando 'data' é inválida.
     Espera-se uma resposta 400 com mensagem específica.
     """
-    with patch('project.app.controllers.Endpoints.Cliente.consultar_horarios.verificar_token_fernet', return_value=True), \
-         patch('project.app.controllers.Endpoints.Cliente.consultar_horarios.verificar_token_jwt', return_value=True), \
-         patch('project.app.controllers.Endpoints.Cliente.consultar_horarios.validar_token_consultar_horarios', return_value=True), \
-         patch('project.app.controllers.Endpoints.Cliente.consultar_horarios.validar_token_id_estabelecimento', return_value=(True, "est_id")), \
-         patch('project.app.controllers.Endpoints.Cliente.consultar_horarios.validar_token_id_user', return_value=(True, "user_id")), \
+    with patch('project.app.controllers.Middlewares.autenticacao_cliente.verificar_token_fernet', return_value=True), \
+         patch('project.app.controllers.Middlewares.autenticacao_cliente.validar_token_escopo', return_value=True), \
+         patch('project.app.controllers.Middlewares.autenticacao_cliente.validar_token_id_estabelecimento', return_value=(True, "est_id")), \
+         patch('project.app.controllers.Middlewares.autenticacao_cliente.validar_token_id_user', return_value=(True, "user_id")), \
          patch('project.app.controllers.Endpoints.Cliente.consultar_horarios.verificar_id_colaborador', return_value=True), \
          patch('project.app.controllers.Endpoints.Cliente.consultar_horarios.verificar_data', return_value=False): # Data inválida
         headers = {'auth': 'valid', 'token-estabelecimento': 'valid', 'token-user': 'valid'}
@@ -276,11 +269,10 @@ def test_consultar_horarios_ids_servicos_invalidos(client):
     Testa a falha quando 'servicos' contém IDs inválidos.
     Espera-se uma resposta 400 com mensagem específica.
     """
-    with patch('project.app.controllers.Endpoints.Cliente.consultar_horarios.verificar_token_fernet', return_value=True), \
-         patch('project.app.controllers.Endpoints.Cliente.consultar_horarios.verificar_token_jwt', return_value=True), \
-         patch('project.app.controllers.Endpoints.Cliente.consultar_horarios.validar_token_consultar_horarios', return_value=True), \
-         patch('project.app.controllers.Endpoints.Cliente.consultar_horarios.validar_token_id_estabelecimento', return_value=(True, "est_id")), \
-         patch('project.app.controllers.Endpoints.Cliente.consultar_horarios.validar_token_id_user', return_value=(True, "user_id")), \
+    with patch('project.app.controllers.Middlewares.autenticacao_cliente.verificar_token_fernet', return_value=True), \
+         patch('project.app.controllers.Middlewares.autenticacao_cliente.validar_token_escopo', return_value=True), \
+         patch('project.app.controllers.Middlewares.autenticacao_cliente.validar_token_id_estabelecimento', return_value=(True, "est_id")), \
+         patch('project.app.controllers.Middlewares.autenticacao_cliente.validar_token_id_user', return_value=(True, "user_id")), \
          patch('project.app.controllers.Endpoints.Cliente.consultar_horarios.verificar_id_colaborador', return_value=True), \
          patch('project.app.controllers.Endpoints.Cliente.consultar_horarios.verificar_data', return_value=True), \
          patch('project.app.controllers.Endpoints.Cliente.consultar_horarios.verificar_ids_servicos', return_value=False): # IDs de serviço inválidos
@@ -296,11 +288,10 @@ def test_consultar_horarios_erro_interno_consulta_db(client):
     Testa a falha quando a consulta ao banco de dados (consultar_horarios_agendamento) retorna False.
     Espera-se uma resposta 501 com mensagem específica.
     """
-    with patch('project.app.controllers.Endpoints.Cliente.consultar_horarios.verificar_token_fernet', return_value=True), \
-         patch('project.app.controllers.Endpoints.Cliente.consultar_horarios.verificar_token_jwt', return_value=True), \
-         patch('project.app.controllers.Endpoints.Cliente.consultar_horarios.validar_token_consultar_horarios', return_value=True), \
-         patch('project.app.controllers.Endpoints.Cliente.consultar_horarios.validar_token_id_estabelecimento', return_value=(True, "est_id")), \
-         patch('project.app.controllers.Endpoints.Cliente.consultar_horarios.validar_token_id_user', return_value=(True, "user_id")), \
+    with patch('project.app.controllers.Middlewares.autenticacao_cliente.verificar_token_fernet', return_value=True), \
+         patch('project.app.controllers.Middlewares.autenticacao_cliente.validar_token_escopo', return_value=True), \
+         patch('project.app.controllers.Middlewares.autenticacao_cliente.validar_token_id_estabelecimento', return_value=(True, "est_id")), \
+         patch('project.app.controllers.Middlewares.autenticacao_cliente.validar_token_id_user', return_value=(True, "user_id")), \
          patch('project.app.controllers.Endpoints.Cliente.consultar_horarios.verificar_id_colaborador', return_value=True), \
          patch('project.app.controllers.Endpoints.Cliente.consultar_horarios.verificar_data', return_value=True), \
          patch('project.app.controllers.Endpoints.Cliente.consultar_horarios.verificar_ids_servicos', return_value=True), \
@@ -310,4 +301,101 @@ def test_consultar_horarios_erro_interno_consulta_db(client):
         response = client.post('/consultar-horarios', headers=headers, json=payload)
         assert response.status_code == 501
         data = json.loads(response.data)
-        assert data['erro'] == "Erro interno ao processar solicitação"
\ No newline at end of file
+        assert data['erro'] == "Erro interno ao processar solicitação"
+
+# --- Testes para a consulta por período (data_inicial / data_final) ---
+
+def test_consultar_horarios_periodo_sucesso(client):
+    """
+    Testa a consulta de várias datas em uma única requisição.
+    Espera-se uma resposta 200 OK com os horários agrupados por data,
+    com lista vazia para as datas sem horários disponíveis.
+    """
+    horarios_por_data = {
+        "2024-01-10": [datetime.time(9, 0), datetime.time(9, 30)],
+        "2024-01-11": [None]
+    }
+    with patch('project.app.controllers.Middlewares.autenticacao_cliente.verificar_token_fernet', return_value=True), \
+         patch('project.app.controllers.Middlewares.autenticacao_cliente.validar_token_escopo', return_value=True), \
+         patch('project.app.controllers.Middlewares.autenticacao_cliente.validar_token_id_estabelecimento', return_value=(True, "est_id_abc")), \
+         patch('project.app.controllers.Middlewares.autenticacao_cliente.validar_token_id_user', return_value=(True, "user_id_xyz")), \
+         patch('project.app.controllers.Endpoints.Cliente.consultar_horarios.verificar_id_colaborador', return_value=True), \
+         patch('project.app.controllers.Endpoints.Cliente.consultar_horarios.verificar_periodo', return_value=True) as mock_v_periodo, \
+         patch('project.app.controllers.Endpoints.Cliente.consultar_horarios.verificar_ids_servicos', return_value=True), \
+         patch('project.app.controllers.Endpoints.Cliente.consultar_horarios.consultar_horarios_periodo', return_value=(True, horarios_por_data)) as mock_cons_periodo, \
+         patch('project.app.controllers.Endpoints.Cliente.consultar_horarios.consultar_horarios_agendamento') as mock_cons_hor:
+
+        client.set_cookie('token_estabelecimento', 'valid-jwt-est-token')
+        client.set_cookie('token_user', 'valid-jwt-user-token')
+        payload = {
+            'servicos': ["serv1"],
+            'colaborador_id': "colab_1",
+            'data_inicial': "2024-01-10",
+            'data_final': "2024-01-11"
+        }
+        response = client.post('/consultar-horarios', headers={'Authorization': 'valid-fernet-token'}, json=payload)
+
+        assert response.status_code == 200
+        data = json.loads(response.data)
+        assert data['horarios'] == {"2024-01-10": ["09:00:00", "09:30:00"], "2024-01-11": []}
+        mock_v_periodo.assert_called_once_with("2024-01-10", "2024-01-11")
+        mock_cons_periodo.assert_called_once_with("est_id_abc", "colab_1", "2024-01-10", "2024-01-11", ["serv1"])
+        mock_cons_hor.assert_not_called()
+
+def test_consultar_horarios_periodo_invalido(client):
+    """
+    Testa a falha quando o período informado é inválido (ex.: data inicial após a final).
+    Espera-se uma resposta 400 com mensagem específica.
+    """
+    with patch('project.app.controllers.Middlewares.autenticacao_cliente.verificar_token_fernet', return_value=True), \
+         patch('project.app.controllers.Middlewares.autenticacao_cliente.validar_token_escopo', return_value=True), \
+         patch('project.app.controllers.Middlewares.autenticacao_cliente.validar_token_id_estabelecimento', return_value=(True, "est_id")), \
+         patch('project.app.controllers.Middlewares.autenticacao_cliente.validar_token_id_user', return_value=(True, "user_id")), \
+         patch('project.app.controllers.Endpoints.Cliente.consultar_horarios.verificar_id_colaborador', return_value=True), \
+         patch('project.app.controllers.Endpoints.Cliente.consultar_horarios.verificar_periodo', return_value=False), \
+         patch('project.app.controllers.Endpoints.Cliente.consultar_horarios.consultar_horarios_periodo') as mock_cons_periodo:
+
+        client.set_cookie('token_estabelecimento', 'valid')
+        client.set_cookie('token_user', 'valid')
+        payload = {'servicos': ["s1"], 'colaborador_id': "c1", 'data_inicial': "2024-01-11", 'data_final': "2024-01-10"}
+        response = client.post('/consultar-horarios', headers={'Authorization': 'valid'}, json=payload)
+
+        assert response.status_code == 400
+        data = json.loads(response.data)
+        assert data['erro'] == "Dados invalidos: período inválido"
+        mock_cons_periodo.assert_not_called()
+
+
+# --- Testes para a consulta sem colaborador ("qualquer profissional") ---
+
+def test_consultar_horarios_qualquer_colaborador(client):
+    """
+    Testa a consulta sem 'colaborador_id'.
+    Espera-se uma resposta 200 OK com cada horário acompanhado dos colaboradores livres nele.
+    """
+    horarios_mock = [
+        (datetime.time(9, 0), ["colab_1", "colab_2"]),
+        (datetime.time(9, 30), ["colab_2"])
+    ]
+    with patch('project.app.controllers.Middlewares.autenticacao_cliente.verificar_token_fernet', return_value=True), \
+         patch('project.app.controllers.Middlewares.autenticacao_cliente.validar_token_escopo', return_value=True), \
+         patch('project.app.controllers.Middlewares.autenticacao_cliente.validar_token_id_estabelecimento', return_value=(True, "est_id_abc")), \
+         patch('project.app.controllers.Middlewares.autenticacao_cliente.validar_token_id_user', return_value=(True, "user_id_xyz")), \
+         patch('project.app.controllers.Endpoints.Cliente.consultar_horarios.verificar_id_colaborador') as mock_v_id_colab, \
+         patch('project.app.controllers.Endpoints.Cliente.consultar_horarios.verificar_data', return_value=True), \
+         patch('project.app.controllers.Endpoints.Cliente.consultar_horarios.verificar_ids_servicos', return_value=True), \
+         patch('project.app.controllers.Endpoints.Cliente.consultar_horarios.consultar_horarios_agendamento', return_value=(True, horarios_mock)) as mock_cons_hor:
+
+        client.set_cookie('token_estabelecimento', 'valid-jwt-est-token')
+        client.set_cookie('token_user', 'valid-jwt-user-token')
+        payload = {'servicos': ["serv1"], 'data': "2024-01-10"}
+        response = client.post('/consultar-horarios', headers={'Authorization': 'valid-fernet-token'}, json=payload)
+
+        assert response.status_code == 200
+        data = json.loads(response.data)
+        assert data['horarios'] == [
+            {"horario": "09:00:00", "colaboradores": ["colab_1", "colab_2"]},
+            {"horario": "09:30:00", "colaboradores": ["colab_2"]}
+        ]
+        mock_v_id_colab.assert_not_called()
+        mock_cons_hor.assert_called_once_with("est_id_abc", None, "2024-01-10", ["serv1"])
@@ -0,0 +1,78 @@
+import pytest
+from unittest.mock import patch
+from flask import Flask, json
+from project.app.controllers.Endpoints.Cliente.consultar_metricas import consultar_metricas_bp
+
+@pytest.fixture
+def app():
+    """
+    Fixture que cria e configura uma instância da aplicação Flask para os testes.
+    Registra o blueprint 'consultar_metricas_bp' e ativa o modo de teste.
+    """
+    app = Flask(__name__)
+    app.register_blueprint(consultar_metricas_bp)
+    app.config['TESTING'] = True
+    return app
+
+@pytest.fixture
+def client(app):
+    """
+    Fixture que cria um cliente de teste para fazer requisições HTTP à aplicação.
+    """
+    return app.test_client()
+
+# --- Testes para o endpoint /consultar-metricas ---
+
+def test_consultar_metricas_sucesso(client):
+    """
+    Testa a consulta das métricas com token válido.
+    Espera-se uma resposta 200 OK com os contadores dos caches de catálogos e de tokens do pool do bcrypt e do limite de tentativas de login.
+    """
+    estatisticas = {
+        "itens": 2,
+        "max_itens": 3000,
+        "catalogos": {"servicos": {"acertos": 5, "revalidacoes": 1, "faltas": 2}}
+    }
+    estatisticas_tokens = {"acertos_positivos": 9, "acertos_negativos": 1, "faltas": 3}
+    estatisticas_login = {"admitidas": 7, "recusadas": {"ip": 1, "email": 3, "estabelecimento": 0}, "armazenamento": "memoria"}
+    estatisticas_bcrypt = {"executadas": 4, "recusadas": 2, "expiradas": 0, "workers": 2, "fila_max": 8, "timeout": 2.0}
+    with patch('project.app.controllers.Middlewares.autenticacao_cliente.verificar_token_fernet', return_value=True), \
+         patch('project.app.controllers.Middlewares.autenticacao_cliente.validar_token_escopo', return_value=True), \
+         patch('project.app.controllers.Endpoints.Cliente.consultar_metricas.estatisticas_catalogo', return_value=estatisticas), \
+         patch('project.app.controllers.Endpoints.Cliente.consultar_metricas.estatisticas_tokens', return_value=estatisticas_tokens), \
+         patch('project.app.controllers.Endpoints.Cliente.consultar_metricas.estatisticas_bcrypt', return_value=estatisticas_bcrypt), \
+         patch('project.app.controllers.Endpoints.Cliente.consultar_metricas.estatisticas_login', return_value=estatisticas_login):
+
+        response = client.post('/consultar-metricas', headers={'Authorization': 'valid-fernet-token'})
+
+        assert response.status_code == 200
+        data = json.loads(response.data)
+        assert data['cache_catalogo'] == estatisticas
+        assert data['cache_tokens'] == estatisticas_tokens
+        assert data['bcrypt'] == estatisticas_bcrypt
+        assert data['tentativas_login'] == estatisticas_login
+
+def test_consultar_metricas_sem_autorizacao(client):
+    """
+    Testa a consulta das métricas sem o header 'Authorization'.
+    Espera-se uma resposta 401 Unauthorized.
+    """
+    response = client.post('/consultar-metricas')
+
+    assert response.status_code == 401
+    data = json.loads(response.data)
+    assert data['erro'] == "Autenticação falhou"
+
+def test_consultar_metricas_token_invalido(client):
+    """
+    Testa a consulta das métricas com um token que não corresponde ao escopo de métricas.
+    Espera-se uma resposta 401 Unauthorized.
+    """
+    with patch('project.app.controllers.Middlewares.autenticacao_cliente.verificar_token_fernet', return_value=True), \
+         patch('project.app.controllers.Middlewares.autenticacao_cliente.validar_token_escopo', return_value=False), \
+         patch('project.app.controllers.Endpoints.Cliente.consultar_metricas.estatisticas_catalogo') as mock_estatisticas:
+
+        response = client.post('/consultar-metricas', headers={'Authorization': 'outro-token'})
+
+        assert response.status_code == 401
+        mock_estatisticas.assert_not_called()
\ No newline at end of file
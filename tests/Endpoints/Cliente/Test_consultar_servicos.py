@@ -34,11 +34,10 @@ def test_consultar_servicos_sucesso_com_servicos(client):
     Espera-se uma resposta 200 OK com a lista de serviços.
     """
     # Mock das funções de serviço para simular um cenário de sucesso
-    with patch('project.app.controllers.Endpoints.Cliente.consultar_servicos.verificar_token_fernet', return_value=True) as mock_ver_fernet, \
-         patch('project.app.controllers.Endpoints.Cliente.consultar_servicos.verificar_token_jwt', return_value=True) as mock_ver_jwt, \
-         patch('project.app.controllers.Endpoints.Cliente.consultar_servicos.validar_token_consultar_servico', return_value=True) as mock_val_token_serv, \
-         patch('project.app.controllers.Endpoints.Cliente.consultar_servicos.validar_token_id_estabelecimento', return_value=(True, "est_id_123")) as mock_val_id_est, \
-         patch('project.app.controllers.Endpoints.Cliente.consultar_servicos.validar_token_id_user', return_value=(True, "user_id_456")) as mock_val_id_user, \
+    with patch('project.app.controllers.Middlewares.autenticacao_cliente.verificar_token_fernet', return_value=True) as mock_ver_fernet, \
+         patch('project.app.controllers.Middlewares.autenticacao_cliente.validar_token_escopo', return_value=True) as mock_val_token_serv, \
+         patch('project.app.controllers.Middlewares.autenticacao_cliente.validar_token_id_estabelecimento', return_value=(True, "est_id_123")) as mock_val_id_est, \
+         patch('project.app.controllers.Middlewares.autenticacao_cliente.validar_token_id_user', return_value=(True, "user_id_456")) as mock_val_id_user, \
          patch('project.app.controllers.Endpoints.Cliente.consultar_servicos.consultar_servicos_por_estabelecimento', return_value=(True, [{"id": 1, "nome": "Corte"}, {"id": 2, "nome": "Barba"}])) as mock_cons_serv:
 
         headers = {
@@ -58,7 +57,6 @@ def test_consultar_servicos_sucesso_com_servicos(client):
 
         # Verifica se os mocks foram chamados como esperado
         mock_ver_fernet.assert_called_once_with('valid-fernet-token')
-        assert mock_ver_jwt.call_count == 2 # Chamado para token-estabelecimento e token-user
         mock_val_token_serv.assert_called_once_with('valid-fernet-token')
         mock_val_id_est.assert_called_once_with('valid-jwt-est-token')
         mock_val_id_user.assert_called_once_with("est_id_123", 'valid-jwt-user-token')
@@ -70,11 +68,10 @@ def test_consultar_servicos_sucesso_sem_servicos_cadastrados(client):
     mas o estabelecimento não possui serviços cadastrados (lista vazia).
     Espera-se uma resposta 200 OK com uma lista de serviços vazia.
     """
-    with patch('project.app.controllers.Endpoints.Cliente.consultar_servicos.verificar_token_fernet', return_value=True), \
-         patch('project.app.controllers.Endpoints.Cliente.consultar_servicos.verificar_token_jwt', return_value=True), \
-         patch('project.app.controllers.Endpoints.Cliente.consultar_servicos.validar_token_consultar_servico', return_value=True), \
-         patch('project.app.controllers.Endpoints.Cliente.consultar_servicos.validar_token_id_estabelecimento', return_value=(True, "est_id_123")), \
-         patch('project.app.controllers.Endpoints.Cliente.consultar_servicos.validar_token_id_user', return_value=(True, "user_id_456")), \
+    with patch('project.app.controllers.Middlewares.autenticacao_cliente.verificar_token_fernet', return_value=True), \
+         patch('project.app.controllers.Middlewares.autenticacao_cliente.validar_token_escopo', return_value=True), \
+         patch('project.app.controllers.Middlewares.autenticacao_cliente.validar_token_id_estabelecimento', return_value=(True, "est_id_123")), \
+         patch('project.app.controllers.Middlewares.autenticacao_cliente.validar_token_id_user', return_value=(True, "user_id_456")), \
          patch('project.app.controllers.Endpoints.Cliente.consultar_servicos.consultar_servicos_por_estabelecimento', return_value=(True, [])): # Lista de serviços vazia
 
         headers = {
@@ -97,11 +94,10 @@ def test_consultar_servicos_falha_consulta_db(client):
     (retorna (False, ...)).
     Espera-se uma resposta 404 Not Found.
     """
-    with patch('project.app.controllers.Endpoints.Cliente.consultar_servicos.verificar_token_fernet', return_value=True), \
-         patch('project.app.controllers.Endpoints.Cliente.consultar_servicos.verificar_token_jwt', return_value=True), \
-         patch('project.app.controllers.Endpoints.Cliente.consultar_servicos.validar_token_consultar_servico', return_value=True), \
-         patch('project.app.controllers.Endpoints.Cliente.consultar_servicos.validar_token_id_estabelecimento', return_value=(True, "est_id_123")), \
-         patch('project.app.controllers.Endpoints.Cliente.consultar_servicos.validar_token_id_user', return_value=(True, "user_id_456")), \
+    with patch('project.app.controllers.Middlewares.autenticacao_cliente.verificar_token_fernet', return_value=True), \
+         patch('project.app.controllers.Middlewares.autenticacao_cliente.validar_token_escopo', return_value=True), \
+         patch('project.app.controllers.Middlewares.autenticacao_cliente.validar_token_id_estabelecimento', return_value=(True, "est_id_123")), \
+         patch('project.app.controllers.Middlewares.autenticacao_cliente.validar_token_id_user', return_value=(True, "user_id_456")), \
          patch('project.app.controllers.Endpoints.Cliente.consultar_servicos.consultar_servicos_por_estabelecimento', return_value=(False, [])): # Falha na consulta
 
         headers = {
@@ -120,11 +116,10 @@ def test_consultar_servicos_falha_consulta_db_retorna_none(client):
     Testa o cenário onde a consulta ao banco de dados por serviços retorna None.
     Espera-se uma resposta 404 Not Found.
     """
-    with patch('project.app.controllers.Endpoints.Cliente.consultar_servicos.verificar_token_fernet', return_value=True), \
-         patch('project.app.controllers.Endpoints.Cliente.consultar_servicos.verificar_token_jwt', return_value=True), \
-         patch('project.app.controllers.Endpoints.Cliente.consultar_servicos.validar_token_consultar_servico', return_value=True), \
-         patch('project.app.controllers.Endpoints.Cliente.consultar_servicos.validar_token_id_estabelecimento', return_value=(True, "est_id_123")), \
-         patch('project.app.controllers.Endpoints.Cliente.consultar_servicos.validar_token_id_user', return_value=(True, "user_id_456")), \
+    with patch('project.app.controllers.Middlewares.autenticacao_cliente.verificar_token_fernet', return_value=True), \
+         patch('project.app.controllers.Middlewares.autenticacao_cliente.validar_token_escopo', return_value=True), \
+         patch('project.app.controllers.Middlewares.autenticacao_cliente.validar_token_id_estabelecimento', return_value=(True, "est_id_123")), \
+         patch('project.app.controllers.Middlewares.autenticacao_cliente.validar_token_id_user', return_value=(True, "user_id_456")), \
          patch('project.app.controllers.Endpoints.Cliente.consultar_servicos.consultar_servicos_por_estabelecimento', return_value=None): # Consulta retorna None
 
         headers = {
@@ -163,7 +158,7 @@ def test_consultar_servicos_token_fernet_invalido(client):
     Testa a falha quando o token Fernet ('auth') é inválido.
     Espera-se uma resposta 401 Unauthorized.
     """
-    with patch('project.app.controllers.Endpoints.Cliente.consultar_servicos.verificar_token_fernet', return_value=False):
+    with patch('project.app.controllers.Middlewares.autenticacao_cliente.verificar_token_fernet', return_value=False):
         headers = {
             'auth': 'invalid-fernet-token',
             'token-estabelecimento': 'valid-jwt-est-token',
@@ -179,8 +174,10 @@ def test_consultar_servicos_token_jwt_estabelecimento_invalido(client):
     Testa a falha quando o token JWT do estabelecimento é inválido.
     Espera-se uma resposta 401 Unauthorized.
     """
-    with patch('project.app.controllers.Endpoints.Cliente.consultar_servicos.verificar_token_fernet', return_value=True), \
-         patch('project.app.controllers.Endpoints.Cliente.consultar_servicos.verificar_token_jwt', side_effect=[False, True]): # Primeiro JWT (est) é inválido
+    with patch('project.app.controllers.Middlewares.autenticacao_cliente.verificar_token_fernet', return_value=True), \
+         patch('project.app.controllers.Middlewares.autenticacao_cliente.validar_token_escopo', return_value=True), \
+         patch('project.app.controllers.Middlewares.autenticacao_cliente.validar_token_id_estabelecimento', return_value=False), \
+         patch('project.app.controllers.Middlewares.autenticacao_cliente.validar_token_id_user', return_value=(True, "user_id_456")): # Primeiro JWT (est) é inválido
         headers = {
             'auth': 'valid-fernet-token',
             'token-estabelecimento': 'invalid-jwt-est-token',
@@ -196,8 +193,10 @@ def test_consultar_servicos_token_jwt_user_invalido(client):
     Testa a falha quando o token JWT do usuário é inválido.
     Espera-se uma resposta 401 Unauthorized.
     """
-    with patch('project.app.controllers.Endpoints.Cliente.consultar_servicos.verificar_token_fernet', return_value=True), \
-         patch('project.app.controllers.Endpoints.Cliente.consultar_servicos.verificar_token_jwt', side_effect=[True, False]): # Segundo JWT (user) é inválido
+    with patch('project.app.controllers.Middlewares.autenticacao_cliente.verificar_token_fernet', return_value=True), \
+         patch('project.app.controllers.Middlewares.autenticacao_cliente.validar_token_escopo', return_value=True), \
+         patch('project.app.controllers.Middlewares.autenticacao_cliente.validar_token_id_estabelecimento', return_value=(True, "est_id_123")), \
+         patch('project.app.controllers.Middlewares.autenticacao_cliente.validar_token_id_user', return_value=False): # Segundo JWT (user) é inválido
         headers = {
             'auth': 'valid-fernet-token',
             'token-estabelecimento': 'valid-jwt-est-token',
@@ -213,9 +212,8 @@ def test_consultar_servicos_token_auth_nao_valido_para_servico(client):
     Testa a falha quando o token 'auth' não é válido para a consulta de serviços.
     Espera-se uma resposta 401 Unauthorized.
     """
-    with patch('project.app.controllers.Endpoints.Cliente.consultar_servicos.verificar_token_fernet', return_value=True), \
-         patch('project.app.controllers.Endpoints.Cliente.consultar_servicos.verificar_token_jwt', return_value=True), \
-         patch('project.app.controllers.Endpoints.Cliente.consultar_servicos.validar_token_consultar_servico', return_value=False): # Token auth inválido para serviço
+    with patch('project.app.controllers.Middlewares.autenticacao_cliente.verificar_token_fernet', return_value=True), \
+         patch('project.app.controllers.Middlewares.autenticacao_cliente.validar_token_escopo', return_value=False): # Token auth inválido para serviço
         headers = {
             'auth': 'valid-fernet-token-but-not-for-service',
             'token-estabelecimento': 'valid-jwt-est-token',
@@ -232,10 +230,9 @@ def test_consultar_servicos_token_id_estabelecimento_invalido(client):
     (validar_token_id_estabelecimento retorna False ou (False, ...)).
     Espera-se uma resposta 401 Unauthorized.
     """
-    with patch('project.app.controllers.Endpoints.Cliente.consultar_servicos.verificar_token_fernet', return_value=True), \
-         patch('project.app.controllers.Endpoints.Cliente.consultar_servicos.verificar_token_jwt', return_value=True), \
-         patch('project.app.controllers.Endpoints.Cliente.consultar_servicos.validar_token_consultar_servico', return_value=True), \
-         patch('project.app.controllers.Endpoints.Cliente.consultar_servicos.validar_token_id_estabelecimento', return_value=False): # Validação do ID do estabelecimento falha
+    with patch('project.app.controllers.Middlewares.autenticacao_cliente.verificar_token_fernet', return_value=True), \
+         patch('project.app.controllers.Middlewares.autenticacao_cliente.validar_token_escopo', return_value=True), \
+         patch('project.app.controllers.Middlewares.autenticacao_cliente.validar_token_id_estabelecimento', return_value=False): # Validação do ID do estabelecimento falha
         headers = {
             'auth': 'valid-fernet-token',
             'token-estabelecimento': 'valid-jwt-est-token-invalid-id',
@@ -252,10 +249,9 @@ def test_consultar_servicos_token_id_estabelecimento_retorna_true_none(client):
     o que invalida a condição 'if valid_est and estabelecimento_id'.
     Espera-se uma resposta 401 Unauthorized.
     """
-    with patch('project.app.controllers.Endpoints.Cliente.consultar_servicos.verificar_token_fernet', return_value=True), \
-         patch('project.app.controllers.Endpoints.Cliente.consultar_servicos.verificar_token_jwt', return_value=True), \
-         patch('project.app.controllers.Endpoints.Cliente.consultar_servicos.validar_token_consultar_servico', return_value=True), \
-         patch('project.app.controllers.Endpoints.Cliente.consultar_servicos.validar_token_id_estabelecimento', return_value=(True, None)): # ID do estabelecimento é None
+    with patch('project.app.controllers.Middlewares.autenticacao_cliente.verificar_token_fernet', return_value=True), \
+         patch('project.app.controllers.Middlewares.autenticacao_cliente.validar_token_escopo', return_value=True), \
+         patch('project.app.controllers.Middlewares.autenticacao_cliente.validar_token_id_estabelecimento', return_value=(True, None)): # ID do estabelecimento é None
         headers = {
             'auth': 'valid-fernet-token',
             'token-estabelecimento': 'valid-jwt-est-token-id-none',
@@ -272,11 +268,10 @@ def test_consultar_servicos_token_id_user_invalido_nao_tupla(client):
     (validar_token_id_user retorna um valor que não é uma tupla, ex: False).
     Espera-se uma resposta 401 Unauthorized.
     """
-    with patch('project.app.controllers.Endpoints.Cliente.consultar_servicos.verificar_token_fernet', return_value=True), \
-         patch('project.app.controllers.Endpoints.Cliente.consultar_servicos.verificar_token_jwt', return_value=True), \
-         patch('project.app.controllers.Endpoints.Cliente.consultar_servicos.validar_token_consultar_servico', return_value=True), \
-         patch('project.app.controllers.Endpoints.Cliente.consultar_servicos.validar_token_id_estabelecimento', return_value=(True, "est_id_123")), \
-         patch('project.app.controllers.Endpoints.Cliente.consultar_servicos.validar_token_id_user', return_value=False): # Validação do ID do usuário falha (não é tupla)
+    with patch('project.app.controllers.Middlewares.autenticacao_cliente.verificar_token_fernet', return_value=True), \
+         patch('project.app.controllers.Middlewares.autenticacao_cliente.validar_token_escopo', return_value=True), \
+         patch('project.app.controllers.Middlewares.autenticacao_cliente.validar_token_id_estabelecimento', return_value=(True, "est_id_123")), \
+         patch('project.app.controllers.Middlewares.autenticacao_cliente.validar_token_id_user', return_value=False): # Validação do ID do usuário falha (não é tupla)
         headers = {
             'auth': 'valid-fernet-token',
             'token-estabelecimento': 'valid-jwt-est-token',
@@ -285,4 +280,31 @@ def test_consultar_servicos_token_id_user_invalido_nao_tupla(client):
         response = client.post('/consultar-servicos', headers=headers)
         assert response.status_code == 401
         data = json.loads(response.data)
-        assert data['erro'] == "Autenticação falhou"
\ No newline at end of file
+        assert data['erro'] == "Autenticação falhou"
+
+
+def test_consultar_servicos_json_no_banco(client):
+    """
+    Testa a consulta com JSON_NO_BANCO ativo: a lista vem como texto JSON do banco e é
+    inserida no corpo com o mesmo envelope da resposta com jsonify.
+    """
+    client.set_cookie('token_estabelecimento', 'valid-jwt-est-token')
+    client.set_cookie('token_user', 'valid-jwt-user-token')
+    with patch('project.app.controllers.Middlewares.autenticacao_cliente.verificar_token_fernet', return_value=True), \
+         patch('project.app.controllers.Middlewares.autenticacao_cliente.validar_token_escopo', return_value=True), \
+         patch('project.app.controllers.Middlewares.autenticacao_cliente.validar_token_id_estabelecimento', return_value=(True, "est_id_123")), \
+         patch('project.app.controllers.Middlewares.autenticacao_cliente.validar_token_id_user', return_value=(True, "user_id_456")), \
+         patch('project.app.controllers.Endpoints.Cliente.consultar_servicos.JSON_NO_BANCO', True), \
+         patch('project.app.controllers.Endpoints.Cliente.consultar_servicos.servicos_json_do_catalogo', return_value='[["id_1", "Corte"]]') as mock_json:
+
+        response = client.post('/consultar-servicos', headers={'Authorization': 'valid-fernet-token'})
+
+        assert response.status_code == 200
+        assert response.mimetype == "application/json"
+        assert json.loads(response.data) == {
+            "message": "Requisição bem sucedida",
+            "estabelecimento_id": "est_id_123",
+            "user_id": "user_id_456",
+            "servicos": [["id_1", "Corte"]]
+        }
+        mock_json.assert_called_once_with("est_id_123")
\ No newline at end of file
@@ -34,11 +34,10 @@ def test_criar_agendamento_sucesso(client):
     e a função 'agendar' retorna True.
     Espera-se uma resposta 200 OK.
     """
-    with patch('project.app.controllers.Endpoints.Cliente.criar_agendamento.verificar_token_fernet', return_value=True) as mock_v_fernet, \
-         patch('project.app.controllers.Endpoints.Cliente.criar_agendamento.verificar_token_jwt', return_value=True) as mock_v_jwt, \
-         patch('project.app.controllers.Endpoints.Cliente.criar_agendamento.validar_token_consultar_servico', return_value=True) as mock_v_token_serv, \
-         patch('project.app.controllers.Endpoints.Cliente.criar_agendamento.validar_token_id_estabelecimento', return_value=(True, "est_id_1")) as mock_v_id_est, \
-         patch('project.app.controllers.Endpoints.Cliente.criar_agendamento.validar_token_id_user', return_value=(True, "user_id_1")) as mock_v_id_user, \
+    with patch('project.app.controllers.Middlewares.autenticacao_cliente.verificar_token_fernet', return_value=True) as mock_v_fernet, \
+         patch('project.app.controllers.Middlewares.autenticacao_cliente.validar_token_escopo', return_value=True) as mock_v_token_serv, \
+         patch('project.app.controllers.Middlewares.autenticacao_cliente.validar_token_id_estabelecimento', return_value=(True, "est_id_1")) as mock_v_id_est, \
+         patch('project.app.controllers.Middlewares.autenticacao_cliente.validar_token_id_user', return_value=(True, "user_id_1")) as mock_v_id_user, \
          patch('project.app.controllers.Endpoints.Cliente.criar_agendamento.verificar_id_colaborador', return_value=True) as mock_v_id_colab, \
          patch('project.app.controllers.Endpoints.Cliente.criar_agendamento.verificar_horario_valido', return_value=True) as mock_v_horario, \
          patch('project.app.controllers.Endpoints.Cliente.criar_agendamento.verificar_data', return_value=True) as mock_v_data, \
@@ -66,7 +65,6 @@ def test_criar_agendamento_sucesso(client):
 
         # Verifica chamadas dos mocks
         mock_v_fernet.assert_called_once_with('valid-fernet-token')
-        assert mock_v_jwt.call_count == 2 # Para token_user e token_estabelecimento
         mock_v_token_serv.assert_called_once_with('valid-fernet-token') # Note: usando validar_token_consultar_servico conforme o código
         mock_v_id_est.assert_called_once_with('valid-jwt-est-token')
         mock_v_id_user.assert_called_once_with("est_id_1", 'valid-jwt-user-token')
@@ -96,41 +94,36 @@ def test_criar_agendamento_cabecalho_ausente(client, missing_header):
     assert data['erro'] == "Erro de autenticação" # Mensagem genérica do último else
 
 @pytest.mark.parametrize("mock_config", [
-    {'target': 'project.app.controllers.Endpoints.Cliente.criar_agendamento.verificar_token_fernet', 'return_value': False},
-    {'target': 'project.app.controllers.Endpoints.Cliente.criar_agendamento.verificar_token_jwt', 'side_effect': [False, True]}, # token_user falha
-    {'target': 'project.app.controllers.Endpoints.Cliente.criar_agendamento.verificar_token_jwt', 'side_effect': [True, False]}, # token_estabelecimento falha
+    {'target': 'project.app.controllers.Middlewares.autenticacao_cliente.verificar_token_fernet', 'return_value': False},
+    {'target': 'project.app.controllers.Middlewares.autenticacao_cliente.validar_token_id_estabelecimento', 'return_value': False}, # token_estabelecimento falha
+    {'target': 'project.app.controllers.Middlewares.autenticacao_cliente.validar_token_id_user', 'return_value': False}, # token_user falha
 ])
 def test_criar_agendamento_falha_verificacao_token_inicial(client, mock_config):
     """
-    Testa a falha quando a verificação inicial de um dos tokens (Fernet ou JWT) falha.
+    Testa a falha quando a verificação de um dos tokens (formato do Fernet ou decodificação de um dos JWTs) falha.
     Espera-se uma resposta 401 Unauthorized.
     """
-    with patch(mock_config['target'], **{key: val for key, val in mock_config.items() if key != 'target'}):
-        # Se verificar_token_jwt for mockado com side_effect, precisamos garantir que o outro mock de verificar_token_fernet ainda funcione
-        # ou que o side_effect cubra todas as chamadas de verificar_token_jwt.
-        # Para simplificar, se o target é verificar_token_jwt, o verificar_token_fernet é True.
-        # Se o target é verificar_token_fernet, o verificar_token_jwt é True (ou não é chamado).
-        patch_fernet = patch('project.app.controllers.Endpoints.Cliente.criar_agendamento.verificar_token_fernet', return_value=True)
-        patch_jwt = patch('project.app.controllers.Endpoints.Cliente.criar_agendamento.verificar_token_jwt', return_value=True)
-
-        if mock_config['target'] == 'project.app.controllers.Endpoints.Cliente.criar_agendamento.verificar_token_fernet':
-            patch_jwt.start()
-        else: # mock_config['target'] is verificar_token_jwt
-            patch_fernet.start()
-
-
+    validos = {
+        'project.app.controllers.Middlewares.autenticacao_cliente.verificar_token_fernet': True,
+        'project.app.controllers.Middlewares.autenticacao_cliente.validar_token_escopo': True,
+        'project.app.controllers.Middlewares.autenticacao_cliente.validar_token_id_estabelecimento': (True, "est_id_123"),
+        'project.app.controllers.Middlewares.autenticacao_cliente.validar_token_id_user': (True, "user_id_456"),
+    }
+    validos[mock_config['target']] = mock_config['return_value']
+    patches = [patch(alvo, return_value=valor) for alvo, valor in validos.items()]
+    for p in patches:
+        p.start()
+    try:
         headers = {'auth': 't1', 'token-estabelecimento': 't2', 'token-user': 't3'}
         payload = {'colaborador_id': 'c1', 'horario': 'h1', 'data': 'd1', 'servicos': ['s1']}
         response = client.post('/criar-agendamento', headers=headers, json=payload)
-        
-        if mock_config['target'] == 'project.app.controllers.Endpoints.Cliente.criar_agendamento.verificar_token_fernet':
-            patch_jwt.stop()
-        else:
-            patch_fernet.stop()
+    finally:
+        for p in patches:
+            p.stop()
 
-        assert response.status_code == 401
-        data = json.loads(response.data)
-        assert data['erro'] == "Erro de autenticação"
+    assert response.status_code == 401
+    data = json.loads(response.data)
+    assert data['erro'] == "Erro de autenticação"
 
 
 def test_criar_agendamento_falha_validar_token_servico(client):
@@ -138,9 +131,8 @@ def test_criar_agendamento_falha_validar_token_servico(client):
     Testa a falha quando validar_token_consultar_servico (token de API) retorna False.
     Espera-se uma resposta 401 Unauthorized.
     """
-    with patch('project.app.controllers.Endpoints.Cliente.criar_agendamento.verificar_token_fernet', return_value=True), \
-         patch('project.app.controllers.Endpoints.Cliente.criar_agendamento.verificar_token_jwt', return_value=True), \
-         patch('project.app.controllers.Endpoints.Cliente.criar_agendamento.validar_token_consultar_servico', return_value=False):
+    with patch('project.app.controllers.Middlewares.autenticacao_cliente.verificar_token_fernet', return_value=True), \
+         patch('project.app.controllers.Middlewares.autenticacao_cliente.validar_token_escopo', return_value=False):
         headers = {'auth': 't1', 'token-estabelecimento': 't2', 'token-user': 't3'}
         payload = {'colaborador_id': 'c1', 'horario': 'h1', 'data': 'd1', 'servicos': ['s1']}
         response = client.post('/criar-agendamento', headers=headers, json=payload)
@@ -154,10 +146,9 @@ def test_criar_agendamento_falha_validar_token_id_estabelecimento(client, id_est
     Testa a falha quando validar_token_id_estabelecimento retorna um valor inválido.
     Espera-se uma resposta 401 Unauthorized.
     """
-    with patch('project.app.controllers.Endpoints.Cliente.criar_agendamento.verificar_token_fernet', return_value=True), \
-         patch('project.app.controllers.Endpoints.Cliente.criar_agendamento.verificar_token_jwt', return_value=True), \
-         patch('project.app.controllers.Endpoints.Cliente.criar_agendamento.validar_token_consultar_servico', return_value=True), \
-         patch('project.app.controllers.Endpoints.Cliente.criar_agendamento.validar_token_id_estabelecimento', return_value=id_est_return_val):
+    with patch('project.app.controllers.Middlewares.autenticacao_cliente.verificar_token_fernet', return_value=True), \
+         patch('project.app.controllers.Middlewares.autenticacao_cliente.validar_token_escopo', return_value=True), \
+         patch('project.app.controllers.Middlewares.autenticacao_cliente.validar_token_id_estabelecimento', return_value=id_est_return_val):
         headers = {'auth': 't1', 'token-estabelecimento': 't2', 'token-user': 't3'}
         payload = {'colaborador_id': 'c1', 'horario': 'h1', 'data': 'd1', 'servicos': ['s1']}
         response = client.post('/criar-agendamento', headers=headers, json=payload)
@@ -171,11 +162,10 @@ def test_criar_agendamento_falha_validar_token_id_user(client, id_user_return_va
     Testa a falha quando validar_token_id_user retorna um valor inválido.
     Espera-se uma resposta 401 Unauthorized.
     """
-    with patch('project.app.controllers.Endpoints.Cliente.criar_agendamento.verificar_token_fernet', return_value=True), \
-         patch('project.app.controllers.Endpoints.Cliente.criar_agendamento.verificar_token_jwt', return_value=True), \
-         patch('project.app.controllers.Endpoints.Cliente.criar_agendamento.validar_token_consultar_servico', return_value=True), \
-         patch('project.app.controllers.Endpoints.Cliente.criar_agendamento.validar_token_id_estabelecimento', return_value=(True, "est_id")), \
-         patch('project.app.controllers.Endpoints.Cliente.criar_agendamento.validar_token_id_user', return_value=id_user_return_val):
+    with patch('project.app.controllers.Middlewares.autenticacao_cliente.verificar_token_fernet', return_value=True), \
+         patch('project.app.controllers.Middlewares.autenticacao_cliente.validar_token_escopo', return_value=True), \
+         patch('project.app.controllers.Middlewares.autenticacao_cliente.validar_token_id_estabelecimento', return_value=(True, "est_id")), \
+         patch('project.app.controllers.Middlewares.autenticacao_cliente.validar_token_id_user', return_value=id_user_return_val):
         headers = {'auth': 't1', 'token-estabelecimento': 't2', 'token-user': 't3'}
         payload = {'colaborador_id': 'c1', 'horario': 'h1', 'data': 'd1', 'servicos': ['s1']}
         response = client.post('/criar-agendamento', headers=headers, json=payload)
@@ -198,11 +188,10 @@ def test_criar_agendamento_dados_insuficientes_payload(client, bad_payload):
     Testa a falha quando o payload JSON é inválido ou dados obrigatórios estão ausentes.
     Espera-se uma resposta 400 com "Dados insuficientes para a consulta".
     """
-    with patch('project.app.controllers.Endpoints.Cliente.criar_agendamento.verificar_token_fernet', return_value=True), \
-         patch('project.app.controllers.Endpoints.Cliente.criar_agendamento.verificar_token_jwt', return_value=True), \
-         patch('project.app.controllers.Endpoints.Cliente.criar_agendamento.validar_token_consultar_servico', return_value=True), \
-         patch('project.app.controllers.Endpoints.Cliente.criar_agendamento.validar_token_id_estabelecimento', return_value=(True, "est_id")), \
-         patch('project.app.controllers.Endpoints.Cliente.criar_agendamento.validar_token_id_user', return_value=(True, "user_id")):
+    with patch('project.app.controllers.Middlewares.autenticacao_cliente.verificar_token_fernet', return_value=True), \
+         patch('project.app.controllers.Middlewares.autenticacao_cliente.validar_token_escopo', return_value=True), \
+         patch('project.app.controllers.Middlewares.autenticacao_cliente.validar_token_id_estabelecimento', return_value=(True, "est_id")), \
+         patch('project.app.controllers.Middlewares.autenticacao_cliente.validar_token_id_user', return_value=(True, "user_id")):
         headers = {'auth': 't1', 'token-estabelecimento': 't2', 'token-user': 't3'}
         
         if bad_payload is None:
@@ -226,11 +215,10 @@ def test_criar_agendamento_falha_validacao_dados(client, validation_function_to_
     Testa a falha quando uma das funções de validação de dados (colaborador, horario, data, servicos) retorna False.
     Espera-se uma resposta 400 com "Dados invalidos".
     """
-    with patch('project.app.controllers.Endpoints.Cliente.criar_agendamento.verificar_token_fernet', return_value=True), \
-         patch('project.app.controllers.Endpoints.Cliente.criar_agendamento.verificar_token_jwt', return_value=True), \
-         patch('project.app.controllers.Endpoints.Cliente.criar_agendamento.validar_token_consultar_servico', return_value=True), \
-         patch('project.app.controllers.Endpoints.Cliente.criar_agendamento.validar_token_id_estabelecimento', return_value=(True, "est_id")), \
-         patch('project.app.controllers.Endpoints.Cliente.criar_agendamento.validar_token_id_user', return_value=(True, "user_id")), \
+    with patch('project.app.controllers.Middlewares.autenticacao_cliente.verificar_token_fernet', return_value=True), \
+         patch('project.app.controllers.Middlewares.autenticacao_cliente.validar_token_escopo', return_value=True), \
+         patch('project.app.controllers.Middlewares.autenticacao_cliente.validar_token_id_estabelecimento', return_value=(True, "est_id")), \
+         patch('project.app.controllers.Middlewares.autenticacao_cliente.validar_token_id_user', return_value=(True, "user_id")), \
          patch('project.app.controllers.Endpoints.Cliente.criar_agendamento.verificar_id_colaborador', return_value=validation_function_to_fail != 'project.app.controllers.Endpoints.Cliente.criar_agendamento.verificar_id_colaborador'), \
          patch('project.app.controllers.Endpoints.Cliente.criar_agendamento.verificar_horario_valido', return_value=validation_function_to_fail != 'project.app.controllers.Endpoints.Cliente.criar_agendamento.verificar_horario_valido'), \
          patch('project.app.controllers.Endpoints.Cliente.criar_agendamento.verificar_data', return_value=validation_function_to_fail != 'project.app.controllers.Endpoints.Cliente.criar_agendamento.verificar_data'), \
@@ -260,11 +248,10 @@ def test_criar_agendamento_falhas_funcao_agendar(client, agendar_return, expecte
     """
     Testa diferentes cenários de falha da função 'agendar'.
     """
-    with patch('project.app.controllers.Endpoints.Cliente.criar_agendamento.verificar_token_fernet', return_value=True), \
-         patch('project.app.controllers.Endpoints.Cliente.criar_agendamento.verificar_token_jwt', return_value=True), \
-         patch('project.app.controllers.Endpoints.Cliente.criar_agendamento.validar_token_consultar_servico', return_value=True), \
-         patch('project.app.controllers.Endpoints.Cliente.criar_agendamento.validar_token_id_estabelecimento', return_value=(True, "est_id")), \
-         patch('project.app.controllers.Endpoints.Cliente.criar_agendamento.validar_token_id_user', return_value=(True, "user_id")), \
+    with patch('project.app.controllers.Middlewares.autenticacao_cliente.verificar_token_fernet', return_value=True), \
+         patch('project.app.controllers.Middlewares.autenticacao_cliente.validar_token_escopo', return_value=True), \
+         patch('project.app.controllers.Middlewares.autenticacao_cliente.validar_token_id_estabelecimento', return_value=(True, "est_id")), \
+         patch('project.app.controllers.Middlewares.autenticacao_cliente.validar_token_id_user', return_value=(True, "user_id")), \
          patch('project.app.controllers.Endpoints.Cliente.criar_agendamento.verificar_id_colaborador', return_value=True), \
          patch('project.app.controllers.Endpoints.Cliente.criar_agendamento.verificar_horario_valido', return_value=True), \
          patch('project.app.controllers.Endpoints.Cliente.criar_agendamento.verificar_data', return_value=True), \
@@ -281,4 +268,29 @@ def test_criar_agendamento_falhas_funcao_agendar(client, agendar_return, expecte
             assert not response.data # Verifica se o corpo está vazio
         else:
             data = json.loads(response.data)
-            assert data == expected_json
\ No newline at end of file
+            assert data == expected_json
+
+def test_criar_agendamento_servico_nao_encontrado(client):
+    """
+    Testa o retorno de 'agendar' quando algum serviço do carrinho não pertence ao estabelecimento.
+    Espera-se uma resposta 400 com a mensagem retornada pelo serviço.
+    """
+    with patch('project.app.controllers.Middlewares.autenticacao_cliente.verificar_token_fernet', return_value=True), \
+         patch('project.app.controllers.Middlewares.autenticacao_cliente.validar_token_escopo', return_value=True), \
+         patch('project.app.controllers.Middlewares.autenticacao_cliente.validar_token_id_estabelecimento', return_value=(True, "est_id")), \
+         patch('project.app.controllers.Middlewares.autenticacao_cliente.validar_token_id_user', return_value=(True, "user_id")), \
+         patch('project.app.controllers.Endpoints.Cliente.criar_agendamento.verificar_id_colaborador', return_value=True), \
+         patch('project.app.controllers.Endpoints.Cliente.criar_agendamento.verificar_horario_valido', return_value=True), \
+         patch('project.app.controllers.Endpoints.Cliente.criar_agendamento.verificar_data', return_value=True), \
+         patch('project.app.controllers.Endpoints.Cliente.criar_agendamento.verificar_ids_servicos', return_value=True), \
+         patch('project.app.controllers.Endpoints.Cliente.criar_agendamento.agendar', return_value=(False, "Serviço não encontrado")) as mock_agendar:
+
+        client.set_cookie('token_estabelecimento', 't2')
+        client.set_cookie('token_user', 't3')
+        payload = {'colaborador_id': 'c1', 'horario': 'h1', 'data': 'd1', 'servicos': ['s1', 's2']}
+        response = client.post('/criar-agendamento', headers={'Authorization': 't1'}, json=payload)
+
+        assert response.status_code == 400
+        data = json.loads(response.data)
+        assert data == {"erro": "Serviço não encontrado"}
+        mock_agendar.assert_called_once_with("est_id", "user_id", ['s1', 's2'], 'c1', 'd1', 'h1')
@@ -35,8 +35,8 @@ def test_redirecionamento_inicial_success(client):
     - Um token JWT é gerado corretamente
     """
     # Configura todos os mocks necessários para simular um fluxo de redirecionamento bem-sucedido
-    with patch('project.app.controllers.Endpoints.Cliente.redirecionamento_inicial.verificar_token_fernet', return_value=True), \
-         patch('project.app.controllers.Endpoints.Cliente.redirecionamento_inicial.validar_token_redirecionamento_inicial', return_value=True), \
+    with patch('project.app.controllers.Middlewares.autenticacao_cliente.verificar_token_fernet', return_value=True), \
+         patch('project.app.controllers.Middlewares.autenticacao_cliente.validar_token_escopo', return_value=True), \
          patch('project.app.controllers.Endpoints.Cliente.redirecionamento_inicial.verificar_id_base', return_value=True), \
          patch('project.app.controllers.Endpoints.Cliente.redirecionamento_inicial.verificar_nome_estabelecimento', return_value=True), \
          patch('project.app.controllers.Endpoints.Cliente.redirecionamento_inicial.consultar_estabelecimento', return_value=(True, "123")), \
@@ -90,7 +90,7 @@ def test_redirecionamento_inicial_invalid_fernet_token(client):
     fornecido não é um token Fernet válido
     """
     # Simula a verificação do token Fernet retornando falso (token inválido)
-    with patch('project.app.controllers.Endpoints.Cliente.redirecionamento_inicial.verificar_token_fernet', return_value=False):
+    with patch('project.app.controllers.Middlewares.autenticacao_cliente.verificar_token_fernet', return_value=False):
         headers = {
             'Authorization': 'invalid-token'
         }
@@ -113,8 +113,8 @@ def test_redirecionamento_inicial_invalid_redirection_token(client):
     não é válido para o propósito específico de redirecionamento
     """
     # Simula um token Fernet válido, mas inválido para redirecionamento
-    with patch('project.app.controllers.Endpoints.Cliente.redirecionamento_inicial.verificar_token_fernet', return_value=True), \
-         patch('project.app.controllers.Endpoints.Cliente.redirecionamento_inicial.validar_token_redirecionamento_inicial', return_value=False):
+    with patch('project.app.controllers.Middlewares.autenticacao_cliente.verificar_token_fernet', return_value=True), \
+         patch('project.app.controllers.Middlewares.autenticacao_cliente.validar_token_escopo', return_value=False):
         
         headers = {
             'Authorization': 'valid-fernet-but-invalid-redirect-token'
@@ -137,8 +137,8 @@ def test_redirecionamento_inicial_missing_json(client):
     os dados necessários no corpo da requisição
     """
     # Configura os mocks para simular token válido
-    with patch('project.app.controllers.Endpoints.Cliente.redirecionamento_inicial.verificar_token_fernet', return_value=True), \
-         patch('project.app.controllers.Endpoints.Cliente.redirecionamento_inicial.validar_token_redirecionamento_inicial', return_value=True):
+    with patch('project.app.controllers.Middlewares.autenticacao_cliente.verificar_token_fernet', return_value=True), \
+         patch('project.app.controllers.Middlewares.autenticacao_cliente.validar_token_escopo', return_value=True):
     
         # Prepara cabeçalho válido
         headers = {
@@ -162,8 +162,8 @@ def test_redirecionamento_inicial_incomplete_data(client):
     dos campos necessários nos dados fornecidos
     """
     # Configura os mocks para simular token válido
-    with patch('project.app.controllers.Endpoints.Cliente.redirecionamento_inicial.verificar_token_fernet', return_value=True), \
-         patch('project.app.controllers.Endpoints.Cliente.redirecionamento_inicial.validar_token_redirecionamento_inicial', return_value=True):
+    with patch('project.app.controllers.Middlewares.autenticacao_cliente.verificar_token_fernet', return_value=True), \
+         patch('project.app.controllers.Middlewares.autenticacao_cliente.validar_token_escopo', return_value=True):
         
         # Prepara cabeçalho válido
         headers = {
@@ -192,8 +192,8 @@ def test_redirecionamento_inicial_invalid_data_format(client):
     do ID base ou do nome do estabelecimento é inválido
     """
     # Configura os mocks para simular token válido mas dados com formato inválido
-    with patch('project.app.controllers.Endpoints.Cliente.redirecionamento_inicial.verificar_token_fernet', return_value=True), \
-         patch('project.app.controllers.Endpoints.Cliente.redirecionamento_inicial.validar_token_redirecionamento_inicial', return_value=True), \
+    with patch('project.app.controllers.Middlewares.autenticacao_cliente.verificar_token_fernet', return_value=True), \
+         patch('project.app.controllers.Middlewares.autenticacao_cliente.validar_token_escopo', return_value=True), \
          patch('project.app.controllers.Endpoints.Cliente.redirecionamento_inicial.verificar_id_base', return_value=False):
         
         # Prepara cabeçalho válido
@@ -223,8 +223,8 @@ def test_redirecionamento_inicial_establishment_not_found(client):
     mas o estabelecimento não existe no banco de dados
     """
     # Configura os mocks para simular estabelecimento não encontrado
-    with patch('project.app.controllers.Endpoints.Cliente.redirecionamento_inicial.verificar_token_fernet', return_value=True), \
-         patch('project.app.controllers.Endpoints.Cliente.redirecionamento_inicial.validar_token_redirecionamento_inicial', return_value=True), \
+    with patch('project.app.controllers.Middlewares.autenticacao_cliente.verificar_token_fernet', return_value=True), \
+         patch('project.app.controllers.Middlewares.autenticacao_cliente.validar_token_escopo', return_value=True), \
          patch('project.app.controllers.Endpoints.Cliente.redirecionamento_inicial.verificar_id_base', return_value=True), \
          patch('project.app.controllers.Endpoints.Cliente.redirecionamento_inicial.verificar_nome_estabelecimento', return_value=True), \
          patch('project.app.controllers.Endpoints.Cliente.redirecionamento_inicial.consultar_estabelecimento', return_value=False):
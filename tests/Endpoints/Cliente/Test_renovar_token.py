@@ -0,0 +1,103 @@
+import pytest
+from unittest.mock import patch
+from flask import Flask, json
+from project.app.controllers.Endpoints.Cliente.renovar_token import renovar_token_bp
+
+# Arquivo de testes para o endpoint de renovação do token do usuário
+
+@pytest.fixture
+def app():
+    """
+    Fixture que cria uma instância da aplicação Flask para testes
+    Registra o blueprint de renovação de token e configura o modo de teste
+    """
+    app = Flask(__name__)
+    app.register_blueprint(renovar_token_bp)
+    app.config['TESTING'] = True
+    return app
+
+@pytest.fixture
+def client(app):
+    """
+    Fixture que cria um cliente de teste para fazer requisições HTTP
+    Usa a aplicação criada pela fixture 'app'
+    """
+    return app.test_client()
+
+@pytest.fixture
+def autenticado():
+    """
+    Fixture que simula a autenticação do estabelecimento pelo middleware
+    """
+    with patch('project.app.controllers.Middlewares.autenticacao_cliente.verificar_token_fernet', return_value=True), \
+         patch('project.app.controllers.Middlewares.autenticacao_cliente.validar_token_escopo', return_value=True), \
+         patch('project.app.controllers.Middlewares.autenticacao_cliente.validar_token_id_estabelecimento', return_value=(True, "123")):
+        yield
+
+def test_renovar_token_sucesso(client, autenticado):
+    """
+    Teste do cenário de sucesso: o token de renovação é trocado por um novo
+    e um novo JWT do usuário é emitido, ambos em cookies
+    """
+    with patch('project.app.controllers.Endpoints.Cliente.renovar_token.renovar_token_refresh', return_value=(True, "456", "novo-refresh")) as mock_renovar, \
+         patch('project.app.controllers.Endpoints.Cliente.renovar_token.gerar_jwt_id_estabelecimento', return_value="mock-jwt-token"):
+
+        client.set_cookie('token_estabelecimento', 'valid-jwt-token')
+        client.set_cookie('token_refresh', 'refresh-atual', path='/api/renovar_token')
+        response = client.post('/api/renovar_token', headers={'Authorization': 'valid-fernet-token'})
+
+        assert response.status_code == 200
+        assert json.loads(response.data) == {
+            "status": "success",
+            "message": "Token renovado",
+            "token": "mock-jwt-token"
+        }
+        mock_renovar.assert_called_once_with("123", "refresh-atual")
+        cookies = response.headers.getlist('Set-Cookie')
+        assert any(c.startswith('token_user=mock-jwt-token') for c in cookies)
+        assert any(c.startswith('token_refresh=novo-refresh') and 'Path=/api/renovar_token' in c for c in cookies)
+
+def test_renovar_token_sem_cookie_refresh(client, autenticado):
+    """
+    Teste de falha quando o cookie 'token_refresh' não é enviado
+    """
+    with patch('project.app.controllers.Endpoints.Cliente.renovar_token.renovar_token_refresh') as mock_renovar:
+        client.set_cookie('token_estabelecimento', 'valid-jwt-token')
+        response = client.post('/api/renovar_token', headers={'Authorization': 'valid-fernet-token'})
+
+        assert response.status_code == 401
+        mock_renovar.assert_not_called()
+
+@pytest.mark.parametrize("retorno, status", [
+    ((False, "Token inválido"), 401),
+    ((False, "Token reutilizado"), 401),
+    ((False, "Token já renovado"), 409),
+    ((False, "Erro interno"), 500),
+])
+def test_renovar_token_falhas(client, autenticado, retorno, status):
+    """
+    Teste das falhas da renovação: token inválido ou reutilizado (401), token trocado há
+    poucos segundos por outra requisição (409) e erro interno (500)
+    """
+    with patch('project.app.controllers.Endpoints.Cliente.renovar_token.renovar_token_refresh', return_value=retorno), \
+         patch('project.app.controllers.Endpoints.Cliente.renovar_token.gerar_jwt_id_estabelecimento') as mock_gerar:
+
+        client.set_cookie('token_estabelecimento', 'valid-jwt-token')
+        client.set_cookie('token_refresh', 'refresh-atual', path='/api/renovar_token')
+        response = client.post('/api/renovar_token', headers={'Authorization': 'valid-fernet-token'})
+
+        assert response.status_code == status
+        assert json.loads(response.data)["status"] == "error"
+        mock_gerar.assert_not_called()
+
+def test_renovar_token_sem_autorizacao(client):
+    """
+    Teste de falha quando o header 'Authorization' não é enviado
+    """
+    response = client.post('/api/renovar_token')
+
+    assert response.status_code == 401
+    assert json.loads(response.data) == {
+        "status": "error",
+        "message": "Erro de autenticação"
+    }
\ No newline at end of file
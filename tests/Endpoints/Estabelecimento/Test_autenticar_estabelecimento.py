@@ -0,0 +1,139 @@
+import pytest
+from unittest.mock import patch
+from flask import Flask, json
+from project.app.controllers.Endpoints.Estabelecimento.autenticar_estabelecimento import autenticar_estabelecimento_bp
+from project.app.services.Cliente.Limite_login.Limitador_login import limpar_limitador_login
+
+ENDPOINT = 'project.app.controllers.Endpoints.Estabelecimento.autenticar_estabelecimento'
+DADOS = {'login': 'dono@example.com', 'senha': 'Valid123!'}
+
+@pytest.fixture
+def app():
+    """
+    Fixture que cria e configura uma instância da aplicação Flask para os testes.
+    Registra o blueprint 'autenticar_estabelecimento_bp' e ativa o modo de teste.
+    """
+    app = Flask(__name__)
+    app.register_blueprint(autenticar_estabelecimento_bp)
+    app.config['TESTING'] = True
+    return app
+
+@pytest.fixture
+def client(app):
+    """
+    Fixture que cria um cliente de teste com o token da API aceito pelo middleware.
+    """
+    with patch('project.app.controllers.Middlewares.autenticacao_cliente.verificar_token_fernet', return_value=True), \
+         patch('project.app.controllers.Middlewares.autenticacao_cliente.validar_token_escopo', return_value=True):
+        yield app.test_client()
+
+@pytest.fixture(autouse=True)
+def limitador_limpo():
+    """
+    Fixture que zera as janelas do limite de tentativas de login entre os testes.
+    """
+    limpar_limitador_login()
+    yield
+    limpar_limitador_login()
+
+def test_autenticar_estabelecimento_sucesso(client):
+    """
+    Testa a autenticação do dono com email e senha corretos.
+    Espera-se 200 com o JWT do dono no cookie httpOnly 'token_dono'.
+    """
+    with patch(f'{ENDPOINT}.autenticar_dono', return_value=(True, "est_id_123")) as mock_autenticar, \
+         patch(f'{ENDPOINT}.gerar_jwt_dono_estabelecimento', return_value="jwt-dono") as mock_gerar:
+        response = client.post('/api/autenticar_estabelecimento', headers={'Authorization': 'valid-fernet-token'}, json=DADOS)
+
+        assert response.status_code == 200
+        assert json.loads(response.data) == {"status": "success", "message": "Estabelecimento autenticado"}
+        cookies = response.headers.getlist('Set-Cookie')
+        assert any(c.startswith('token_dono=jwt-dono') and 'HttpOnly' in c for c in cookies)
+        mock_autenticar.assert_called_once_with("dono@example.com", "Valid123!")
+        mock_gerar.assert_called_once_with("est_id_123")
+
+def test_autenticar_estabelecimento_senha_incorreta(client):
+    """
+    Testa a autenticação com email inexistente ou senha incorreta.
+    Espera-se 401 sem gerar o JWT do dono.
+    """
+    with patch(f'{ENDPOINT}.autenticar_dono', return_value=False), \
+         patch(f'{ENDPOINT}.gerar_jwt_dono_estabelecimento') as mock_gerar:
+        response = client.post('/api/autenticar_estabelecimento', headers={'Authorization': 'valid-fernet-token'}, json=DADOS)
+
+        assert response.status_code == 401
+        assert json.loads(response.data)["status"] == "error"
+        mock_gerar.assert_not_called()
+
+def test_autenticar_estabelecimento_bcrypt_sobrecarregado(client):
+    """
+    Testa a recusa rápida quando o pool do bcrypt está sobrecarregado.
+    Espera-se 503 com 'Retry-After'.
+    """
+    with patch(f'{ENDPOINT}.autenticar_dono', return_value=None):
+        response = client.post('/api/autenticar_estabelecimento', headers={'Authorization': 'valid-fernet-token'}, json=DADOS)
+
+        assert response.status_code == 503
+        assert response.headers['Retry-After'] == "1"
+
+@pytest.mark.parametrize("payload, status", [
+    ({}, 411),
+    ({'login': 'dono@example.com'}, 411),
+    ({'login': 'nao-e-email', 'senha': 'Valid123!'}, 400),
+    ({'login': ['dono@example.com'], 'senha': 'Valid123!'}, 400),
+])
+def test_autenticar_estabelecimento_dados_invalidos(client, payload, status):
+    """
+    Testa dados ausentes ou inválidos.
+    Espera-se 411 ou 400 sem consultar o banco.
+    """
+    with patch(f'{ENDPOINT}.autenticar_dono') as mock_autenticar:
+        response = client.post('/api/autenticar_estabelecimento', headers={'Authorization': 'valid-fernet-token'}, json=payload)
+
+        assert response.status_code == status
+        mock_autenticar.assert_not_called()
+
+def test_autenticar_estabelecimento_limite_de_tentativas(client):
+    """
+    Testa que, esgotado o limite de tentativas do email, as seguintes são recusadas com 429
+    antes da verificação da senha.
+    """
+    from project.app.services.Cliente.Limite_login.Limitador_login import LIMITES
+
+    with patch(f'{ENDPOINT}.autenticar_dono', return_value=False) as mock_autenticar:
+        status = [
+            client.post('/api/autenticar_estabelecimento', headers={'Authorization': 'valid-fernet-token'}, json=DADOS).status_code
+            for _ in range(LIMITES["email"] + 1)
+        ]
+
+        assert status == [401] * LIMITES["email"] + [429]
+        assert mock_autenticar.call_count == LIMITES["email"]
+
+def test_autenticar_estabelecimento_limite_nao_bloqueia_outro_dono(client):
+    """
+    Testa que as falhas de um dono, até a recusa com 429, não bloqueiam o login de outro dono:
+    as tentativas dos donos não ocupam nenhuma janela de estabelecimento compartilhada.
+    """
+    from project.app.services.Cliente.Limite_login.Limitador_login import LIMITES, estatisticas_login
+
+    with patch.dict(LIMITES, {"estabelecimento": 1}), \
+         patch(f'{ENDPOINT}.autenticar_dono', return_value=False):
+        status = [
+            client.post('/api/autenticar_estabelecimento', headers={'Authorization': 'valid-fernet-token'}, json=DADOS).status_code
+            for _ in range(LIMITES["email"] + 1)
+        ]
+        outro = client.post('/api/autenticar_estabelecimento', headers={'Authorization': 'valid-fernet-token'},
+                            json={'login': 'outro@example.com', 'senha': 'Valid123!'})
+
+        assert status == [401] * LIMITES["email"] + [429]
+        assert outro.status_code == 401
+        assert estatisticas_login()["recusadas"]["estabelecimento"] == 0
+
+def test_autenticar_estabelecimento_sem_autorizacao(app):
+    """
+    Testa a autenticação sem o header 'Authorization'.
+    Espera-se 401.
+    """
+    response = app.test_client().post('/api/autenticar_estabelecimento', json=DADOS)
+
+    assert response.status_code == 401
\ No newline at end of file
@@ -0,0 +1,131 @@
+import pytest
+from unittest.mock import patch
+from flask import Flask, json
+from project.app.controllers.Endpoints.Estabelecimento.exportar_agendamentos import exportar_agendamentos_bp
+
+@pytest.fixture
+def app():
+    """
+    Fixture que cria e configura uma instância da aplicação Flask para os testes.
+    Registra o blueprint 'exportar_agendamentos_bp' e ativa o modo de teste.
+    """
+    app = Flask(__name__)
+    app.register_blueprint(exportar_agendamentos_bp)
+    app.config['TESTING'] = True
+    return app
+
+@pytest.fixture
+def client(app):
+    """
+    Fixture que cria um cliente de teste com o cookie do dono do estabelecimento e a
+    autenticação do middleware simulada.
+    """
+    client = app.test_client()
+    client.set_cookie('token_dono', 'valid-jwt-dono-token')
+    with patch('project.app.controllers.Middlewares.autenticacao_cliente.verificar_token_fernet', return_value=True), \
+         patch('project.app.controllers.Middlewares.autenticacao_cliente.validar_token_escopo', return_value=True), \
+         patch('project.app.controllers.Middlewares.autenticacao_cliente.validar_token_dono_estabelecimento', return_value=(True, "est_id_123")):
+        yield client
+
+# --- Testes para o endpoint /api/exportar_agendamentos ---
+
+def test_exportar_agendamentos_ndjson(client):
+    """
+    Testa a exportação padrão em NDJSON.
+    Espera-se 200 com os blocos do gerador transmitidos em sequência e o anexo 'agendamentos.ndjson'.
+    """
+    blocos = ['{"id": "ag_1"}\n', '{"id": "ag_2"}\n{"id": "ag_3"}\n']
+    with patch('project.app.controllers.Endpoints.Estabelecimento.exportar_agendamentos.gerar_exportacao',
+               return_value=iter(blocos)) as mock_exportar:
+
+        response = client.post('/api/exportar_agendamentos', headers={'Authorization': 'valid-fernet-token'})
+
+        assert response.status_code == 200
+        assert response.is_streamed
+        assert response.mimetype == "application/x-ndjson"
+        assert response.headers['Content-Disposition'] == 'attachment; filename="agendamentos.ndjson"'
+        assert [json.loads(linha)["id"] for linha in response.get_data(as_text=True).splitlines()] == ["ag_1", "ag_2", "ag_3"]
+        mock_exportar.assert_called_once_with("est_id_123", "ndjson", None, None, None)
+
+def test_exportar_agendamentos_csv_com_filtros(client):
+    """
+    Testa a exportação em CSV com período e status.
+    Espera-se 200 em text/csv e os filtros repassados ao serviço.
+    """
+    with patch('project.app.controllers.Endpoints.Estabelecimento.exportar_agendamentos.gerar_exportacao',
+               return_value=iter(["id,data\r\n", "ag_1,2024-01-01\r\n"])) as mock_exportar:
+
+        payload = {"formato": "csv", "data_inicio": "2024-01-01", "data_fim": "2024-12-31", "status": "concluído"}
+        response = client.post('/api/exportar_agendamentos', headers={'Authorization': 'valid-fernet-token'}, json=payload)
+
+        assert response.status_code == 200
+        assert response.mimetype == "text/csv"
+        assert response.get_data(as_text=True) == "id,data\r\nag_1,2024-01-01\r\n"
+        mock_exportar.assert_called_once_with("est_id_123", "csv", "2024-01-01", "2024-12-31", "concluído")
+
+@pytest.mark.parametrize("payload", [
+    {"formato": "xml"},
+    {"data_inicio": "01/01/2024"},
+    {"data_fim": "2024-02-30"},
+    {"data_inicio": "2024-02-01", "data_fim": "2024-01-01"},
+    {"status": "qualquer"},
+    {"formato": []},
+    {"formato": {}},
+    {"status": []},
+    ["csv"],
+])
+def test_exportar_agendamentos_dados_invalidos(client, payload):
+    """
+    Testa formatos, datas e status inválidos, inclusive de tipos não textuais, e corpo que não é objeto.
+    Espera-se 400 sem iniciar a exportação.
+    """
+    with patch('project.app.controllers.Endpoints.Estabelecimento.exportar_agendamentos.gerar_exportacao') as mock_exportar:
+        response = client.post('/api/exportar_agendamentos', headers={'Authorization': 'valid-fernet-token'}, json=payload)
+
+        assert response.status_code == 400
+        assert json.loads(response.data) == {"status": "error", "message": "Dados invalidos"}
+        mock_exportar.assert_not_called()
+
+def test_exportar_agendamentos_sem_autorizacao(app):
+    """
+    Testa a exportação sem o header 'Authorization'.
+    Espera-se 401.
+    """
+    response = app.test_client().post('/api/exportar_agendamentos')
+
+    assert response.status_code == 401
+    assert json.loads(response.data) == {"status": "error", "message": "Erro de autenticação"}
+
+def test_exportar_agendamentos_recusa_o_token_anonimo_do_estabelecimento(app):
+    """
+    Testa a exportação apenas com o JWT de 'token_estabelecimento' (obtido sem senha em
+    /api/redirecionamento_inicial).
+    Espera-se 401 sem iniciar a exportação.
+    """
+    client = app.test_client()
+    client.set_cookie('token_estabelecimento', 'valid-jwt-est-token')
+    with patch('project.app.controllers.Middlewares.autenticacao_cliente.verificar_token_fernet', return_value=True), \
+         patch('project.app.controllers.Middlewares.autenticacao_cliente.validar_token_escopo', return_value=True), \
+         patch('project.app.controllers.Middlewares.autenticacao_cliente.validar_token_id_estabelecimento', return_value=(True, "est_id_123")), \
+         patch('project.app.controllers.Endpoints.Estabelecimento.exportar_agendamentos.gerar_exportacao') as mock_exportar:
+        response = client.post('/api/exportar_agendamentos', headers={'Authorization': 'valid-fernet-token'})
+
+        assert response.status_code == 401
+        mock_exportar.assert_not_called()
+
+def test_exportar_agendamentos_token_do_dono_invalido(app):
+    """
+    Testa a exportação com um 'token_dono' recusado pela validação.
+    Espera-se 401 sem iniciar a exportação.
+    """
+    client = app.test_client()
+    client.set_cookie('token_dono', 'invalid-jwt-dono-token')
+    with patch('project.app.controllers.Middlewares.autenticacao_cliente.verificar_token_fernet', return_value=True), \
+         patch('project.app.controllers.Middlewares.autenticacao_cliente.validar_token_escopo', return_value=True), \
+         patch('project.app.controllers.Middlewares.autenticacao_cliente.validar_token_dono_estabelecimento', return_value=False), \
+         patch('project.app.controllers.Endpoints.Estabelecimento.exportar_agendamentos.gerar_exportacao') as mock_exportar:
+        response = client.post('/api/exportar_agendamentos', headers={'Authorization': 'valid-fernet-token'})
+
+        assert response.status_code == 401
+        assert json.loads(response.data) == {"status": "error", "message": "Erro de autenticação"}
+        mock_exportar.assert_not_called()
\ No newline at end of file
@@ -0,0 +1,199 @@
+import jwt
+import pytest
+from unittest.mock import patch
+from flask import Flask, Blueprint, json, g
+from project.app.controllers.Middlewares.autenticacao_cliente import exigir_autenticacao
+
+MIDDLEWARE = 'project.app.controllers.Middlewares.autenticacao_cliente'
+ID_ESTABELECIMENTO = 'project.app.services.Cliente.Autenticacao_Tokens.Validar_Token_ID_estabelecimento'
+ID_USER = 'project.app.services.Cliente.Autenticacao_Tokens.Validar_Token_ID_user'
+
+def criar_client(**opcoes):
+    """
+    Cria uma aplicação com um blueprint protegido por exigir_autenticacao, cuja view devolve
+    os IDs deixados em g pelo middleware.
+    """
+    blueprint = Blueprint('protegido', __name__)
+    exigir_autenticacao(blueprint, "consultar_servicos", **opcoes)
+
+    @blueprint.route('/protegido', methods=['POST'])
+    def protegido():
+        return {"estabelecimento_id": g.estabelecimento_id, "user_id": g.user_id}, 200
+
+    app = Flask(__name__)
+    app.register_blueprint(blueprint)
+    app.config['TESTING'] = True
+    return app.test_client()
+
+def com_cookies(client, estabelecimento='jwt-est', user='jwt-user'):
+    if estabelecimento:
+        client.set_cookie('token_estabelecimento', estabelecimento)
+    if user:
+        client.set_cookie('token_user', user)
+    return client
+
+@pytest.fixture
+def etapas_validas():
+    """
+    Fixture que simula todas as etapas da autenticação com sucesso e devolve os mocks.
+    """
+    with patch(f'{MIDDLEWARE}.verificar_token_fernet', return_value=True) as fernet, \
+         patch(f'{MIDDLEWARE}.validar_token_escopo', return_value=True) as escopo, \
+         patch(f'{MIDDLEWARE}.validar_token_id_estabelecimento', return_value=(True, "est_id_123")) as estabelecimento, \
+         patch(f'{MIDDLEWARE}.validar_token_id_user', return_value=(True, "user_id_456")) as user:
+        yield {"fernet": fernet, "escopo": escopo, "estabelecimento": estabelecimento, "user": user}
+
+def test_sucesso_define_ids_em_g(etapas_validas):
+    """
+    Testa que, com todas as etapas válidas, a view é executada com os IDs em g.
+    """
+    client = com_cookies(criar_client())
+    response = client.post('/protegido', headers={'Authorization': 'fernet'})
+
+    assert response.status_code == 200
+    assert json.loads(response.data) == {"estabelecimento_id": "est_id_123", "user_id": "user_id_456"}
+    etapas_validas["escopo"].assert_called_once_with("consultar_servicos", "fernet")
+    etapas_validas["estabelecimento"].assert_called_once_with("jwt-est")
+    etapas_validas["user"].assert_called_once_with("est_id_123", "jwt-user")
+
+@pytest.mark.parametrize("sem", ["Authorization", "token_estabelecimento", "token_user"])
+def test_cabecalho_ou_cookie_ausente(etapas_validas, sem):
+    """
+    Testa que a ausência do header ou de um dos cookies falha antes de qualquer validação.
+    """
+    client = com_cookies(criar_client(),
+                         estabelecimento=None if sem == "token_estabelecimento" else 'jwt-est',
+                         user=None if sem == "token_user" else 'jwt-user')
+    headers = {} if sem == "Authorization" else {'Authorization': 'fernet'}
+    response = client.post('/protegido', headers=headers)
+
+    assert response.status_code == 401
+    assert json.loads(response.data) == {"erro": "Autenticação falhou"}
+    etapas_validas["fernet"].assert_not_called()
+    etapas_validas["estabelecimento"].assert_not_called()
+
+@pytest.mark.parametrize("etapa, valor, chamadas_seguintes", [
+    ("fernet", False, ["escopo", "estabelecimento", "user"]),
+    ("escopo", False, ["estabelecimento", "user"]),
+    ("estabelecimento", False, ["user"]),
+    ("estabelecimento", (True, None), ["user"]),
+    ("user", False, []),
+])
+def test_falha_em_cada_etapa(etapas_validas, etapa, valor, chamadas_seguintes):
+    """
+    Testa que a falha de uma etapa responde 401 com a mensagem da etapa, sem executar as seguintes.
+    """
+    mensagens = {"tokens": "token", "escopo": "escopo", "estabelecimento": "estabelecimento", "user": "user"}
+    esperada = {"fernet": "token"}.get(etapa, etapa)
+    etapas_validas[etapa].return_value = valor
+    client = com_cookies(criar_client(mensagens=mensagens, formato="status"))
+    response = client.post('/protegido', headers={'Authorization': 'fernet'})
+
+    assert response.status_code == 401
+    assert json.loads(response.data) == {"status": "error", "message": esperada}
+    for seguinte in chamadas_seguintes:
+        etapas_validas[seguinte].assert_not_called()
+
+def test_sem_user_nao_exige_cookie_do_user(etapas_validas):
+    """
+    Testa user=False: o cookie 'token_user' não é exigido e g.user_id fica None.
+    """
+    client = com_cookies(criar_client(user=False), user=None)
+    response = client.post('/protegido', headers={'Authorization': 'fernet'})
+
+    assert response.status_code == 200
+    assert json.loads(response.data) == {"estabelecimento_id": "est_id_123", "user_id": None}
+    etapas_validas["user"].assert_not_called()
+
+def test_sem_estabelecimento_exige_apenas_o_token_da_api(etapas_validas):
+    """
+    Testa estabelecimento=False e user=False: apenas o header 'Authorization' é exigido.
+    """
+    client = criar_client(estabelecimento=False, user=False)
+    response = client.post('/protegido', headers={'Authorization': 'fernet'})
+
+    assert response.status_code == 200
+    assert json.loads(response.data) == {"estabelecimento_id": None, "user_id": None}
+    etapas_validas["estabelecimento"].assert_not_called()
+
+def test_options_nao_exige_credenciais(etapas_validas):
+    """
+    Testa que o preflight do CORS (OPTIONS) passa sem credenciais e sem validações.
+    """
+    response = criar_client().options('/protegido')
+
+    assert response.status_code == 200
+    etapas_validas["fernet"].assert_not_called()
+
+def test_cada_jwt_e_decodificado_uma_unica_vez(monkeypatch):
+    """
+    Testa, com JWTs reais, que cada token é decodificado (jwt.decode) uma única vez por
+    requisição, pelo validador da sua etapa.
+    """
+    monkeypatch.setenv("SECRET_KEY_ID_ESTABELECIMENTO", "segredo-est")
+    monkeypatch.setenv("SECRET_KEY_ID_USER", "segredo-user")
+    token_est = jwt.encode({"id": "est_id_123"}, "segredo-est", algorithm="HS256")
+    token_user = jwt.encode({"id": "user_id_456"}, "segredo-user", algorithm="HS256")
+
+    with patch(f'{MIDDLEWARE}.verificar_token_fernet', return_value=True), \
+         patch(f'{MIDDLEWARE}.validar_token_escopo', return_value=True), \
+         patch(f'{ID_ESTABELECIMENTO}.estabelecimento_existe', return_value=True), \
+         patch(f'{ID_USER}.cliente_confirmado', return_value=True), \
+         patch('jwt.decode', wraps=jwt.decode) as decode:
+        client = com_cookies(criar_client(), estabelecimento=token_est, user=token_user)
+        response = client.post('/protegido', headers={'Authorization': 'fernet'})
+
+        assert response.status_code == 200
+        assert json.loads(response.data) == {"estabelecimento_id": "est_id_123", "user_id": "user_id_456"}
+        assert [chamada.args[0] for chamada in decode.call_args_list] == [token_est, token_user]
+
+def test_jwt_malformado_falha_na_decodificacao(monkeypatch):
+    """
+    Testa que um JWT sem o formato header.payload.assinatura é recusado na etapa do estabelecimento.
+    """
+    monkeypatch.setenv("SECRET_KEY_ID_ESTABELECIMENTO", "segredo-est")
+    with patch(f'{MIDDLEWARE}.verificar_token_fernet', return_value=True), \
+         patch(f'{MIDDLEWARE}.validar_token_escopo', return_value=True), \
+         patch(f'{MIDDLEWARE}.validar_token_id_user') as validar_user:
+        client = com_cookies(criar_client(mensagens={"estabelecimento": "estabelecimento"}), estabelecimento='nao-e-um-jwt')
+        response = client.post('/protegido', headers={'Authorization': 'fernet'})
+
+        assert response.status_code == 401
+        assert json.loads(response.data) == {"erro": "estabelecimento"}
+        validar_user.assert_not_called()
+
+def test_dono_resolve_o_estabelecimento_pelo_token_do_dono(etapas_validas):
+    """
+    Testa dono=True: o estabelecimento vem do cookie 'token_dono', e não do JWT anônimo de
+    'token_estabelecimento'.
+    """
+    with patch(f'{MIDDLEWARE}.validar_token_dono_estabelecimento', return_value=(True, "est_do_dono")) as validar_dono:
+        client = com_cookies(criar_client(estabelecimento=False, user=False, dono=True), user=None)
+        client.set_cookie('token_dono', 'jwt-dono')
+        response = client.post('/protegido', headers={'Authorization': 'fernet'})
+
+    assert response.status_code == 200
+    assert json.loads(response.data) == {"estabelecimento_id": "est_do_dono", "user_id": None}
+    validar_dono.assert_called_once_with("jwt-dono")
+    etapas_validas["estabelecimento"].assert_not_called()
+
+@pytest.mark.parametrize("token_dono, resultado", [(None, None), ('jwt-dono', False)])
+def test_dono_sem_token_valido_do_dono(etapas_validas, token_dono, resultado):
+    """
+    Testa dono=True sem o cookie 'token_dono' ou com um token recusado: 401, mesmo com um
+    'token_estabelecimento' válido.
+    """
+    with patch(f'{MIDDLEWARE}.validar_token_dono_estabelecimento', return_value=resultado):
+        client = com_cookies(criar_client(estabelecimento=False, user=False, dono=True), user=None)
+        if token_dono:
+            client.set_cookie('token_dono', token_dono)
+        response = client.post('/protegido', headers={'Authorization': 'fernet'})
+
+    assert response.status_code == 401
+
+def test_dono_nao_combina_com_estabelecimento_ou_user():
+    """
+    Testa que dono=True com o JWT do estabelecimento ou do user exigido é recusado no registro.
+    """
+    with pytest.raises(ValueError):
+        exigir_autenticacao(Blueprint('invalido', __name__), "consultar_servicos", dono=True)
\ No newline at end of file
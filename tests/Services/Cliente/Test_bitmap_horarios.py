@@ -0,0 +1,137 @@
+import random
+import pytest
+from datetime import time
+from project.app.services.Cliente.Disponibilidade.Bitmap_horarios import (
+    horario_do_indice,
+    indice_do_horario,
+    bits_para_inteiro,
+    inteiro_para_bits,
+    mascara_slots,
+    bloquear_slots,
+    liberar_slots
+)
+
+# --- Conversão entre horário e posição na grade ---
+
+@pytest.mark.parametrize("indice, esperado", [
+    (0, time(8, 0)),
+    (1, time(8, 15)),
+    (4, time(9, 0)),
+    (63, time(23, 45)),
+])
+def test_horario_do_indice(indice, esperado):
+    """
+    Testa a conversão da posição do slot no horário, do primeiro ao último slot do dia.
+    """
+    assert horario_do_indice(time(8, 0), 15, indice) == esperado
+
+@pytest.mark.parametrize("horario, esperado", [
+    (time(8, 0), 0),
+    (time(8, 15), 1),
+    (time(23, 45), 63),
+    (time(7, 45), None),   # antes do início da grade
+    (time(8, 10), None),   # fora do alinhamento de menor_time
+])
+def test_indice_do_horario(horario, esperado):
+    """
+    Testa a conversão do horário na posição do slot, incluindo horários fora da grade.
+    """
+    assert indice_do_horario(time(8, 0), 15, horario) == esperado
+
+def test_indice_e_horario_sao_inversos():
+    """
+    Testa que indice_do_horario desfaz horario_do_indice em toda a grade do dia.
+    """
+    for indice in range(48):
+        assert indice_do_horario(time(0, 0), 30, horario_do_indice(time(0, 0), 30, indice)) == indice
+
+# --- Conversão entre o BIT VARYING e o inteiro ---
+
+def test_bits_para_inteiro_primeiro_caractere_e_o_bit_menos_significativo():
+    """
+    Testa a ordem dos bits: o primeiro caractere é o slot 0, isto é, o bit (1 << 0).
+    """
+    assert bits_para_inteiro("1000") == 0b0001
+    assert bits_para_inteiro("0001") == 0b1000
+    assert bits_para_inteiro("") == 0
+    assert bits_para_inteiro(None) == 0
+
+def test_inteiro_para_bits_completa_e_corta_no_tamanho():
+    """
+    Testa que a string gerada tem sempre 'tamanho' caracteres, completando com slots
+    ocupados e descartando bits além do final da grade.
+    """
+    assert inteiro_para_bits(0b0001, 4) == "1000"
+    assert inteiro_para_bits(0, 3) == "000"
+    assert inteiro_para_bits(0b11111, 3) == "111"
+    assert inteiro_para_bits(0b1, 0) == ""
+
+def test_bits_ida_e_volta():
+    """
+    Testa a ida e volta entre string e inteiro para mapas aleatórios de vários tamanhos.
+    """
+    aleatorio = random.Random(1)
+    for tamanho in [1, 2, 31, 32, 33, 64, 65, 96]:
+        for _ in range(20):
+            bits = "".join(aleatorio.choice("01") for _ in range(tamanho))
+            assert inteiro_para_bits(bits_para_inteiro(bits), tamanho) == bits
+            mapa = aleatorio.getrandbits(tamanho)
+            assert bits_para_inteiro(inteiro_para_bits(mapa, tamanho)) == mapa
+
+# --- Reserva e liberação de slots ---
+
+def test_bloquear_slots_no_inicio_e_no_final_do_dia():
+    """
+    Testa o bloqueio do primeiro e do último slot da grade.
+    """
+    livre = mascara_slots(0, 8)
+    assert bloquear_slots(livre, 8, 0, 2) == livre & ~0b11
+    assert bloquear_slots(livre, 8, 6, 2) == livre & ~(0b11 << 6)
+    assert bloquear_slots(livre, 8, 0, 8) == 0
+
+@pytest.mark.parametrize("inicio, quantidade", [
+    (7, 2),    # ultrapassa o final da grade
+    (8, 1),    # começa depois do último slot
+    (-1, 2),   # começa antes do primeiro slot
+    (0, 0),    # nenhum slot
+])
+def test_bloquear_slots_fora_da_grade(inicio, quantidade):
+    """
+    Testa que reservas que não cabem na grade são recusadas sem alterar o mapa.
+    """
+    assert bloquear_slots(mascara_slots(0, 8), 8, inicio, quantidade) is None
+
+def test_bloquear_slots_ocupados():
+    """
+    Testa que a reserva é recusada se qualquer slot do intervalo estiver ocupado.
+    """
+    mapa = mascara_slots(0, 8) & ~(1 << 7)
+    assert bloquear_slots(mapa, 8, 6, 2) is None
+    assert bloquear_slots(mapa, 8, 5, 2) == mapa & ~(0b11 << 5)
+
+def test_liberar_slots_nos_limites_do_dia():
+    """
+    Testa a liberação no início e no final da grade, ignorando o que ultrapassa o último slot.
+    """
+    assert liberar_slots(0, 8, 0, 2) == 0b11
+    assert liberar_slots(0, 8, 6, 5) == 0b11 << 6
+    assert liberar_slots(0, 8, 8, 1) == 0
+    assert liberar_slots(0, 8, -1, 2) == 0
+    assert liberar_slots(0b1, 8, 0, 0) == 0b1
+
+def test_bloquear_e_liberar_sao_inversos():
+    """
+    Testa que liberar os slots de uma reserva devolve o mapa original, e que o resultado
+    gravado como BIT VARYING mantém o tamanho da grade.
+    """
+    aleatorio = random.Random(2)
+    for _ in range(200):
+        tamanho = aleatorio.randint(1, 96)
+        mapa = aleatorio.getrandbits(tamanho)
+        inicio = aleatorio.randrange(tamanho)
+        quantidade = aleatorio.randint(1, tamanho - inicio)
+        bloqueado = bloquear_slots(mapa, tamanho, inicio, quantidade)
+        if bloqueado is None:
+            continue
+        assert liberar_slots(bloqueado, tamanho, inicio, quantidade) == mapa
+        assert len(inteiro_para_bits(bloqueado, tamanho)) == tamanho
\ No newline at end of file
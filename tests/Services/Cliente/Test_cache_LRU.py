@@ -0,0 +1,52 @@
+from project.app.services.Cliente.Cache.Cache_LRU import CacheLRU, MarcasInvalidacao
+
+def test_lru_descarta_o_menos_usado_e_avisa():
+    """
+    Testa que o item usado há mais tempo é descartado acima de max_itens e repassado a ao_descartar.
+    """
+    descartados = []
+    cache = CacheLRU(2, ao_descartar=lambda chave, valor: descartados.append((chave, valor)))
+    cache.gravar("a", 1)
+    cache.gravar("b", 2)
+    cache.obter("a")
+    cache.gravar("c", 3)
+
+    assert descartados == [("b", 2)]
+    assert cache.obter("a") == 1 and cache.obter("b") is None
+
+def test_marcas_recusam_leitura_anterior_a_invalidacao():
+    """
+    Testa que apenas leituras iniciadas depois da invalidação da chave podem gravar.
+    """
+    marcas = MarcasInvalidacao(10)
+    anterior = marcas.marcar_leitura()
+    marcas.invalidar("chave")
+    posterior = marcas.marcar_leitura()
+
+    assert marcas.atual("chave", anterior) is False
+    assert marcas.atual("chave", posterior) is True
+    assert marcas.atual("outra", anterior) is True
+
+def test_marcas_descartadas_do_lru_continuam_recusando():
+    """
+    Testa que, descartada a marca de uma chave, as leituras anteriores a ela continuam recusadas.
+    """
+    marcas = MarcasInvalidacao(1)
+    anterior = marcas.marcar_leitura()
+    marcas.invalidar("chave")
+    marcas.invalidar("outra_1")
+    marcas.invalidar("outra_2")
+
+    assert marcas.atual("chave", anterior) is False
+    assert marcas.atual("chave", marcas.marcar_leitura()) is True
+
+def test_invalidar_tudo_recusa_todas_as_leituras_anteriores():
+    """
+    Testa que invalidar_tudo recusa as leituras já iniciadas de qualquer chave.
+    """
+    marcas = MarcasInvalidacao(10)
+    anterior = marcas.marcar_leitura()
+    marcas.invalidar_tudo()
+
+    assert marcas.atual("qualquer", anterior) is False
+    assert marcas.atual("qualquer", marcas.marcar_leitura()) is True
\ No newline at end of file
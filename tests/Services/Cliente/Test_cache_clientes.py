@@ -0,0 +1,86 @@
+import pytest
+from types import SimpleNamespace
+from unittest.mock import patch
+from project.app.services.Cliente.Cache import Cache_clientes
+from project.app.services.Cliente.Cache.Cache_LRU import MarcasInvalidacao
+from project.app.services.Cliente.Cache.Cache_clientes import (
+    cliente_confirmado,
+    confirmar_cliente,
+    invalidar_cliente,
+    marcar_leitura,
+    limpar_cache_clientes,
+    CHAVE_PENDENTES
+)
+
+@pytest.fixture(autouse=True)
+def cache_vazio():
+    """
+    Fixture que esvazia o cache de clientes antes e depois de cada teste.
+    """
+    limpar_cache_clientes()
+    yield
+    limpar_cache_clientes()
+
+def test_confirmar_e_invalidar():
+    """
+    Testa que a invalidação remove o cliente de todos os estabelecimentos.
+    """
+    confirmar_cliente("est_1", "cli", marcar_leitura())
+    confirmar_cliente("est_2", "cli", marcar_leitura())
+    assert cliente_confirmado("est_1", "cli") is True
+
+    invalidar_cliente("cli")
+    assert cliente_confirmado("est_1", "cli") is False
+    assert cliente_confirmado("est_2", "cli") is False
+
+def test_leitura_anterior_a_invalidacao_nao_confirma():
+    """
+    Testa que uma leitura iniciada antes da exclusão do cliente não o confirma depois dela.
+    """
+    marca = marcar_leitura()
+    invalidar_cliente("cli")
+    confirmar_cliente("est", "cli", marca)
+    assert cliente_confirmado("est", "cli") is False
+
+    confirmar_cliente("est", "cli", marcar_leitura())
+    assert cliente_confirmado("est", "cli") is True
+
+def test_leitura_anterior_a_invalidacao_descartada_do_lru_nao_confirma():
+    """
+    Testa que a proteção continua valendo depois que a marca da invalidação sai do LRU.
+    """
+    with patch.object(Cache_clientes, '_marcas', MarcasInvalidacao(1)):
+        marca = marcar_leitura()
+        invalidar_cliente("cli")
+        invalidar_cliente("outro_1")
+        invalidar_cliente("outro_2")
+        confirmar_cliente("est", "cli", marca)
+        assert cliente_confirmado("est", "cli") is False
+
+def test_confirmacao_entre_flush_e_commit_e_desfeita_no_commit():
+    """
+    Testa a janela entre o flush e o commit da exclusão: outra requisição ainda lê a linha
+    anterior (deleted=False) e confirma o cliente; o commit o invalida novamente.
+    """
+    sessao = SimpleNamespace(info={})
+    cliente = SimpleNamespace(id="cli", deleted=True)
+
+    with patch.object(Cache_clientes, 'object_session', return_value=sessao):
+        Cache_clientes._invalidar_no_flush(cliente)
+    assert sessao.info[CHAVE_PENDENTES] == {"cli"}
+
+    # Requisição concorrente que começou a ler depois do flush, antes do commit
+    confirmar_cliente("est", "cli", marcar_leitura())
+    assert cliente_confirmado("est", "cli") is True
+
+    Cache_clientes._apos_commit(sessao)
+    assert cliente_confirmado("est", "cli") is False
+    assert CHAVE_PENDENTES not in sessao.info
+
+def test_rollback_descarta_pendentes():
+    """
+    Testa que um rollback descarta os clientes pendentes da sessão.
+    """
+    sessao = SimpleNamespace(info={CHAVE_PENDENTES: {"cli"}})
+    Cache_clientes._apos_rollback(sessao)
+    assert CHAVE_PENDENTES not in sessao.info
\ No newline at end of file
@@ -0,0 +1,79 @@
+import pytest
+from unittest.mock import patch
+from project.app.services.Cliente.Cache import Cache_horarios
+from project.app.services.Cliente.Cache.Cache_LRU import MarcasInvalidacao
+from project.app.services.Cliente.Cache.Cache_horarios import (
+    obter_horarios,
+    gravar_horarios,
+    invalidar_horarios,
+    marcar_leitura,
+    limpar_cache_horarios
+)
+
+@pytest.fixture(autouse=True)
+def cache_vazio():
+    """
+    Fixture que esvazia o cache de horários antes e depois de cada teste.
+    """
+    limpar_cache_horarios()
+    yield
+    limpar_cache_horarios()
+
+def test_grava_e_obtem_por_required_slots():
+    """
+    Testa que cada required_slots da mesma linha é guardado separadamente.
+    """
+    gravar_horarios("est", "colab", "2030-01-01", 1, ["09:00", "09:30"], marcar_leitura())
+    gravar_horarios("est", "colab", "2030-01-01", 2, ["09:00"], marcar_leitura())
+    assert obter_horarios("est", "colab", "2030-01-01", 1) == ["09:00", "09:30"]
+    assert obter_horarios("est", "colab", "2030-01-01", 2) == ["09:00"]
+    assert obter_horarios("est", "colab", "2030-01-01", 3) is None
+
+def test_invalidacao_remove_colaborador_e_qualquer_colaborador():
+    """
+    Testa que a invalidação alcança a consulta do colaborador e a de qualquer colaborador na data.
+    """
+    gravar_horarios("est", "colab", "2030-01-01", 1, ["09:00"], marcar_leitura())
+    gravar_horarios("est", None, "2030-01-01", 1, ["09:00"], marcar_leitura())
+    gravar_horarios("est", "colab", "2030-01-02", 1, ["09:00"], marcar_leitura())
+    invalidar_horarios("est", "colab", "2030-01-01")
+    assert obter_horarios("est", "colab", "2030-01-01", 1) is None
+    assert obter_horarios("est", None, "2030-01-01", 1) is None
+    assert obter_horarios("est", "colab", "2030-01-02", 1) == ["09:00"]
+
+def test_leitura_anterior_a_invalidacao_nao_e_gravada():
+    """
+    Testa que uma consulta iniciada antes de um agendamento não grava a disponibilidade antiga.
+    """
+    marca = marcar_leitura()
+    invalidar_horarios("est", "colab", "2030-01-01")
+    gravar_horarios("est", "colab", "2030-01-01", 1, ["09:00"], marca)
+    assert obter_horarios("est", "colab", "2030-01-01", 1) is None
+
+    gravar_horarios("est", "colab", "2030-01-01", 1, ["09:30"], marcar_leitura())
+    assert obter_horarios("est", "colab", "2030-01-01", 1) == ["09:30"]
+
+def test_leitura_anterior_a_invalidacao_descartada_do_lru_nao_e_gravada():
+    """
+    Testa que, mesmo depois que a marca da invalidação é descartada do LRU (outras linhas
+    invalidadas em seguida), a consulta iniciada antes dela não grava a disponibilidade antiga.
+    """
+    with patch.object(Cache_horarios, '_marcas', MarcasInvalidacao(1)):
+        marca = marcar_leitura()
+        invalidar_horarios("est", "colab", "2030-01-01")
+        for dia in range(2, 5):
+            invalidar_horarios("est", "colab", f"2030-01-0{dia}")
+
+        gravar_horarios("est", "colab", "2030-01-01", 1, ["09:00"], marca)
+        assert obter_horarios("est", "colab", "2030-01-01", 1) is None
+
+        gravar_horarios("est", "colab", "2030-01-01", 1, ["09:30"], marcar_leitura())
+        assert obter_horarios("est", "colab", "2030-01-01", 1) == ["09:30"]
+
+def test_ttl_zero_desliga_o_cache():
+    """
+    Testa que CACHE_HORARIOS_TTL=0 desliga o cache, em vez de manter as entradas sem validade.
+    """
+    with patch.object(Cache_horarios, 'TTL', 0):
+        gravar_horarios("est", "colab", "2030-01-01", 1, ["09:00"], marcar_leitura())
+        assert obter_horarios("est", "colab", "2030-01-01", 1) is None
\ No newline at end of file
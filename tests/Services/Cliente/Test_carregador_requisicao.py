@@ -0,0 +1,98 @@
+import uuid
+import pytest
+from types import SimpleNamespace
+from unittest.mock import MagicMock, patch
+from flask import Flask
+from project.app.services.Cliente.Consulta_DataBase.Carregador_requisicao import carregar, carregar_colunas, lembrar
+
+MODULO = 'project.app.services.Cliente.Consulta_DataBase.Carregador_requisicao'
+ID = uuid.UUID('22222222-2222-2222-2222-222222222222')
+
+class Modelo:
+    """
+    Model de teste: as colunas são usadas apenas para montar a consulta (mockada).
+    """
+    id = MagicMock()
+    deleted = MagicMock()
+    estabelecimento_id = MagicMock()
+
+    def __init__(self, id):
+        self.id = id
+
+@pytest.fixture
+def requisicao():
+    """
+    Fixture que abre um contexto de aplicação (g novo, como em uma requisição).
+    """
+    with Flask(__name__).app_context():
+        yield
+
+@pytest.fixture
+def db():
+    """
+    Fixture que substitui a sessão do banco por um mock.
+    """
+    with patch(f'{MODULO}.db') as db:
+        yield db
+
+def test_carregar_consulta_cada_id_uma_unica_vez(requisicao, db):
+    """
+    Testa que o mesmo ID, como str ou UUID, é buscado no banco uma única vez por requisição.
+    """
+    entidade = Modelo(ID)
+    db.session.get.return_value = entidade
+
+    assert carregar(Modelo, str(ID)) is entidade
+    assert carregar(Modelo, ID) is entidade
+    db.session.get.assert_called_once_with(Modelo, ID)
+
+def test_carregar_registra_ids_inexistentes(requisicao, db):
+    """
+    Testa que um ID inexistente não é consultado de novo e que IDs inválidos não vão ao banco.
+    """
+    db.session.get.return_value = None
+
+    assert carregar(Modelo, ID) is None
+    assert carregar(Modelo, ID) is None
+    assert carregar(Modelo, "nao-e-um-uuid") is None
+    db.session.get.assert_called_once()
+
+def test_lembrar_evita_a_consulta_de_carregar(requisicao, db):
+    """
+    Testa que uma entidade registrada por lembrar (ex.: buscada pelo email) não é consultada por carregar.
+    """
+    entidade = lembrar(Modelo(ID))
+
+    assert carregar(Modelo, str(ID)) is entidade
+    db.session.get.assert_not_called()
+
+def test_carregar_colunas_consulta_apenas_as_colunas_uma_unica_vez(requisicao, db):
+    """
+    Testa que carregar_colunas seleciona apenas as colunas pedidas, uma única vez por requisição.
+    """
+    linha = SimpleNamespace(deleted=False, estabelecimento_id="est")
+    db.session.query.return_value.filter.return_value.first.return_value = linha
+
+    assert carregar_colunas(Modelo, ID, "deleted", "estabelecimento_id") is linha
+    assert carregar_colunas(Modelo, str(ID), "deleted", "estabelecimento_id") is linha
+    db.session.query.assert_called_once_with(Modelo.deleted, Modelo.estabelecimento_id)
+    db.session.get.assert_not_called()
+
+def test_carregar_colunas_usa_a_entidade_ja_carregada(requisicao, db):
+    """
+    Testa que carregar_colunas devolve a entidade inteira já carregada, sem nova consulta.
+    """
+    entidade = lembrar(Modelo(ID))
+
+    assert carregar_colunas(Modelo, ID, "deleted") is entidade
+    db.session.query.assert_not_called()
+
+def test_cada_requisicao_tem_o_seu_carregador(db):
+    """
+    Testa que as entidades carregadas não passam de uma requisição para a seguinte.
+    """
+    db.session.get.return_value = Modelo(ID)
+    for _ in range(2):
+        with Flask(__name__).app_context():
+            carregar(Modelo, ID)
+    assert db.session.get.call_count == 2
\ No newline at end of file
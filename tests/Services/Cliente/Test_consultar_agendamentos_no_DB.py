@@ -0,0 +1,160 @@
+import json
+import uuid
+from datetime import date, time, timedelta
+import pytest
+from sqlalchemy import event
+
+# Teste de regressão da quantidade de consultas da listagem de agendamentos do cliente.
+#
+# Precisa de um PostgreSQL com as migrações aplicadas, informado em TEST_DATABASE_URL (fixture
+# sessao_banco do conftest); sem ele, o teste é ignorado. Os dados são criados em uma transação
+# desfeita ao final.
+
+pytestmark = pytest.mark.banco
+
+@pytest.fixture(scope="module")
+def modulos(app_real):
+    """
+    Fixture que importa os módulos reais usados pelos testes
+    """
+    return (
+        app_real("app.extensions").db,
+        app_real("app.models.models"),
+        app_real("app.services.Cliente.Consulta_DataBase.Consultar_agendamentos_no_DB")
+    )
+
+def criar_agendamentos(models, session, quantidade):
+    """
+    Cria um estabelecimento, um cliente, um colaborador, dois serviços e 'quantidade'
+    agendamentos concluídos (um por dia) com os dois serviços
+    """
+    sufixo = uuid.uuid4().hex[:8]
+    estabelecimento = models.Estabelecimento(
+        identificador_base=sufixo, email_login=f"e{sufixo}@teste.com", senha_hash="x", nome_fantasia="Estabelecimento Teste"
+    )
+    session.add(estabelecimento)
+    session.flush()
+    cliente = models.Cliente(
+        email_login=f"c{sufixo}@teste.com", senha_hash="x", nome="Cliente Teste", estabelecimento_id=estabelecimento.id
+    )
+    colaborador = models.Colaborador(nome="Colaborador Teste", estabelecimento_id=estabelecimento.id)
+    servicos = [
+        models.Servico(nome=f"Serviço {i}", duracao=30, preco=10, estabelecimento_id=estabelecimento.id)
+        for i in range(2)
+    ]
+    session.add_all([cliente, colaborador] + servicos)
+    session.flush()
+    for dia in range(quantidade):
+        session.add(models.Agendamento(
+            cliente_id=cliente.id,
+            colaborador_id=colaborador.id,
+            estabelecimento_id=estabelecimento.id,
+            data=date(2020, 1, 1) + timedelta(days=dia),
+            horas=[time(9, 0)],
+            duracao=30,
+            status="concluído",
+            servicos=servicos
+        ))
+    session.flush()
+    session.expunge_all()
+    return str(estabelecimento.id), str(cliente.id)
+
+def contar_consultas(session, funcao, *args):
+    """
+    Executa 'funcao' e retorna (resultado, quantidade de comandos SQL emitidos)
+    """
+    comandos = []
+    conexao = session.connection()
+    ouvinte = lambda *a: comandos.append(a[2])
+    event.listen(conexao, "before_cursor_execute", ouvinte)
+    try:
+        resultado = funcao(*args)
+    finally:
+        event.remove(conexao, "before_cursor_execute", ouvinte)
+    return resultado, len(comandos)
+
+@pytest.mark.parametrize("quantidade", [1, 25])
+def test_listagem_historico_quantidade_constante_de_consultas(modulos, sessao_banco, quantidade):
+    """
+    Testa que a listagem carrega colaborador, serviços e estabelecimento sem uma consulta
+    por agendamento: são sempre 2 consultas (agendamentos + serviços), para 1 ou 25 agendamentos
+    """
+    _, models, servico = modulos
+    estabelecimento_id, cliente_id = criar_agendamentos(models, sessao_banco, quantidade)
+
+    resultado, consultas = contar_consultas(
+        sessao_banco, servico.consultar_agendamentos_por_estabelecimento_cliente_status,
+        estabelecimento_id, cliente_id, "historico"
+    )
+
+    assert len(resultado) == quantidade
+    assert consultas == 2
+    assert resultado[0]["colaborador"] == "Colaborador Teste"
+    assert resultado[0]["estabelecimento"] == "Estabelecimento Teste"
+    assert sorted(resultado[0]["servicos"]) == ["Serviço 0", "Serviço 1"]
+    assert resultado[0]["horas"] == ["09:00:00"]
+
+def test_historico_paginado_percorre_todas_as_paginas(modulos, sessao_banco):
+    """
+    Testa a paginação por chave do histórico: 25 agendamentos em páginas de 10 são devolvidos
+    do mais recente para o mais antigo, sem repetição, com a mesma quantidade de consultas
+    em todas as páginas e 'next_cursor' nulo na última
+    """
+    _, models, servico = modulos
+    estabelecimento_id, cliente_id = criar_agendamentos(models, sessao_banco, 25)
+
+    paginas, cursor = [], None
+    while True:
+        (sucesso, agendamentos, cursor), consultas = contar_consultas(
+            sessao_banco, servico.consultar_historico_paginado, estabelecimento_id, cliente_id, cursor, 10
+        )
+        assert sucesso is True
+        assert consultas == 2
+        paginas.append(agendamentos)
+        if cursor is None:
+            break
+
+    assert [len(pagina) for pagina in paginas] == [10, 10, 5]
+    datas = [ag["data"] for pagina in paginas for ag in pagina]
+    assert datas == sorted(datas, reverse=True)
+    assert len({ag["id"] for pagina in paginas for ag in pagina}) == 25
+
+def test_historico_paginado_cursor_invalido(modulos, sessao_banco):
+    """
+    Testa que um cursor adulterado é recusado
+    """
+    _, _, servico = modulos
+    assert servico.consultar_historico_paginado(str(uuid.uuid4()), str(uuid.uuid4()), "nao-e-um-cursor") == (False, "Cursor inválido")
+
+def _ordenar_servicos(agendamentos):
+    # A ordem dos serviços de cada agendamento não é garantida em nenhuma das listagens
+    for agendamento in agendamentos:
+        agendamento["servicos"].sort()
+    return agendamentos
+
+def test_historico_json_no_banco_igual_ao_serializado(modulos, sessao_banco):
+    """
+    Testa que a listagem montada pelo banco (JSON_NO_BANCO) tem as mesmas páginas, o mesmo
+    conteúdo e os mesmos cursores da listagem serializada em Python, em uma consulta por página
+    """
+    _, models, servico = modulos
+    estabelecimento_id, cliente_id = criar_agendamentos(models, sessao_banco, 25)
+
+    cursor = cursor_json = None
+    while True:
+        _, agendamentos, cursor = servico.consultar_historico_paginado(estabelecimento_id, cliente_id, cursor, 10)
+        (sucesso, texto, cursor_json), consultas = contar_consultas(
+            sessao_banco, servico.consultar_historico_paginado_json, estabelecimento_id, cliente_id, cursor_json, 10
+        )
+        assert sucesso is True
+        assert consultas == 1
+        assert _ordenar_servicos(json.loads(texto)) == _ordenar_servicos(agendamentos)
+        assert cursor_json == cursor
+        if cursor is None:
+            break
+
+    historico = servico.consultar_agendamentos_por_estabelecimento_cliente_status(estabelecimento_id, cliente_id, "historico")
+    historico_json = json.loads(servico.consultar_agendamentos_json(estabelecimento_id, cliente_id, "historico"))
+    chave = lambda agendamento: (agendamento["data"], agendamento["id"])
+    assert _ordenar_servicos(historico_json) == _ordenar_servicos(sorted(historico, key=chave))
+    assert servico.consultar_agendamentos_json(estabelecimento_id, cliente_id, "ativos") is None
\ No newline at end of file
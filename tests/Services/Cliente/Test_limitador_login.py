@@ -0,0 +1,66 @@
+import pytest
+from unittest.mock import patch
+from project.app.services.Cliente.Limite_login import Limitador_login
+from project.app.services.Cliente.Limite_login.Limitador_login import (
+    admitir_tentativa_login,
+    limpar_tentativas_email,
+    limpar_limitador_login,
+    LIMITES
+)
+
+MODULO = 'project.app.services.Cliente.Limite_login.Limitador_login'
+
+@pytest.fixture(autouse=True)
+def limitador_limpo():
+    """
+    Fixture que zera as janelas do limitador (em memória) antes e depois de cada teste.
+    """
+    limpar_limitador_login()
+    yield
+    limpar_limitador_login()
+
+def test_login_bem_sucedido_devolve_a_vaga_do_estabelecimento():
+    """
+    Testa que apenas tentativas que falharam ocupam a janela do estabelecimento.
+    """
+    with patch.dict(LIMITES, {"estabelecimento": 2}):
+        for indice in range(5):
+            assert admitir_tentativa_login(f"ip_{indice}", f"user_{indice}@x.com", "est") == (True, 0)
+            limpar_tentativas_email(f"user_{indice}@x.com", "est")
+
+        assert admitir_tentativa_login("ip_a", "a@x.com", "est") == (True, 0)
+        assert admitir_tentativa_login("ip_b", "b@x.com", "est") == (True, 0)
+        admitida, _ = admitir_tentativa_login("ip_c", "c@x.com", "est")
+        assert admitida is False
+
+def test_limite_zero_desliga_a_dimensao():
+    """
+    Testa que LIMITE_LOGIN_ESTABELECIMENTO=0 não limita o estabelecimento.
+    """
+    with patch.dict(LIMITES, {"estabelecimento": 0}):
+        for indice in range(10):
+            assert admitir_tentativa_login(f"ip_{indice}", f"user_{indice}@x.com", "est") == (True, 0)
+
+def test_redis_verifica_e_registra_em_um_unico_script():
+    """
+    Testa que o armazenamento no Redis envia todas as chaves e limites da tentativa em uma
+    única chamada do script atômico e interpreta a dimensão que recusou.
+    """
+    with patch(f'{MODULO}.redis') as redis:
+        script = redis.Redis.from_url.return_value.register_script.return_value
+        janelas = Limitador_login._JanelasRedis("redis://teste")
+        chaves = Limitador_login._chaves("1.2.3.4", "a@x.com", "est")
+
+        script.return_value = [0, b'0']
+        assert janelas.admitir(chaves) == (None, 0)
+
+        script.return_value = [2, b'12.5']
+        assert janelas.admitir(chaves) == ("email", 12.5)
+
+    assert script.call_count == 2
+    argumentos = script.call_args.kwargs
+    assert argumentos["keys"] == [
+        "limite_login:ip:1.2.3.4", "limite_login:email:est:a@x.com", "limite_login:estabelecimento:est"
+    ]
+    assert argumentos["args"][3:] == [LIMITES["ip"], LIMITES["email"], LIMITES["estabelecimento"]]
+    redis.Redis.from_url.return_value.pipeline.assert_not_called()
\ No newline at end of file
@@ -0,0 +1,104 @@
+import random
+import pytest
+from collections import namedtuple
+from datetime import date, time
+from unittest.mock import patch, MagicMock
+from project.app.services.Cliente.Disponibilidade.Motor_disponibilidade import (
+    consultar_horarios_em_lote,
+    inicios_disponiveis_matriz,
+    montar_matriz
+)
+from project.app.services.Cliente.Consulta_DataBase.Consultar_horario import consultar_horarios_agendamento
+
+# Equivalência entre o motor vetorizado (consultar_horarios_em_lote) e a consulta de um
+# colaborador e uma data (consultar_horarios_agendamento) para os mesmos bitmaps.
+
+CONSULTAR_HORARIO = 'project.app.services.Cliente.Consulta_DataBase.Consultar_horario'
+MOTOR = 'project.app.services.Cliente.Disponibilidade.Motor_disponibilidade'
+DATA = date(2030, 1, 1)
+
+Registro = namedtuple("Registro", "colaborador_id data horario_inicial menor_time disponibilidade")
+
+def horarios_escalar(registro, required_slots):
+    """
+    Executa consultar_horarios_agendamento para o registro, com o banco e o cache simulados.
+    """
+    db = MagicMock()
+    db.session.query.return_value.filter_by.return_value.first.return_value = registro
+    with patch(f'{CONSULTAR_HORARIO}.db', db), \
+         patch(f'{CONSULTAR_HORARIO}.calcular_required_slots', return_value=required_slots), \
+         patch(f'{CONSULTAR_HORARIO}.obter_horarios', return_value=None), \
+         patch(f'{CONSULTAR_HORARIO}.gravar_horarios'), \
+         patch(f'{CONSULTAR_HORARIO}.marcar_leitura', return_value=0):
+        sucesso, horarios = consultar_horarios_agendamento("est_id", registro.colaborador_id, DATA.isoformat(), ["serv_id"])
+    assert sucesso is True
+    return horarios
+
+def horarios_matriz(registros, required_slots):
+    """
+    Executa consultar_horarios_em_lote para os registros, com o banco simulado.
+    """
+    with patch(f'{MOTOR}.carregar_horarios', return_value=registros):
+        return consultar_horarios_em_lote("est_id", [DATA], required_slots)
+
+def assert_equivalentes(registros, required_slots):
+    em_lote = horarios_matriz(registros, required_slots)
+    for registro in registros:
+        assert em_lote[(registro.colaborador_id, DATA)] == horarios_escalar(registro, required_slots), \
+            (registro.disponibilidade, required_slots)
+
+def registro(indice, disponibilidade, horario_inicial=time(8, 0), menor_time=15):
+    return Registro(f"colab_{indice}", DATA, horario_inicial, menor_time, disponibilidade)
+
+def test_bitmaps_aleatorios():
+    """
+    Testa bitmaps aleatórios de tamanhos diferentes na mesma matriz (linhas completadas com
+    slots ocupados) para vários valores de required_slots.
+    """
+    aleatorio = random.Random(5)
+    for _ in range(50):
+        registros = [
+            registro(i, "".join(aleatorio.choice("0111") for _ in range(aleatorio.randint(1, 96))),
+                     time(aleatorio.randint(0, 12), 0), aleatorio.choice([10, 15, 30]))
+            for i in range(aleatorio.randint(1, 6))
+        ]
+        for required_slots in [0, 1, 2, 3, 5, 8, 13]:
+            assert_equivalentes(registros, required_slots)
+
+@pytest.mark.parametrize("required_slots", [1, 2])
+def test_ultimo_slot_do_dia(required_slots):
+    """
+    Testa sequências livres que terminam exatamente no último slot da grade.
+    """
+    registros = [registro(0, "0" * 30 + "11"), registro(1, "0" * 10 + "1")]
+    assert_equivalentes(registros, required_slots)
+    assert horarios_matriz(registros, 1)[("colab_0", DATA)] == [time(15, 30), time(15, 45)]
+    assert horarios_matriz(registros, 1)[("colab_1", DATA)] == [time(10, 30)]
+
+def test_required_slots_maior_que_o_dia():
+    """
+    Testa required_slots maior que a grade do dia: nenhum horário em nenhuma das versões.
+    """
+    registros = [registro(0, "1" * 8), registro(1, "1" * 4)]
+    assert_equivalentes(registros, 9)
+    assert horarios_matriz(registros, 9)[("colab_0", DATA)] == [None]
+    assert horarios_matriz(registros, 5)[("colab_1", DATA)] == [None]
+
+def test_dia_todo_livre():
+    """
+    Testa um dia sem agendamentos: todos os inícios até o último que ainda cabe na grade.
+    """
+    registros = [registro(0, "1" * 40)]
+    for required_slots in [1, 4, 40]:
+        assert_equivalentes(registros, required_slots)
+    assert len(horarios_matriz(registros, 4)[("colab_0", DATA)]) == 37
+    assert horarios_matriz(registros, 40)[("colab_0", DATA)] == [time(8, 0)]
+
+def test_matriz_completa_linhas_menores():
+    """
+    Testa que o preenchimento de linhas menores não cria inícios além do final da grade.
+    """
+    matriz, _ = montar_matriz([registro(0, "1" * 10), registro(1, "11")])
+    inicios = inicios_disponiveis_matriz(matriz, 2)
+    assert inicios[1].nonzero()[0].tolist() == [0]
+    assert inicios[0].nonzero()[0].tolist() == list(range(9))
\ No newline at end of file
@@ -0,0 +1,101 @@
+import pytest
+from unittest.mock import patch
+from cryptography.fernet import Fernet
+from project.app.services.Cliente.Autenticacao_Tokens import Registro_chaves_api
+from project.app.services.Cliente.Autenticacao_Tokens.Registro_chaves_api import carregar_chaves_api, validar_token_escopo
+
+MODULO = 'project.app.services.Cliente.Autenticacao_Tokens.Registro_chaves_api'
+
+def token_para(chave: bytes, esperado: str) -> str:
+    return Fernet(chave).encrypt(esperado.encode()).decode()
+
+@pytest.fixture(autouse=True)
+def registro_limpo(monkeypatch):
+    """
+    Fixture que remove as variáveis do escopo de teste do ambiente e descarta o registro carregado.
+    """
+    monkeypatch.delenv("CHAVE_API_CONSULTAR_SERVICOS", raising=False)
+    monkeypatch.delenv("TOKEN_API_CONSULTAR_SERVICOS", raising=False)
+    monkeypatch.setattr(Registro_chaves_api, '_arquivo', {})
+    monkeypatch.setattr(Registro_chaves_api, '_registro', None)
+    yield
+
+def test_ambiente_tem_precedencia_sobre_o_arquivo(monkeypatch):
+    """
+    Testa que variáveis definidas no ambiente do processo (ex.: contêiner ou gerenciador de
+    segredos) prevalecem sobre o .env, como em load_dotenv.
+    """
+    chave_ambiente, chave_arquivo = Fernet.generate_key(), Fernet.generate_key()
+    monkeypatch.setenv("CHAVE_API_CONSULTAR_SERVICOS", chave_ambiente.decode())
+    monkeypatch.setenv("TOKEN_API_CONSULTAR_SERVICOS", "esperado-ambiente")
+    arquivo = {"CHAVE_API_CONSULTAR_SERVICOS": chave_arquivo.decode(), "TOKEN_API_CONSULTAR_SERVICOS": "esperado-arquivo"}
+
+    with patch(f'{MODULO}.dotenv_values', return_value=arquivo):
+        carregar_chaves_api()
+
+    assert validar_token_escopo("consultar_servicos", token_para(chave_ambiente, "esperado-ambiente")) is True
+    assert validar_token_escopo("consultar_servicos", token_para(chave_arquivo, "esperado-arquivo")) is False
+
+def test_arquivo_usado_quando_ambiente_nao_define():
+    """
+    Testa que o .env é usado para as variáveis ausentes do ambiente.
+    """
+    chave = Fernet.generate_key()
+    arquivo = {"CHAVE_API_CONSULTAR_SERVICOS": chave.decode(), "TOKEN_API_CONSULTAR_SERVICOS": "esperado"}
+
+    with patch(f'{MODULO}.dotenv_values', return_value=arquivo):
+        carregar_chaves_api()
+
+    assert validar_token_escopo("consultar_servicos", token_para(chave, "esperado")) is True
+
+def test_recarga_segue_o_arquivo_para_valores_copiados_por_load_dotenv(monkeypatch):
+    """
+    Testa a troca de chaves pelo .env: valores que load_dotenv copiou do arquivo para o
+    ambiente seguem o arquivo na recarga.
+    """
+    chave_antiga, chave_nova = Fernet.generate_key(), Fernet.generate_key()
+    antigo = {"CHAVE_API_CONSULTAR_SERVICOS": chave_antiga.decode(), "TOKEN_API_CONSULTAR_SERVICOS": "esperado"}
+    novo = {"CHAVE_API_CONSULTAR_SERVICOS": chave_nova.decode(), "TOKEN_API_CONSULTAR_SERVICOS": "esperado"}
+    for nome, valor in antigo.items():
+        monkeypatch.setenv(nome, valor)
+
+    with patch(f'{MODULO}.dotenv_values', return_value=antigo):
+        carregar_chaves_api()
+    with patch(f'{MODULO}.dotenv_values', return_value=novo):
+        carregar_chaves_api()
+
+    assert validar_token_escopo("consultar_servicos", token_para(chave_nova, "esperado")) is True
+    assert validar_token_escopo("consultar_servicos", token_para(chave_antiga, "esperado")) is False
+
+def test_veredito_obtido_com_a_chave_anterior_a_troca_nao_fica_em_cache():
+    """
+    Testa uma validação que começa com a chave antiga e termina depois da troca de chaves:
+    o veredito positivo não é gravado, e o token antigo é recusado na validação seguinte.
+    """
+    from project.app.services.Cliente.Cache.Cache_tokens import limpar_cache_tokens
+    limpar_cache_tokens()
+    chave_antiga, chave_nova = Fernet.generate_key(), Fernet.generate_key()
+    antigo = {"CHAVE_API_CONSULTAR_SERVICOS": chave_antiga.decode(), "TOKEN_API_CONSULTAR_SERVICOS": "esperado"}
+    novo = {"CHAVE_API_CONSULTAR_SERVICOS": chave_nova.decode(), "TOKEN_API_CONSULTAR_SERVICOS": "esperado"}
+    token_antigo = token_para(chave_antiga, "esperado")
+
+    with patch(f'{MODULO}.dotenv_values', return_value=antigo):
+        carregar_chaves_api()
+
+    class TrocaDuranteVerificacao:
+        # Fernet da chave antiga que, no meio da descriptografia, vê as chaves serem trocadas
+        def __init__(self, fernet):
+            self.fernet = fernet
+
+        def decrypt(self, token):
+            with patch(f'{MODULO}.dotenv_values', return_value=novo):
+                carregar_chaves_api()
+            return self.fernet.decrypt(token)
+
+    fernet, esperado = Registro_chaves_api._registro["consultar_servicos"]
+    Registro_chaves_api._registro["consultar_servicos"] = (TrocaDuranteVerificacao(fernet), esperado)
+
+    assert validar_token_escopo("consultar_servicos", token_antigo) is True
+    assert validar_token_escopo("consultar_servicos", token_antigo) is False
+    assert validar_token_escopo("consultar_servicos", token_para(chave_nova, "esperado")) is True
+    limpar_cache_tokens()
\ No newline at end of file
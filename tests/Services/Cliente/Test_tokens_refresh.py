@@ -0,0 +1,108 @@
+import pytest
+from datetime import datetime, timedelta
+from types import SimpleNamespace
+from unittest.mock import patch
+from project.app.services.Cliente.Consulta_DataBase import Tokens_refresh
+from project.app.services.Cliente.Consulta_DataBase.Tokens_refresh import emitir_token_refresh, renovar_token_refresh
+
+MODULO = 'project.app.services.Cliente.Consulta_DataBase.Tokens_refresh'
+
+@pytest.fixture(autouse=True)
+def sem_purga_anterior(monkeypatch):
+    """
+    Fixture que simula um processo que ainda não removeu tokens expirados.
+    """
+    monkeypatch.setattr(Tokens_refresh, '_ultima_purga', None)
+    yield
+
+def test_emissao_remove_expirados_no_maximo_uma_vez_por_intervalo():
+    """
+    Testa que emitir_token_refresh remove um lote de tokens expirados na primeira emissão do
+    processo e não repete a remoção antes de INTERVALO_PURGA segundos.
+    """
+    with patch(f'{MODULO}.db'), \
+         patch(f'{MODULO}.TokenRefresh'), \
+         patch(f'{MODULO}.purgar_tokens_refresh') as purgar, \
+         patch(f'{MODULO}.time.monotonic', side_effect=[100.0, 200.0, 100.0 + Tokens_refresh.INTERVALO_PURGA]):
+        assert emitir_token_refresh("est", "cli")
+        assert emitir_token_refresh("est", "cli")
+        assert emitir_token_refresh("est", "cli")
+
+    assert purgar.call_count == 2
+    purgar.assert_called_with(Tokens_refresh.LOTE_PURGA)
+
+def test_emissao_que_falha_nao_remove_expirados():
+    """
+    Testa que, se a gravação do token falhar, a emissão retorna False sem tentar a remoção.
+    """
+    with patch(f'{MODULO}.db') as db, \
+         patch(f'{MODULO}.TokenRefresh'), \
+         patch(f'{MODULO}.purgar_tokens_refresh') as purgar:
+        db.session.commit.side_effect = Exception("falha")
+        assert emitir_token_refresh("est", "cli") is False
+
+    db.session.rollback.assert_called_once()
+    purgar.assert_not_called()
+
+def test_purga_que_falha_retorna_zero():
+    """
+    Testa que uma falha na remoção é desfeita e não é propagada para a emissão.
+    """
+    with patch(f'{MODULO}.db') as db, patch(f'{MODULO}.TokenRefresh'):
+        db.session.commit.side_effect = Exception("falha")
+        assert Tokens_refresh.purgar_tokens_refresh(10) == 0
+
+    db.session.rollback.assert_called_once()
+
+def registro_usado(segundos_atras: float, revogado: bool = False):
+    """
+    Simula a linha de um token trocado 'segundos_atras' segundos antes da renovação.
+    """
+    return SimpleNamespace(
+        cliente_id="cli", familia="familia", revogado=revogado,
+        usado_em=datetime.utcnow() - timedelta(seconds=segundos_atras)
+    )
+
+@pytest.fixture
+def db_renovacao():
+    """
+    Fixture que simula a sessão em que o UPDATE que consome o token não altera nenhuma linha.
+    """
+    with patch(f'{MODULO}.db') as db, patch(f'{MODULO}.TokenRefresh') as modelo:
+        # Permite montar o filtro 'expira_em > agora' com o model simulado
+        modelo.expira_em.__gt__.return_value = True
+        db.session.query.return_value.filter.return_value.update.return_value = 0
+        yield db
+
+def test_renovacao_concorrente_dentro_da_graca_nao_revoga_a_familia(db_renovacao):
+    """
+    Testa duas abas (ou a repetição de uma requisição) renovando com o mesmo token: o segundo
+    uso, logo após a troca, é recusado sem revogar a família.
+    """
+    db_renovacao.session.query.return_value.filter.return_value.first.return_value = registro_usado(1)
+
+    assert renovar_token_refresh("est", "token") == (False, "Token já renovado")
+    # Apenas o UPDATE que tenta consumir o token; nenhum UPDATE de revogação
+    assert db_renovacao.session.query.return_value.filter.return_value.update.call_count == 1
+    db_renovacao.session.commit.assert_not_called()
+    db_renovacao.session.rollback.assert_called_once()
+
+def test_reuso_depois_da_graca_revoga_a_familia(db_renovacao):
+    """
+    Testa que o reuso depois de GRACA_REUSO segundos continua revogando a família.
+    """
+    db_renovacao.session.query.return_value.filter.return_value.first.return_value = registro_usado(Tokens_refresh.GRACA_REUSO + 5)
+
+    assert renovar_token_refresh("est", "token") == (False, "Token reutilizado")
+    atualizacoes = db_renovacao.session.query.return_value.filter.return_value.update.call_args_list
+    assert len(atualizacoes) == 2
+    assert atualizacoes[1].args[0]["revogado"] is True
+    db_renovacao.session.commit.assert_called_once()
+
+def test_reuso_dentro_da_graca_de_familia_revogada_e_invalido(db_renovacao):
+    """
+    Testa que, com a família já revogada, a graça não se aplica.
+    """
+    db_renovacao.session.query.return_value.filter.return_value.first.return_value = registro_usado(1, revogado=True)
+
+    assert renovar_token_refresh("est", "token") == (False, "Token reutilizado")
\ No newline at end of file
@@ -0,0 +1,167 @@
+import csv
+import io
+import json
+import uuid
+from datetime import date, time
+from types import SimpleNamespace
+import pytest
+from sqlalchemy.dialects import postgresql
+from project.app.services.Estabelecimento.Consulta_DataBase.Exportar_agendamentos import (
+    _registro,
+    _bloco_csv,
+    _bloco_ndjson,
+    COLUNAS
+)
+
+ID = uuid.UUID('33333333-3333-3333-3333-333333333333')
+
+def linha(**campos):
+    """
+    Cria uma linha como as devolvidas por _consulta.
+    """
+    valores = {
+        "id": ID, "data": date(2024, 5, 2), "horas": [time(9, 0), time(9, 30)], "duracao": 60,
+        "status": "concluído", "cliente": "Ana", "colaborador": "Bruno", "servicos": ["Barba", "Corte"]
+    }
+    valores.update(campos)
+    return SimpleNamespace(**valores)
+
+def ler_csv(texto):
+    return list(csv.reader(io.StringIO(texto)))
+
+def test_registro_serializa_a_linha():
+    """
+    Testa a conversão de uma linha em um registro serializável em JSON.
+    """
+    assert _registro(linha()) == {
+        "id": str(ID), "data": "2024-05-02", "horas": ["09:00:00", "09:30:00"], "duracao": 60,
+        "status": "concluído", "cliente": "Ana", "colaborador": "Bruno", "servicos": ["Barba", "Corte"]
+    }
+
+def test_registro_sem_horas_e_sem_servicos():
+    """
+    Testa que horas e serviços nulos (agendamento sem serviços no array_agg) viram listas vazias.
+    """
+    registro = _registro(linha(horas=None, servicos=None))
+    assert registro["horas"] == []
+    assert registro["servicos"] == []
+
+def test_bloco_ndjson_um_objeto_por_linha():
+    """
+    Testa que cada linha vira um objeto JSON em uma linha, sem escapar acentos.
+    """
+    texto = _bloco_ndjson([linha(), linha(cliente="Zé")])
+    assert [json.loads(item)["cliente"] for item in texto.splitlines()] == ["Ana", "Zé"]
+    assert "Zé" in texto
+
+def test_bloco_csv_cabecalho_e_colunas():
+    """
+    Testa o cabeçalho e a junção das horas e dos serviços em uma célula cada.
+    """
+    assert ler_csv(_bloco_csv([], cabecalho=True)) == [list(COLUNAS)]
+    assert ler_csv(_bloco_csv([linha()])) == [
+        [str(ID), "2024-05-02", "09:00:00 09:30:00", "60", "concluído", "Ana", "Bruno", "Barba, Corte"]
+    ]
+
+@pytest.mark.parametrize("nome", [
+    "=HYPERLINK(\"http://x\")", "+1+1", "-2+3", "@SUM(A1)", "\t=1", "\r=1"
+])
+def test_bloco_csv_escapa_formulas(nome):
+    """
+    Testa que textos informados por usuários que começam com caracteres de fórmula são
+    exportados com um apóstrofo na frente.
+    """
+    celulas = ler_csv(_bloco_csv([linha(cliente=nome, colaborador=nome, servicos=[nome])]))[0]
+    assert celulas[COLUNAS.index("cliente")] == "'" + nome
+    assert celulas[COLUNAS.index("colaborador")] == "'" + nome
+    assert celulas[COLUNAS.index("servicos")] == "'" + nome
+
+def test_bloco_csv_nao_altera_textos_comuns():
+    """
+    Testa que textos sem caractere de fórmula no início (inclusive com '=' no meio) não mudam.
+    """
+    celulas = ler_csv(_bloco_csv([linha(cliente="Ana = Maria", servicos=["Corte - curto"])]))[0]
+    assert celulas[COLUNAS.index("cliente")] == "Ana = Maria"
+    assert celulas[COLUNAS.index("servicos")] == "Corte - curto"
+
+@pytest.fixture(scope="module")
+def servico(app_real):
+    """
+    Fixture que importa o serviço com os models reais, para compilar a consulta.
+    """
+    return app_real("app.services.Estabelecimento.Consulta_DataBase.Exportar_agendamentos")
+
+def compilar(consulta):
+    compilada = consulta.compile(dialect=postgresql.dialect())
+    return str(compilada), compilada.params
+
+def test_consulta_sem_filtros(servico):
+    """
+    Testa que a consulta filtra apenas pelo estabelecimento e pelos agendamentos não excluídos,
+    em ordem de data e ID.
+    """
+    sql, parametros = compilar(servico._consulta("est"))
+    assert "agendamentos.estabelecimento_id = %(estabelecimento_id_1)s" in sql
+    assert "agendamentos.deleted IS false" in sql
+    assert "agendamentos.data >=" not in sql and "agendamentos.data <=" not in sql
+    assert "agendamentos.status =" not in sql
+    assert sql.rstrip().endswith("ORDER BY agendamentos.data, agendamentos.id")
+    assert parametros["estabelecimento_id_1"] == "est"
+
+def test_consulta_com_periodo_e_status(servico):
+    """
+    Testa que o período e o status entram como filtros da consulta.
+    """
+    sql, parametros = compilar(servico._consulta("est", "2024-01-01", "2024-12-31", "cancelado"))
+    assert "agendamentos.data >= %(data_1)s" in sql
+    assert "agendamentos.data <= %(data_2)s" in sql
+    assert "agendamentos.status = %(status_1)s" in sql
+    assert (parametros["data_1"], parametros["data_2"], parametros["status_1"]) == ("2024-01-01", "2024-12-31", "cancelado")
+
+def test_consulta_agrega_os_servicos_por_agendamento(servico):
+    """
+    Testa que os serviços são agregados em ordem de nome, com um grupo por agendamento.
+    """
+    sql, _ = compilar(servico._consulta("est"))
+    assert "array_agg(servicos.nome ORDER BY servicos.nome) FILTER (WHERE servicos.id IS NOT NULL)" in sql
+    assert "LEFT OUTER JOIN agendamento_servico" in sql
+    assert "GROUP BY agendamentos.id, clientes.nome, colaboradores.nome" in sql
+
+@pytest.mark.banco
+def test_exportacao_csv_no_banco(app_real, servico, sessao_banco):
+    """
+    Testa a exportação completa em CSV no PostgreSQL (TEST_DATABASE_URL): filtro por status,
+    serviços agregados e o nome do cliente com fórmula escapado.
+    """
+    models = app_real("app.models.models")
+    sufixo = uuid.uuid4().hex[:8]
+    estabelecimento = models.Estabelecimento(
+        identificador_base=sufixo, email_login=f"e{sufixo}@teste.com", senha_hash="x", nome_fantasia="Estabelecimento Teste"
+    )
+    sessao_banco.add(estabelecimento)
+    sessao_banco.flush()
+    cliente = models.Cliente(
+        email_login=f"c{sufixo}@teste.com", senha_hash="x", nome="=1+1", estabelecimento_id=estabelecimento.id
+    )
+    colaborador = models.Colaborador(nome="Colaborador Teste", estabelecimento_id=estabelecimento.id)
+    servicos = [
+        models.Servico(nome=nome, duracao=30, preco=10, estabelecimento_id=estabelecimento.id)
+        for nome in ("Corte", "Barba")
+    ]
+    sessao_banco.add_all([cliente, colaborador] + servicos)
+    sessao_banco.flush()
+    for dia, status in ((1, "concluído"), (2, "cancelado")):
+        sessao_banco.add(models.Agendamento(
+            cliente_id=cliente.id, colaborador_id=colaborador.id, estabelecimento_id=estabelecimento.id,
+            data=date(2020, 1, dia), horas=[time(9, 0)], duracao=60, status=status, servicos=servicos
+        ))
+    sessao_banco.flush()
+
+    texto = "".join(servico.exportar_agendamentos(str(estabelecimento.id), "csv", status="concluído"))
+    cabecalho, *linhas = ler_csv(texto)
+    assert cabecalho == list(COLUNAS)
+    assert len(linhas) == 1
+    registro = dict(zip(COLUNAS, linhas[0]))
+    assert registro["data"] == "2020-01-01"
+    assert registro["cliente"] == "'=1+1"
+    assert registro["servicos"] == "Barba, Corte"
\ No newline at end of file
@@ -0,0 +1,87 @@
+import jwt
+import bcrypt
+import pytest
+from types import SimpleNamespace
+from unittest.mock import patch
+from project.app.services.Estabelecimento.Autenticacao_Tokens.Token_dono_estabelecimento import (
+    gerar_jwt_dono_estabelecimento,
+    validar_token_dono_estabelecimento
+)
+from project.app.services.Estabelecimento.Consulta_DataBase.Autenticar_estabelecimento import autenticar_estabelecimento
+
+TOKEN = 'project.app.services.Estabelecimento.Autenticacao_Tokens.Token_dono_estabelecimento'
+AUTENTICAR = 'project.app.services.Estabelecimento.Consulta_DataBase.Autenticar_estabelecimento'
+
+@pytest.fixture(autouse=True)
+def chaves(monkeypatch):
+    """
+    Fixture que define chaves diferentes para o JWT do estabelecimento e o do dono.
+    """
+    monkeypatch.setenv("SECRET_KEY_ID_ESTABELECIMENTO", "segredo-estabelecimento")
+    monkeypatch.setenv("SECRET_KEY_DONO_ESTABELECIMENTO", "segredo-dono")
+
+def test_token_do_dono_valido():
+    """
+    Testa que o token gerado para o dono é aceito e devolve o ID do estabelecimento.
+    """
+    with patch(f'{TOKEN}.estabelecimento_existe', return_value=True):
+        assert validar_token_dono_estabelecimento(gerar_jwt_dono_estabelecimento("est_id")) == (True, "est_id")
+
+def test_token_anonimo_do_estabelecimento_recusado():
+    """
+    Testa que o JWT de /api/redirecionamento_inicial (chave do estabelecimento) não vale como
+    token do dono, mesmo com o mesmo payload.
+    """
+    anonimo = jwt.encode({"id": "est_id", "tipo": "dono_estabelecimento"}, "segredo-estabelecimento", algorithm="HS256")
+    with patch(f'{TOKEN}.estabelecimento_existe', return_value=True):
+        assert validar_token_dono_estabelecimento(anonimo) is False
+
+@pytest.mark.parametrize("payload", [{"id": "est_id"}, {"id": "est_id", "tipo": "user"}, {"tipo": "dono_estabelecimento"}])
+def test_token_sem_tipo_ou_id_recusado(payload):
+    """
+    Testa que tokens assinados com a chave do dono, mas sem o tipo ou o ID, são recusados.
+    """
+    token = jwt.encode(payload, "segredo-dono", algorithm="HS256")
+    with patch(f'{TOKEN}.estabelecimento_existe', return_value=True):
+        assert validar_token_dono_estabelecimento(token) is False
+
+def test_token_de_estabelecimento_inexistente_recusado():
+    """
+    Testa que o token de um estabelecimento que não existe mais é recusado.
+    """
+    with patch(f'{TOKEN}.estabelecimento_existe', return_value=False):
+        assert validar_token_dono_estabelecimento(gerar_jwt_dono_estabelecimento("est_id")) is False
+
+def test_sem_chave_do_dono_nada_e_aceito(monkeypatch):
+    """
+    Testa que, sem SECRET_KEY_DONO_ESTABELECIMENTO, nenhum token é aceito nem gerado.
+    """
+    token = gerar_jwt_dono_estabelecimento("est_id")
+    monkeypatch.delenv("SECRET_KEY_DONO_ESTABELECIMENTO")
+    assert validar_token_dono_estabelecimento(token) is False
+    with pytest.raises(ValueError):
+        gerar_jwt_dono_estabelecimento("est_id")
+
+@pytest.fixture
+def estabelecimento():
+    """
+    Fixture que simula a consulta do estabelecimento com a senha 'Valid123!' (custo 4).
+    """
+    linha = SimpleNamespace(id="est_id", senha_hash=bcrypt.hashpw(b"Valid123!", bcrypt.gensalt(rounds=4)).decode())
+    with patch(f'{AUTENTICAR}.db') as db, patch(f'{AUTENTICAR}.Estabelecimento'):
+        db.session.query.return_value.filter.return_value.first.return_value = linha
+        yield db
+
+def test_autenticar_estabelecimento_senha_correta(estabelecimento):
+    assert autenticar_estabelecimento("dono@example.com", "Valid123!") == (True, "est_id")
+
+def test_autenticar_estabelecimento_senha_incorreta(estabelecimento):
+    assert autenticar_estabelecimento("dono@example.com", "Errada123!") is False
+
+def test_autenticar_estabelecimento_email_inexistente(estabelecimento):
+    estabelecimento.session.query.return_value.filter.return_value.first.return_value = None
+    assert autenticar_estabelecimento("dono@example.com", "Valid123!") is False
+
+def test_autenticar_estabelecimento_bcrypt_sobrecarregado(estabelecimento):
+    with patch(f'{AUTENTICAR}.executar_bcrypt', return_value=None):
+        assert autenticar_estabelecimento("dono@example.com", "Valid123!") is None
\ No newline at end of file
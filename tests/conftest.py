@@ -1,5 +1,8 @@
 import sys
 import os
+import importlib
+import pytest
+from flask import Flask
 from unittest.mock import MagicMock
 
 # Adiciona o diretório raiz ao path
@@ -14,4 +17,46 @@ mock_extensions.db = mock_db
 sys.modules['app'] = MagicMock()
 sys.modules['app.extensions'] = mock_extensions
 sys.modules['app.models'] = MagicMock()
-sys.modules['app.models.models'] = MagicMock()
\ No newline at end of file
+sys.modules['app.models.models'] = MagicMock()
+
+DIRETORIO_PROJETO = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'project'))
+TEST_DATABASE_URL = os.getenv("TEST_DATABASE_URL")
+
+def _modulos_app():
+    return {nome: modulo for nome, modulo in sys.modules.items() if nome == 'app' or nome.startswith('app.')}
+
+@pytest.fixture(scope="module")
+def app_real():
+    """
+    Fixture que troca, durante o módulo de teste, os mocks do pacote 'app' registrados acima
+    pelos módulos reais, e restaura os mocks ao final.
+    Retorna uma função que importa um módulo real pelo nome (ex.: app_real("app.models.models")).
+    """
+    mocks = _modulos_app()
+    for nome in mocks:
+        del sys.modules[nome]
+    sys.path.insert(0, DIRETORIO_PROJETO)
+    try:
+        yield importlib.import_module
+    finally:
+        sys.path.remove(DIRETORIO_PROJETO)
+        for nome in _modulos_app():
+            del sys.modules[nome]
+        sys.modules.update(mocks)
+
+@pytest.fixture
+def sessao_banco(app_real):
+    """
+    Fixture que cria uma aplicação ligada ao PostgreSQL de TEST_DATABASE_URL (com as migrações
+    aplicadas) e desfaz os dados criados ao final. Sem TEST_DATABASE_URL, o teste é ignorado.
+    """
+    if not TEST_DATABASE_URL:
+        pytest.skip("TEST_DATABASE_URL não definida")
+    db = app_real("app.extensions").db
+    app = Flask(__name__)
+    app.config['SQLALCHEMY_DATABASE_URI'] = TEST_DATABASE_URL
+    app.config['TESTING'] = True
+    db.init_app(app)
+    with app.app_context():
+        yield db.session
+        db.session.rollback()
\ No newline at end of file